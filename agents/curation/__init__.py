@@ -3,6 +3,7 @@ Curation Agent Module
 Handles validation, enrichment, and deduplication of discovered grants.
 """
 
+from agents.curation.dedup_index import DuplicateIndex
 from agents.curation.validator import (
     CurationValidator,
     EnrichedGrant,
@@ -10,6 +11,7 @@ from agents.curation.validator import (
     ValidationResult,
     celery_app,
     consume_discovery_stream_task,
+    rebuild_dedup_index_task,
     run_validator_worker,
     validate_grant_task,
 )
@@ -19,8 +21,10 @@ __all__ = [
     "ValidationResult",
     "EnrichedGrant",
     "ManualReviewEntry",
+    "DuplicateIndex",
     "celery_app",
     "validate_grant_task",
     "consume_discovery_stream_task",
+    "rebuild_dedup_index_task",
     "run_validator_worker",
 ]
@@ -0,0 +1,436 @@
+"""
+Duplicate Index
+MinHash LSH index over grant titles for near-duplicate candidate lookup.
+
+Titles are normalized and shingled into character 3-grams, and a MinHash
+signature is split into bands. Each band hashes to a Redis bucket set, so
+grants whose titles share any band are candidates. Candidates are then
+verified with an exact edit-distance check. The index is shared by all
+validator workers, covers every indexed grant, and is updated
+incrementally as grants are validated.
+
+Entries are keyed by ``index_key`` (source and external id, which the
+database keeps unique), so the validator and the database backfill index
+the same grant under the same key. Entries not re-indexed within the
+retention window are pruned.
+
+Redis layout:
+- ``grants:dedup:band:{band}:{bucket}``: set of index keys
+- ``grants:dedup:external:{external_id}``: set of index keys
+- ``grants:dedup:grants``: hash of index key to a compact JSON summary
+- ``grants:dedup:indexed``: sorted set of index key by last indexed time
+"""
+
+import hashlib
+import json
+import re
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+import numpy as np
+import redis
+import structlog
+
+logger = structlog.get_logger().bind(agent="curation", component="dedup_index")
+
+KEY_PREFIX = "grants:dedup"
+GRANTS_KEY = f"{KEY_PREFIX}:grants"
+INDEXED_KEY = f"{KEY_PREFIX}:indexed"
+
+# Fields kept per grant: enough to confirm and merge a duplicate
+SUMMARY_FIELDS = (
+    "grant_id",
+    "external_id",
+    "source",
+    "title",
+    "description",
+    "url",
+    "funding_agency",
+    "estimated_amount",
+    "deadline",
+    "discovered_at",
+    "eligibility_criteria",
+    "keywords",
+)
+
+# Descriptions are cut to what the LLM duplicate check reads
+DESCRIPTION_LENGTH = 500
+
+# Expired entries removed per add_many call
+PRUNE_BATCH_SIZE = 100
+
+# Titles are compared on their first 100 characters, as in the original check
+TITLE_LENGTH = 100
+SHINGLE_SIZE = 3
+
+# 20 bands x 3 rows: pairs with title Jaccard ~0.37 have a 50% chance of
+# colliding; titles within edit distance 2 are well above that
+NUM_BANDS = 20
+ROWS_PER_BAND = 3
+NUM_PERM = NUM_BANDS * ROWS_PER_BAND
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.default_rng(1)
+_PERM_A = _rng.integers(1, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_title(title: str) -> str:
+    """
+    Normalize a title for shingling.
+
+    Args:
+        title: Raw grant title.
+
+    Returns:
+        Lowercase title with punctuation runs collapsed to single spaces.
+    """
+    return _NON_WORD.sub(" ", title.lower()[:TITLE_LENGTH]).strip()
+
+
+def minhash_signature(title: str) -> Optional[np.ndarray]:
+    """
+    Compute the MinHash signature of a title's character 3-grams.
+
+    Args:
+        title: Raw grant title.
+
+    Returns:
+        Signature of NUM_PERM values, or None for an empty title.
+    """
+    normalized = normalize_title(title)
+    if not normalized:
+        return None
+
+    padded = f" {normalized} "
+    shingles = {padded[i : i + SHINGLE_SIZE] for i in range(max(1, len(padded) - SHINGLE_SIZE + 1))}
+    hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+    # (a * x + b) mod p for every permutation and shingle; a, x < 2^32 so no overflow
+    permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0)
+
+
+def _band_keys(signature: np.ndarray) -> list[str]:
+    keys = []
+    for band in range(NUM_BANDS):
+        rows = signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+        bucket = hashlib.blake2b(rows.tobytes(), digest_size=8).hexdigest()
+        keys.append(f"{KEY_PREFIX}:band:{band}:{bucket}")
+    return keys
+
+
+def _external_key(external_id: str) -> str:
+    return f"{KEY_PREFIX}:external:{external_id}"
+
+
+def levenshtein_distance(s1: str, s2: str, max_distance: Optional[int] = None) -> int:
+    """
+    Calculate Levenshtein distance between two strings.
+
+    Args:
+        s1: First string.
+        s2: Second string.
+        max_distance: Stop early once the distance is known to exceed this.
+
+    Returns:
+        Edit distance (any value above max_distance when stopped early).
+    """
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    if max_distance is not None and len(s1) - len(s2) > max_distance:
+        return len(s1) - len(s2)
+    if len(s2) == 0:
+        return len(s1)
+
+    previous_row = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            insertions = previous_row[j + 1] + 1
+            deletions = current_row[j] + 1
+            substitutions = previous_row[j] + (c1 != c2)
+            current_row.append(min(insertions, deletions, substitutions))
+        if max_distance is not None and min(current_row) > max_distance:
+            return min(current_row)
+        previous_row = current_row
+
+    return previous_row[-1]
+
+
+def index_key(grant: dict[str, Any]) -> Optional[str]:
+    """
+    Key a grant is indexed under.
+
+    Args:
+        grant: Grant data.
+
+    Returns:
+        ``{source}:{external_id}`` when both are known, otherwise
+        ``id:{grant_id}``; None if the grant has neither.
+    """
+    source = grant.get("source")
+    external_id = grant.get("external_id")
+    if source and external_id:
+        return f"{source}:{external_id}"
+    if grant.get("grant_id"):
+        return f"id:{grant['grant_id']}"
+    return None
+
+
+def _summarize(grant: dict[str, Any]) -> str:
+    summary = {field: grant.get(field) for field in SUMMARY_FIELDS}
+    if summary["grant_id"] is not None:
+        summary["grant_id"] = str(summary["grant_id"])
+    if summary["description"]:
+        summary["description"] = str(summary["description"])[:DESCRIPTION_LENGTH]
+    return json.dumps(summary, default=lambda v: v.isoformat() if isinstance(v, datetime) else str(v))
+
+
+def _load_summary(summary_json: Optional[str]) -> Optional[dict[str, Any]]:
+    if not summary_json:
+        return None
+    try:
+        return json.loads(summary_json)
+    except json.JSONDecodeError:
+        return None
+
+
+def _membership_keys(grant: dict[str, Any]) -> set[str]:
+    """Band and external id sets a grant belongs to."""
+    keys: set[str] = set()
+    signature = minhash_signature(grant.get("title") or "")
+    if signature is not None:
+        keys.update(_band_keys(signature))
+    if grant.get("external_id"):
+        keys.add(_external_key(str(grant["external_id"])))
+    return keys
+
+
+class DuplicateIndex:
+    """
+    Redis-backed near-duplicate index over all validated grants.
+
+    Matches the validator's duplicate rules: titles within an edit
+    distance of ``max_title_distance`` (on the first 100 lowercase
+    characters), or the same external id from a different source.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        max_title_distance: int = 2,
+        retention_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize index.
+
+        Args:
+            redis_client: Redis client (decoded responses).
+            max_title_distance: Largest title edit distance treated as a duplicate.
+            retention_seconds: Drop entries not re-indexed for this long
+                (pruned a batch at a time on each add); None keeps them.
+        """
+        self.redis = redis_client
+        self.max_title_distance = max_title_distance
+        self.retention_seconds = retention_seconds
+
+    def add(self, grant: dict[str, Any]) -> None:
+        """
+        Index a validated grant.
+
+        Args:
+            grant: Grant data with at least ``grant_id`` and ``title``.
+        """
+        self.add_many([grant])
+
+    def add_many(self, grants: Iterable[dict[str, Any]]) -> int:
+        """
+        Index several grants in one pipeline.
+
+        Re-indexing a grant whose title changed moves it out of the buckets
+        of its previous title.
+
+        Args:
+            grants: Grant data dicts.
+
+        Returns:
+            Number of grants indexed.
+        """
+        keyed: dict[str, dict[str, Any]] = {}
+        for grant in grants:
+            key = index_key(grant)
+            if key is not None:
+                keyed[key] = grant
+        if not keyed:
+            return 0
+
+        keys = list(keyed)
+        previous = self.redis.hmget(GRANTS_KEY, keys)
+        now = time.time()
+
+        pipe = self.redis.pipeline(transaction=False)
+        for key, previous_json in zip(keys, previous):
+            grant = keyed[key]
+            memberships = _membership_keys(grant)
+            old = _load_summary(previous_json)
+            if old is not None:
+                for stale in _membership_keys(old) - memberships:
+                    pipe.srem(stale, key)
+            for member_of in memberships:
+                pipe.sadd(member_of, key)
+            pipe.hset(GRANTS_KEY, key, _summarize(grant))
+        pipe.zadd(INDEXED_KEY, {key: now for key in keys})
+        pipe.execute()
+
+        if self.retention_seconds is not None:
+            self.prune(self.retention_seconds, limit=PRUNE_BATCH_SIZE)
+        return len(keys)
+
+    def prune(self, max_age_seconds: float, limit: Optional[int] = None) -> int:
+        """
+        Remove entries that have not been re-indexed for max_age_seconds.
+
+        Args:
+            max_age_seconds: Age beyond which an entry is dropped.
+            limit: Maximum entries removed in this call (None for all).
+
+        Returns:
+            Number of entries removed.
+        """
+        cutoff = time.time() - max_age_seconds
+        if limit is None:
+            keys = self.redis.zrangebyscore(INDEXED_KEY, "-inf", cutoff)
+        else:
+            keys = self.redis.zrangebyscore(INDEXED_KEY, "-inf", cutoff, start=0, num=limit)
+        if not keys:
+            return 0
+
+        pipe = self.redis.pipeline(transaction=False)
+        for key, summary_json in zip(keys, self.redis.hmget(GRANTS_KEY, keys)):
+            summary = _load_summary(summary_json)
+            if summary is not None:
+                for member_of in _membership_keys(summary):
+                    pipe.srem(member_of, key)
+            pipe.hdel(GRANTS_KEY, key)
+        pipe.zrem(INDEXED_KEY, *keys)
+        pipe.execute()
+
+        logger.info("dedup_index_pruned", removed=len(keys))
+        return len(keys)
+
+    def candidates(self, grant: dict[str, Any]) -> list[dict[str, Any]]:
+        """
+        Find indexed grants that may duplicate the given grant.
+
+        One SUNION over the grant's LSH buckets (and external id set) and
+        one HMGET for the summaries, then exact verification in memory.
+
+        Args:
+            grant: Grant data to check.
+
+        Returns:
+            Summaries of indexed grants that meet the duplicate rules.
+        """
+        title = grant.get("title") or ""
+        external_id = grant.get("external_id")
+        source = grant.get("source")
+
+        keys = _membership_keys(grant)
+        if not keys:
+            return []
+
+        own_key = index_key(grant)
+        candidate_ids = sorted(i for i in self.redis.sunion(list(keys)) if i != own_key)
+        if not candidate_ids:
+            return []
+
+        title_key = title.lower()[:TITLE_LENGTH]
+        duplicates = []
+        for summary_json in self.redis.hmget(GRANTS_KEY, candidate_ids):
+            existing = _load_summary(summary_json)
+            if existing is None:
+                continue
+
+            existing_title = existing.get("title") or ""
+            if title and existing_title:
+                distance = levenshtein_distance(
+                    title_key,
+                    existing_title.lower()[:TITLE_LENGTH],
+                    max_distance=self.max_title_distance,
+                )
+                if distance <= self.max_title_distance:
+                    duplicates.append(existing)
+                    continue
+
+            if external_id and existing.get("external_id") == external_id and existing.get("source") != source:
+                duplicates.append(existing)
+
+        return duplicates
+
+    def size(self) -> int:
+        """Number of indexed grants."""
+        return self.redis.hlen(GRANTS_KEY)
+
+
+def rebuild_from_database(index: DuplicateIndex, session: Any, batch_size: int = 1000) -> int:
+    """
+    Index every grant in the database.
+
+    Idempotent: grants are keyed by ``index_key``, so a grant the
+    validator already indexed is overwritten rather than added twice.
+
+    Args:
+        index: Index to populate.
+        session: Synchronous database session.
+        batch_size: Grants fetched and indexed per batch.
+
+    Returns:
+        Number of grants indexed.
+    """
+    from sqlalchemy import select
+
+    from backend.models import Grant
+
+    stmt = (
+        select(
+            Grant.id,
+            Grant.external_id,
+            Grant.source,
+            Grant.title,
+            Grant.description,
+            Grant.url,
+            Grant.agency,
+            Grant.amount_max,
+            Grant.deadline,
+            Grant.created_at,
+        )
+        .order_by(Grant.id)
+        .execution_options(stream_results=True, yield_per=batch_size)
+    )
+
+    total = 0
+    for rows in session.execute(stmt).partitions():
+        total += index.add_many(
+            {
+                "grant_id": row.id,
+                "external_id": row.external_id,
+                "source": row.source,
+                "title": row.title,
+                "description": row.description,
+                "url": row.url,
+                "funding_agency": row.agency,
+                "estimated_amount": row.amount_max,
+                "deadline": row.deadline,
+                "discovered_at": row.created_at,
+            }
+            for row in rows
+        )
+        logger.info("dedup_index_rebuild_progress", indexed=total)
+
+    return total
@@ -3,6 +3,7 @@ Curation/Validation Agent
 Consumes from 'grants:discovered' stream, validates, enriches, and deduplicates grants.
 """
 
+import asyncio
 import json
 from datetime import datetime, timezone
 from typing import Any, Optional
@@ -14,7 +15,11 @@ import structlog
 from celery import Celery
 from pydantic import BaseModel, Field
 
+from agents.curation.dedup_index import DuplicateIndex, rebuild_from_database
 from backend.core.config import settings
+from backend.core.embedding_service import EmbeddingService
+from backend.core.events import DeadLetterEvent
+from backend.events import StreamNames
 
 # Initialize logger
 logger = structlog.get_logger().bind(agent="curation", component="validator")
@@ -131,6 +136,7 @@ class CurationValidator:
         self.logger = logger.bind(validator="curation")
         self._redis_client: Optional[redis.Redis] = None
         self._openai_client: Optional[openai.OpenAI] = None
+        self._dedup_index: Optional[DuplicateIndex] = None
 
     @property
     def redis_client(self) -> redis.Redis:
@@ -148,6 +154,16 @@ class CurationValidator:
             self._openai_client = openai.OpenAI(api_key=settings.openai_api_key)
         return self._openai_client
 
+    @property
+    def dedup_index(self) -> DuplicateIndex:
+        """Lazy-loaded near-duplicate index."""
+        if self._dedup_index is None:
+            self._dedup_index = DuplicateIndex(
+                self.redis_client,
+                retention_seconds=settings.curation_dedup_retention_days * 24 * 3600,
+            )
+        return self._dedup_index
+
     def _ensure_consumer_group(self) -> None:
         """Create consumer group if it doesn't exist."""
         try:
@@ -211,7 +227,8 @@ The quality_score should reflect:
 - 0-49: Poor - significant issues or not a research grant"""
 
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await asyncio.to_thread(
+                self.openai_client.chat.completions.create,
                 model=settings.llm_model,
                 max_tokens=500,
                 messages=[{"role": "user", "content": prompt}],
@@ -282,7 +299,8 @@ Return an array of 2-5 categories from this list ONLY: [{categories_str}]
 Return ONLY a JSON array, e.g.: ["Computer Science", "Engineering"]"""
 
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await asyncio.to_thread(
+                self.openai_client.chat.completions.create,
                 model=settings.llm_model,
                 max_tokens=200,
                 messages=[{"role": "user", "content": prompt}],
@@ -323,90 +341,33 @@ Return ONLY a JSON array, e.g.: ["Computer Science", "Engineering"]"""
             # Truncate text if too long (8191 tokens max for embedding model)
             truncated_text = text[:8000]
 
-            response = self.openai_client.embeddings.create(
-                model=settings.embedding_model,
-                input=truncated_text,
-            )
-
-            return response.data[0].embedding
+            return await asyncio.to_thread(EmbeddingService(self.openai_client).embed, truncated_text)
         except Exception as e:
             self.logger.error("embedding_generation_error", error=str(e))
             return None
 
-    def _levenshtein_distance(self, s1: str, s2: str) -> int:
-        """Calculate Levenshtein distance between two strings."""
-        if len(s1) < len(s2):
-            return self._levenshtein_distance(s2, s1)
-
-        if len(s2) == 0:
-            return len(s1)
-
-        previous_row = range(len(s2) + 1)
-        for i, c1 in enumerate(s1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(s2):
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
-
-        return previous_row[-1]
-
     async def find_potential_duplicates(self, grant_data: dict[str, Any]) -> list[dict[str, Any]]:
         """
-        Find potential duplicate grants in the database.
+        Find potential duplicate grants among all validated grants.
 
         Checks for:
         - Similar title (Levenshtein distance < 3)
         - Same external_id from different source
 
+        Candidates come from the MinHash LSH index, so only a handful of
+        titles are compared exactly.
+
         Args:
             grant_data: Grant data to check
 
         Returns:
             List of potential duplicate grants
         """
-        duplicates = []
-        title = grant_data.get("title", "")
-        external_id = grant_data.get("external_id")
-        source = grant_data.get("source")
-
-        # Get recently validated grants from Redis for quick duplicate check
-        # In production, this would query the PostgreSQL grants table
-        validated_grants_key = "grants:validated:recent"
-
         try:
-            recent_grants = self.redis_client.lrange(validated_grants_key, 0, 1000)
-
-            for grant_json in recent_grants:
-                try:
-                    existing_grant = json.loads(grant_json)
-                    existing_title = existing_grant.get("title", "")
-                    existing_external_id = existing_grant.get("external_id")
-                    existing_source = existing_grant.get("source")
-
-                    # Check title similarity
-                    if title and existing_title:
-                        distance = self._levenshtein_distance(title.lower()[:100], existing_title.lower()[:100])
-                        if distance < 3:
-                            duplicates.append(existing_grant)
-                            continue
-
-                    # Check same external_id from different source
-                    if (
-                        external_id
-                        and existing_external_id
-                        and external_id == existing_external_id
-                        and source != existing_source
-                    ):
-                        duplicates.append(existing_grant)
-                except json.JSONDecodeError:
-                    continue
+            return self.dedup_index.candidates(grant_data)
         except Exception as e:
             self.logger.error("duplicate_check_error", error=str(e))
-
-        return duplicates
+            return []
 
     async def check_is_duplicate(self, grant1: dict[str, Any], grant2: dict[str, Any]) -> bool:
         """
@@ -440,7 +401,8 @@ Grant 2:
 Return ONLY "true" if these are the same grant, or "false" if they are different grants."""
 
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await asyncio.to_thread(
+                self.openai_client.chat.completions.create,
                 model=settings.llm_model,
                 max_tokens=50,
                 messages=[{"role": "user", "content": prompt}],
@@ -572,11 +534,7 @@ Return ONLY "true" if these are the same grant, or "false" if they are different
         message = {"data": json.dumps(event_data)}
         message_id = self.redis_client.xadd(self.OUTPUT_STREAM, message)
 
-        # Also store the full enriched grant for quick access
-        grant_json = enriched_grant.model_dump_json()
-        self.redis_client.lpush("grants:validated:recent", grant_json)
-        # Keep only last 1000 grants in the recent list
-        self.redis_client.ltrim("grants:validated:recent", 0, 999)
+        self.dedup_index.add(enriched_grant.model_dump(exclude={"embedding", "raw_data"}))
 
         self.logger.info(
             "grant_validated_published",
@@ -618,15 +576,15 @@ Return ONLY "true" if these are the same grant, or "false" if they are different
             )
             return None
 
-        # Step 2: Categorization
+        # Steps 2 and 3: Categorization and embedding (independent, run together)
         title = grant_data.get("title", "")
         description = grant_data.get("description", "")
-        categories = await self.categorize_grant(title, description)
-        validation_result.categories = categories
-
-        # Step 3: Generate embedding
         embedding_text = f"{title} {description}".strip()
-        embedding = await self.generate_embedding(embedding_text)
+        categories, embedding = await asyncio.gather(
+            self.categorize_grant(title, description),
+            self.generate_embedding(embedding_text),
+        )
+        validation_result.categories = categories
 
         # Step 4: Check for duplicates
         potential_duplicates = await self.find_potential_duplicates(grant_data)
@@ -679,13 +637,79 @@ Return ONLY "true" if these are the same grant, or "false" if they are different
 
         return enriched_grant
 
-    async def consume_stream(self, count: int = 10, block_ms: int = 5000) -> int:
+    async def _process_message(self, message_id: str, message_data: dict[str, str]) -> tuple[bool, Optional[Exception]]:
+        """
+        Process one stream message, capturing any failure.
+
+        Args:
+            message_id: Redis stream message ID
+            message_data: Raw message fields
+
+        Returns:
+            Tuple of (whether a grant was published, exception if processing failed)
+        """
+        try:
+            grant_data = json.loads(message_data.get("data", "{}"))
+            result = await self.process_grant(grant_data)
+            return result is not None, None
+        except Exception as e:
+            self.logger.error(
+                "grant_processing_error",
+                message_id=message_id,
+                error=str(e),
+            )
+            return False, e
+
+    def _dead_letter(self, message_id: str, message_data: dict[str, str], error: Exception) -> dict[str, str]:
+        """
+        Build a dead letter queue entry in the event bus format.
+
+        Args:
+            message_id: Redis stream message ID
+            message_data: Raw message fields
+            error: Exception raised while processing
+
+        Returns:
+            Stream fields for the DLQ entry
+        """
+        try:
+            original_payload = json.loads(message_data.get("data", "{}"))
+        except json.JSONDecodeError:
+            original_payload = {"raw": message_data.get("data")}
+        if not isinstance(original_payload, dict):
+            original_payload = {"raw": original_payload}
+
+        now = datetime.utcnow()
+        event = DeadLetterEvent(
+            event_id=uuid4(),
+            original_stream=self.INPUT_STREAM,
+            original_message_id=message_id,
+            original_payload=original_payload,
+            error_message=str(error),
+            error_type=error.__class__.__name__,
+            failure_count=1,
+            first_failure_at=now,
+            last_failure_at=now,
+        )
+        return {
+            "payload": event.model_dump_json(),
+            "event_type": DeadLetterEvent.__name__,
+            "published_at": now.isoformat(),
+        }
+
+    async def consume_stream(self, count: int = 10, block_ms: int = 5000, concurrency: Optional[int] = None) -> int:
         """
         Consume and process grants from the discovery stream.
 
+        Messages in a batch are processed concurrently, at most
+        ``concurrency`` at a time. The batch is then acknowledged with a
+        single XACK, and failed messages are moved to the discovery DLQ in
+        the same pipeline.
+
         Args:
             count: Maximum number of messages to process per batch
             block_ms: How long to block waiting for new messages
+            concurrency: Messages processed in parallel (defaults to settings.curation_concurrency)
 
         Returns:
             Number of grants successfully processed
@@ -693,6 +717,11 @@ Return ONLY "true" if these are the same grant, or "false" if they are different
         self._ensure_consumer_group()
 
         processed = 0
+        semaphore = asyncio.Semaphore(max(1, concurrency or settings.curation_concurrency))
+
+        async def process(message_id: str, message_data: dict[str, str]) -> tuple[bool, Optional[Exception]]:
+            async with semaphore:
+                return await self._process_message(message_id, message_data)
 
         try:
             # Read new messages from the stream
@@ -707,31 +736,33 @@ Return ONLY "true" if these are the same grant, or "false" if they are different
             if not messages:
                 return 0
 
-            for stream_name, stream_messages in messages:
-                for message_id, message_data in stream_messages:
-                    try:
-                        # Parse grant data
-                        grant_json = message_data.get("data", "{}")
-                        grant_data = json.loads(grant_json)
+            batch = [message for _, stream_messages in messages for message in stream_messages]
+            results = await asyncio.gather(*(process(message_id, data) for message_id, data in batch))
+
+            dlq_stream = StreamNames.get_dlq_for_stream(self.INPUT_STREAM)
+            pipe = self.redis_client.pipeline(transaction=False)
+            failed = 0
+            for (message_id, message_data), (published, error) in zip(batch, results):
+                if error is not None:
+                    pipe.xadd(
+                        dlq_stream,
+                        self._dead_letter(message_id, message_data, error),
+                        maxlen=10000,
+                        approximate=True,
+                    )
+                    failed += 1
+                elif published:
+                    processed += 1
+            # Acknowledge everything, including failures now held in the DLQ
+            pipe.xack(self.INPUT_STREAM, self.CONSUMER_GROUP, *[message_id for message_id, _ in batch])
+            pipe.execute()
 
-                        # Process the grant
-                        result = await self.process_grant(grant_data)
-
-                        # Acknowledge the message
-                        self.redis_client.xack(self.INPUT_STREAM, self.CONSUMER_GROUP, message_id)
-
-                        if result:
-                            processed += 1
-
-                    except Exception as e:
-                        self.logger.error(
-                            "grant_processing_error",
-                            message_id=message_id,
-                            error=str(e),
-                        )
-                        # Still acknowledge to prevent reprocessing
-                        # In production, might want to move to DLQ instead
-                        self.redis_client.xack(self.INPUT_STREAM, self.CONSUMER_GROUP, message_id)
+            self.logger.info(
+                "stream_batch_processed",
+                messages=len(batch),
+                published=processed,
+                dead_lettered=failed,
+            )
 
         except Exception as e:
             self.logger.error("stream_consumption_error", error=str(e))
@@ -743,6 +774,7 @@ Return ONLY "true" if these are the same grant, or "false" if they are different
         if self._redis_client:
             self._redis_client.close()
             self._redis_client = None
+            self._dedup_index = None
 
 
 # ===== Celery Tasks =====
@@ -764,8 +796,6 @@ def validate_grant_task(self, grant_data: dict[str, Any]) -> Optional[dict]:
     Returns:
         Enriched grant data if valid, None otherwise
     """
-    import asyncio
-
     validator = CurationValidator()
     try:
         result = asyncio.run(validator.process_grant(grant_data))
@@ -792,8 +822,6 @@ def consume_discovery_stream_task(self, count: int = 10, block_ms: int = 5000) -
     Returns:
         Dict with processing statistics
     """
-    import asyncio
-
     validator = CurationValidator()
     try:
         processed = asyncio.run(validator.consume_stream(count, block_ms))
@@ -805,6 +833,33 @@ def consume_discovery_stream_task(self, count: int = 10, block_ms: int = 5000) -
         validator.close()
 
 
+@celery_app.task(
+    name="agents.curation.validator.rebuild_dedup_index_task",
+    bind=True,
+)
+def rebuild_dedup_index_task(self, batch_size: int = 1000) -> dict[str, int]:
+    """
+    Celery task to index every grant in the database for duplicate checks.
+
+    Args:
+        batch_size: Grants indexed per batch
+
+    Returns:
+        Dict with the number of grants indexed
+    """
+    from backend.database import get_sync_db
+
+    validator = CurationValidator()
+    db = get_sync_db()
+    try:
+        indexed = rebuild_from_database(validator.dedup_index, db, batch_size=batch_size)
+        logger.info("dedup_index_rebuilt", indexed=indexed)
+        return {"indexed": indexed}
+    finally:
+        db.close()
+        validator.close()
+
+
 @celery_app.task(name="agents.curation.validator.run_validator_worker")
 def run_validator_worker(batch_size: int = 10, iterations: int = 100) -> dict[str, int]:
     """
@@ -817,8 +872,6 @@ def run_validator_worker(batch_size: int = 10, iterations: int = 100) -> dict[st
     Returns:
         Dict with total processing statistics
     """
-    import asyncio
-
     validator = CurationValidator()
     total_processed = 0
 
@@ -11,6 +11,7 @@ from agents.delivery.alerter import (
     send_medium_priority_alert,
     process_digest_batch,
     process_all_digests,
+    send_digest_chunk,
 )
 from agents.delivery.channels import (
     SendGridChannel,
@@ -26,6 +27,7 @@ from agents.delivery.models import (
     DeliveryChannel,
     DeliveryStatus,
     DigestBatch,
+    DigestEntry,
     EmailContent,
     GrantInfo,
     MatchInfo,
@@ -44,6 +46,7 @@ __all__ = [
     "send_medium_priority_alert",
     "process_digest_batch",
     "process_all_digests",
+    "send_digest_chunk",
     # Channels
     "SendGridChannel",
     "TwilioChannel",
@@ -57,6 +60,7 @@ __all__ = [
     "DeliveryChannel",
     "DeliveryStatus",
     "DigestBatch",
+    "DigestEntry",
     "EmailContent",
     "GrantInfo",
     "MatchInfo",
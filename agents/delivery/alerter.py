@@ -3,9 +3,11 @@ GrantRadar Alert Delivery Agent
 Consumes from 'matches:computed' stream and sends personalized alerts.
 """
 
+import asyncio
 import json
-from datetime import datetime, timedelta, timezone
-from typing import Optional
+import time
+from datetime import datetime, timezone
+from typing import Iterable, Optional
 from uuid import UUID, uuid4
 
 import openai
@@ -24,6 +26,7 @@ from agents.delivery.models import (
     AlertPriority,
     DeliveryChannel,
     DeliveryStatus,
+    DigestEntry,
     EmailContent,
     GrantInfo,
     MatchInfo,
@@ -36,6 +39,11 @@ from agents.delivery.channels import (
     get_twilio_channel,
     get_slack_channel,
 )
+from agents.delivery.digest import DigestStore
+from agents.delivery.templates import EmailRenderer
+from agents.orchestrator.coordinator import PipelineTracker
+from agents.orchestrator.health import LatencyTracker
+from agents.orchestrator.metrics import MetricKeys
 
 
 logger = structlog.get_logger(__name__)
@@ -59,6 +67,7 @@ celery_app.conf.update(
         "agents.delivery.alerter.send_high_priority_alert": {"queue": "high"},
         "agents.delivery.alerter.send_medium_priority_alert": {"queue": "default"},
         "agents.delivery.alerter.process_digest_batch": {"queue": "default"},
+        "agents.delivery.alerter.send_digest_chunk": {"queue": "default"},
     },
     task_default_queue="default",
     task_default_priority=5,
@@ -79,13 +88,21 @@ class AlertDeliveryAgent:
     MATCHES_STREAM = "matches:computed"
     CONSUMER_GROUP = "alerter"
     CONSUMER_NAME = "alerter-worker-1"
-    DIGEST_KEY_PREFIX = "digest:pending:"
     ALERTS_SENT_KEY = "alerts:sent"
 
+    # Stages timed for each batch read from the stream
+    STAGES = ("read", "lookup", "route", "ack")
+    ALERTING_LATENCY_KEY = f"{MetricKeys.PIPELINE_LATENCIES}:alerting"
+    LATENCY_RETENTION_SECONDS = 24 * 3600
+
     def __init__(self):
         self.logger = structlog.get_logger().bind(agent="alerter")
         self._redis_client: Optional[redis.Redis] = None
         self._openai_client: Optional[openai.OpenAI] = None
+        self._renderer: Optional[EmailRenderer] = None
+        self._digests: Optional[DigestStore] = None
+        self.stage_latency = {stage: LatencyTracker() for stage in self.STAGES}
+        self.alerting_latency = LatencyTracker()
 
     @property
     def redis_client(self) -> redis.Redis:
@@ -103,6 +120,23 @@ class AlertDeliveryAgent:
             self._openai_client = openai.OpenAI(api_key=settings.openai_api_key)
         return self._openai_client
 
+    @property
+    def renderer(self) -> EmailRenderer:
+        """Lazy-loaded email renderer sharing the grant section cache."""
+        if self._renderer is None:
+            self._renderer = EmailRenderer(
+                redis_client_factory=lambda: self.redis_client,
+                llm_client_factory=lambda: self.openai_client,
+            )
+        return self._renderer
+
+    @property
+    def digests(self) -> DigestStore:
+        """Lazy-loaded pending digest store."""
+        if self._digests is None:
+            self._digests = DigestStore(self.redis_client)
+        return self._digests
+
     def _ensure_consumer_group(self) -> None:
         """Create consumer group if it doesn't exist."""
         try:
@@ -205,110 +239,13 @@ class AlertDeliveryAgent:
         match: MatchInfo,
     ) -> EmailContent:
         """
-        Generate personalized email content using Claude.
+        Generate personalized email content from the alert template.
 
-        Uses two prompts:
-        1. Subject line generation
-        2. Body content generation
+        The grant-specific part is rendered once per grant version and
+        cached; only the recipient's name and match details are filled in
+        here, so no LLM call is made per alert.
         """
-        # Generate subject line
-        subject_prompt = f"""Write an engaging subject line (under 50 characters) for this grant alert:
-Grant title: {grant.title}
-Match score: {int(match.match_score * 100)}%
-Deadline: {grant.deadline.strftime("%B %d, %Y") if grant.deadline else "Open"}
-
-Return ONLY the subject line, no quotes or explanation."""
-
-        subject_response = self.openai_client.chat.completions.create(
-            model=settings.llm_model,
-            max_tokens=100,
-            messages=[{"role": "user", "content": subject_prompt}],
-        )
-        subject = subject_response.choices[0].message.content.strip()[:100]
-
-        # Generate body content
-        body_prompt = f"""Write a personalized alert email for {user.name} about this grant:
-
-Grant Title: {grant.title}
-Funding Agency: {grant.funding_agency}
-Amount: {f"${grant.amount_min:,.0f} - ${grant.amount_max:,.0f}" if grant.amount_min and grant.amount_max else "Not specified"}
-Deadline: {grant.deadline.strftime("%B %d, %Y") if grant.deadline else "Rolling/Open"}
-Description: {grant.description[:500]}
-
-Match Score: {int(match.match_score * 100)}%
-Matching Criteria: {", ".join(match.matching_criteria) if match.matching_criteria else "Strong overall fit"}
-Reasoning: {match.explanation or "This grant aligns well with your research profile."}
-
-Requirements:
-1. Tone: Professional but friendly
-2. Include: (1) Why this is a great fit, (2) Key deadline info, (3) Strategic recommendations, (4) CTA to view full details
-3. Keep under 200 words
-4. Format for HTML email with proper paragraphs
-
-Return the email body only, no subject line or signature."""
-
-        body_response = self.openai_client.chat.completions.create(
-            model=settings.llm_model,
-            max_tokens=1000,
-            messages=[{"role": "user", "content": body_prompt}],
-        )
-        body_html = body_response.choices[0].message.content.strip()
-
-        # Convert to plain text (simple version)
-        body_text = body_html.replace("<p>", "").replace("</p>", "\n\n")
-        body_text = body_text.replace("<br>", "\n").replace("<br/>", "\n")
-        body_text = body_text.replace("<strong>", "").replace("</strong>", "")
-        body_text = body_text.replace("<em>", "").replace("</em>", "")
-
-        # Wrap in email template
-        body_html_full = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; }}
-        .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-        .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px; border-radius: 8px 8px 0 0; }}
-        .content {{ background: #fff; padding: 24px; border: 1px solid #e5e7eb; border-top: none; }}
-        .match-score {{ display: inline-block; background: #10b981; color: white; padding: 4px 12px; border-radius: 20px; font-weight: bold; }}
-        .cta-button {{ display: inline-block; background: #667eea; color: white; padding: 12px 24px; border-radius: 6px; text-decoration: none; margin-top: 16px; }}
-        .footer {{ text-align: center; padding: 16px; color: #6b7280; font-size: 12px; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1 style="margin: 0;">New Grant Match</h1>
-            <p style="margin: 8px 0 0;">GrantRadar found a {int(match.match_score * 100)}% match for you</p>
-        </div>
-        <div class="content">
-            <h2 style="margin-top: 0;">{grant.title}</h2>
-            <p><strong>Agency:</strong> {grant.funding_agency}</p>
-            <p><span class="match-score">{int(match.match_score * 100)}% Match</span></p>
-
-            {body_html}
-
-            <a href="{grant.url}" class="cta-button">View Full Grant Details</a>
-        </div>
-        <div class="footer">
-            <p>You're receiving this because you have grant alerts enabled.</p>
-            <p>GrantRadar - AI-Powered Grant Discovery</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
-
-        return EmailContent(
-            subject=subject,
-            body_html=body_html_full,
-            body_text=f"Hi {user.name},\n\n{body_text}\n\nView grant: {grant.url}\n\n-- GrantRadar",
-            from_email=settings.from_email,
-            from_name=settings.from_name,
-            to_email=user.email,
-            to_name=user.name,
-            tracking_id=str(match.match_id),
-        )
+        return self.renderer.render_alert(user, grant, match)
 
     def generate_sms_content(
         self,
@@ -463,53 +400,11 @@ Return the email body only, no subject line or signature."""
 
         return statuses
 
-    async def _send_digest_email(self, alerts: list[AlertPayload]) -> Optional[DeliveryStatus]:
-        """
-        Generate and send a digest email combining multiple grant alerts.
-
-        Args:
-            alerts: List of AlertPayload objects to include in digest
-
-        Returns:
-            DeliveryStatus if email was sent, None if no alerts or user info missing
-        """
-        if not alerts:
-            return None
-
-        # Get user info from first alert (all alerts are for same user)
-        user = alerts[0].user
-
-        # Sort alerts by match score descending
-        sorted_alerts = sorted(alerts, key=lambda a: a.match.match_score, reverse=True)
-
-        # Generate digest content
-        email_content = await self._generate_digest_email_content(user, sorted_alerts)
-
-        if not email_content:
-            self.logger.error(
-                "digest_email_generation_failed",
-                user_id=str(user.user_id),
-                alert_count=len(alerts),
-            )
-            return None
-
-        # Send via SendGrid
-        sendgrid = get_sendgrid_channel()
-        status = await sendgrid.send(email_content)
-
-        self.logger.info(
-            "digest_email_sent",
-            user_id=str(user.user_id),
-            alert_count=len(alerts),
-            status=status.status,
-        )
-
-        return status
-
     async def _generate_digest_email_content(
         self,
         user: UserInfo,
         alerts: list[AlertPayload],
+        shared_body: bool = False,
     ) -> Optional[EmailContent]:
         """
         Generate email content for a digest of multiple grants.
@@ -517,6 +412,7 @@ Return the email body only, no subject line or signature."""
         Args:
             user: User to send digest to
             alerts: Sorted list of alerts (highest score first)
+            shared_body: Render the shared digest layout with per-user substitutions (for bulk sends)
 
         Returns:
             EmailContent for the digest email
@@ -524,139 +420,138 @@ Return the email body only, no subject line or signature."""
         if not alerts:
             return None
 
-        # Generate subject line
-        if len(alerts) == 1:
-            subject = f"GrantRadar: New grant match ({int(alerts[0].match.match_score * 100)}%)"
-        else:
-            subject = f"GrantRadar: {len(alerts)} new grant matches for you"
+        intro_text = await asyncio.to_thread(self.renderer.digest_intro, user, alerts)
+        return self.renderer.render_digest(user, alerts, intro_text=intro_text, shared_body=shared_body)
 
-        # Build grant summaries for LLM
-        grant_summaries = []
-        for i, alert in enumerate(alerts[:10], 1):  # Limit to 10 grants
-            grant_summaries.append(
-                f"{i}. {alert.grant.title} ({alert.grant.funding_agency}) - {int(alert.match.match_score * 100)}% match"
-            )
+    async def _fetch_match_details(
+        self, user_ids: Iterable[UUID], grant_ids: Iterable[UUID]
+    ) -> dict[tuple[UUID, UUID], tuple[list[str], Optional[str]]]:
+        """
+        Fetch matching criteria and explanations for digest entries in one query.
 
-        # Generate personalized intro using Claude
-        intro_prompt = f"""Write a brief, friendly intro paragraph (2-3 sentences) for a grant digest email to {user.name}.
-They have {len(alerts)} new grant match{"es" if len(alerts) > 1 else ""}.
-Top matches: {"; ".join(grant_summaries[:3])}
-Keep it professional but warm. Don't list the grants, just intro the digest."""
+        Args:
+            user_ids: Users in the digest batch.
+            grant_ids: Grants in the digest batch.
 
+        Returns:
+            Mapping of (user ID, grant ID) to (key strengths, reasoning).
+        """
+        users, grants = list(set(user_ids)), list(set(grant_ids))
+        if not users or not grants:
+            return {}
         try:
-            intro_response = self.openai_client.chat.completions.create(
-                model=settings.llm_model,
-                max_tokens=200,
-                messages=[{"role": "user", "content": intro_prompt}],
-            )
-            intro_text = intro_response.choices[0].message.content.strip()
+            async with get_async_session() as session:
+                result = await session.execute(
+                    select(Match.user_id, Match.grant_id, Match.key_strengths, Match.reasoning).where(
+                        Match.user_id.in_(users), Match.grant_id.in_(grants)
+                    )
+                )
+                return {(row.user_id, row.grant_id): (row.key_strengths or [], row.reasoning) for row in result}
         except Exception as e:
-            self.logger.warning("digest_intro_generation_failed", error=str(e))
-            intro_text = f"Hi {user.name}, we found {len(alerts)} new grant{'s' if len(alerts) > 1 else ''} that match your research profile."
-
-        # Build HTML for each grant
-        grant_html_blocks = []
-        for alert in alerts[:10]:
-            deadline_str = alert.grant.deadline.strftime("%B %d, %Y") if alert.grant.deadline else "Open/Rolling"
-            amount_str = (
-                f"${alert.grant.amount_min:,.0f} - ${alert.grant.amount_max:,.0f}"
-                if alert.grant.amount_min and alert.grant.amount_max
-                else "Amount varies"
-            )
+            self.logger.error("match_details_fetch_error", error=str(e))
+            return {}
 
-            grant_html_blocks.append(f"""
-            <div style="border: 1px solid #e5e7eb; border-radius: 8px; padding: 16px; margin-bottom: 16px;">
-                <div style="display: flex; justify-content: space-between; align-items: start; margin-bottom: 8px;">
-                    <h3 style="margin: 0; color: #1f2937; font-size: 16px;">{alert.grant.title}</h3>
-                    <span style="background: #10b981; color: white; padding: 2px 8px; border-radius: 12px; font-size: 12px; font-weight: bold;">{int(alert.match.match_score * 100)}%</span>
-                </div>
-                <p style="color: #6b7280; margin: 4px 0; font-size: 14px;">{alert.grant.funding_agency} • {amount_str}</p>
-                <p style="color: #6b7280; margin: 4px 0; font-size: 14px;">Deadline: {deadline_str}</p>
-                <p style="color: #374151; margin: 8px 0 12px; font-size: 14px;">{alert.match.explanation or "Strong alignment with your research profile."}</p>
-                <a href="{alert.grant.url}" style="display: inline-block; background: #667eea; color: white; padding: 8px 16px; border-radius: 4px; text-decoration: none; font-size: 14px;">View Details →</a>
-            </div>
-            """)
-
-        grants_html = "\n".join(grant_html_blocks)
-
-        # Build full HTML email
-        body_html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; }}
-        .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-        .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 24px; border-radius: 8px 8px 0 0; }}
-        .content {{ background: #fff; padding: 24px; border: 1px solid #e5e7eb; border-top: none; }}
-        .footer {{ text-align: center; padding: 16px; color: #6b7280; font-size: 12px; background: #f9fafb; border-radius: 0 0 8px 8px; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1 style="margin: 0; font-size: 24px;">Your Grant Digest</h1>
-            <p style="margin: 8px 0 0; opacity: 0.9;">{len(alerts)} new match{"es" if len(alerts) > 1 else ""} found</p>
-        </div>
-        <div class="content">
-            <p style="margin-top: 0;">{intro_text}</p>
-
-            <h2 style="font-size: 18px; margin: 24px 0 16px; color: #1f2937;">Your Matches</h2>
-
-            {grants_html}
-
-            {"<p style='color: #6b7280; font-style: italic;'>Showing top 10 matches. View all in your dashboard.</p>" if len(alerts) > 10 else ""}
-        </div>
-        <div class="footer">
-            <p>You're receiving this because you have grant alerts enabled with digest delivery.</p>
-            <p><a href="{settings.frontend_url}/settings/notifications" style="color: #667eea;">Manage notification preferences</a></p>
-            <p>GrantRadar - AI-Powered Grant Discovery</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+    async def send_digests(self, user_ids: list[str]) -> dict[str, int]:
+        """
+        Send pending digests for a batch of users.
 
-        # Build plain text version
-        grant_text_blocks = []
-        for i, alert in enumerate(alerts[:10], 1):
-            deadline_str = alert.grant.deadline.strftime("%B %d, %Y") if alert.grant.deadline else "Open/Rolling"
-            grant_text_blocks.append(
-                f"{i}. {alert.grant.title}\n"
-                f"   {alert.grant.funding_agency} - {int(alert.match.match_score * 100)}% match\n"
-                f"   Deadline: {deadline_str}\n"
-                f"   View: {alert.grant.url}\n"
-            )
+        Entries are read with one pipelined round trip, users, grants and
+        match details with one query each, and all emails go out through
+        the SendGrid bulk path as personalizations of one shared body. Delivered entries are removed; users whose
+        send failed are retried later. Entries are only dropped for users
+        or grants that no longer exist: if the user or grant lookup fails,
+        every digest in the batch is rescheduled untouched.
 
-        body_text = f"""Hi {user.name},
+        Args:
+            user_ids: Users to send digests to (normally claimed from the due index).
 
-{intro_text}
+        Returns:
+            Counts of digests sent, failed and skipped, and alerts included.
+        """
+        pending = self.digests.entries(user_ids)
+        try:
+            users, grants = await asyncio.gather(
+                self._fetch_users(UUID(user_id) for user_id, entries in pending.items() if entries),
+                self._fetch_grants(entry.grant_id for entries in pending.values() for entry in entries),
+            )
+        except Exception as e:
+            # A failed lookup says nothing about whether users or grants exist
+            retry = [user_id for user_id, entries in pending.items() if entries]
+            self.digests.reschedule(retry)
+            self.logger.error("digest_lookup_failed", users=len(retry), error=str(e))
+            return {"digests_sent": 0, "digests_failed": len(retry), "digests_skipped": 0, "alerts_sent": 0}
+        details = await self._fetch_match_details(users, grants)
+
+        contents: list[EmailContent] = []
+        batches: list[tuple[str, list[DigestEntry], int]] = []
+        skipped: dict[str, list[DigestEntry]] = {}
+        frequencies: dict[str, str] = {}
+
+        for user_id, entries in pending.items():
+            user_result = users.get(UUID(user_id))
+            if not user_result or not user_result[1].email_notifications:
+                # Deleted user or email turned off: drop the pending entries
+                skipped[user_id] = entries
+                continue
+            user, preferences = user_result
+            frequencies[user_id] = preferences.digest_frequency
 
-YOUR MATCHES
-============
+            alerts = []
+            for entry in entries:
+                grant = grants.get(entry.grant_id)
+                if grant is None:
+                    continue
+                criteria, explanation = details.get((user.user_id, entry.grant_id), ([], None))
+                alerts.append(
+                    AlertPayload(
+                        match_id=entry.match_id,
+                        user=user,
+                        grant=grant,
+                        match=MatchInfo(
+                            match_id=entry.match_id,
+                            match_score=entry.match_score,
+                            matching_criteria=criteria,
+                            explanation=explanation,
+                        ),
+                        # Digest alerts all go out together by email; priority only matters for routing
+                        priority=AlertPriority.MEDIUM,
+                        channels=[DeliveryChannel.EMAIL],
+                    )
+                )
 
-{chr(10).join(grant_text_blocks)}
+            email_content = await self._generate_digest_email_content(user, alerts, shared_body=True)
+            if email_content is None:
+                skipped[user_id] = entries
+                continue
+            contents.append(email_content)
+            batches.append((user_id, entries, len(alerts)))
+
+        statuses = await get_sendgrid_channel().send_bulk(contents) if contents else []
+
+        sent = dict(skipped)
+        failed = []
+        alerts_sent = 0
+        for (user_id, entries, alert_count), status in zip(batches, statuses):
+            if status.status == "sent":
+                sent[user_id] = entries
+                alerts_sent += alert_count
+            else:
+                failed.append(user_id)
 
----
-GrantRadar - AI-Powered Grant Discovery
-Manage preferences: {settings.frontend_url}/settings/notifications
-"""
+        self.digests.complete(sent, frequencies)
+        self.digests.reschedule(failed)
 
-        return EmailContent(
-            subject=subject,
-            body_html=body_html,
-            body_text=body_text,
-            from_email=settings.from_email,
-            from_name=settings.from_name,
-            to_email=user.email,
-            to_name=user.name,
-            tracking_id=str(alerts[0].match_id),  # Use first match ID for tracking
-        )
+        result = {
+            "digests_sent": len(sent) - len(skipped),
+            "digests_failed": len(failed),
+            "digests_skipped": len(skipped),
+            "alerts_sent": alerts_sent,
+        }
+        self.logger.info("digests_sent", users=len(user_ids), **result)
+        return result
 
     def _log_alert_sent(self, payload: AlertPayload, statuses: list[DeliveryStatus]) -> None:
         """Log sent alert to Redis and database for tracking and analytics."""
-        import asyncio
-
         for status in statuses:
             alert_record = {
                 "match_id": str(payload.match_id),
@@ -761,29 +656,48 @@ Manage preferences: {settings.frontend_url}/settings/notifications
                 error=str(e),
             )
 
-    def should_batch_for_digest(self, user_id: UUID, priority: AlertPriority) -> bool:
+    def should_batch_for_digest(
+        self,
+        user_id: UUID,
+        priority: AlertPriority,
+        pending_count: Optional[int] = None,
+    ) -> bool:
         """
         Check if alert should be batched for digest.
 
-        Medium priority alerts are batched if user has >3 medium matches per day.
+        Medium priority alerts are batched once the user has 3 or more
+        pending digest entries.
+
+        Args:
+            user_id: Recipient.
+            priority: Alert priority.
+            pending_count: Known pending entry count (looked up if omitted).
         """
         if priority != AlertPriority.MEDIUM:
             return False
 
-        digest_key = f"{self.DIGEST_KEY_PREFIX}{user_id}:{datetime.utcnow().strftime('%Y-%m-%d')}"
-        count = self.redis_client.llen(digest_key)
+        if pending_count is None:
+            pending_count = self.digests.pending_counts([user_id]).get(user_id, 0)
+
+        return pending_count >= 3
 
-        return count >= 3
+    def add_to_digest_batch(self, payload: AlertPayload, frequency: str = "daily") -> int:
+        """
+        Add alert to user's pending digest.
 
-    def add_to_digest_batch(self, payload: AlertPayload) -> None:
-        """Add alert to user's digest batch."""
-        digest_key = f"{self.DIGEST_KEY_PREFIX}{payload.user.user_id}:{datetime.utcnow().strftime('%Y-%m-%d')}"
+        Args:
+            payload: Alert to batch.
+            frequency: User's digest frequency, which sets the send time.
 
-        self.redis_client.lpush(digest_key, payload.model_dump_json())
-        # Expire at end of day + 1 hour buffer
-        self.redis_client.expireat(
-            digest_key,
-            int((datetime.utcnow().replace(hour=23, minute=59, second=59) + timedelta(hours=1)).timestamp()),
+        Returns:
+            Number of entries now pending for the user.
+        """
+        return self.digests.add(
+            payload.user.user_id,
+            payload.match_id,
+            payload.grant.grant_id,
+            payload.match.match_score,
+            frequency,
         )
 
     async def process_match_event(self, event_data: dict) -> None:
@@ -806,103 +720,169 @@ Manage preferences: {settings.frontend_url}/settings/notifications
             user_result = await self._fetch_user(match_event.user_id)
             grant = await self._fetch_grant(match_event.grant_id)
 
-            if not user_result or not grant:
-                self.logger.warning(
-                    "missing_user_or_grant",
-                    user_id=str(match_event.user_id),
-                    grant_id=str(match_event.grant_id),
-                )
-                return
+            await self._route_match(match_event, user_result, grant)
 
-            user, preferences = user_result
+        except Exception as e:
+            self.logger.error(
+                "match_processing_failed",
+                error=str(e),
+                event_data=event_data,
+            )
+            raise
 
-            # Check user's minimum match score threshold
-            if match_event.match_score < preferences.minimum_match_score:
-                self.logger.debug(
-                    "match_below_user_threshold",
-                    match_id=str(match_event.match_id),
-                    score=match_event.match_score,
-                    user_threshold=preferences.minimum_match_score,
-                )
-                return
+    async def _route_match(
+        self,
+        match_event: MatchComputedEvent,
+        user_result: Optional[tuple[UserInfo, UserNotificationPreferences]],
+        grant: Optional[GrantInfo],
+        digest_counts: Optional[dict[UUID, int]] = None,
+    ) -> None:
+        """
+        Route a match to immediate delivery or the digest batch.
 
-            # Determine priority and channels (respecting user preferences)
-            priority = self.determine_priority(match_event.match_score, match_event.grant_deadline)
+        Args:
+            match_event: Parsed match event.
+            user_result: User info and preferences, or None if not found.
+            grant: Grant info, or None if not found.
+            digest_counts: Pending digest entry counts prefetched for the batch; kept up to date as alerts are batched.
+        """
+        if not user_result or not grant:
+            self.logger.warning(
+                "missing_user_or_grant",
+                user_id=str(match_event.user_id),
+                grant_id=str(match_event.grant_id),
+            )
+            return
 
-            if priority == AlertPriority.LOW:
-                self.logger.debug(
-                    "match_below_threshold",
-                    match_id=str(match_event.match_id),
-                    score=match_event.match_score,
-                )
-                return
+        user, preferences = user_result
 
-            channels = self.determine_channels(priority, preferences)
+        # Check user's minimum match score threshold
+        if match_event.match_score < preferences.minimum_match_score:
+            self.logger.debug(
+                "match_below_user_threshold",
+                match_id=str(match_event.match_id),
+                score=match_event.match_score,
+                user_threshold=preferences.minimum_match_score,
+            )
+            return
 
-            # If no channels are enabled, skip sending
-            if not channels:
-                self.logger.debug(
-                    "no_channels_enabled",
-                    match_id=str(match_event.match_id),
-                    user_id=str(match_event.user_id),
-                )
-                return
+        # Determine priority and channels (respecting user preferences)
+        priority = self.determine_priority(match_event.match_score, match_event.grant_deadline)
 
-            # Build payload
-            payload = AlertPayload(
-                match_id=match_event.match_id,
-                user=user,
-                grant=grant,
-                match=MatchInfo(
-                    match_id=match_event.match_id,
-                    match_score=match_event.match_score,
-                    matching_criteria=match_event.matching_criteria or [],
-                    explanation=match_event.explanation,
-                ),
-                priority=priority,
-                channels=channels,
+        if priority == AlertPriority.LOW:
+            self.logger.debug(
+                "match_below_threshold",
+                match_id=str(match_event.match_id),
+                score=match_event.match_score,
             )
+            return
 
-            # Route based on user's digest frequency preference
-            if preferences.digest_frequency == "daily":
-                # Batch all alerts for daily digest (except critical)
-                if priority == AlertPriority.CRITICAL:
-                    send_critical_alert.delay(payload.model_dump_json())
-                else:
-                    self.add_to_digest_batch(payload)
-            elif preferences.digest_frequency == "weekly":
-                # Batch all alerts for weekly digest (except critical)
-                if priority == AlertPriority.CRITICAL:
-                    send_critical_alert.delay(payload.model_dump_json())
-                else:
-                    self.add_to_digest_batch(payload)
-            else:
-                # Immediate delivery (default)
-                if priority == AlertPriority.CRITICAL:
-                    send_critical_alert.delay(payload.model_dump_json())
-                elif priority == AlertPriority.HIGH:
-                    send_high_priority_alert.delay(payload.model_dump_json())
-                elif priority == AlertPriority.MEDIUM:
-                    if self.should_batch_for_digest(user.user_id, priority):
-                        self.add_to_digest_batch(payload)
-                    else:
-                        send_medium_priority_alert.delay(payload.model_dump_json())
-
-            self.logger.info(
-                "match_processed",
+        channels = self.determine_channels(priority, preferences)
+
+        # If no channels are enabled, skip sending
+        if not channels:
+            self.logger.debug(
+                "no_channels_enabled",
                 match_id=str(match_event.match_id),
-                priority=priority.value,
-                channels=[c.value for c in channels],
-                digest_frequency=preferences.digest_frequency,
+                user_id=str(match_event.user_id),
             )
+            return
+
+        # Build payload
+        payload = AlertPayload(
+            match_id=match_event.match_id,
+            user=user,
+            grant=grant,
+            match=MatchInfo(
+                match_id=match_event.match_id,
+                match_score=match_event.match_score,
+                matching_criteria=match_event.matching_criteria or [],
+                explanation=match_event.explanation,
+            ),
+            priority=priority,
+            channels=channels,
+        )
 
-        except Exception as e:
-            self.logger.error(
-                "match_processing_failed",
-                error=str(e),
-                event_data=event_data,
-            )
-            raise
+        # Route based on user's digest frequency preference
+        if preferences.digest_frequency in ("daily", "weekly"):
+            # Batch all alerts for the user's digest (except critical)
+            if priority == AlertPriority.CRITICAL:
+                await self._enqueue(send_critical_alert, payload)
+            else:
+                self.add_to_digest_batch(payload, preferences.digest_frequency)
+        else:
+            # Immediate delivery (default)
+            if priority == AlertPriority.CRITICAL:
+                await self._enqueue(send_critical_alert, payload)
+            elif priority == AlertPriority.HIGH:
+                await self._enqueue(send_high_priority_alert, payload)
+            elif priority == AlertPriority.MEDIUM:
+                pending = digest_counts.get(user.user_id) if digest_counts is not None else None
+                if self.should_batch_for_digest(user.user_id, priority, pending):
+                    count = self.add_to_digest_batch(payload)
+                    if digest_counts is not None:
+                        digest_counts[user.user_id] = count
+                else:
+                    await self._enqueue(send_medium_priority_alert, payload)
+
+        self.logger.info(
+            "match_processed",
+            match_id=str(match_event.match_id),
+            priority=priority.value,
+            channels=[c.value for c in channels],
+            digest_frequency=preferences.digest_frequency,
+        )
+
+    @staticmethod
+    def _to_user_info(user: User) -> tuple[UserInfo, UserNotificationPreferences]:
+        """Build alert user details and notification preferences from a User row."""
+        user_info = UserInfo(
+            user_id=user.id,
+            name=user.name or user.email.split("@")[0],
+            email=user.email,
+            phone=user.phone,
+            slack_webhook_url=user.slack_webhook_url,
+            alert_preferences={},  # Could be extended with user preferences
+        )
+
+        # Extract notification preferences
+        preferences = UserNotificationPreferences(
+            email_notifications=user.email_notifications,
+            sms_notifications=user.sms_notifications,
+            slack_notifications=user.slack_notifications,
+            digest_frequency=user.digest_frequency,
+            minimum_match_score=user.minimum_match_score,
+        )
+
+        return user_info, preferences
+
+    @staticmethod
+    def _to_grant_info(grant: Grant) -> GrantInfo:
+        """Build alert grant details from a Grant row."""
+        # Extract eligibility criteria as a list of strings if available
+        eligibility_criteria = []
+        if grant.eligibility:
+            # Handle various eligibility formats
+            if isinstance(grant.eligibility, dict):
+                eligibility_criteria = [
+                    f"{k}: {v}" for k, v in grant.eligibility.items() if v and isinstance(v, (str, bool, int, float))
+                ]
+            elif isinstance(grant.eligibility, list):
+                eligibility_criteria = [str(item) for item in grant.eligibility]
+
+        return GrantInfo(
+            grant_id=grant.id,
+            title=grant.title,
+            description=grant.description or "",
+            funding_agency=grant.agency or "Unknown Agency",
+            amount_min=float(grant.amount_min) if grant.amount_min else None,
+            amount_max=float(grant.amount_max) if grant.amount_max else None,
+            deadline=grant.deadline,
+            url=grant.url or "",
+            categories=grant.categories or [],
+            eligibility_criteria=eligibility_criteria,
+            posted_at=grant.posted_at,
+        )
 
     async def _fetch_user(self, user_id: UUID) -> Optional[tuple[UserInfo, UserNotificationPreferences]]:
         """
@@ -930,25 +910,7 @@ Manage preferences: {settings.frontend_url}/settings/notifications
                     )
                     return None
 
-                user_info = UserInfo(
-                    user_id=user.id,
-                    name=user.name or user.email.split("@")[0],
-                    email=user.email,
-                    phone=user.phone,
-                    slack_webhook_url=user.slack_webhook_url,
-                    alert_preferences={},  # Could be extended with user preferences
-                )
-
-                # Extract notification preferences
-                preferences = UserNotificationPreferences(
-                    email_notifications=user.email_notifications,
-                    sms_notifications=user.sms_notifications,
-                    slack_notifications=user.slack_notifications,
-                    digest_frequency=user.digest_frequency,
-                    minimum_match_score=user.minimum_match_score,
-                )
-
-                return user_info, preferences
+                return self._to_user_info(user)
 
         except Exception as e:
             self.logger.error(
@@ -984,32 +946,7 @@ Manage preferences: {settings.frontend_url}/settings/notifications
                     )
                     return None
 
-                # Extract eligibility criteria as a list of strings if available
-                eligibility_criteria = []
-                if grant.eligibility:
-                    # Handle various eligibility formats
-                    if isinstance(grant.eligibility, dict):
-                        eligibility_criteria = [
-                            f"{k}: {v}"
-                            for k, v in grant.eligibility.items()
-                            if v and isinstance(v, (str, bool, int, float))
-                        ]
-                    elif isinstance(grant.eligibility, list):
-                        eligibility_criteria = [str(item) for item in grant.eligibility]
-
-                return GrantInfo(
-                    grant_id=grant.id,
-                    title=grant.title,
-                    description=grant.description or "",
-                    funding_agency=grant.agency or "Unknown Agency",
-                    amount_min=float(grant.amount_min) if grant.amount_min else None,
-                    amount_max=float(grant.amount_max) if grant.amount_max else None,
-                    deadline=grant.deadline,
-                    url=grant.url or "",
-                    categories=grant.categories or [],
-                    eligibility_criteria=eligibility_criteria,
-                    posted_at=grant.posted_at,
-                )
+                return self._to_grant_info(grant)
 
         except Exception as e:
             self.logger.error(
@@ -1019,9 +956,206 @@ Manage preferences: {settings.frontend_url}/settings/notifications
             )
             return None
 
-    async def run(self) -> None:
+    async def _fetch_users(self, user_ids: Iterable[UUID]) -> dict[UUID, tuple[UserInfo, UserNotificationPreferences]]:
+        """
+        Fetch several users and their notification preferences in one query.
+
+        Args:
+            user_ids: User UUIDs to fetch.
+
+        Returns:
+            Mapping of user ID to (UserInfo, UserNotificationPreferences) for users that exist.
+
+        Raises:
+            Database errors, so a failed lookup is not mistaken for missing users.
+        """
+        ids = list(set(user_ids))
+        if not ids:
+            return {}
+        async with get_async_session() as session:
+            result = await session.execute(select(User).where(User.id.in_(ids)))
+            return {user.id: self._to_user_info(user) for user in result.scalars()}
+
+    async def _fetch_grants(self, grant_ids: Iterable[UUID]) -> dict[UUID, GrantInfo]:
+        """
+        Fetch several grants in one query.
+
+        Args:
+            grant_ids: Grant UUIDs to fetch.
+
+        Returns:
+            Mapping of grant ID to GrantInfo for grants that exist.
+
+        Raises:
+            Database errors, so a failed lookup is not mistaken for missing grants.
+        """
+        ids = list(set(grant_ids))
+        if not ids:
+            return {}
+        async with get_async_session() as session:
+            result = await session.execute(select(Grant).where(Grant.id.in_(ids)))
+            return {grant.id: self._to_grant_info(grant) for grant in result.scalars()}
+
+    async def _enqueue(self, task, payload: AlertPayload) -> None:
+        """Queue a delivery task without blocking the event loop on the broker."""
+        await asyncio.to_thread(task.delay, payload.model_dump_json())
+
+    def _record_stage(self, stages: dict[str, float], stage: str, started: float) -> float:
+        """Record a stage's duration in milliseconds and return the current time."""
+        now = time.perf_counter()
+        stages[stage] = (now - started) * 1000
+        self.stage_latency[stage].record(stages[stage])
+        return now
+
+    async def process_batch(
+        self,
+        count: Optional[int] = None,
+        block_ms: Optional[int] = 5000,
+        concurrency: Optional[int] = None,
+    ) -> int:
+        """
+        Read one batch of match events and route them concurrently.
+
+        Users and grants for the whole batch are fetched with one query
+        each, events are routed by at most ``concurrency`` tasks at a time,
+        and successfully routed messages are acknowledged with a single
+        pipelined XACK. Messages that fail are left pending for redelivery.
+
+        Args:
+            count: Maximum events per batch (defaults to settings.alerter_batch_size).
+            block_ms: How long to block waiting for new messages.
+            concurrency: Events routed in parallel (defaults to settings.alerter_concurrency).
+
+        Returns:
+            Number of messages acknowledged.
+        """
+        stages: dict[str, float] = {}
+        started = time.perf_counter()
+
+        messages = self.redis_client.xreadgroup(
+            self.CONSUMER_GROUP,
+            self.CONSUMER_NAME,
+            {self.MATCHES_STREAM: ">"},
+            count=count or settings.alerter_batch_size,
+            block=block_ms,
+        )
+        if not messages:
+            return 0
+        started = self._record_stage(stages, "read", started)
+
+        events: list[tuple[str, MatchComputedEvent]] = []
+        for _, stream_messages in messages:
+            for message_id, message_data in stream_messages:
+                try:
+                    event_data = json.loads(message_data["data"]) if "data" in message_data else message_data
+                    events.append((message_id, MatchComputedEvent(**event_data)))
+                except Exception as e:
+                    self.logger.error(
+                        "message_processing_failed",
+                        message_id=message_id,
+                        error=str(e),
+                    )
+                    # Don't ACK - message will be redelivered
+
+        try:
+            users, grants = await asyncio.gather(
+                self._fetch_users(event.user_id for _, event in events),
+                self._fetch_grants(event.grant_id for _, event in events),
+            )
+        except Exception as e:
+            # Routing without users or grants would drop the events; leave them pending
+            self.logger.error("batch_lookup_failed", events=len(events), error=str(e))
+            return 0
+        # One round trip for the digest counts of immediate-delivery users
+        digest_counts = self.digests.pending_counts(
+            user_id for user_id, (_, preferences) in users.items() if preferences.digest_frequency == "immediate"
+        )
+        started = self._record_stage(stages, "lookup", started)
+
+        semaphore = asyncio.Semaphore(max(1, concurrency or settings.alerter_concurrency))
+
+        async def route(message_id: str, event: MatchComputedEvent) -> bool:
+            async with semaphore:
+                try:
+                    await self._route_match(event, users.get(event.user_id), grants.get(event.grant_id), digest_counts)
+                    return True
+                except Exception as e:
+                    self.logger.error(
+                        "message_processing_failed",
+                        message_id=message_id,
+                        match_id=str(event.match_id),
+                        error=str(e),
+                    )
+                    return False
+
+        routed = await asyncio.gather(*(route(message_id, event) for message_id, event in events))
+        started = self._record_stage(stages, "route", started)
+
+        done = [(message_id, event) for (message_id, event), ok in zip(events, routed) if ok]
+        now = datetime.now(timezone.utc)
+        ages = {}
+        for _, event in done:
+            timestamp = event.timestamp if event.timestamp.tzinfo else event.timestamp.replace(tzinfo=timezone.utc)
+            ages[event.match_id] = max(0.0, (now - timestamp).total_seconds())
+            self.alerting_latency.record(ages[event.match_id] * 1000)
+
+        if done:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.xack(self.MATCHES_STREAM, self.CONSUMER_GROUP, *[message_id for message_id, _ in done])
+            # Same format as MetricsCollector.record_pipeline_latency
+            pipe.zadd(
+                self.ALERTING_LATENCY_KEY,
+                {
+                    json.dumps(
+                        {"latency": age, "match_id": str(match_id), "timestamp": now.isoformat()}
+                    ): now.timestamp()
+                    for match_id, age in ages.items()
+                },
+            )
+            pipe.zremrangebyscore(self.ALERTING_LATENCY_KEY, 0, now.timestamp() - self.LATENCY_RETENTION_SECONDS)
+            pipe.execute()
+        self._record_stage(stages, "ack", started)
+
+        max_age = max(ages.values(), default=0.0)
+        self.logger.info(
+            "alert_batch_processed",
+            messages=sum(len(stream_messages) for _, stream_messages in messages),
+            acknowledged=len(done),
+            stage_ms={stage: round(ms, 2) for stage, ms in stages.items()},
+            max_alerting_latency_seconds=round(max_age, 2),
+            target_met=max_age <= PipelineTracker.ALERTING_TARGET,
+        )
+        if max_age > PipelineTracker.ALERTING_TARGET:
+            self.logger.warning(
+                "alerting_target_exceeded",
+                latency_seconds=round(max_age, 2),
+                target_seconds=PipelineTracker.ALERTING_TARGET,
+            )
+
+        return len(done)
+
+    def get_latency_stats(self) -> dict[str, dict[str, float]]:
+        """
+        Get per-stage batch latencies and end-to-end alerting latency.
+
+        Returns:
+            LatencyTracker stats (milliseconds) keyed by stage, plus "alerting"
+            measured from match computation to acknowledgement.
+        """
+        stats = {stage: tracker.stats() for stage, tracker in self.stage_latency.items()}
+        stats["alerting"] = {
+            **self.alerting_latency.stats(),
+            "target_ms": PipelineTracker.ALERTING_TARGET * 1000,
+        }
+        return stats
+
+    async def run(self, concurrency: Optional[int] = None, batch_size: Optional[int] = None) -> None:
         """
         Main run loop - consume from matches:computed stream.
+
+        Args:
+            concurrency: Events routed in parallel (defaults to settings.alerter_concurrency).
+            batch_size: Events read per batch (defaults to settings.alerter_batch_size).
         """
         self._ensure_consumer_group()
 
@@ -1029,46 +1163,10 @@ Manage preferences: {settings.frontend_url}/settings/notifications
 
         while True:
             try:
-                # Read from stream with consumer group
-                messages = self.redis_client.xreadgroup(
-                    self.CONSUMER_GROUP,
-                    self.CONSUMER_NAME,
-                    {self.MATCHES_STREAM: ">"},
-                    count=10,
-                    block=5000,  # 5 second block
-                )
-
-                for stream_name, stream_messages in messages:
-                    for message_id, message_data in stream_messages:
-                        try:
-                            # Parse the event data
-                            if "data" in message_data:
-                                event_data = json.loads(message_data["data"])
-                            else:
-                                event_data = message_data
-
-                            await self.process_match_event(event_data)
-
-                            # Acknowledge the message
-                            self.redis_client.xack(
-                                self.MATCHES_STREAM,
-                                self.CONSUMER_GROUP,
-                                message_id,
-                            )
-
-                        except Exception as e:
-                            self.logger.error(
-                                "message_processing_failed",
-                                message_id=message_id,
-                                error=str(e),
-                            )
-                            # Don't ACK - message will be redelivered
-
+                await self.process_batch(count=batch_size, block_ms=5000, concurrency=concurrency)
             except Exception as e:
                 self.logger.error("stream_read_error", error=str(e))
                 # Brief pause before retry
-                import asyncio
-
                 await asyncio.sleep(1)
 
     def close(self) -> None:
@@ -1179,48 +1277,37 @@ def send_medium_priority_alert(self, payload_json: str) -> dict:
 
 
 @celery_app.task
-def process_digest_batch(user_id: str, date_str: str) -> dict:
+def process_digest_batch(user_id: str, date_str: Optional[str] = None) -> dict:
     """
-    Process batched digest alerts for a user.
+    Send a single user's pending digest now.
 
-    Called at end of day to send digest email combining all pending alerts.
+    ``date_str`` is accepted for tasks queued before digests were indexed
+    by send time and is ignored.
     """
-    import asyncio
-
     agent = AlertDeliveryAgent()
-    digest_key = f"{agent.DIGEST_KEY_PREFIX}{user_id}:{date_str}"
-
-    # Get all pending alerts
-    alert_data = agent.redis_client.lrange(digest_key, 0, -1)
+    try:
+        result = asyncio.run(agent.send_digests([user_id]))
+    finally:
+        agent.close()
 
-    if not alert_data:
-        return {"user_id": user_id, "alerts_processed": 0}
+    return {"user_id": user_id, **result}
 
-    alerts = [AlertPayload.model_validate_json(data) for data in alert_data]
 
-    # Generate and send digest email
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+@celery_app.task
+def send_digest_chunk(user_ids: list[str]) -> dict:
+    """Send pending digests for a chunk of claimed users."""
+    agent = AlertDeliveryAgent()
     try:
-        status = loop.run_until_complete(agent._send_digest_email(alerts))
+        return asyncio.run(agent.send_digests(user_ids))
     finally:
-        loop.close()
-
-    # Clear processed batch
-    agent.redis_client.delete(digest_key)
-
-    return {
-        "user_id": user_id,
-        "alerts_processed": len(alerts),
-        "status": status.status if status else "no_email_sent",
-    }
+        agent.close()
 
 
-# Celery Beat schedule for digest processing
+# Celery Beat schedule for digest processing; send times come from the due index
 celery_app.conf.beat_schedule = {
-    "process-daily-digests": {
+    "process-due-digests": {
         "task": "agents.delivery.alerter.process_all_digests",
-        "schedule": 86400,  # Daily
+        "schedule": 900,  # Every 15 minutes
         "options": {"queue": "default"},
     },
 }
@@ -1229,27 +1316,30 @@ celery_app.conf.beat_schedule = {
 @celery_app.task
 def process_all_digests() -> dict:
     """
-    Process all pending digest batches.
+    Dispatch every digest that is due.
 
-    Called once daily by Celery Beat.
+    Called periodically by Celery Beat. Due users are read from the
+    ``digest:due`` index (no keyspace scans) and fanned out in chunks of
+    settings.digest_users_per_task.
     """
     agent = AlertDeliveryAgent()
-    date_str = datetime.utcnow().strftime("%Y-%m-%d")
-
-    # Find all pending digest keys
-    pattern = f"{agent.DIGEST_KEY_PREFIX}*:{date_str}"
-    keys = agent.redis_client.keys(pattern)
-
-    processed = 0
-    for key in keys:
-        # Extract user_id from key
-        parts = key.split(":")
-        if len(parts) >= 3:
-            user_id = parts[2]
-            process_digest_batch.delay(user_id, date_str)
-            processed += 1
-
-    return {"date": date_str, "digests_queued": processed}
+    chunk_size = settings.digest_users_per_task
+    claimed = 0
+    tasks = 0
+    try:
+        while True:
+            user_ids = agent.digests.claim_due(limit=chunk_size * 10)
+            if not user_ids:
+                break
+            for start in range(0, len(user_ids), chunk_size):
+                send_digest_chunk.delay(user_ids[start : start + chunk_size])
+                tasks += 1
+            claimed += len(user_ids)
+    finally:
+        agent.close()
+
+    logger.info("digests_dispatched", users=claimed, tasks=tasks)
+    return {"digests_queued": claimed, "tasks": tasks}
 
 
 # Entry point for running as standalone worker
@@ -1,9 +1,21 @@
 """
 GrantRadar Alert Delivery Channels
 Channel implementations for SendGrid, Twilio, and Slack.
+
+Besides the per-message ``send`` methods, SendGrid and Twilio have a bulk
+path (``send_bulk``) that talks to the provider REST APIs through one
+pooled HTTP client: emails sharing a body go out as SendGrid
+personalizations (up to 1000 recipients per request, per-recipient text
+carried in ``substitutions``), and SMS fan out with bounded concurrency.
+Each provider is paced by a token bucket.
 """
 
+import asyncio
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
+from collections import defaultdict
 from datetime import datetime
 from typing import Any, Optional
 from uuid import UUID, uuid4
@@ -37,6 +49,157 @@ from agents.delivery.models import (
 
 logger = structlog.get_logger(__name__)
 
+# SendGrid v3 accepts at most this many personalizations per mail/send request
+SENDGRID_MAX_PERSONALIZATIONS = 1000
+
+# SendGrid v3 rejects personalizations whose substitutions total more than this
+SENDGRID_MAX_SUBSTITUTION_BYTES = 10_000
+
+# Longest Retry-After honoured before giving up on a rate-limited request
+MAX_RETRY_AFTER_SECONDS = 60.0
+
+
+class TokenBucket:
+    """
+    Request pacing for one provider.
+
+    Refills continuously at ``rate`` tokens per second up to ``capacity``.
+    Callers reserve tokens up front (the balance may go negative) and sleep
+    until their reservation is covered, so waiters are served in order.
+    Thread-safe and not tied to an event loop.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize bucket.
+
+        Args:
+            rate: Sustained tokens per second.
+            capacity: Burst size (defaults to one second of tokens, at least 1).
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Reserve tokens.
+
+        Args:
+            tokens: Tokens to take.
+
+        Returns:
+            Seconds to wait before the reservation may be used.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Take tokens, waiting for refill if needed.
+
+        Args:
+            tokens: Tokens to take.
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+# One pooled client per event loop: Celery tasks run each send in a fresh loop
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_delivery_http_client() -> httpx.AsyncClient:
+    """
+    Get the pooled HTTP client shared by the bulk provider paths.
+
+    Returns:
+        Keep-alive client for the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=settings.delivery_http_max_connections,
+                max_connections=settings.delivery_http_max_connections,
+            ),
+        )
+        _http_clients[loop] = client
+    return client
+
+
+async def close_delivery_http_client() -> None:
+    """Close the pooled HTTP client for the running event loop."""
+    client = _http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def _retry_after(response: httpx.Response, default: float) -> float:
+    try:
+        return min(float(response.headers.get("Retry-After", default)), MAX_RETRY_AFTER_SECONDS)
+    except ValueError:
+        return default
+
+
+async def _post_with_retries(
+    bucket: TokenBucket,
+    url: str,
+    retry_delays: tuple[float, ...],
+    log: Any,
+    **request_kwargs: Any,
+) -> tuple[Optional[httpx.Response], Optional[str], int]:
+    """
+    POST to a provider API with pacing and retries.
+
+    Retries connection errors, 429 (honouring Retry-After) and 5xx
+    responses; other 4xx responses fail immediately.
+
+    Args:
+        bucket: Provider token bucket; one token per attempt.
+        url: Request URL.
+        retry_delays: Backoff before each retry (its length is the retry count).
+        log: Bound logger.
+        **request_kwargs: Passed to ``httpx.AsyncClient.post``.
+
+    Returns:
+        Tuple of (successful response or None, error message or None, retries made).
+    """
+    client = get_delivery_http_client()
+    error: Optional[str] = None
+
+    for attempt in range(len(retry_delays) + 1):
+        await bucket.acquire()
+        retryable = True
+        delay = retry_delays[attempt] if attempt < len(retry_delays) else 0.0
+        try:
+            response = await client.post(url, **request_kwargs)
+            if response.is_success:
+                return response, None, attempt
+            error = f"HTTP {response.status_code}: {response.text[:200]}"
+            if response.status_code == 429:
+                delay = _retry_after(response, delay)
+            else:
+                retryable = response.status_code >= 500
+        except httpx.TransportError as e:
+            error = f"{type(e).__name__}: {e}"
+
+        if not retryable or attempt >= len(retry_delays):
+            return None, error, attempt
+        log.warning("provider_request_retrying", error=error, attempt=attempt + 1, delay_seconds=delay)
+        await asyncio.sleep(delay)
+
+    return None, error, len(retry_delays)
+
 
 class BaseChannel(ABC):
     """Abstract base class for delivery channels."""
@@ -68,22 +231,56 @@ class SendGridChannel(BaseChannel):
     MAX_RETRIES: int = 3
     RETRY_DELAYS: tuple[float, ...] = (1.0, 2.0, 4.0)  # Exponential backoff in seconds
 
-    def __init__(self):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_base_url: Optional[str] = None,
+        requests_per_second: Optional[float] = None,
+    ):
+        """
+        Initialize channel.
+
+        Args:
+            api_key: SendGrid API key (defaults to settings.sendgrid_api_key).
+            api_base_url: REST API root for the bulk path (defaults to settings.sendgrid_api_base_url).
+            requests_per_second: Bulk request pacing (defaults to settings.sendgrid_requests_per_second).
+        """
         self._client: Optional[SendGridAPIClient] = None
+        self._api_key = api_key
+        self._api_base_url = api_base_url
+        self._requests_per_second = requests_per_second
+        self._bucket: Optional[TokenBucket] = None
         self.logger = structlog.get_logger().bind(channel="sendgrid")
 
+    @property
+    def api_key(self) -> Optional[str]:
+        """SendGrid API key."""
+        return self._api_key or settings.sendgrid_api_key
+
+    @property
+    def api_base_url(self) -> str:
+        """REST API root for the bulk path."""
+        return (self._api_base_url or settings.sendgrid_api_base_url).rstrip("/")
+
+    @property
+    def bucket(self) -> TokenBucket:
+        """Lazy-loaded request pacing shared by bulk sends."""
+        if self._bucket is None:
+            self._bucket = TokenBucket(self._requests_per_second or settings.sendgrid_requests_per_second)
+        return self._bucket
+
     @property
     def client(self) -> SendGridAPIClient:
         """Lazy-loaded SendGrid client."""
         if self._client is None:
-            if not settings.sendgrid_api_key:
+            if not self.api_key:
                 raise ValueError("SendGrid API key not configured")
-            self._client = SendGridAPIClient(api_key=settings.sendgrid_api_key)
+            self._client = SendGridAPIClient(api_key=self.api_key)
         return self._client
 
     def is_configured(self) -> bool:
         """Check if SendGrid is configured."""
-        return bool(settings.sendgrid_api_key)
+        return bool(self.api_key)
 
     def _build_message(self, content: EmailContent) -> Mail:
         """
@@ -184,9 +381,9 @@ class SendGridChannel(BaseChannel):
             status="pending",
         )
 
-        # Build the message once
+        # Build the message once; the single-send API has no per-recipient substitutions
         try:
-            message = self._build_message(content)
+            message = self._build_message(content.personalized())
         except Exception as e:
             status.status = "failed"
             status.error_message = f"Failed to build message: {str(e)}"
@@ -263,6 +460,155 @@ class SendGridChannel(BaseChannel):
 
         return status
 
+    @staticmethod
+    def _substitutions_size(content: EmailContent) -> int:
+        """Bytes SendGrid counts against the per-personalization substitution limit."""
+        return sum(len(key.encode()) + len(value.encode()) for key, value in (content.substitutions or {}).items())
+
+    @staticmethod
+    def _template_key(content: EmailContent) -> tuple:
+        """Fields a bulk request shares; emails with the same key can be personalizations of one request."""
+        return (content.from_email, content.from_name, content.reply_to, content.body_text, content.body_html)
+
+    @staticmethod
+    def _build_bulk_payload(contents: list[EmailContent]) -> dict[str, Any]:
+        """
+        Build a v3 mail/send body with one personalization per email.
+
+        Args:
+            contents: Emails sharing a template key.
+
+        Returns:
+            JSON request body.
+        """
+        first = contents[0]
+        personalizations = []
+        for content in contents:
+            recipient = {"email": content.to_email}
+            if content.to_name:
+                recipient["name"] = content.to_name
+            personalization: dict[str, Any] = {"to": [recipient], "subject": content.subject}
+            if content.substitutions:
+                personalization["substitutions"] = content.substitutions
+            if content.tracking_id:
+                personalization["custom_args"] = {"match_id": content.tracking_id}
+            personalizations.append(personalization)
+
+        payload: dict[str, Any] = {
+            "personalizations": personalizations,
+            "from": {"email": first.from_email, "name": first.from_name},
+            "content": [
+                {"type": "text/plain", "value": first.body_text},
+                {"type": "text/html", "value": first.body_html},
+            ],
+            "tracking_settings": {
+                "click_tracking": {"enable": True, "enable_text": True},
+                "open_tracking": {"enable": True},
+            },
+            "categories": ["grant_alert"],
+        }
+        if first.reply_to:
+            payload["reply_to"] = {"email": first.reply_to}
+        return payload
+
+    async def _send_bulk_request(self, contents: list[EmailContent]) -> list[DeliveryStatus]:
+        """Send one mail/send request and return a status per recipient."""
+        statuses = [
+            DeliveryStatus(
+                alert_id=uuid4(),
+                match_id=UUID(content.tracking_id) if content.tracking_id else uuid4(),
+                channel=DeliveryChannel.EMAIL,
+                status="pending",
+            )
+            for content in contents
+        ]
+
+        response, error, retries = await _post_with_retries(
+            self.bucket,
+            f"{self.api_base_url}/v3/mail/send",
+            self.RETRY_DELAYS[: self.MAX_RETRIES - 1],
+            self.logger,
+            json=self._build_bulk_payload(contents),
+            headers={"Authorization": f"Bearer {self.api_key}"},
+        )
+
+        sent_at = datetime.utcnow()
+        message_id = response.headers.get("X-Message-Id") if response is not None else None
+        for status in statuses:
+            status.retry_count = retries
+            if response is not None:
+                status.status = "sent"
+                status.sent_at = sent_at
+                status.provider_message_id = message_id or str(status.alert_id)
+            else:
+                status.status = "failed"
+                status.error_message = error
+
+        if response is None:
+            self.logger.error("email_bulk_request_failed", recipients=len(contents), error=error, retries=retries)
+        return statuses
+
+    async def send_bulk(self, contents: list[EmailContent], concurrency: Optional[int] = None) -> list[DeliveryStatus]:
+        """
+        Send many emails with as few API requests as possible.
+
+        Emails with identical sender, reply-to and body are sent as
+        personalizations of a single request (up to 1000 each), with
+        per-recipient subject, ``substitutions`` and tracking id. An email
+        whose substitutions exceed SendGrid's size limit is filled in
+        locally and sent with its own body instead. Requests
+        run concurrently over the pooled HTTP client, paced by the
+        channel's token bucket.
+
+        Args:
+            contents: Emails to send.
+            concurrency: Requests in flight (defaults to settings.delivery_bulk_concurrency).
+
+        Returns:
+            DeliveryStatus per email, in input order.
+        """
+        if not contents:
+            return []
+        if not self.is_configured():
+            return [
+                DeliveryStatus(
+                    alert_id=uuid4(),
+                    match_id=UUID(c.tracking_id) if c.tracking_id else uuid4(),
+                    channel=DeliveryChannel.EMAIL,
+                    status="failed",
+                    error_message="SendGrid API key not configured",
+                )
+                for c in contents
+            ]
+
+        contents = [
+            content.personalized() if self._substitutions_size(content) > SENDGRID_MAX_SUBSTITUTION_BYTES else content
+            for content in contents
+        ]
+        groups: dict[tuple, list[int]] = defaultdict(list)
+        for i, content in enumerate(contents):
+            groups[self._template_key(content)].append(i)
+        chunks = [
+            indexes[start : start + SENDGRID_MAX_PERSONALIZATIONS]
+            for indexes in groups.values()
+            for start in range(0, len(indexes), SENDGRID_MAX_PERSONALIZATIONS)
+        ]
+
+        semaphore = asyncio.Semaphore(concurrency or settings.delivery_bulk_concurrency)
+        results: list[Optional[DeliveryStatus]] = [None] * len(contents)
+
+        async def send_chunk(indexes: list[int]) -> None:
+            async with semaphore:
+                chunk_statuses = await self._send_bulk_request([contents[i] for i in indexes])
+            for i, status in zip(indexes, chunk_statuses):
+                results[i] = status
+
+        await asyncio.gather(*(send_chunk(indexes) for indexes in chunks))
+
+        sent = sum(1 for status in results if status.status == "sent")
+        self.logger.info("email_bulk_sent", emails=len(contents), requests=len(chunks), sent=sent)
+        return results
+
     def send_email(
         self,
         to_email: str,
@@ -474,24 +820,78 @@ class TwilioChannel(BaseChannel):
     - SMS sending for critical alerts
     - Delivery status tracking
     - Rate limiting awareness
+    - Paced, concurrency-limited bulk fan-out
     """
 
-    def __init__(self):
+    MAX_RETRIES: int = 3
+    RETRY_DELAYS: tuple[float, ...] = (1.0, 2.0, 4.0)
+
+    def __init__(
+        self,
+        account_sid: Optional[str] = None,
+        auth_token: Optional[str] = None,
+        from_number: Optional[str] = None,
+        api_base_url: Optional[str] = None,
+        messages_per_second: Optional[float] = None,
+    ):
+        """
+        Initialize channel.
+
+        Args:
+            account_sid: Twilio account SID (defaults to settings.twilio_account_sid).
+            auth_token: Twilio auth token (defaults to settings.twilio_auth_token).
+            from_number: Sender number (defaults to settings.twilio_phone_number).
+            api_base_url: REST API root for the bulk path (defaults to settings.twilio_api_base_url).
+            messages_per_second: Bulk send pacing (defaults to settings.twilio_messages_per_second).
+        """
         self._client: Optional[TwilioClient] = None
+        self._account_sid = account_sid
+        self._auth_token = auth_token
+        self._from_number = from_number
+        self._api_base_url = api_base_url
+        self._messages_per_second = messages_per_second
+        self._bucket: Optional[TokenBucket] = None
         self.logger = structlog.get_logger().bind(channel="twilio")
 
+    @property
+    def account_sid(self) -> Optional[str]:
+        """Twilio account SID."""
+        return self._account_sid or settings.twilio_account_sid
+
+    @property
+    def auth_token(self) -> Optional[str]:
+        """Twilio auth token."""
+        return self._auth_token or settings.twilio_auth_token
+
+    @property
+    def from_number(self) -> Optional[str]:
+        """Sender phone number."""
+        return self._from_number or settings.twilio_phone_number
+
+    @property
+    def api_base_url(self) -> str:
+        """REST API root for the bulk path."""
+        return (self._api_base_url or settings.twilio_api_base_url).rstrip("/")
+
+    @property
+    def bucket(self) -> TokenBucket:
+        """Lazy-loaded message pacing shared by bulk sends."""
+        if self._bucket is None:
+            self._bucket = TokenBucket(self._messages_per_second or settings.twilio_messages_per_second)
+        return self._bucket
+
     @property
     def client(self) -> TwilioClient:
         """Lazy-loaded Twilio client."""
         if self._client is None:
-            if not settings.twilio_account_sid or not settings.twilio_auth_token:
+            if not self.account_sid or not self.auth_token:
                 raise ValueError("Twilio credentials not configured")
-            self._client = TwilioClient(settings.twilio_account_sid, settings.twilio_auth_token)
+            self._client = TwilioClient(self.account_sid, self.auth_token)
         return self._client
 
     def is_configured(self) -> bool:
         """Check if Twilio is configured."""
-        return bool(settings.twilio_account_sid and settings.twilio_auth_token and settings.twilio_phone_number)
+        return bool(self.account_sid and self.auth_token and self.from_number)
 
     async def send(self, content: SMSContent) -> DeliveryStatus:
         """
@@ -514,7 +914,7 @@ class TwilioChannel(BaseChannel):
         try:
             message = self.client.messages.create(
                 body=content.message,
-                from_=settings.twilio_phone_number,
+                from_=self.from_number,
                 to=content.phone_number,
                 status_callback=f"{settings.backend_url}/api/webhooks/twilio/status",
             )
@@ -549,6 +949,81 @@ class TwilioChannel(BaseChannel):
 
         return status
 
+    async def _send_bulk_message(self, content: SMSContent) -> DeliveryStatus:
+        """Send one SMS over the pooled HTTP client."""
+        status = DeliveryStatus(
+            alert_id=uuid4(),
+            match_id=uuid4(),
+            channel=DeliveryChannel.SMS,
+            status="pending",
+        )
+
+        response, error, retries = await _post_with_retries(
+            self.bucket,
+            f"{self.api_base_url}/2010-04-01/Accounts/{self.account_sid}/Messages.json",
+            self.RETRY_DELAYS[: self.MAX_RETRIES - 1],
+            self.logger,
+            data={
+                "To": content.phone_number,
+                "From": self.from_number,
+                "Body": content.message,
+                "StatusCallback": f"{settings.backend_url}/api/webhooks/twilio/status",
+            },
+            auth=(self.account_sid, self.auth_token),
+        )
+
+        status.retry_count = retries
+        if response is None:
+            status.status = "failed"
+            status.error_message = error
+            self.logger.error("sms_send_failed", to=content.phone_number[-4:], error=error)
+            return status
+
+        status.status = "sent"
+        status.sent_at = datetime.utcnow()
+        status.provider_message_id = response.json().get("sid")
+        return status
+
+    async def send_bulk(self, contents: list[SMSContent], concurrency: Optional[int] = None) -> list[DeliveryStatus]:
+        """
+        Fan out many SMS with bounded concurrency.
+
+        Messages go through the pooled HTTP client, paced by the channel's
+        token bucket so the sender number's throughput is not exceeded.
+
+        Args:
+            contents: Messages to send.
+            concurrency: Requests in flight (defaults to settings.delivery_bulk_concurrency).
+
+        Returns:
+            DeliveryStatus per message, in input order.
+        """
+        if not contents:
+            return []
+        if not self.is_configured():
+            return [
+                DeliveryStatus(
+                    alert_id=uuid4(),
+                    match_id=uuid4(),
+                    channel=DeliveryChannel.SMS,
+                    status="failed",
+                    error_message="Twilio credentials not configured",
+                )
+                for _ in contents
+            ]
+
+        semaphore = asyncio.Semaphore(concurrency or settings.delivery_bulk_concurrency)
+
+        async def send_one(content: SMSContent) -> DeliveryStatus:
+            async with semaphore:
+                return await self._send_bulk_message(content)
+
+        statuses = await asyncio.gather(*(send_one(content) for content in contents))
+
+        sent = sum(1 for status in statuses if status.status == "sent")
+        self.logger.info("sms_bulk_sent", messages=len(contents), sent=sent)
+        return list(statuses)
+
     def send_sms(self, phone_number: str, message: str, match_id: Optional[UUID] = None) -> DeliveryStatus:
         """
         Synchronous helper to send SMS.
@@ -0,0 +1,237 @@
+"""
+GrantRadar Digest Store
+Pending digest entries and the index of users due a digest.
+
+Redis layout:
+- ``digest:entries:{user_id}``: sorted set of ``{match_id}:{grant_id}``
+  scored by match score. Grant and match details are hydrated in bulk at
+  send time, so entries stay a few dozen bytes.
+- ``digest:due``: sorted set of user ids scored by the Unix time their
+  digest should go out. Dispatch reads due users with ZRANGEBYSCORE
+  instead of scanning the keyspace.
+
+A claimed user's due time is pushed forward by a lease, so a digest
+whose worker dies is retried once the lease expires.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+from uuid import UUID
+
+import redis
+import structlog
+
+from agents.delivery.models import DigestEntry
+from backend.core.config import settings
+
+logger = structlog.get_logger().bind(agent="alerter", component="digest")
+
+DUE_KEY = "digest:due"
+ENTRIES_KEY_PREFIX = "digest:entries"
+
+# Lower-scored entries beyond this are dropped; emails show the top 10
+MAX_ENTRIES_PER_USER = 100
+
+# Entries outlive a weekly cycle so a late dispatch still finds them
+ENTRIES_TTL_SECONDS = 9 * 24 * 3600
+
+# How long a claimed user is hidden from dispatch while their digest is sent
+CLAIM_LEASE_SECONDS = 30 * 60
+
+# Retry delay after a failed send
+RETRY_DELAY_SECONDS = 15 * 60
+
+
+def _entries_key(user_id: UUID | str) -> str:
+    return f"{ENTRIES_KEY_PREFIX}:{user_id}"
+
+
+def next_send_time(frequency: str, now: Optional[datetime] = None) -> datetime:
+    """
+    When the next digest for a frequency goes out.
+
+    Daily digests go out at ``settings.digest_send_hour_utc``; weekly ones at
+    that hour on ``settings.digest_weekly_day`` (0 = Monday). Any other
+    frequency (immediate users whose medium alerts overflowed) is daily.
+
+    Args:
+        frequency: User's digest frequency.
+        now: Reference time (defaults to the current time).
+
+    Returns:
+        Next send time after ``now`` (timezone-aware UTC).
+    """
+    now = now or datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+
+    send_at = now.replace(hour=settings.digest_send_hour_utc, minute=0, second=0, microsecond=0)
+    if frequency == "weekly":
+        send_at += timedelta(days=(settings.digest_weekly_day - send_at.weekday()) % 7)
+        if send_at <= now:
+            send_at += timedelta(days=7)
+    elif send_at <= now:
+        send_at += timedelta(days=1)
+    return send_at
+
+
+class DigestStore:
+    """Redis-backed pending digests and their due-time index."""
+
+    def __init__(self, redis_client: redis.Redis):
+        """
+        Initialize store.
+
+        Args:
+            redis_client: Redis client (decoded responses).
+        """
+        self.redis = redis_client
+
+    def add(
+        self,
+        user_id: UUID,
+        match_id: UUID,
+        grant_id: UUID,
+        match_score: float,
+        frequency: str,
+    ) -> int:
+        """
+        Add a match to a user's pending digest.
+
+        The user is indexed for their next send time unless already
+        scheduled. One pipelined round trip.
+
+        Args:
+            user_id: Recipient.
+            match_id: Match identifier.
+            grant_id: Matched grant.
+            match_score: Match score (0-1).
+            frequency: User's digest frequency.
+
+        Returns:
+            Number of entries now pending for the user.
+        """
+        key = _entries_key(user_id)
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.zadd(key, {f"{match_id}:{grant_id}": match_score})
+        pipe.zremrangebyrank(key, 0, -(MAX_ENTRIES_PER_USER + 1))
+        pipe.expire(key, ENTRIES_TTL_SECONDS)
+        pipe.zadd(DUE_KEY, {str(user_id): next_send_time(frequency).timestamp()}, nx=True)
+        pipe.zcard(key)
+        return pipe.execute()[-1]
+
+    def pending_counts(self, user_ids: Iterable[UUID]) -> dict[UUID, int]:
+        """
+        Count pending entries for several users in one round trip.
+
+        Args:
+            user_ids: Users to count.
+
+        Returns:
+            Mapping of user ID to pending entry count.
+        """
+        ids = list(dict.fromkeys(user_ids))
+        if not ids:
+            return {}
+        pipe = self.redis.pipeline(transaction=False)
+        for user_id in ids:
+            pipe.zcard(_entries_key(user_id))
+        return dict(zip(ids, pipe.execute()))
+
+    def claim_due(self, now: Optional[datetime] = None, limit: int = 1000) -> list[str]:
+        """
+        Claim users whose digest is due.
+
+        Claimed users' due times move forward by CLAIM_LEASE_SECONDS; the
+        sender completes or reschedules them. Intended for a single
+        dispatcher (the Celery Beat task).
+
+        Args:
+            now: Reference time (defaults to the current time).
+            limit: Maximum users claimed.
+
+        Returns:
+            Claimed user ids.
+        """
+        now = now or datetime.now(timezone.utc)
+        user_ids = self.redis.zrangebyscore(DUE_KEY, "-inf", now.timestamp(), start=0, num=limit)
+        if user_ids:
+            lease_until = now.timestamp() + CLAIM_LEASE_SECONDS
+            self.redis.zadd(DUE_KEY, dict.fromkeys(user_ids, lease_until), xx=True)
+        return user_ids
+
+    def entries(self, user_ids: Iterable[UUID | str]) -> dict[str, list[DigestEntry]]:
+        """
+        Read pending entries for several users in one round trip.
+
+        Args:
+            user_ids: Users to read.
+
+        Returns:
+            Mapping of user id string to entries, highest score first.
+        """
+        ids = [str(user_id) for user_id in dict.fromkeys(user_ids)]
+        if not ids:
+            return {}
+        pipe = self.redis.pipeline(transaction=False)
+        for user_id in ids:
+            pipe.zrevrange(_entries_key(user_id), 0, -1, withscores=True)
+
+        result: dict[str, list[DigestEntry]] = {}
+        for user_id, members in zip(ids, pipe.execute()):
+            entries = []
+            for member, score in members:
+                match_id, _, grant_id = member.partition(":")
+                try:
+                    entries.append(DigestEntry(match_id=match_id, grant_id=grant_id, match_score=score))
+                except ValueError:
+                    logger.warning("digest_entry_invalid", user_id=user_id, member=member)
+            result[user_id] = entries
+        return result
+
+    def complete(self, sent: dict[str, list[DigestEntry]], frequencies: dict[str, str]) -> None:
+        """
+        Remove sent entries and reschedule users who gained entries meanwhile.
+
+        Args:
+            sent: Entries delivered, keyed by user id string.
+            frequencies: Digest frequency per user id string.
+        """
+        if not sent:
+            return
+        pipe = self.redis.pipeline(transaction=False)
+        count_positions = []
+        for user_id, entries in sent.items():
+            key = _entries_key(user_id)
+            if entries:
+                pipe.zrem(key, *[f"{e.match_id}:{e.grant_id}" for e in entries])
+            pipe.zcard(key)
+            count_positions.append(len(pipe) - 1)
+        results = pipe.execute()
+        remaining = [results[i] for i in count_positions]
+
+        pipe = self.redis.pipeline(transaction=False)
+        for user_id, count in zip(sent, remaining):
+            if count:
+                send_at = next_send_time(frequencies.get(user_id, "daily"))
+                pipe.zadd(DUE_KEY, {user_id: send_at.timestamp()})
+            else:
+                pipe.zrem(DUE_KEY, user_id)
+        pipe.execute()
+
+    def reschedule(self, user_ids: Iterable[str], delay_seconds: float = RETRY_DELAY_SECONDS) -> None:
+        """
+        Retry users' digests after a delay.
+
+        Args:
+            user_ids: Users whose send failed.
+            delay_seconds: Delay before they are due again.
+        """
+        ids = list(user_ids)
+        if ids:
+            retry_at = datetime.now(timezone.utc).timestamp() + delay_seconds
+            self.redis.zadd(DUE_KEY, dict.fromkeys(ids, retry_at))
+
+    def due_count(self) -> int:
+        """Number of users with a pending digest."""
+        return self.redis.zcard(DUE_KEY)
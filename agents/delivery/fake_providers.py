@@ -0,0 +1,356 @@
+"""
+GrantRadar Fake Delivery Providers
+Local stand-in for the SendGrid and Twilio REST APIs.
+
+Serves the two endpoints the bulk delivery path uses, with configurable
+latency and rate limiting, and counts what it receives. Used to
+benchmark delivery throughput without touching the real services:
+
+    python -m agents.delivery.fake_providers --emails 5000 --sms 500
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import threading
+import time
+from typing import Any, Optional
+from urllib.parse import parse_qs
+from uuid import uuid4
+
+import structlog
+import uvicorn
+from fastapi import FastAPI, Request, Response
+
+from agents.delivery.channels import (
+    SENDGRID_MAX_PERSONALIZATIONS,
+    SendGridChannel,
+    TwilioChannel,
+    close_delivery_http_client,
+)
+from agents.delivery.models import EmailContent, SMSContent
+
+logger = structlog.get_logger(__name__)
+
+FAKE_ACCOUNT_SID = "ACfake"
+FAKE_AUTH_TOKEN = "fake-token"
+FAKE_API_KEY = "SG.fake"
+FAKE_FROM_NUMBER = "+15005550006"
+
+
+class FakeProviderStats:
+    """Counters for requests received by the fake providers."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.email_requests = 0
+        self.emails = 0
+        self.sms = 0
+        self.rate_limited = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+
+    def enter(self) -> None:
+        with self.lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+
+    def exit(self) -> None:
+        with self.lock:
+            self._in_flight -= 1
+
+    def as_dict(self) -> dict[str, int]:
+        with self.lock:
+            return {
+                "email_requests": self.email_requests,
+                "emails": self.emails,
+                "sms": self.sms,
+                "rate_limited": self.rate_limited,
+                "max_in_flight": self.max_in_flight,
+            }
+
+
+class _WindowLimiter:
+    """Fixed one-second window limiter, like the providers' own 429 behaviour."""
+
+    def __init__(self, per_second: Optional[int]):
+        self.per_second = per_second
+        self._window = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        if not self.per_second:
+            return True
+        with self._lock:
+            window = int(time.monotonic())
+            if window != self._window:
+                self._window, self._count = window, 0
+            self._count += 1
+            return self._count <= self.per_second
+
+
+def create_fake_provider_app(
+    latency_ms: float = 20.0,
+    email_requests_per_second: Optional[int] = None,
+    sms_per_second: Optional[int] = None,
+) -> FastAPI:
+    """
+    Build the fake provider application.
+
+    Args:
+        latency_ms: Delay added to every request.
+        email_requests_per_second: Answer 429 above this many mail/send requests per second.
+        sms_per_second: Answer 429 above this many messages per second.
+
+    Returns:
+        FastAPI app; counters are on ``app.state.stats``.
+    """
+    app = FastAPI(title="Fake delivery providers")
+    stats = FakeProviderStats()
+    email_limiter = _WindowLimiter(email_requests_per_second)
+    sms_limiter = _WindowLimiter(sms_per_second)
+    app.state.stats = stats
+
+    @app.post("/v3/mail/send")
+    async def mail_send(request: Request) -> Response:
+        stats.enter()
+        try:
+            await asyncio.sleep(latency_ms / 1000)
+            if not request.headers.get("Authorization", "").startswith("Bearer "):
+                return Response(status_code=401)
+            if not email_limiter.allow():
+                with stats.lock:
+                    stats.rate_limited += 1
+                return Response(status_code=429, headers={"Retry-After": "1"})
+
+            body = json.loads(await request.body())
+            personalizations = body.get("personalizations") or []
+            if not personalizations or len(personalizations) > SENDGRID_MAX_PERSONALIZATIONS:
+                return Response(
+                    content=json.dumps({"errors": [{"message": "invalid personalizations"}]}),
+                    status_code=400,
+                    media_type="application/json",
+                )
+            with stats.lock:
+                stats.email_requests += 1
+                stats.emails += len(personalizations)
+            return Response(status_code=202, headers={"X-Message-Id": uuid4().hex})
+        finally:
+            stats.exit()
+
+    @app.post("/2010-04-01/Accounts/{account_sid}/Messages.json")
+    async def create_message(account_sid: str, request: Request) -> Response:
+        stats.enter()
+        try:
+            await asyncio.sleep(latency_ms / 1000)
+            if not sms_limiter.allow():
+                with stats.lock:
+                    stats.rate_limited += 1
+                return Response(
+                    content=json.dumps({"code": 20429, "message": "Too Many Requests"}),
+                    status_code=429,
+                    headers={"Retry-After": "1"},
+                    media_type="application/json",
+                )
+
+            form = parse_qs((await request.body()).decode())
+            with stats.lock:
+                stats.sms += 1
+            message = {
+                "sid": f"SM{uuid4().hex}",
+                "account_sid": account_sid,
+                "to": form.get("To", [""])[0],
+                "status": "queued",
+            }
+            return Response(content=json.dumps(message), status_code=201, media_type="application/json")
+        finally:
+            stats.exit()
+
+    @app.get("/stats")
+    async def get_stats() -> dict[str, int]:
+        return stats.as_dict()
+
+    return app
+
+
+class FakeProviderServer:
+    """
+    Runs the fake providers on a local port in a background thread.
+
+    Usage:
+        with FakeProviderServer(latency_ms=10) as server:
+            channel = SendGridChannel(api_key=FAKE_API_KEY, api_base_url=server.url)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **app_kwargs: Any):
+        """
+        Initialize server.
+
+        Args:
+            host: Interface to bind.
+            port: Port to bind (0 picks a free port).
+            **app_kwargs: Passed to create_fake_provider_app.
+        """
+        self.app = create_fake_provider_app(**app_kwargs)
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((host, port))
+        self.host, self.port = self._socket.getsockname()[:2]
+        self._server = uvicorn.Server(uvicorn.Config(self.app, log_level="warning", access_log=False))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL for both provider APIs."""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Requests received so far."""
+        return self.app.state.stats.as_dict()
+
+    def start(self) -> "FakeProviderServer":
+        self._thread = threading.Thread(target=self._server.run, kwargs={"sockets": [self._socket]}, daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Fake provider server did not start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        if self._thread:
+            self._thread.join(timeout=10)
+        self._socket.close()
+
+    def __enter__(self) -> "FakeProviderServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def _fake_emails(count: int) -> list[EmailContent]:
+    return [
+        EmailContent(
+            subject="Your weekly grant digest",
+            body_html="<p>Hi -name-, you have new grant matches.</p>",
+            body_text="Hi -name-, you have new grant matches.",
+            from_email="alerts@grantradar.com",
+            from_name="GrantRadar",
+            to_email=f"user{i}@example.edu",
+            to_name=f"User {i}",
+            tracking_id=str(uuid4()),
+            substitutions={"-name-": f"User {i}"},
+        )
+        for i in range(count)
+    ]
+
+
+def _fake_sms(count: int) -> list[SMSContent]:
+    return [
+        SMSContent(message="GrantRadar: new 92% grant match", phone_number=f"+1415555{i:04d}") for i in range(count)
+    ]
+
+
+async def benchmark_delivery(
+    base_url: str,
+    emails: int = 2000,
+    sms: int = 200,
+    concurrency: int = 8,
+    sendgrid_requests_per_second: float = 1000.0,
+    twilio_messages_per_second: float = 1000.0,
+) -> dict[str, Any]:
+    """
+    Measure bulk delivery throughput against a provider endpoint.
+
+    Compares one-request-per-email (the per-message path's request
+    pattern) with personalization batching, and times the SMS fan-out.
+
+    Args:
+        base_url: Root URL serving both provider APIs.
+        emails: Emails per email run.
+        sms: Messages in the SMS run.
+        concurrency: Requests in flight.
+        sendgrid_requests_per_second: Email request pacing.
+        twilio_messages_per_second: SMS pacing.
+
+    Returns:
+        Report with elapsed seconds, requests and messages per second for each run.
+    """
+    sendgrid = SendGridChannel(
+        api_key=FAKE_API_KEY, api_base_url=base_url, requests_per_second=sendgrid_requests_per_second
+    )
+    twilio = TwilioChannel(
+        account_sid=FAKE_ACCOUNT_SID,
+        auth_token=FAKE_AUTH_TOKEN,
+        from_number=FAKE_FROM_NUMBER,
+        api_base_url=base_url,
+        messages_per_second=twilio_messages_per_second,
+    )
+
+    async def timed(name: str, sends: int, run) -> dict[str, Any]:
+        start = time.perf_counter()
+        statuses = await run()
+        elapsed = time.perf_counter() - start
+        sent = sum(1 for status in statuses if status.status == "sent")
+        logger.info("delivery_benchmark_run", run=name, sent=sent, elapsed_seconds=round(elapsed, 3))
+        return {
+            "messages": len(statuses),
+            "sent": sent,
+            "requests": sends,
+            "elapsed_seconds": round(elapsed, 3),
+            "messages_per_second": round(len(statuses) / elapsed, 1) if elapsed else None,
+        }
+
+    email_batch = _fake_emails(emails)
+    # Unique bodies force one personalization per request
+    unbatched = [
+        content.model_copy(update={"body_text": f"{content.body_text} {i}"}) for i, content in enumerate(email_batch)
+    ]
+
+    try:
+        report = {
+            "email_per_message": await timed(
+                "email_per_message", emails, lambda: sendgrid.send_bulk(unbatched, concurrency=concurrency)
+            ),
+            "email_bulk": await timed(
+                "email_bulk",
+                -(-emails // SENDGRID_MAX_PERSONALIZATIONS),
+                lambda: sendgrid.send_bulk(email_batch, concurrency=concurrency),
+            ),
+            "sms_bulk": await timed("sms_bulk", sms, lambda: twilio.send_bulk(_fake_sms(sms), concurrency=concurrency)),
+        }
+    finally:
+        await close_delivery_http_client()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark bulk delivery against local fake providers")
+    parser.add_argument("--emails", type=int, default=2000)
+    parser.add_argument("--sms", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--serve", action="store_true", help="Only run the fake server until interrupted")
+    parser.add_argument("--port", type=int, default=0)
+    args = parser.parse_args()
+
+    with FakeProviderServer(port=args.port, latency_ms=args.latency_ms) as server:
+        if args.serve:
+            print(f"Fake providers listening on {server.url}")
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                return
+        report = asyncio.run(benchmark_delivery(server.url, args.emails, args.sms, args.concurrency))
+        print(json.dumps({"report": report, "server": server.stats}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
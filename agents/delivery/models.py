@@ -3,6 +3,7 @@ GrantRadar Alert Delivery Models
 Pydantic models for alert payloads and delivery tracking.
 """
 
+import re
 from datetime import datetime
 from enum import Enum
 from typing import Optional
@@ -74,6 +75,19 @@ class MatchInfo(BaseModel):
     explanation: Optional[str] = None
 
 
+class GrantEmailSection(BaseModel):
+    """Grant-specific email fragments, rendered once and shared by all recipients."""
+
+    grant_id: UUID
+    content_hash: str
+    title: str
+    funding_agency: str
+    amount: str
+    deadline: str
+    url: str
+    summary: Optional[str] = None  # Optional LLM-written overview (plain text)
+
+
 class AlertPayload(BaseModel):
     """Complete payload for alert processing."""
 
@@ -98,6 +112,26 @@ class EmailContent(BaseModel):
     to_name: Optional[str] = None
     reply_to: Optional[str] = None
     tracking_id: Optional[str] = None
+    substitutions: Optional[dict[str, str]] = None  # Per-recipient placeholder values for bulk sends
+
+    def personalized(self) -> "EmailContent":
+        """Copy with ``substitutions`` filled into the subject and bodies, for sends that don't use them."""
+        if not self.substitutions:
+            return self
+        values = self.substitutions
+        pattern = re.compile("|".join(re.escape(key) for key in sorted(values, key=len, reverse=True)))
+
+        def fill(text: str) -> str:
+            return pattern.sub(lambda m: values[m.group(0)], text)
+
+        return self.model_copy(
+            update={
+                "subject": fill(self.subject),
+                "body_html": fill(self.body_html),
+                "body_text": fill(self.body_text),
+                "substitutions": None,
+            }
+        )
 
 
 class SMSContent(BaseModel):
@@ -138,3 +172,11 @@ class DigestBatch(BaseModel):
     user_id: UUID
     alerts: list[AlertPayload]
     created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class DigestEntry(BaseModel):
+    """Compact pending digest entry; details are hydrated at send time."""
+
+    match_id: UUID
+    grant_id: UUID
+    match_score: float
@@ -0,0 +1,496 @@
+"""
+GrantRadar Email Templates
+Renders alert and digest emails without a per-recipient LLM call.
+
+The grant-specific part of an email (formatted title, agency, amount,
+deadline and an optional LLM-written overview) is built once per grant
+and cached by grant id and a hash of the grant's content, in-process and
+in Redis. Per-recipient fields (name, match score, matching criteria,
+explanation) are filled in locally, so rendering cost no longer grows
+with the number of users matched to a grant. Digests share one layout
+and carry their per-recipient parts as SendGrid ``substitutions``, so a
+batch of digests goes out in a single bulk request.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from html import escape
+from typing import Any, Callable, Optional
+
+import redis
+import structlog
+
+from agents.delivery.models import (
+    AlertPayload,
+    EmailContent,
+    GrantEmailSection,
+    GrantInfo,
+    MatchInfo,
+    UserInfo,
+)
+from backend.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+SECTION_KEY_PREFIX = "email:grant_section"
+SECTION_TTL_SECONDS = 7 * 24 * 3600
+MAX_CACHED_SECTIONS = 1024
+DIGEST_MAX_GRANTS = 10
+
+_sections: OrderedDict[str, GrantEmailSection] = OrderedDict()
+_sections_lock = threading.Lock()
+_stats = {"hits": 0, "redis_hits": 0, "misses": 0, "llm_calls": 0}
+
+ALERT_STYLE = """
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px; border-radius: 8px 8px 0 0; }
+        .content { background: #fff; padding: 24px; border: 1px solid #e5e7eb; border-top: none; }
+        .match-score { display: inline-block; background: #10b981; color: white; padding: 4px 12px; border-radius: 20px; font-weight: bold; }
+        .cta-button { display: inline-block; background: #667eea; color: white; padding: 12px 24px; border-radius: 6px; text-decoration: none; margin-top: 16px; }
+        .footer { text-align: center; padding: 16px; color: #6b7280; font-size: 12px; }"""
+
+DIGEST_STYLE = """
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 24px; border-radius: 8px 8px 0 0; }
+        .content { background: #fff; padding: 24px; border: 1px solid #e5e7eb; border-top: none; }
+        .footer { text-align: center; padding: 16px; color: #6b7280; font-size: 12px; background: #f9fafb; border-radius: 0 0 8px 8px; }
+        .grant { border: 1px solid #e5e7eb; border-radius: 8px; padding: 16px; margin-bottom: 16px; }
+        .grant-head { display: flex; justify-content: space-between; align-items: start; margin-bottom: 8px; }
+        .grant-head h3 { margin: 0; color: #1f2937; font-size: 16px; }
+        .score { background: #10b981; color: white; padding: 2px 8px; border-radius: 12px; font-size: 12px; font-weight: bold; }
+        .meta { color: #6b7280; margin: 4px 0; font-size: 14px; }
+        .reason { color: #374151; margin: 8px 0 12px; font-size: 14px; }
+        .details { display: inline-block; background: #667eea; color: white; padding: 8px 16px; border-radius: 4px; text-decoration: none; font-size: 14px; }
+        .more { color: #6b7280; font-style: italic; }"""
+
+
+def grant_content_hash(grant: GrantInfo) -> str:
+    """
+    Hash the grant fields that appear in emails.
+
+    Args:
+        grant: Grant details.
+
+    Returns:
+        Short hex digest; changes whenever rendered grant content would.
+    """
+    content = json.dumps(
+        [
+            grant.title,
+            grant.funding_agency,
+            grant.amount_min,
+            grant.amount_max,
+            grant.deadline.isoformat() if grant.deadline else None,
+            grant.url,
+            grant.description,
+        ]
+    )
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def get_render_stats() -> dict[str, int]:
+    """Get grant section cache hits, misses and LLM calls for this process."""
+    with _sections_lock:
+        return {**_stats, "cached_sections": len(_sections)}
+
+
+def reset_section_cache() -> None:
+    """Clear the in-process section cache and counters."""
+    with _sections_lock:
+        _sections.clear()
+        for name in _stats:
+            _stats[name] = 0
+
+
+def _count(name: str) -> None:
+    with _sections_lock:
+        _stats[name] += 1
+
+
+def _format_deadline(deadline: Optional[datetime]) -> str:
+    return deadline.strftime("%B %d, %Y") if deadline else "Open/Rolling"
+
+
+def _format_amount(grant: GrantInfo) -> str:
+    if grant.amount_min and grant.amount_max:
+        return f"${grant.amount_min:,.0f} - ${grant.amount_max:,.0f}"
+    if grant.amount_max:
+        return f"Up to ${grant.amount_max:,.0f}"
+    return "Amount varies"
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[: limit - 3].rstrip() + "..."
+
+
+class EmailRenderer:
+    """
+    Renders alert and digest emails from cached grant sections.
+
+    The LLM is only used for optional enrichment: a short grant overview
+    written once per grant version (and a digest intro), never per alert.
+    """
+
+    def __init__(
+        self,
+        redis_client_factory: Optional[Callable[[], redis.Redis]] = None,
+        llm_client_factory: Optional[Callable[[], Any]] = None,
+        enrich: Optional[bool] = None,
+    ):
+        """
+        Initialize renderer.
+
+        Args:
+            redis_client_factory: Returns a Redis client (decoded responses) for the shared section cache.
+            llm_client_factory: Returns an OpenAI client; only called when enriching.
+            enrich: Add LLM-written copy (defaults to settings.alert_email_llm_enrichment).
+        """
+        self.redis_client_factory = redis_client_factory
+        self.llm_client_factory = llm_client_factory
+        self.enrich = settings.alert_email_llm_enrichment if enrich is None else enrich
+
+    # =========================================================================
+    # Grant Sections
+    # =========================================================================
+
+    def grant_section(self, grant: GrantInfo) -> GrantEmailSection:
+        """
+        Get the grant-specific email fragments, building them on a cache miss.
+
+        Args:
+            grant: Grant details.
+
+        Returns:
+            GrantEmailSection shared by every recipient of this grant version.
+        """
+        content_hash = grant_content_hash(grant)
+        key = f"{SECTION_KEY_PREFIX}:{grant.grant_id}:{content_hash}:{int(self.enrich)}"
+
+        with _sections_lock:
+            section = _sections.get(key)
+            if section is not None:
+                _sections.move_to_end(key)
+                _stats["hits"] += 1
+                return section
+
+        section = self._load_section(key)
+        if section is None:
+            _count("misses")
+            section = GrantEmailSection(
+                grant_id=grant.grant_id,
+                content_hash=content_hash,
+                title=grant.title,
+                funding_agency=grant.funding_agency,
+                amount=_format_amount(grant),
+                deadline=_format_deadline(grant.deadline),
+                url=grant.url,
+                summary=self._summarize(grant) if self.enrich else None,
+            )
+            self._store_section(key, section)
+        else:
+            _count("redis_hits")
+
+        with _sections_lock:
+            _sections[key] = section
+            while len(_sections) > MAX_CACHED_SECTIONS:
+                _sections.popitem(last=False)
+        return section
+
+    def _load_section(self, key: str) -> Optional[GrantEmailSection]:
+        if self.redis_client_factory is None:
+            return None
+        try:
+            cached = self.redis_client_factory().get(key)
+            return GrantEmailSection.model_validate_json(cached) if cached else None
+        except Exception as e:
+            # The shared tier is best-effort: unreachable Redis or a bad entry means re-rendering
+            logger.warning("email_section_cache_read_failed", error=str(e))
+            return None
+
+    def _store_section(self, key: str, section: GrantEmailSection) -> None:
+        if self.redis_client_factory is None:
+            return
+        try:
+            self.redis_client_factory().setex(key, SECTION_TTL_SECONDS, section.model_dump_json())
+        except Exception as e:
+            logger.warning("email_section_cache_write_failed", error=str(e))
+
+    def _complete(self, prompt: str, max_tokens: int) -> Optional[str]:
+        """Run one LLM completion, returning None if unavailable or failing."""
+        if self.llm_client_factory is None:
+            return None
+        try:
+            _count("llm_calls")
+            response = self.llm_client_factory().chat.completions.create(
+                model=settings.llm_model,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+            )
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            logger.warning("email_enrichment_failed", error=str(e))
+            return None
+
+    def _summarize(self, grant: GrantInfo) -> Optional[str]:
+        prompt = f"""Write a 2-3 sentence overview of this grant for researchers deciding whether to apply.
+Mention what it funds and any strategic considerations. Plain text, no greeting.
+
+Grant Title: {grant.title}
+Funding Agency: {grant.funding_agency}
+Amount: {_format_amount(grant)}
+Deadline: {_format_deadline(grant.deadline)}
+Description: {grant.description[:500]}"""
+        return self._complete(prompt, max_tokens=300)
+
+    # =========================================================================
+    # Alert Emails
+    # =========================================================================
+
+    def render_alert(self, user: UserInfo, grant: GrantInfo, match: MatchInfo) -> EmailContent:
+        """
+        Render a single-grant alert email.
+
+        Args:
+            user: Recipient.
+            grant: Matched grant.
+            match: Match details for this recipient.
+
+        Returns:
+            EmailContent ready to send.
+        """
+        section = self.grant_section(grant)
+        score = int(match.match_score * 100)
+        reason = match.explanation or "This grant aligns well with your research profile."
+
+        criteria_html = ""
+        criteria_text = ""
+        if match.matching_criteria:
+            items = "".join(f"<li>{escape(c)}</li>" for c in match.matching_criteria)
+            criteria_html = f"<ul>{items}</ul>"
+            criteria_text = "".join(f"  - {c}\n" for c in match.matching_criteria)
+
+        summary_html = f"<p>{escape(section.summary)}</p>" if section.summary else ""
+        summary_text = f"{section.summary}\n\n" if section.summary else ""
+
+        body_html = f"""
+<!DOCTYPE html>
+<html>
+<head>
+    <style>{ALERT_STYLE}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1 style="margin: 0;">New Grant Match</h1>
+            <p style="margin: 8px 0 0;">GrantRadar found a {score}% match for you</p>
+        </div>
+        <div class="content">
+            <h2 style="margin-top: 0;">{escape(section.title)}</h2>
+            <p><strong>Agency:</strong> {escape(section.funding_agency)}</p>
+            <p><span class="match-score">{score}% Match</span></p>
+
+            <p>Hi {escape(user.name)},</p>
+            {summary_html}
+            <p><strong>Why it's a fit:</strong> {escape(reason)}</p>
+            {criteria_html}
+            <p><strong>Funding:</strong> {escape(section.amount)}<br><strong>Deadline:</strong> {section.deadline}</p>
+
+            <a href="{escape(section.url, quote=True)}" class="cta-button">View Full Grant Details</a>
+        </div>
+        <div class="footer">
+            <p>You're receiving this because you have grant alerts enabled.</p>
+            <p>GrantRadar - AI-Powered Grant Discovery</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+        body_text = (
+            f"Hi {user.name},\n\n"
+            f"GrantRadar found a {score}% match for you: {section.title} ({section.funding_agency})\n\n"
+            f"{summary_text}"
+            f"Why it's a fit: {reason}\n"
+            f"{criteria_text}\n"
+            f"Funding: {section.amount}\n"
+            f"Deadline: {section.deadline}\n\n"
+            f"View grant: {section.url}\n\n-- GrantRadar"
+        )
+
+        return EmailContent(
+            subject=_truncate(f"{score}% grant match: {section.title}", 100),
+            body_html=body_html,
+            body_text=body_text,
+            from_email=settings.from_email,
+            from_name=settings.from_name,
+            to_email=user.email,
+            to_name=user.name,
+            tracking_id=str(match.match_id),
+        )
+
+    # =========================================================================
+    # Digest Emails
+    # =========================================================================
+
+    def digest_intro(self, user: UserInfo, alerts: list[AlertPayload]) -> str:
+        """
+        Opening paragraph for a digest; LLM-written only when enrichment is on.
+
+        Args:
+            user: Recipient.
+            alerts: Alerts in the digest, highest score first.
+
+        Returns:
+            Intro text.
+        """
+        fallback = (
+            f"Hi {user.name}, we found {len(alerts)} new grant{'s' if len(alerts) > 1 else ''} "
+            "that match your research profile."
+        )
+        if not self.enrich:
+            return fallback
+
+        top = "; ".join(
+            f"{a.grant.title} ({a.grant.funding_agency}) - {int(a.match.match_score * 100)}% match" for a in alerts[:3]
+        )
+        prompt = f"""Write a brief, friendly intro paragraph (2-3 sentences) for a grant digest email to {user.name}.
+They have {len(alerts)} new grant match{"es" if len(alerts) > 1 else ""}.
+Top matches: {top}
+Keep it professional but warm. Don't list the grants, just intro the digest."""
+        return self._complete(prompt, max_tokens=200) or fallback
+
+    def render_digest(
+        self,
+        user: UserInfo,
+        alerts: list[AlertPayload],
+        intro_text: Optional[str] = None,
+        shared_body: bool = False,
+    ) -> Optional[EmailContent]:
+        """
+        Render a digest email for several alerts.
+
+        Args:
+            user: Recipient.
+            alerts: Alerts sorted by match score, highest first.
+            intro_text: Opening paragraph (defaults to digest_intro()).
+            shared_body: Return the layout every digest shares, with this
+                recipient's name, intro and matches in ``substitutions``, so
+                a bulk send can put many digests in one request.
+
+        Returns:
+            EmailContent, or None when there are no alerts.
+        """
+        if not alerts:
+            return None
+
+        if len(alerts) == 1:
+            subject = f"GrantRadar: New grant match ({int(alerts[0].match.match_score * 100)}%)"
+        else:
+            subject = f"GrantRadar: {len(alerts)} new grant matches for you"
+        intro_text = intro_text or self.digest_intro(user, alerts)
+
+        grant_html_blocks = []
+        grant_text_blocks = []
+        for i, alert in enumerate(alerts[:DIGEST_MAX_GRANTS], 1):
+            section = self.grant_section(alert.grant)
+            score = int(alert.match.match_score * 100)
+            reason = alert.match.explanation or "Strong alignment with your research profile."
+
+            grant_html_blocks.append(
+                f'<div class="grant"><div class="grant-head"><h3>{escape(section.title)}</h3>'
+                f'<span class="score">{score}%</span></div>'
+                f'<p class="meta">{escape(section.funding_agency)} • {escape(section.amount)}</p>'
+                f'<p class="meta">Deadline: {section.deadline}</p>'
+                f'<p class="reason">{escape(reason)}</p>'
+                f'<a href="{escape(section.url, quote=True)}" class="details">View Details →</a></div>'
+            )
+            grant_text_blocks.append(
+                f"{i}. {section.title}\n"
+                f"   {section.funding_agency} - {score}% match\n"
+                f"   Deadline: {section.deadline}\n"
+                f"   View: {section.url}\n"
+            )
+
+        more_html = (
+            '<p class="more">Showing top 10 matches. View all in your dashboard.</p>'
+            if len(alerts) > DIGEST_MAX_GRANTS
+            else ""
+        )
+        body_html, body_text = _digest_layout()
+
+        content = EmailContent(
+            subject=subject,
+            body_html=body_html,
+            body_text=body_text,
+            from_email=settings.from_email,
+            from_name=settings.from_name,
+            to_email=user.email,
+            to_name=user.name,
+            tracking_id=str(alerts[0].match_id),  # Use first match ID for tracking
+            substitutions={
+                "-name-": user.name,
+                "-match_count-": f"{len(alerts)} new match{'es' if len(alerts) > 1 else ''} found",
+                "-intro-": intro_text,
+                "-intro_html-": escape(intro_text),
+                "-matches-": "\n".join(grant_text_blocks),
+                "-matches_html-": "\n".join(grant_html_blocks),
+                "-more_html-": more_html,
+            },
+        )
+        return content if shared_body else content.personalized()
+
+
+def _digest_layout() -> tuple[str, str]:
+    """HTML and text digest bodies, identical for every recipient apart from ``-placeholder-`` keys."""
+    body_html = f"""
+<!DOCTYPE html>
+<html>
+<head>
+    <style>{DIGEST_STYLE}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1 style="margin: 0; font-size: 24px;">Your Grant Digest</h1>
+            <p style="margin: 8px 0 0; opacity: 0.9;">-match_count-</p>
+        </div>
+        <div class="content">
+            <p style="margin-top: 0;">-intro_html-</p>
+
+            <h2 style="font-size: 18px; margin: 24px 0 16px; color: #1f2937;">Your Matches</h2>
+
+            -matches_html-
+
+            -more_html-
+        </div>
+        <div class="footer">
+            <p>You're receiving this because you have grant alerts enabled with digest delivery.</p>
+            <p><a href="{settings.frontend_url}/settings/notifications" style="color: #667eea;">Manage notification preferences</a></p>
+            <p>GrantRadar - AI-Powered Grant Discovery</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+    body_text = f"""Hi -name-,
+
+-intro-
+
+YOUR MATCHES
+============
+
+-matches-
+
+---
+GrantRadar - AI-Powered Grant Discovery
+Manage preferences: {settings.frontend_url}/settings/notifications
+"""
+    return body_html, body_text
@@ -1,27 +1,304 @@
 """
 Base Discovery Agent
 Abstract base class for all grant discovery agents with common functionality.
+
+Duplicate checks and publishing have batch variants that cost one Redis
+round trip per page of grants, and the seen-set can be a Bloom filter for
+sources with very large histories.
+
+Also provides the shared paginator for offset-paginated source APIs: once
+the first page reports the total, the remaining offsets are fetched
+concurrently under an adaptive rate limiter and pages are yielded as they
+arrive.
 """
 
 from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Optional
+import asyncio
 import hashlib
 import json
+import math
+import time
 
+import httpx
 import redis
 import structlog
 
 from backend.core.config import settings
 
 
+# ============================================================================
+# Seen-Set Bloom Filter
+# ============================================================================
+
+
+class RedisBloomFilter:
+    """
+    Bloom filter stored in a plain Redis bitmap.
+
+    Sized for ``capacity`` members at ``error_rate`` false positives. Checks
+    and inserts for a whole batch go out as one pipeline. Works on any Redis
+    server, no modules needed.
+    """
+
+    def __init__(self, key: str, capacity: int, error_rate: float):
+        self.key = key
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+
+    def _offsets(self, member: str) -> list[int]:
+        # Double hashing: k offsets from two 64-bit halves of one digest
+        digest = hashlib.sha256(member.encode()).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def contains_many(self, client: redis.Redis, members: list[str]) -> list[bool]:
+        """Membership of each member, in order (false positives possible)."""
+        pipe = client.pipeline(transaction=False)
+        for member in members:
+            for offset in self._offsets(member):
+                pipe.getbit(self.key, offset)
+        bits = pipe.execute()
+        k = self.hash_count
+        return [all(bits[i * k : (i + 1) * k]) for i in range(len(members))]
+
+    def add_many(self, client: redis.Redis, members: list[str]) -> None:
+        pipe = client.pipeline(transaction=False)
+        for member in members:
+            for offset in self._offsets(member):
+                pipe.setbit(self.key, offset, 1)
+        pipe.execute()
+
+
+# ============================================================================
+# Concurrent Pagination
+# ============================================================================
+
+# Responses that mean "slow down" rather than "this request is wrong"
+THROTTLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class AdaptiveRateLimiter:
+    """
+    Paces requests to one source with additive increase, multiplicative decrease.
+
+    Requests are spaced ``1 / rate`` seconds apart. Each success raises the
+    rate by ``increase`` up to ``max_rate``; each throttle response halves it
+    down to ``min_rate`` and honours Retry-After when the server sends one.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float,
+        max_rate: float,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+    ):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.throttled = 0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait for the next request slot."""
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def on_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        self.throttled += 1
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        if retry_after:
+            self._next_slot = max(self._next_slot, time.monotonic() + retry_after)
+
+
+@dataclass
+class PaginationStats:
+    """Throughput of one paginated fetch."""
+
+    source: str
+    pages: int = 0
+    items: int = 0
+    failed_pages: int = 0
+    throttled: int = 0
+    elapsed_seconds: float = 0.0
+    final_rate: float = 0.0
+
+    @property
+    def pages_per_second(self) -> float:
+        return round(self.pages / self.elapsed_seconds, 2) if self.elapsed_seconds > 0 else 0.0
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        # HTTP-date form; fall back to the limiter's own backoff
+        return None
+
+
+class ConcurrentPaginator:
+    """
+    Fetches every page of an offset-paginated API.
+
+    ``fetch_page(offset)`` returns the decoded response and ``parse_page``
+    turns it into ``(items, total)``. When the first page reports a total,
+    the remaining offsets are known and fetched by ``concurrency`` workers;
+    otherwise pages are walked one at a time until a short page. Pages are
+    yielded as they complete, so their order is not guaranteed.
+
+    Throttle responses (429/5xx) slow the limiter down and are retried; any
+    other failure, including a page ``parse_page`` cannot handle, skips that
+    page and is counted in ``stats.failed_pages``.
+    """
+
+    MAX_ATTEMPTS = 4
+
+    def __init__(
+        self,
+        source: str,
+        fetch_page: Callable[[int], Awaitable[dict[str, Any]]],
+        parse_page: Callable[[dict[str, Any]], tuple[list[Any], Optional[int]]],
+        page_size: int,
+        first_offset: int = 0,
+        max_pages: int = 100,
+        concurrency: Optional[int] = None,
+        limiter: Optional[AdaptiveRateLimiter] = None,
+        logger: Optional[Any] = None,
+    ):
+        self.fetch_page = fetch_page
+        self.parse_page = parse_page
+        self.page_size = page_size
+        self.first_offset = first_offset
+        self.max_pages = max_pages
+        self.concurrency = max(1, concurrency or settings.discovery_page_concurrency)
+        self.limiter = limiter or AdaptiveRateLimiter(
+            settings.discovery_page_rate,
+            settings.discovery_page_min_rate,
+            settings.discovery_page_max_rate,
+        )
+        self.logger = logger or structlog.get_logger().bind(source=source)
+        self.stats = PaginationStats(source=source)
+
+    async def pages(self) -> AsyncIterator[list[Any]]:
+        """Yield the parsed items of each page as it arrives."""
+        start = time.monotonic()
+        try:
+            first = await self._fetch(self.first_offset)
+            if first is None:
+                return
+            items, total = first
+            yield items
+
+            if total is not None:
+                end = self.first_offset + total
+                offsets = list(range(self.first_offset + self.page_size, end, self.page_size))
+                async for items in self._fan_out(offsets[: self.max_pages - 1]):
+                    yield items
+                return
+
+            # Total unknown: keep going while pages come back full
+            offset, page_count = self.first_offset, 1
+            while len(items) >= self.page_size and page_count < self.max_pages:
+                offset += self.page_size
+                page_count += 1
+                result = await self._fetch(offset)
+                if result is None:
+                    break
+                items, _ = result
+                yield items
+        finally:
+            self.stats.elapsed_seconds = round(time.monotonic() - start, 3)
+            self.stats.throttled = self.limiter.throttled
+            self.stats.final_rate = round(self.limiter.rate, 2)
+
+    async def _fan_out(self, offsets: list[int]) -> AsyncIterator[list[Any]]:
+        pending = deque(offsets)
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def worker() -> None:
+            while pending:
+                offset = pending.popleft()
+                try:
+                    result = await self._fetch(offset)
+                except Exception as e:
+                    # Every offset must produce exactly one result or the
+                    # consumer below waits forever
+                    self.logger.error("pagination_page_failed", offset=offset, error=str(e))
+                    self.stats.failed_pages += 1
+                    result = None
+                await results.put(result)
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.concurrency, len(pending)))]
+        try:
+            for _ in offsets:
+                result = await results.get()
+                if result is not None:
+                    yield result[0]
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _fetch(self, offset: int) -> Optional[tuple[list[Any], Optional[int]]]:
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            await self.limiter.acquire()
+            try:
+                data = await self.fetch_page(offset)
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if status in THROTTLE_STATUS_CODES and attempt < self.MAX_ATTEMPTS:
+                    self.limiter.on_throttle(_retry_after_seconds(e.response))
+                    self.logger.warning(
+                        "pagination_throttled", offset=offset, status=status, rate=round(self.limiter.rate, 2)
+                    )
+                    continue
+                self.logger.error("pagination_page_failed", offset=offset, status=status, error=str(e))
+                self.stats.failed_pages += 1
+                return None
+            except Exception as e:
+                self.logger.error("pagination_page_failed", offset=offset, error=str(e))
+                self.stats.failed_pages += 1
+                return None
+
+            self.limiter.on_success()
+            try:
+                items, total = self.parse_page(data)
+            except Exception as e:
+                self.logger.error("pagination_page_unparseable", offset=offset, error=str(e))
+                self.stats.failed_pages += 1
+                return None
+            self.stats.pages += 1
+            self.stats.items += len(items)
+            self.logger.info("pagination_page_fetched", offset=offset, items=len(items), total=total)
+            return items, total
+        return None
+
+
 class DiscoveryAgent(ABC):
     """
     Base class for grant discovery agents.
 
     Provides common functionality for:
-    - Redis stream publishing
-    - Duplicate detection via seen hashes
+    - Redis stream publishing, pipelined per batch
+    - Duplicate detection via seen hashes (Redis set or Bloom filter)
     - Error handling patterns
     - Structured logging setup
     - Last check time tracking
@@ -35,6 +312,10 @@ class DiscoveryAgent(ABC):
     LAST_CHECK_PREFIX = "discovery:last_check:"
     # Default TTL for seen grant hashes (30 days)
     SEEN_GRANT_TTL_SECONDS = 60 * 60 * 24 * 30
+    # Redis key prefix for per-source pagination throughput
+    PAGINATION_STATS_PREFIX = "discovery:pagination:"
+    # "set" or "bloom"; None uses settings.discovery_seen_backend
+    SEEN_BACKEND: Optional[str] = None
 
     def __init__(self, source_name: str):
         """
@@ -46,6 +327,9 @@ class DiscoveryAgent(ABC):
         self.source_name = source_name
         self.logger = structlog.get_logger().bind(agent="discovery", source=source_name)
         self._redis_client: Optional[redis.Redis] = None
+        self.last_pagination: Optional[PaginationStats] = None
+        self._bloom_filter: Optional[RedisBloomFilter] = None
+        self._seen_ttl_pending = False
 
     @property
     def redis_client(self) -> redis.Redis:
@@ -58,6 +342,20 @@ class DiscoveryAgent(ABC):
         """Get Redis key for tracking seen grants for this source."""
         return f"{self.SEEN_GRANTS_PREFIX}{self.source_name}"
 
+    @property
+    def seen_backend(self) -> str:
+        """Storage for seen hashes: "set" (exact) or "bloom" (bounded memory)."""
+        return self.SEEN_BACKEND or settings.discovery_seen_backend
+
+    def _get_bloom_filter(self) -> RedisBloomFilter:
+        if self._bloom_filter is None:
+            self._bloom_filter = RedisBloomFilter(
+                f"{self._get_seen_key()}:bloom",
+                settings.discovery_bloom_capacity,
+                settings.discovery_bloom_error_rate,
+            )
+        return self._bloom_filter
+
     def _get_last_check_key(self) -> str:
         """Get Redis key for last check timestamp."""
         return f"{self.LAST_CHECK_PREFIX}{self.source_name}"
@@ -87,6 +385,9 @@ class DiscoveryAgent(ABC):
         Returns:
             True if grant has been seen before
         """
+        if self.seen_backend == "bloom":
+            return self.filter_duplicates([(external_id, title)])[0]
+
         grant_hash = self._compute_grant_hash(external_id, title)
         seen_key = self._get_seen_key()
 
@@ -100,6 +401,11 @@ class DiscoveryAgent(ABC):
             external_id: External identifier from the source
             title: Grant title
         """
+        if self.seen_backend == "bloom":
+            self.mark_many_as_seen([(external_id, title)])
+            self.refresh_seen_ttl()
+            return
+
         grant_hash = self._compute_grant_hash(external_id, title)
         seen_key = self._get_seen_key()
 
@@ -108,6 +414,62 @@ class DiscoveryAgent(ABC):
         # Refresh TTL each time we add
         self.redis_client.expire(seen_key, self.SEEN_GRANT_TTL_SECONDS)
 
+    def filter_duplicates(self, grants: list[tuple[str, str]]) -> list[bool]:
+        """
+        Batch version of is_duplicate, in one Redis round trip.
+
+        A grant repeated within the batch counts as a duplicate after its
+        first occurrence.
+
+        Args:
+            grants: (external_id, title) pairs
+
+        Returns:
+            For each pair, True if it has been seen before
+        """
+        if not grants:
+            return []
+
+        hashes = [self._compute_grant_hash(external_id, title) for external_id, title in grants]
+        if self.seen_backend == "bloom":
+            seen = self._get_bloom_filter().contains_many(self.redis_client, hashes)
+        else:
+            seen = self.redis_client.smismember(self._get_seen_key(), hashes)
+
+        duplicates: list[bool] = []
+        batch: set[str] = set()
+        for grant_hash, is_seen in zip(hashes, seen):
+            duplicates.append(bool(is_seen) or grant_hash in batch)
+            batch.add(grant_hash)
+        return duplicates
+
+    def mark_many_as_seen(self, grants: list[tuple[str, str]]) -> None:
+        """
+        Batch version of mark_as_seen, in one Redis round trip.
+
+        The TTL is not touched here; call refresh_seen_ttl once per run.
+
+        Args:
+            grants: (external_id, title) pairs
+        """
+        if not grants:
+            return
+
+        hashes = [self._compute_grant_hash(external_id, title) for external_id, title in grants]
+        if self.seen_backend == "bloom":
+            self._get_bloom_filter().add_many(self.redis_client, hashes)
+        else:
+            self.redis_client.sadd(self._get_seen_key(), *hashes)
+        self._seen_ttl_pending = True
+
+    def refresh_seen_ttl(self) -> None:
+        """Refresh the seen-set TTL if grants were marked since the last refresh."""
+        if not self._seen_ttl_pending:
+            return
+        key = self._get_bloom_filter().key if self.seen_backend == "bloom" else self._get_seen_key()
+        self.redis_client.expire(key, self.SEEN_GRANT_TTL_SECONDS)
+        self._seen_ttl_pending = False
+
     def get_last_check_time(self) -> Optional[datetime]:
         """
         Get the last time this source was checked.
@@ -166,7 +528,7 @@ class DiscoveryAgent(ABC):
 
     def publish_grants_batch(self, grants: list[dict[str, Any]]) -> list[str]:
         """
-        Publish multiple grants to the Redis stream.
+        Publish multiple grants to the Redis stream in one pipeline.
 
         Args:
             grants: List of normalized grant data dictionaries
@@ -174,15 +536,99 @@ class DiscoveryAgent(ABC):
         Returns:
             List of Redis stream message IDs
         """
-        message_ids = []
+        if not grants:
+            return []
+
+        discovered_at = datetime.now(timezone.utc).isoformat()
+        pipe = self.redis_client.pipeline(transaction=False)
         for grant in grants:
-            try:
-                msg_id = self.publish_grant(grant)
-                message_ids.append(msg_id)
-            except Exception as e:
-                self.logger.error("grant_publish_failed", external_id=grant.get("external_id"), error=str(e))
+            # Ensure source is set
+            grant["source"] = self.source_name
+            grant["discovered_at"] = discovered_at
+            pipe.xadd(self.GRANTS_STREAM, {"data": json.dumps(grant)})
+
+        try:
+            results = pipe.execute(raise_on_error=False)
+        except Exception as e:
+            self.logger.error("grant_batch_publish_failed", grants=len(grants), error=str(e))
+            return []
+
+        message_ids = []
+        for grant, result in zip(grants, results):
+            if isinstance(result, Exception):
+                self.logger.error("grant_publish_failed", external_id=grant.get("external_id"), error=str(result))
+            else:
+                message_ids.append(result)
+
+        self.logger.info("grants_published", count=len(message_ids), stream=self.GRANTS_STREAM)
         return message_ids
 
+    async def paginate(
+        self,
+        fetch_page: Callable[[int], Awaitable[dict[str, Any]]],
+        parse_page: Callable[[dict[str, Any]], tuple[list[Any], Optional[int]]],
+        page_size: int,
+        first_offset: int = 0,
+        max_pages: int = 100,
+    ) -> AsyncIterator[list[Any]]:
+        """
+        Yield every page of an offset-paginated source API as it arrives.
+
+        See ConcurrentPaginator. Throughput is kept in ``last_pagination``
+        and recorded per source once all pages are consumed.
+
+        Args:
+            fetch_page: Fetches the decoded response at an offset
+            parse_page: Turns a response into (items, total or None)
+            page_size: Items per page
+            first_offset: Offset of the first page (1 for 1-indexed APIs)
+            max_pages: Safety limit on pages fetched
+
+        Yields:
+            Parsed items of one page
+        """
+        paginator = ConcurrentPaginator(
+            self.source_name,
+            fetch_page,
+            parse_page,
+            page_size=page_size,
+            first_offset=first_offset,
+            max_pages=max_pages,
+            logger=self.logger,
+        )
+        self.last_pagination = paginator.stats
+        async for items in paginator.pages():
+            yield items
+        self.record_pagination_stats(paginator.stats)
+
+    def record_pagination_stats(self, stats: PaginationStats) -> None:
+        """Store the latest pagination throughput for this source."""
+        self.logger.info(
+            "pagination_complete",
+            pages=stats.pages,
+            items=stats.items,
+            failed_pages=stats.failed_pages,
+            throttled=stats.throttled,
+            pages_per_second=stats.pages_per_second,
+            final_rate=stats.final_rate,
+        )
+        try:
+            self.redis_client.hset(
+                f"{self.PAGINATION_STATS_PREFIX}{self.source_name}",
+                mapping={
+                    "pages": stats.pages,
+                    "items": stats.items,
+                    "failed_pages": stats.failed_pages,
+                    "throttled": stats.throttled,
+                    "elapsed_seconds": stats.elapsed_seconds,
+                    "pages_per_second": stats.pages_per_second,
+                    "final_rate": stats.final_rate,
+                    "recorded_at": datetime.now(timezone.utc).isoformat(),
+                },
+            )
+        except Exception as e:
+            self.logger.warning("pagination_stats_not_recorded", error=str(e))
+
     @abstractmethod
     async def discover(self) -> list[dict[str, Any]]:
         """
@@ -190,8 +636,8 @@ class DiscoveryAgent(ABC):
 
         Implementations should:
         1. Fetch data from the source API
-        2. Filter out duplicates using is_duplicate()
-        3. Mark new grants as seen using mark_as_seen()
+        2. Filter out duplicates using filter_duplicates()
+        3. Mark new grants as seen using mark_many_as_seen()
         4. Return normalized grant data
 
         Returns:
@@ -205,7 +651,8 @@ class DiscoveryAgent(ABC):
         Execute the discovery process.
 
         This is the main entry point called by Celery tasks.
-        Should call discover() and publish results.
+        Should call discover() and publish results with
+        publish_grants_batch(), then refresh_seen_ttl() once.
 
         Returns:
             Number of new grants discovered
@@ -3,11 +3,20 @@ Grants.gov RSS Discovery Agent
 
 Subscribes to Grants.gov RSS feed for new funding opportunities,
 fetches full details via API, and publishes to Redis stream.
+
+Detail lookups for a poll's new entries run concurrently under the API rate
+limit over a pooled HTTP/2 client. Responses carrying an ETag or
+Last-Modified are kept in Redis and revalidated on later polls, so an
+unchanged feed or detail record is answered by a 304 instead of a full
+download.
 """
 
 import asyncio
+import base64
 import hashlib
+import json
 import time
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 from typing import Optional
 
@@ -171,6 +180,110 @@ class RateLimiter:
             self.request_times.append(time.monotonic())
 
 
+# ============================================================================
+# Conditional Request Cache
+# ============================================================================
+
+
+class ConditionalCacheTransport(httpx.AsyncBaseTransport):
+    """
+    Transport that revalidates responses with ETag / Last-Modified.
+
+    The validators and body of every 200 response that carries them are
+    kept in Redis under a key derived from the method, URL and request
+    body. Repeating the request later sends If-None-Match /
+    If-Modified-Since, and a 304 is answered from the stored body. Servers
+    that ignore the validators just return a fresh 200, which replaces the
+    stored entry.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        get_redis: Callable[[], Awaitable[aioredis.Redis]],
+        prefix: str,
+        ttl_seconds: int,
+    ):
+        self._transport = transport
+        self._get_redis = get_redis
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self.revalidated = 0
+        self.downloaded = 0
+
+    def _cache_key(self, request: httpx.Request, body: bytes) -> str:
+        digest = hashlib.sha256(f"{request.method} {request.url}\n".encode())
+        digest.update(body)
+        return f"{self.prefix}{digest.hexdigest()}"
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        redis = await self._get_redis()
+        key = self._cache_key(request, await request.aread())
+        cached = await redis.hgetall(key)
+        if cached.get("etag"):
+            request.headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            request.headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = await self._transport.handle_async_request(request)
+
+        if response.status_code == 304 and cached:
+            await response.aclose()
+            await redis.expire(key, self.ttl_seconds)
+            self.revalidated += 1
+            logger.debug("http_cache_revalidated", url=str(request.url))
+            # The body is stored decoded, so no Content-Encoding is replayed
+            headers = {
+                "Content-Type": cached.get("content_type", ""),
+                "ETag": cached.get("etag", ""),
+                "Last-Modified": cached.get("last_modified", ""),
+            }
+            return httpx.Response(
+                200,
+                headers={name: value for name, value in headers.items() if value},
+                content=base64.b64decode(cached["body"]),
+                request=request,
+                extensions=response.extensions,
+            )
+
+        self.downloaded += 1
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return response
+
+        # Read and decode (gzip, br, ...) here so the stored body is plain
+        body = await response.aread()
+        await response.aclose()
+        entry = {
+            "etag": etag or "",
+            "last_modified": last_modified or "",
+            "content_type": response.headers.get("content-type", ""),
+            "body": base64.b64encode(body).decode("ascii"),
+        }
+        pipe = redis.pipeline(transaction=False)
+        pipe.delete(key)
+        pipe.hset(key, mapping=entry)
+        pipe.expire(key, self.ttl_seconds)
+        await pipe.execute()
+
+        headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name.lower() not in ("content-encoding", "content-length")
+        ]
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=body,
+            request=request,
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
 # ============================================================================
 # Grants.gov RSS Discovery Agent
 # ============================================================================
@@ -182,10 +295,11 @@ class GrantsGovRSSAgent:
 
     Features:
     - Polls RSS feed every 5 minutes
-    - Fetches full details via Grants.gov API
+    - Fetches full details via Grants.gov API, concurrently up to the rate limit
     - Publishes to Redis stream
     - Tracks last processed ID to avoid duplicates
     - Rate limiting (3 req/sec)
+    - Pooled HTTP/2 connections with ETag / Last-Modified revalidation
     - Retry logic for network errors
     """
 
@@ -194,6 +308,9 @@ class GrantsGovRSSAgent:
     REDIS_STREAM = "grants:discovered"
     REDIS_LAST_ID_KEY = "grants_gov:last_processed_id"
     REDIS_PROCESSED_SET = "grants_gov:processed_ids"
+    REDIS_HTTP_CACHE_PREFIX = "grants_gov:http_cache:"
+    # Cached responses not revalidated within this window are dropped (7 days)
+    HTTP_CACHE_TTL_SECONDS = 60 * 60 * 24 * 7
 
     def __init__(self):
         self.rate_limiter = RateLimiter(max_requests=3, time_window=1.0)
@@ -214,12 +331,24 @@ class GrantsGovRSSAgent:
     async def _get_http_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client."""
         if self._http_client is None:
+            # One multiplexed HTTP/2 connection per host carries the
+            # concurrent detail lookups; keep-alive covers HTTP/1.1 servers
+            pool = httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            )
             self._http_client = httpx.AsyncClient(
                 timeout=httpx.Timeout(30.0),
                 headers={
                     "User-Agent": "GrantRadar/1.0 (https://grantradar.com)",
                     "Accept": "application/json",
                 },
+                transport=ConditionalCacheTransport(
+                    pool,
+                    self._get_redis,
+                    self.REDIS_HTTP_CACHE_PREFIX,
+                    self.HTTP_CACHE_TTL_SECONDS,
+                ),
             )
         return self._http_client
 
@@ -538,52 +667,115 @@ class GrantsGovRSSAgent:
 
         return message_id
 
-    async def discover_new_grants(self) -> list[DiscoveredGrant]:
+    async def filter_unprocessed(self, entries: list[GrantsGovEntry]) -> list[GrantsGovEntry]:
         """
-        Main discovery method: fetch RSS, get details, publish new grants.
+        Drop entries that were already processed, in one Redis round trip.
 
-        Returns:
-            List of newly discovered grants
+        An opportunity listed more than once in the feed is kept once.
         """
-        self.logger.info("starting_discovery_run")
-        start_time = time.time()
+        if not entries:
+            return []
 
-        try:
-            # Fetch RSS feed
-            entries = await self.fetch_rss_feed()
+        redis = await self._get_redis()
+        processed = await redis.smismember(self.REDIS_PROCESSED_SET, [entry.opportunity_id for entry in entries])
+
+        new_entries: list[GrantsGovEntry] = []
+        seen: set[str] = set()
+        for entry, is_processed in zip(entries, processed):
+            if is_processed or entry.opportunity_id in seen:
+                self.logger.debug(
+                    "skipping_processed_entry",
+                    opportunity_id=entry.opportunity_id,
+                )
+                continue
+            seen.add(entry.opportunity_id)
+            new_entries.append(entry)
+        return new_entries
 
-            discovered_grants = []
+    async def fetch_details_concurrently(self, entries: list[GrantsGovEntry]) -> list[Optional[GrantsGovDetails]]:
+        """
+        Fetch details for several entries at once, bounded by the rate limit.
 
-            for entry in entries:
-                # Skip if already processed
-                if await self.is_processed(entry.opportunity_id):
-                    self.logger.debug(
-                        "skipping_processed_entry",
-                        opportunity_id=entry.opportunity_id,
-                    )
-                    continue
+        At most ``rate_limiter.max_requests`` lookups are in flight, and the
+        rate limiter still spaces their starts. A lookup that fails yields
+        None so the grant is published from its RSS entry alone.
 
-                # Fetch full details from API
+        Returns:
+            Details for each entry, in order
+        """
+        in_flight = asyncio.Semaphore(self.rate_limiter.max_requests)
+
+        async def fetch(entry: GrantsGovEntry) -> Optional[GrantsGovDetails]:
+            async with in_flight:
                 try:
-                    details = await self.fetch_grant_details(entry.opportunity_id)
+                    return await self.fetch_grant_details(entry.opportunity_id)
                 except Exception as e:
                     self.logger.warning(
                         "failed_to_fetch_details",
                         opportunity_id=entry.opportunity_id,
                         error=str(e),
                     )
-                    details = None
+                    return None
+
+        return await asyncio.gather(*(fetch(entry) for entry in entries))
+
+    async def publish_grants(self, grants: list[DiscoveredGrant]) -> list[str]:
+        """
+        Publish grants and mark them processed in one MULTI/EXEC pipeline.
+
+        A grant is only marked processed if its stream entry was written
+        in the same transaction.
+
+        Returns:
+            Stream message IDs, in order
+        """
+        if not grants:
+            return []
+
+        redis = await self._get_redis()
+        pipe = redis.pipeline(transaction=True)
+        for grant in grants:
+            pipe.xadd(self.REDIS_STREAM, {"data": json.dumps(grant.to_stream_dict())})
+        pipe.sadd(self.REDIS_PROCESSED_SET, *[grant.external_id for grant in grants])
+        pipe.set(self.REDIS_LAST_ID_KEY, grants[-1].external_id)
+        results = await pipe.execute()
 
-                # Normalize the grant
-                grant = self._normalize_grant(entry, details)
+        message_ids = results[: len(grants)]
+        self.logger.info(
+            "grants_published",
+            count=len(message_ids),
+            stream=self.REDIS_STREAM,
+        )
+        return message_ids
+
+    async def discover_new_grants(self) -> list[DiscoveredGrant]:
+        """
+        Main discovery method: fetch RSS, get details, publish new grants.
+
+        Details for all new entries are fetched concurrently, then the
+        grants are published and marked processed together.
+
+        Returns:
+            List of newly discovered grants
+        """
+        self.logger.info("starting_discovery_run")
+        start_time = time.time()
+
+        try:
+            # Fetch RSS feed
+            entries = await self.fetch_rss_feed()
 
-                # Publish to Redis stream
-                await self.publish_grant(grant)
+            # Skip entries already processed
+            new_entries = await self.filter_unprocessed(entries)
 
-                # Mark as processed
-                await self.mark_processed(entry.opportunity_id)
+            # Fetch full details from API
+            details = await self.fetch_details_concurrently(new_entries)
 
-                discovered_grants.append(grant)
+            # Normalize, publish and mark as processed
+            discovered_grants = [
+                self._normalize_grant(entry, entry_details) for entry, entry_details in zip(new_entries, details)
+            ]
+            await self.publish_grants(discovered_grants)
 
             elapsed = time.time() - start_time
             self.logger.info(
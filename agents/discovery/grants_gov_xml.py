@@ -6,15 +6,26 @@ since the RSS feed has been deprecated.
 
 XML Extract URL Pattern:
 https://prod-grants-gov-chatbot.s3.amazonaws.com/extracts/GrantsDBExtract{YYYYMMDD}v2.zip
+
+Each extract is a full snapshot. A content fingerprint of every tracked
+opportunity is kept in Redis, so a run only emits opportunities that are
+new (to ``grants:discovered``) or whose fields changed since the previous
+extract (to ``grants:updated``).
 """
 
 import asyncio
+import hashlib
 import io
+import json
+import resource
+import sys
+import tempfile
 import time
 import zipfile
 import xml.etree.ElementTree as ET
+from collections.abc import Iterator
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import BinaryIO, Optional, Union
 
 import httpx
 import redis.asyncio as aioredis
@@ -39,9 +50,44 @@ logger = structlog.get_logger(__name__)
 
 XML_EXTRACT_BASE_URL = "https://prod-grants-gov-chatbot.s3.amazonaws.com/extracts"
 REDIS_STREAM = "grants:discovered"
+REDIS_UPDATE_STREAM = "grants:updated"
 REDIS_PROCESSED_SET = "grants_gov:processed_ids"
+REDIS_FINGERPRINTS = "grants_gov:fingerprints"
 REDIS_LAST_EXTRACT_KEY = "grants_gov:last_extract_date"
 
+# Downloads up to this size stay in memory; larger ones spill to a temp file
+DOWNLOAD_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+
+# Opportunities deduplicated and published per Redis pipeline
+PUBLISH_BATCH_SIZE = 500
+
+ACTIVE_STATUSES = (None, "Posted", "Forecasted", "posted", "forecasted")
+
+# Fields compared between extracts. Bump FINGERPRINT_VERSION when changing
+# them so stored fingerprints are re-baselined instead of reported as changes.
+FINGERPRINT_VERSION = 1
+FINGERPRINT_FIELDS = (
+    "title",
+    "agency_name",
+    "opportunity_status",
+    "close_date",
+    "award_ceiling",
+    "award_floor",
+    "estimated_funding",
+    "funding_instrument_type",
+    "category",
+    "cost_sharing",
+    "cfda_numbers",
+    "eligible_applicants",
+)
+# Long fields stored as a digest; changes report that they changed, not the text
+DIGEST_FIELDS = ("description",)
+
+DEADLINE_FIELDS = {"close_date"}
+AMOUNT_FIELDS = {"award_ceiling", "award_floor", "estimated_funding"}
+STATUS_FIELDS = {"opportunity_status"}
+
 
 # ============================================================================
 # Pydantic Models
@@ -94,8 +140,6 @@ class DiscoveredGrant(BaseModel):
 
     def to_stream_dict(self) -> dict:
         """Convert to dictionary suitable for Redis stream."""
-        import json
-
         data = self.model_dump(mode="json", exclude_none=True)
         if "eligible_applicants" in data:
             data["eligible_applicants"] = json.dumps(data["eligible_applicants"])
@@ -107,6 +151,100 @@ class DiscoveredGrant(BaseModel):
         return data
 
 
+class GrantUpdate(BaseModel):
+    """A known opportunity whose content changed between extracts."""
+
+    external_id: str = Field(..., description="Source system ID")
+    source: str = Field(default="grants_gov", description="Source identifier")
+    update_type: str = Field(..., description="deadline_changed, amount_updated, status_changed or details_updated")
+    changes: dict[str, dict] = Field(default_factory=dict, description="Changed fields with old and new values")
+    message: str = Field(..., description="Human-readable summary of the change")
+    grant: DiscoveredGrant = Field(..., description="Current version of the grant")
+
+    def to_stream_dict(self) -> dict:
+        """Convert to dictionary suitable for Redis stream."""
+        return {
+            "external_id": self.external_id,
+            "source": self.source,
+            "update_type": self.update_type,
+            "changes": self.changes,
+            "message": self.message,
+            "grant": self.grant.to_stream_dict(),
+        }
+
+
+class ExtractRunStats(BaseModel):
+    """Summary of one extract ingestion run."""
+
+    extract_date: Optional[str] = Field(None, description="Date of the extract processed")
+    download_mb: float = Field(0.0, description="Compressed extract size")
+    total_opportunities: int = Field(0, description="Opportunities parsed from the extract")
+    active_opportunities: int = Field(0, description="Posted or forecasted opportunities")
+    new_grants: int = Field(0, description="Grants published to the stream")
+    updated_grants: int = Field(0, description="Known grants published as update events")
+    skipped: int = Field(0, description="Opportunities unchanged since the previous extract")
+    sample_ids: list[str] = Field(default_factory=list, description="First published external IDs")
+    elapsed_seconds: float = Field(0.0, description="Wall time of the run")
+    records_per_second: float = Field(0.0, description="Parsed opportunities per second")
+    peak_rss_mb: float = Field(0.0, description="Peak resident memory of this process")
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def opportunity_fingerprint(opp: GrantsGovOpportunity) -> str:
+    """Canonical JSON of the fields compared between extracts."""
+    values = opp.model_dump(mode="json", include=set(FINGERPRINT_FIELDS))
+    for field in DIGEST_FIELDS:
+        text = getattr(opp, field) or ""
+        values[field] = hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+    values["v"] = FINGERPRINT_VERSION
+    return json.dumps(values, sort_keys=True, separators=(",", ":"))
+
+
+def diff_fingerprints(previous: str, current: str) -> Optional[dict[str, dict]]:
+    """
+    Field-level differences between two fingerprints.
+
+    Returns:
+        Changed fields mapped to ``{"old", "new"}`` (``{"updated": True}`` for
+        digest fields), or None if the previous fingerprint has another version
+    """
+    before, after = json.loads(previous), json.loads(current)
+    if before.get("v") != after.get("v"):
+        return None
+
+    changes: dict[str, dict] = {}
+    for field in sorted(after.keys() - {"v"}):
+        if before.get(field) == after.get(field):
+            continue
+        if field in DIGEST_FIELDS:
+            changes[field] = {"updated": True}
+        else:
+            changes[field] = {"old": before.get(field), "new": after.get(field)}
+    return changes
+
+
+def describe_changes(changes: dict[str, dict]) -> tuple[str, str]:
+    """Pick the update type and message for ``notify_grant_update``."""
+    fields = set(changes)
+    if fields & DEADLINE_FIELDS:
+        change = changes["close_date"]
+        old = (change["old"] or "none")[:10]
+        new = (change["new"] or "none")[:10]
+        return "deadline_changed", f"Deadline changed from {old} to {new}"
+    if fields & AMOUNT_FIELDS:
+        return "amount_updated", "Award amounts updated"
+    if fields & STATUS_FIELDS:
+        change = changes["opportunity_status"]
+        return "status_changed", f"Status changed from {change['old']} to {change['new']}"
+    return "details_updated", "Updated: " + ", ".join(sorted(fields))
+
+
 # ============================================================================
 # Grants.gov XML Extract Discovery Agent
 # ============================================================================
@@ -117,11 +255,16 @@ class GrantsGovXMLAgent:
     Agent for discovering grant opportunities from Grants.gov daily XML extracts.
 
     Features:
-    - Downloads daily XML database extract (~76MB compressed)
-    - Parses all opportunities from XML
-    - Tracks processed IDs to identify new grants
-    - Publishes new grants to Redis stream
+    - Streams the daily XML database extract (~76MB compressed) to a
+      spooled temp file
+    - Parses opportunities one at a time with iterparse
+    - Diffs each batch against the stored fingerprints (HMGET)
+    - Publishes new grants and update events for changed ones in
+      pipelined XADD batches
     - Runs daily (or more frequently to catch updates)
+
+    Memory stays flat regardless of extract size: neither the archive nor
+    the parsed opportunities are ever held in full.
     """
 
     def __init__(self):
@@ -169,79 +312,119 @@ class GrantsGovXMLAgent:
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=5, max=60),
     )
-    async def download_extract(self, date: datetime) -> bytes:
+    async def download_extract(self, date: datetime) -> BinaryIO:
         """
         Download the XML extract for a specific date.
 
+        The body is streamed into a spooled temporary file, which stays in
+        memory for small archives and spills to disk beyond
+        DOWNLOAD_SPOOL_MAX_BYTES.
+
         Args:
             date: The date to download the extract for
 
         Returns:
-            Raw zip file bytes
+            Seekable file positioned at the start of the zip archive
         """
         url = self._get_extract_url(date)
         self.logger.info("downloading_xml_extract", url=url, date=date.isoformat())
 
         client = await self._get_http_client()
+        spool = tempfile.SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_MAX_BYTES)
 
         try:
-            response = await client.get(url)
-            response.raise_for_status()
-            self.logger.info(
-                "xml_extract_downloaded",
-                size_mb=round(len(response.content) / 1024 / 1024, 2),
-            )
-            return response.content
+            async with client.stream("GET", url) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_BYTES):
+                    spool.write(chunk)
         except httpx.HTTPStatusError as e:
+            spool.close()
             if e.response.status_code == 404:
                 self.logger.warning("xml_extract_not_found", date=date.isoformat())
             raise
+        except BaseException:
+            spool.close()
+            raise
 
-    def parse_xml_extract(self, zip_content: bytes) -> list[GrantsGovOpportunity]:
+        size = spool.tell()
+        spool.seek(0)
+        self.logger.info("xml_extract_downloaded", size_mb=round(size / 1024 / 1024, 2))
+        return spool
+
+    def iter_opportunities(self, extract: Union[bytes, BinaryIO]) -> Iterator[GrantsGovOpportunity]:
         """
-        Parse the XML extract from the zip file.
+        Parse opportunities from the zip archive one at a time.
+
+        Each top-level record is discarded as soon as it has been parsed, so
+        memory does not grow with the size of the extract.
 
         Args:
-            zip_content: Raw zip file bytes
+            extract: Zip archive as bytes or a seekable binary file
 
-        Returns:
-            List of parsed opportunities
+        Yields:
+            Parsed opportunities, in extract order
         """
-        self.logger.info("parsing_xml_extract")
-        start_time = time.time()
-
-        opportunities = []
+        if isinstance(extract, bytes):
+            extract = io.BytesIO(extract)
 
-        with zipfile.ZipFile(io.BytesIO(zip_content)) as zf:
+        with zipfile.ZipFile(extract) as zf:
             # Find the XML file in the archive
             xml_files = [f for f in zf.namelist() if f.endswith(".xml")]
             if not xml_files:
                 self.logger.error("no_xml_file_in_archive")
-                return []
+                return
 
             xml_filename = xml_files[0]
             self.logger.info("parsing_xml_file", filename=xml_filename)
 
             with zf.open(xml_filename) as xml_file:
-                # Parse XML incrementally to handle large files
-                # Handle namespace in Grants.gov XML
-                context = ET.iterparse(xml_file, events=("end",))
+                root = None
+                depth = 0
+                for event, elem in ET.iterparse(xml_file, events=("start", "end")):
+                    if event == "start":
+                        if root is None:
+                            root = elem
+                        depth += 1
+                        continue
+
+                    depth -= 1
+                    if depth != 1:
+                        continue
 
-                for event, elem in context:
                     # Match with or without namespace
                     tag_name = elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
                     if tag_name == "OpportunitySynopsisDetail_1_0":
                         try:
                             opp = self._parse_opportunity_element(elem)
-                            if opp:
-                                opportunities.append(opp)
                         except Exception as e:
+                            opp = None
                             self.logger.warning(
                                 "failed_to_parse_opportunity",
                                 error=str(e),
                             )
-                        # Clear element to save memory
-                        elem.clear()
+                        if opp:
+                            yield opp
+
+                    # Drop every finished top-level record to keep memory flat
+                    root.clear()
+
+    def parse_xml_extract(self, zip_content: Union[bytes, BinaryIO]) -> list[GrantsGovOpportunity]:
+        """
+        Parse the XML extract from the zip file.
+
+        Loads every opportunity into a list; ``discover_new_grants`` uses
+        ``iter_opportunities`` instead.
+
+        Args:
+            zip_content: Raw zip file bytes or a seekable binary file
+
+        Returns:
+            List of parsed opportunities
+        """
+        self.logger.info("parsing_xml_extract")
+        start_time = time.time()
+
+        opportunities = list(self.iter_opportunities(zip_content))
 
         elapsed = time.time() - start_time
         self.logger.info(
@@ -366,11 +549,9 @@ class GrantsGovXMLAgent:
 
     async def publish_grant(self, grant: DiscoveredGrant) -> str:
         """Publish a discovered grant to the Redis stream."""
-        import json as json_lib
-
         redis = await self._get_redis()
         # Wrap in "data" key as JSON string - format expected by validator
-        stream_data = {"data": json_lib.dumps(grant.to_stream_dict())}
+        stream_data = {"data": json.dumps(grant.to_stream_dict())}
         message_id = await redis.xadd(REDIS_STREAM, stream_data)
 
         self.logger.debug(
@@ -381,6 +562,83 @@ class GrantsGovXMLAgent:
 
         return message_id
 
+    async def process_batch(
+        self, opportunities: list[GrantsGovOpportunity]
+    ) -> tuple[list[DiscoveredGrant], list[GrantUpdate]]:
+        """
+        Publish the new and changed opportunities of a batch.
+
+        The batch's stored fingerprints and processed flags are read in one
+        round trip. New active opportunities go to ``grants:discovered``,
+        known opportunities whose fingerprint changed go to
+        ``grants:updated``, and everything else is skipped. The XADDs and
+        the fingerprint/processed writes then go out in a single pipeline.
+
+        Opportunities processed before fingerprints existed, or stored with
+        an older FINGERPRINT_VERSION, are re-baselined without an event.
+
+        Args:
+            opportunities: Parsed opportunities, active or not
+
+        Returns:
+            The grants published as new, and the update events published
+        """
+        if not opportunities:
+            return [], []
+
+        redis = await self._get_redis()
+        ids = [opp.opportunity_id for opp in opportunities]
+        pipe = redis.pipeline(transaction=False)
+        pipe.hmget(REDIS_FINGERPRINTS, ids)
+        pipe.smismember(REDIS_PROCESSED_SET, ids)
+        stored, seen = await pipe.execute()
+
+        new_grants: list[DiscoveredGrant] = []
+        updates: list[GrantUpdate] = []
+        fingerprints: dict[str, str] = {}
+        for opp, previous, is_seen in zip(opportunities, stored, seen):
+            # Extracts occasionally repeat an opportunity; handle it once
+            if opp.opportunity_id in fingerprints:
+                continue
+            current = opportunity_fingerprint(opp)
+            if previous == current:
+                continue
+
+            if previous is None and not is_seen:
+                # Only posted/forecasted opportunities are tracked from the start
+                if opp.opportunity_status not in ACTIVE_STATUSES:
+                    continue
+                new_grants.append(self._normalize_opportunity(opp))
+            elif previous is not None:
+                changes = diff_fingerprints(previous, current)
+                if changes:
+                    update_type, message = describe_changes(changes)
+                    updates.append(
+                        GrantUpdate(
+                            external_id=opp.opportunity_id,
+                            update_type=update_type,
+                            changes=changes,
+                            message=message,
+                            grant=self._normalize_opportunity(opp),
+                        )
+                    )
+            fingerprints[opp.opportunity_id] = current
+
+        if not fingerprints:
+            return [], []
+
+        pipe = redis.pipeline(transaction=False)
+        for grant in new_grants:
+            pipe.xadd(REDIS_STREAM, {"data": json.dumps(grant.to_stream_dict())})
+        for update in updates:
+            pipe.xadd(REDIS_UPDATE_STREAM, {"data": json.dumps(update.to_stream_dict())})
+        if new_grants:
+            pipe.sadd(REDIS_PROCESSED_SET, *[grant.external_id for grant in new_grants])
+        pipe.hset(REDIS_FINGERPRINTS, mapping=fingerprints)
+        await pipe.execute()
+
+        return new_grants, updates
+
     async def get_last_extract_date(self) -> Optional[datetime]:
         """Get the date of the last processed extract."""
         redis = await self._get_redis()
@@ -394,87 +652,70 @@ class GrantsGovXMLAgent:
         redis = await self._get_redis()
         await redis.set(REDIS_LAST_EXTRACT_KEY, date.isoformat())
 
-    async def discover_new_grants(self, target_date: Optional[datetime] = None) -> list[DiscoveredGrant]:
+    async def discover_new_grants(self, target_date: Optional[datetime] = None) -> ExtractRunStats:
         """
         Main discovery method: download XML, parse, publish new grants.
 
+        The extract is streamed end to end: downloaded to a spooled temp
+        file, parsed one opportunity at a time, and diffed and published
+        PUBLISH_BATCH_SIZE opportunities per Redis round trip. Only new and
+        changed opportunities are published.
+
         Args:
             target_date: Specific date to fetch (defaults to today)
 
         Returns:
-            List of newly discovered grants
+            Run stats, including records/sec and peak RSS
         """
         if target_date is None:
             target_date = datetime.now(timezone.utc)
 
         self.logger.info("starting_discovery_run", target_date=target_date.isoformat())
         start_time = time.time()
+        stats = ExtractRunStats()
 
         try:
             # Download the XML extract
             try:
-                zip_content = await self.download_extract(target_date)
+                extract = await self.download_extract(target_date)
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 404:
                     # Try yesterday if today's not available yet
                     target_date = target_date - timedelta(days=1)
                     self.logger.info("trying_previous_day", date=target_date.isoformat())
-                    zip_content = await self.download_extract(target_date)
+                    extract = await self.download_extract(target_date)
                 else:
                     raise
 
-            # Parse the XML
-            opportunities = self.parse_xml_extract(zip_content)
-
-            # Filter to only active/posted opportunities
-            active_opps = [
-                opp
-                for opp in opportunities
-                if opp.opportunity_status in (None, "Posted", "Forecasted", "posted", "forecasted")
-            ]
-
-            self.logger.info(
-                "filtering_opportunities",
-                total=len(opportunities),
-                active=len(active_opps),
-            )
-
-            discovered_grants = []
-            new_count = 0
-            skipped_count = 0
-
-            for opp in active_opps:
-                # Skip if already processed
-                if await self.is_processed(opp.opportunity_id):
-                    skipped_count += 1
-                    continue
-
-                # Normalize and publish
-                grant = self._normalize_opportunity(opp)
-                await self.publish_grant(grant)
-                await self.mark_processed(opp.opportunity_id)
-
-                discovered_grants.append(grant)
-                new_count += 1
-
-                # Log progress every 100 grants
-                if new_count % 100 == 0:
-                    self.logger.info("discovery_progress", new_grants=new_count)
+            stats.extract_date = target_date.date().isoformat()
+            extract.seek(0, io.SEEK_END)
+            stats.download_mb = round(extract.tell() / 1024 / 1024, 2)
+            extract.seek(0)
+
+            with extract:
+                batch: list[GrantsGovOpportunity] = []
+                for opp in self.iter_opportunities(extract):
+                    stats.total_opportunities += 1
+                    # Inactive opportunities are still diffed so closures are reported
+                    if opp.opportunity_status in ACTIVE_STATUSES:
+                        stats.active_opportunities += 1
+                    batch.append(opp)
+                    if len(batch) >= PUBLISH_BATCH_SIZE:
+                        await self._publish_batch(batch, stats)
+                        batch = []
+                await self._publish_batch(batch, stats)
 
             # Record last extract date
             await self.set_last_extract_date(target_date)
 
-            elapsed = time.time() - start_time
-            self.logger.info(
-                "discovery_run_complete",
-                total_opportunities=len(opportunities),
-                active_opportunities=len(active_opps),
-                new_grants=new_count,
-                skipped=skipped_count,
-                elapsed_seconds=round(elapsed, 2),
-            )
+            stats.elapsed_seconds = round(time.time() - start_time, 2)
+            if stats.elapsed_seconds > 0:
+                stats.records_per_second = round(stats.total_opportunities / stats.elapsed_seconds, 1)
+            stats.peak_rss_mb = peak_rss_mb()
 
-            return discovered_grants
+            self.logger.info("discovery_run_complete", **stats.model_dump(exclude={"sample_ids"}))
+
+            return stats
 
         except Exception as e:
             self.logger.error(
@@ -484,6 +725,18 @@ class GrantsGovXMLAgent:
             )
             raise
 
+    async def _publish_batch(self, batch: list[GrantsGovOpportunity], stats: ExtractRunStats) -> None:
+        """Publish one batch and fold the result into the run stats."""
+        published, updates = await self.process_batch(batch)
+        stats.new_grants += len(published)
+        stats.updated_grants += len(updates)
+        stats.skipped += len(batch) - len(published) - len(updates)
+        room = 10 - len(stats.sample_ids)
+        if room > 0:
+            stats.sample_ids.extend(grant.external_id for grant in published[:room])
+        if published or updates:
+            self.logger.info("discovery_progress", new_grants=stats.new_grants, updated_grants=stats.updated_grants)
+
 
 # ============================================================================
 # Celery Task Configuration
@@ -539,11 +792,13 @@ def discover_grants_gov_xml(self) -> dict:
     async def run_discovery():
         agent = GrantsGovXMLAgent()
         try:
-            grants = await agent.discover_new_grants()
+            stats = await agent.discover_new_grants()
             return {
                 "status": "success",
-                "grants_discovered": len(grants),
-                "sample_ids": [g.external_id for g in grants[:10]],
+                "grants_discovered": stats.new_grants,
+                "grants_updated": stats.updated_grants,
+                "sample_ids": stats.sample_ids,
+                "stats": stats.model_dump(),
             }
         finally:
             await agent.close()
@@ -573,10 +828,11 @@ async def main():
     """Manual run for testing the agent."""
     agent = GrantsGovXMLAgent()
     try:
-        grants = await agent.discover_new_grants()
-        print(f"\nDiscovered {len(grants)} new grants")
-        for grant in grants[:10]:
-            print(f"  - {grant.external_id}: {grant.title[:60]}...")
+        stats = await agent.discover_new_grants()
+        print(f"\nDiscovered {stats.new_grants} new grants, {stats.updated_grants} updated")
+        print(f"  {stats.total_opportunities} records at {stats.records_per_second}/s, peak RSS {stats.peak_rss_mb} MB")
+        for external_id in stats.sample_ids:
+            print(f"  - {external_id}")
     finally:
         await agent.close()
 
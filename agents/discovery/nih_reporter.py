@@ -6,6 +6,7 @@ This provides a reliable alternative to web scraping for NIH grant data.
 API documentation: https://api.reporter.nih.gov/
 """
 
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
 from typing import Any, Optional
 import asyncio
@@ -385,69 +386,62 @@ class NIHReporterDiscoveryAgent(DiscoveryAgent):
             raw_data=project.model_dump(mode="json"),
         )
 
-    async def _fetch_all_pages(self, base_request: NIHSearchRequest) -> list[NIHReporterProject]:
+    def _parse_page(self, response_data: dict[str, Any]) -> tuple[list[NIHReporterProject], Optional[int]]:
         """
-        Fetch all pages of results from the NIH Reporter API.
+        Parse one API response into projects and the total result count.
 
         Args:
-            base_request: Base search request
+            response_data: Decoded API response
 
         Returns:
-            List of all projects across all pages
+            Parsed projects and ``meta.total`` (None if missing)
         """
-        all_projects: list[NIHReporterProject] = []
-        current_offset = 0
-        page_count = 0
-
-        while page_count < self.MAX_PAGES:
-            request = base_request.model_copy(update={"offset": current_offset})
-
+        projects: list[NIHReporterProject] = []
+        for project_data in response_data.get("results", []):
             try:
-                response_data = await self._fetch_page(request)
-            except httpx.HTTPError as e:
-                self.logger.error("nih_reporter_api_fetch_failed", offset=current_offset, error=str(e))
-                break
-
-            # Parse response structure
-            meta = response_data.get("meta", {})
-            total = meta.get("total", 0)
-            results = response_data.get("results", [])
-
-            if not results:
-                self.logger.info(
-                    "nih_reporter_api_no_more_results", offset=current_offset, total_fetched=len(all_projects)
+                projects.append(NIHReporterProject.model_validate(project_data))
+            except Exception as e:
+                self.logger.warning(
+                    "nih_reporter_project_parse_failed", project_num=project_data.get("project_num"), error=str(e)
                 )
-                break
-
-            # Parse projects
-            for project_data in results:
-                try:
-                    project = NIHReporterProject.model_validate(project_data)
-                    all_projects.append(project)
-                except Exception as e:
-                    self.logger.warning(
-                        "nih_reporter_project_parse_failed", project_num=project_data.get("project_num"), error=str(e)
-                    )
-
-            self.logger.info(
-                "nih_reporter_api_page_fetched",
-                offset=current_offset,
-                projects_in_page=len(results),
-                total_fetched=len(all_projects),
-                total_available=total,
-            )
+        return projects, response_data.get("meta", {}).get("total")
 
-            # Check if we've fetched all results
-            if current_offset + len(results) >= total:
-                break
+    def _iter_project_pages(self, base_request: NIHSearchRequest) -> AsyncIterator[list[NIHReporterProject]]:
+        """
+        Yield pages of projects as they arrive.
+
+        The first page reports ``meta.total``; the remaining offsets are then
+        fetched concurrently by the shared paginator.
 
-            current_offset += self.RESULTS_PER_PAGE
-            page_count += 1
+        Args:
+            base_request: Base search request
 
-            # Rate limiting - be nice to the API
-            await asyncio.sleep(0.5)
+        Returns:
+            Async iterator over pages of parsed projects
+        """
 
-        return all_projects
+        async def fetch(offset: int) -> dict[str, Any]:
+            return await self._fetch_page(base_request.model_copy(update={"offset": offset}))
+
+        return self.paginate(
+            fetch,
+            self._parse_page,
+            page_size=self.RESULTS_PER_PAGE,
+            first_offset=0,
+            max_pages=self.MAX_PAGES,
+        )
+
+    async def _fetch_all_pages(self, base_request: NIHSearchRequest) -> list[NIHReporterProject]:
+        """
+        Fetch all pages of results from the NIH Reporter API.
+
+        Args:
+            base_request: Base search request
+
+        Returns:
+            List of all projects across all pages
+        """
+        return [project async for page in self._iter_project_pages(base_request) for project in page]
 
     def _get_current_fiscal_year(self) -> int:
         """Get current federal fiscal year (Oct 1 - Sep 30)."""
@@ -457,13 +451,8 @@ class NIHReporterDiscoveryAgent(DiscoveryAgent):
             return now.year + 1
         return now.year
 
-    async def discover(self) -> list[dict[str, Any]]:
-        """
-        Discover new grants from NIH Reporter.
-
-        Returns:
-            List of normalized grant data dictionaries
-        """
+    def _build_request(self) -> NIHSearchRequest:
+        """Build the search request for active projects since the last check."""
         # Build search criteria for active projects
         current_fy = self._get_current_fiscal_year()
 
@@ -483,7 +472,7 @@ class NIHReporterDiscoveryAgent(DiscoveryAgent):
                 "to_date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
             }
 
-        request = NIHSearchRequest(
+        return NIHSearchRequest(
             criteria=criteria,
             limit=self.RESULTS_PER_PAGE,
             offset=0,
@@ -491,6 +480,16 @@ class NIHReporterDiscoveryAgent(DiscoveryAgent):
             sort_order="desc",
         )
 
+    async def _iter_new_grants(self) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Yield the new grants of each fetched page.
+
+        Yields:
+            Normalized grant data dictionaries not seen before
+        """
+        request = self._build_request()
+        criteria = request.criteria
+
         self.logger.info(
             "nih_reporter_discovery_start",
             fiscal_years=criteria.fiscal_years,
@@ -498,50 +497,63 @@ class NIHReporterDiscoveryAgent(DiscoveryAgent):
             newly_added=criteria.newly_added_projects_only,
         )
 
-        # Fetch all projects
-        projects = await self._fetch_all_pages(request)
-
-        self.logger.info("nih_reporter_projects_fetched", total_projects=len(projects))
+        total_fetched = 0
+        total_new = 0
+        async for projects in self._iter_project_pages(request):
+            total_fetched += len(projects)
+
+            # Filter duplicates and normalize, one Redis round trip per page
+            keys = [(project.project_num, project.project_title) for project in projects]
+            duplicates = self.filter_duplicates(keys)
+            new_grants: list[dict[str, Any]] = []
+            new_keys: list[tuple[str, str]] = []
+            for project, key, is_duplicate in zip(projects, keys, duplicates):
+                if is_duplicate:
+                    self.logger.debug("nih_reporter_project_duplicate", project_num=project.project_num)
+                    continue
+                new_grants.append(self._normalize_project(project).model_dump(mode="json"))
+                new_keys.append(key)
 
-        # Filter duplicates and normalize
-        new_grants: list[dict[str, Any]] = []
-
-        for project in projects:
-            # Check for duplicates
-            if self.is_duplicate(project.project_num, project.project_title):
-                self.logger.debug("nih_reporter_project_duplicate", project_num=project.project_num)
-                continue
+            # Mark as seen
+            self.mark_many_as_seen(new_keys)
 
-            # Normalize and add
-            grant = self._normalize_project(project)
-            new_grants.append(grant.model_dump(mode="json"))
+            total_new += len(new_grants)
+            if new_grants:
+                yield new_grants
 
-            # Mark as seen
-            self.mark_as_seen(project.project_num, project.project_title)
+        self.refresh_seen_ttl()
+        self.logger.info("nih_reporter_discovery_complete", total_fetched=total_fetched, new_grants=total_new)
 
-        self.logger.info("nih_reporter_discovery_complete", total_fetched=len(projects), new_grants=len(new_grants))
+    async def discover(self) -> list[dict[str, Any]]:
+        """
+        Discover new grants from NIH Reporter.
 
-        return new_grants
+        Returns:
+            List of normalized grant data dictionaries
+        """
+        return [grant async for page in self._iter_new_grants() for grant in page]
 
     async def run(self) -> int:
         """
         Execute the discovery process.
 
+        New grants are published page by page while later pages are still
+        being fetched.
+
         Returns:
             Number of new grants discovered
         """
         try:
-            # Discover new grants
-            grants = await self.discover()
-
-            if grants:
+            count = 0
+            async for grants in self._iter_new_grants():
                 # Publish to Redis stream
                 self.publish_grants_batch(grants)
+                count += len(grants)
 
             # Update last check time
             self.set_last_check_time()
 
-            return len(grants)
+            return count
 
         except Exception as e:
             self.logger.error("nih_reporter_discovery_failed", error=str(e), exc_info=True)
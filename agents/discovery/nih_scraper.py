@@ -511,7 +511,8 @@ async def run_nih_scraper() -> dict[str, Any]:
 
         result["opportunities_found"] = len(opportunities)
 
-        # Publish to Redis stream
+        # Publish to Redis stream in one pipeline
+        pipe = redis_client.pipeline(transaction=False)
         for opp in opportunities:
             discovered_grant = DiscoveredGrant(
                 source="nih",
@@ -525,18 +526,13 @@ async def run_nih_scraper() -> dict[str, Any]:
             )
 
             # Wrap in "data" key as JSON string - format expected by validator
-            import json as json_lib
-
-            redis_client.xadd(
+            pipe.xadd(
                 REDIS_STREAM_KEY,
-                {"data": json_lib.dumps(discovered_grant.to_stream_dict())},
+                {"data": json.dumps(discovered_grant.to_stream_dict())},
             )
+        pipe.execute()
 
-            logger.info(
-                "published_to_stream",
-                foa_number=opp.foa_number,
-                title=opp.title[:50] + "..." if len(opp.title) > 50 else opp.title,
-            )
+        logger.info("published_to_stream", opportunities=len(opportunities))
 
         # Update hash
         redis_client.set(REDIS_HASH_KEY, new_hash)
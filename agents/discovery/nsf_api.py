@@ -3,6 +3,7 @@ NSF Award Search API Discovery Agent
 Discovers new grant opportunities from the National Science Foundation.
 """
 
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
 from enum import Enum
@@ -331,72 +332,69 @@ class NSFDiscoveryAgent(DiscoveryAgent):
             raw_data=award.model_dump(),
         )
 
-    async def _fetch_all_pages(self, base_params: NSFSearchParams) -> list[NSFAward]:
+    def _parse_page(self, response_data: dict[str, Any]) -> tuple[list[NSFAward], Optional[int]]:
         """
-        Fetch all pages of results from the NSF API.
+        Parse one API response into awards and the total result count.
+
+        NSF API returns: {"response": {"award": [...], "metadata": {"totalCount": N}}}
 
         Args:
-            base_params: Base search parameters
+            response_data: Decoded API response
 
         Returns:
-            List of all awards across all pages
+            Parsed awards and the total count (None if missing)
         """
-        all_awards: list[NSFAward] = []
-        current_offset = 1
-        page_count = 0
+        response_wrapper = response_data.get("response", {})
+        awards: list[NSFAward] = []
+        for award_data in response_wrapper.get("award", []):
+            try:
+                awards.append(NSFAward.model_validate(award_data))
+            except Exception as e:
+                self.logger.warning("nsf_award_parse_failed", award_id=award_data.get("id"), error=str(e))
 
-        while page_count < self.MAX_PAGES:
-            params = base_params.model_copy(update={"offset": current_offset})
+        total = response_wrapper.get("metadata", {}).get("totalCount", response_wrapper.get("totalRecords"))
+        return awards, int(total) if total is not None else None
 
-            try:
-                response_data = await self._fetch_page(params)
-            except httpx.HTTPError as e:
-                self.logger.error("nsf_api_fetch_failed", offset=current_offset, error=str(e))
-                break
-
-            # Parse response structure
-            # NSF API returns: {"response": {"award": [...], "totalRecords": N}}
-            response_wrapper = response_data.get("response", {})
-            awards_data = response_wrapper.get("award", [])
-
-            if not awards_data:
-                self.logger.info("nsf_api_no_more_results", offset=current_offset, total_fetched=len(all_awards))
-                break
-
-            # Parse awards
-            for award_data in awards_data:
-                try:
-                    award = NSFAward.model_validate(award_data)
-                    all_awards.append(award)
-                except Exception as e:
-                    self.logger.warning("nsf_award_parse_failed", award_id=award_data.get("id"), error=str(e))
-
-            self.logger.info(
-                "nsf_api_page_fetched",
-                offset=current_offset,
-                awards_in_page=len(awards_data),
-                total_fetched=len(all_awards),
-            )
+    def _iter_award_pages(self, base_params: NSFSearchParams) -> AsyncIterator[list[NSFAward]]:
+        """
+        Yield pages of awards as they arrive.
 
-            # Check if we've fetched all results
-            if len(awards_data) < self.RESULTS_PER_PAGE:
-                break
+        Offsets are 1-indexed. When the first page reports the total count,
+        the remaining offsets are fetched concurrently by the shared
+        paginator; otherwise pages are walked until a short one.
 
-            current_offset += self.RESULTS_PER_PAGE
-            page_count += 1
+        Args:
+            base_params: Base search parameters
 
-            # Rate limiting - be nice to the API
-            await asyncio.sleep(0.5)
+        Returns:
+            Async iterator over pages of parsed awards
+        """
 
-        return all_awards
+        async def fetch(offset: int) -> dict[str, Any]:
+            return await self._fetch_page(base_params.model_copy(update={"offset": offset}))
 
-    async def discover(self) -> list[dict[str, Any]]:
+        return self.paginate(
+            fetch,
+            self._parse_page,
+            page_size=self.RESULTS_PER_PAGE,
+            first_offset=1,
+            max_pages=self.MAX_PAGES,
+        )
+
+    async def _fetch_all_pages(self, base_params: NSFSearchParams) -> list[NSFAward]:
         """
-        Discover new grants from NSF.
+        Fetch all pages of results from the NSF API.
+
+        Args:
+            base_params: Base search parameters
 
         Returns:
-            List of normalized grant data dictionaries
+            List of all awards across all pages
         """
+        return [award async for page in self._iter_award_pages(base_params) for award in page]
+
+    def _build_params(self) -> NSFSearchParams:
+        """Build search parameters for awards since the last check."""
         # Determine date range
         last_check = self.get_last_check_time()
 
@@ -412,7 +410,7 @@ class NSFDiscoveryAgent(DiscoveryAgent):
         self.logger.info("nsf_discovery_start", start_date=start_date.isoformat(), end_date=end_date.isoformat())
 
         # Build search parameters
-        params = NSFSearchParams(
+        return NSFSearchParams(
             dateStart=self._format_date_for_api(start_date),
             dateEnd=self._format_date_for_api(end_date),
             printFields=self.DEFAULT_FIELDS,
@@ -420,50 +418,72 @@ class NSFDiscoveryAgent(DiscoveryAgent):
             offset=1,
         )
 
-        # Fetch all awards
-        awards = await self._fetch_all_pages(params)
+    async def _iter_new_grants(self) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Yield the new grants of each fetched page.
 
-        self.logger.info("nsf_awards_fetched", total_awards=len(awards))
+        Yields:
+            Normalized grant data dictionaries not seen before
+        """
+        params = self._build_params()
+
+        total_fetched = 0
+        total_new = 0
+        async for awards in self._iter_award_pages(params):
+            total_fetched += len(awards)
+
+            # Filter duplicates and normalize, one Redis round trip per page
+            keys = [(award.id, award.title) for award in awards]
+            duplicates = self.filter_duplicates(keys)
+            new_grants: list[dict[str, Any]] = []
+            new_keys: list[tuple[str, str]] = []
+            for award, key, is_duplicate in zip(awards, keys, duplicates):
+                if is_duplicate:
+                    self.logger.debug("nsf_award_duplicate", award_id=award.id)
+                    continue
+                new_grants.append(self._normalize_award(award).model_dump(mode="json"))
+                new_keys.append(key)
 
-        # Filter duplicates and normalize
-        new_grants: list[dict[str, Any]] = []
+            # Mark as seen
+            self.mark_many_as_seen(new_keys)
 
-        for award in awards:
-            # Check for duplicates
-            if self.is_duplicate(award.id, award.title):
-                self.logger.debug("nsf_award_duplicate", award_id=award.id)
-                continue
+            total_new += len(new_grants)
+            if new_grants:
+                yield new_grants
 
-            # Normalize and add
-            grant = self._normalize_award(award)
-            new_grants.append(grant.model_dump(mode="json"))
+        self.refresh_seen_ttl()
+        self.logger.info("nsf_discovery_complete", total_fetched=total_fetched, new_grants=total_new)
 
-            # Mark as seen
-            self.mark_as_seen(award.id, award.title)
-
-        self.logger.info("nsf_discovery_complete", total_fetched=len(awards), new_grants=len(new_grants))
+    async def discover(self) -> list[dict[str, Any]]:
+        """
+        Discover new grants from NSF.
 
-        return new_grants
+        Returns:
+            List of normalized grant data dictionaries
+        """
+        return [grant async for page in self._iter_new_grants() for grant in page]
 
     async def run(self) -> int:
         """
         Execute the discovery process.
 
+        New grants are published page by page while later pages are still
+        being fetched.
+
         Returns:
             Number of new grants discovered
         """
         try:
-            # Discover new grants
-            grants = await self.discover()
-
-            if grants:
+            count = 0
+            async for grants in self._iter_new_grants():
                 # Publish to Redis stream
                 self.publish_grants_batch(grants)
+                count += len(grants)
 
             # Update last check time
             self.set_last_check_time()
 
-            return len(grants)
+            return count
 
         except Exception as e:
             self.logger.error("nsf_discovery_failed", error=str(e), exc_info=True)
@@ -7,11 +7,14 @@ from .grant_embedder import GrantEmbedder
 from .matcher import (
     GrantMatcher,
     process_grant_matches,
+    process_grant_matches_batch,
     run_matching_consumer,
 )
 from .models import (
     BatchMatchRequest,
     BatchMatchResponse,
+    CrossGrantMatchRequest,
+    CrossGrantMatchResponse,
     FinalMatch,
     GrantData,
     MatchResult,
@@ -20,19 +23,25 @@ from .models import (
     UserProfile,
 )
 from .profile_builder import ProfileBuilder
+from .score_cache import MatchScoreCache
 
 __all__ = [
     # Matcher
     "GrantMatcher",
     "process_grant_matches",
+    "process_grant_matches_batch",
     "run_matching_consumer",
     # Grant Embedder
     "GrantEmbedder",
     # Profile Builder
     "ProfileBuilder",
+    # Score Cache
+    "MatchScoreCache",
     # Models
     "BatchMatchRequest",
     "BatchMatchResponse",
+    "CrossGrantMatchRequest",
+    "CrossGrantMatchResponse",
     "FinalMatch",
     "GrantData",
     "MatchResult",
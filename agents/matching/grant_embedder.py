@@ -15,6 +15,9 @@ from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
 from backend.core.config import settings
+from backend.core.embedding_codec import encode_embedding
+from backend.core.embedding_service import EmbeddingService
+from backend.core.vector_index import GRANTS, record_embedding_updates
 
 logger = structlog.get_logger().bind(agent="grant_embedder")
 
@@ -41,6 +44,11 @@ class GrantEmbedder:
         self.db_engine = db_engine
         self.openai_client = openai.OpenAI(api_key=settings.openai_api_key)
 
+    @property
+    def embedding_service(self) -> EmbeddingService:
+        """Cached embedding service bound to the current OpenAI client."""
+        return EmbeddingService(self.openai_client, model=self.EMBEDDING_MODEL)
+
     def _grant_to_text(self, grant: dict[str, Any]) -> str:
         """
         Convert grant data to text for embedding.
@@ -110,7 +118,7 @@ class GrantEmbedder:
 
     def _generate_embedding(self, text: str) -> list[float]:
         """
-        Generate embedding using OpenAI API.
+        Generate embedding using OpenAI API (through the shared cache).
 
         Args:
             text: Text to embed.
@@ -118,27 +126,21 @@ class GrantEmbedder:
         Returns:
             Embedding vector (1536 dimensions).
         """
-        response = self.openai_client.embeddings.create(
-            model=self.EMBEDDING_MODEL,
-            input=text,
-        )
-        return response.data[0].embedding
+        return self.embedding_service.embed(text)
 
     def _generate_embeddings_batch(self, texts: list[str]) -> list[list[float]]:
         """
         Generate embeddings for multiple texts in one API call.
 
+        Cached texts are served from the shared cache; only the rest are sent.
+
         Args:
             texts: List of texts to embed.
 
         Returns:
             List of embedding vectors.
         """
-        response = self.openai_client.embeddings.create(
-            model=self.EMBEDDING_MODEL,
-            input=texts,
-        )
-        return [item.embedding for item in response.data]
+        return self.embedding_service.embed_many(texts)
 
     def needs_embedding(self, grant_id: UUID, session: Session) -> bool:
         """
@@ -222,14 +224,14 @@ class GrantEmbedder:
             embedding = self._generate_embedding(embedding_text)
 
             # Store embedding
-            embedding_str = "[" + ",".join(map(str, embedding)) + "]"
             update_query = text("""
                 UPDATE grants
                 SET embedding = CAST(:embedding AS vector)
                 WHERE id = :grant_id
             """)
-            session.execute(update_query, {"grant_id": str(grant_id), "embedding": embedding_str})
+            session.execute(update_query, {"grant_id": str(grant_id), "embedding": encode_embedding(embedding)})
             session.commit()
+            record_embedding_updates(GRANTS, [(grant_id, embedding)])
 
             logger.info(
                 "embedding_generated",
@@ -309,7 +311,6 @@ class GrantEmbedder:
 
                     # Store embeddings
                     for grant, embedding in zip(batch, embeddings):
-                        embedding_str = "[" + ",".join(map(str, embedding)) + "]"
                         update_query = text("""
                             UPDATE grants
                             SET embedding = CAST(:embedding AS vector)
@@ -319,12 +320,15 @@ class GrantEmbedder:
                             update_query,
                             {
                                 "grant_id": str(grant["id"]),
-                                "embedding": embedding_str,
+                                "embedding": encode_embedding(embedding),
                             },
                         )
                         stats["generated"] += 1
 
                     session.commit()
+                    record_embedding_updates(
+                        GRANTS, [(grant["id"], embedding) for grant, embedding in zip(batch, embeddings)]
+                    )
                     stats["processed"] += len(batch)
 
                 except Exception as e:
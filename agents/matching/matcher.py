@@ -3,10 +3,12 @@ Grant Matching Engine
 Matches grants to user profiles using vector similarity and LLM re-ranking.
 """
 
+import asyncio
+import concurrent.futures
 import json
 import time
 from datetime import datetime, timezone
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Optional
 from uuid import UUID, uuid4
 
 import openai
@@ -18,21 +20,95 @@ from sqlalchemy.orm import Session
 
 from backend.celery_app import celery_app
 from backend.core.config import settings
+from backend.core.embedding_codec import decode_embedding, encode_embedding
 from backend.core.events import MatchComputedEvent, PriorityLevel
+from backend.core.vector_index import PROFILES, VectorIndex, get_vector_index
 
 from .models import (
     BatchMatchRequest,
     BatchMatchResponse,
+    CrossGrantMatchRequest,
+    CrossGrantMatchResponse,
     FinalMatch,
     GrantData,
     MatchResult,
     ProfileMatch,
     UserProfile,
 )
+from .score_cache import MatchScoreCache, grant_text_hash, profile_text_hash
 
 logger = structlog.get_logger().bind(agent="matcher")
 
 
+def _run_coroutine(coro: Awaitable[Any]) -> Any:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    asyncio.run() refuses to start inside a running event loop, so when one
+    is active the coroutine runs on a fresh loop in a worker thread instead.
+    Async callers should await the ``*_async`` methods directly.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+_MATCH_UPSERT_SQL = text("""
+    INSERT INTO matches (
+        id,
+        grant_id,
+        user_id,
+        match_score,
+        vector_similarity,
+        llm_match_score,
+        reasoning,
+        key_strengths,
+        concerns,
+        predicted_success,
+        created_at
+    ) VALUES (
+        :id,
+        :grant_id,
+        :user_id,
+        :match_score,
+        :vector_similarity,
+        :llm_match_score,
+        :reasoning,
+        :key_strengths,
+        :concerns,
+        :predicted_success,
+        :created_at
+    )
+    ON CONFLICT (grant_id, user_id) DO UPDATE SET
+        match_score = EXCLUDED.match_score,
+        vector_similarity = EXCLUDED.vector_similarity,
+        llm_match_score = EXCLUDED.llm_match_score,
+        reasoning = EXCLUDED.reasoning,
+        key_strengths = EXCLUDED.key_strengths,
+        concerns = EXCLUDED.concerns,
+        predicted_success = EXCLUDED.predicted_success,
+        created_at = EXCLUDED.created_at
+""")
+
+MATCH_SCORING_GUIDELINES = """Scoring Guidelines:
+- 90-100: Exceptional fit - researcher's expertise directly aligns with grant focus
+- 70-89: Strong fit - significant overlap in research areas and methods
+- 50-69: Moderate fit - some relevant experience but gaps exist
+- 30-49: Weak fit - limited alignment, would require significant adaptation
+- 0-29: Poor fit - minimal relevance to researcher's expertise
+
+Consider:
+1. Research area alignment
+2. Methodological expertise match
+3. Prior grant experience relevance
+4. Institutional fit and resources
+5. Eligibility criteria match"""
+
+
 class GrantMatcher:
     """
     Grant matching engine.
@@ -42,6 +118,9 @@ class GrantMatcher:
     2. LLM re-ranking using Claude (top 20 for detailed evaluation)
 
     Final score: 40% vector similarity + 60% LLM match score
+
+    LLM re-rank calls run concurrently (bounded by llm_rerank_concurrency)
+    with a per-call timeout; failed calls leave the other results intact.
     """
 
     # Redis stream names
@@ -56,19 +135,29 @@ class GrantMatcher:
     LLM_RERANK_LIMIT = 20
     FINAL_MATCH_THRESHOLD = 70  # Score > 70 gets published
 
+    # Bump when the re-rank prompt changes to invalidate cached LLM scores
+    LLM_PROMPT_VERSION = "v1"
+
     # Batch processing
     LLM_BATCH_SIZE = 5  # Profiles per LLM call
+    GRANT_BATCH_SIZE = 50  # Grants per batch in batch mode
+    CROSS_GRANT_PAIRS_PER_CALL = 10  # (grant, profile) pairs per shared LLM call
 
-    def __init__(self, db_engine: Engine):
+    def __init__(self, db_engine: Engine, async_llm_client: Optional[Any] = None):
         """
         Initialize matcher.
 
         Args:
             db_engine: SQLAlchemy engine for database operations.
+            async_llm_client: Optional AsyncOpenAI-compatible client for
+                concurrent re-ranking. When omitted, a client is created per
+                re-rank run (see agents.matching.fake_llm for an offline stub).
         """
         self.db_engine = db_engine
         self.openai_client = openai.OpenAI(api_key=settings.openai_api_key)
+        self.async_llm_client = async_llm_client
         self._redis_client: Optional[redis.Redis] = None
+        self._score_cache: Optional[MatchScoreCache] = None
 
     @property
     def redis_client(self) -> redis.Redis:
@@ -80,6 +169,19 @@ class GrantMatcher:
             )
         return self._redis_client
 
+    @property
+    def score_cache(self) -> Optional[MatchScoreCache]:
+        """Lazy-loaded LLM match score cache (None when disabled)."""
+        if not settings.llm_score_cache_enabled:
+            return None
+        if self._score_cache is None:
+            self._score_cache = MatchScoreCache(
+                self.redis_client,
+                prompt_version=f"{self.LLM_PROMPT_VERSION}:{settings.llm_model}",
+                ttl_seconds=settings.llm_score_cache_ttl_seconds,
+            )
+        return self._score_cache
+
     def _ensure_consumer_group(self) -> None:
         """Ensure Redis consumer group exists."""
         try:
@@ -126,29 +228,85 @@ class GrantMatcher:
             logger.warning("grant_not_found", grant_id=str(grant_id))
             return None
 
+        return self._row_to_grant_data(grant_id, result)
+
+    def fetch_grants_data_batch(self, grant_ids: list[UUID], session: Session) -> dict[UUID, GrantData]:
+        """
+        Fetch data for several grants in a single query.
+
+        Args:
+            grant_ids: Grant identifiers.
+            session: Database session.
+
+        Returns:
+            Mapping of grant_id to GrantData for the grants that exist.
+        """
+        if not grant_ids:
+            return {}
+
+        query = text("""
+            SELECT
+                id as grant_id,
+                title,
+                description,
+                agency,
+                amount_min,
+                amount_max,
+                deadline,
+                eligibility,
+                categories,
+                embedding
+            FROM grants
+            WHERE id = ANY(CAST(:grant_ids AS uuid[]))
+        """)
+
+        rows = session.execute(query, {"grant_ids": [str(gid) for gid in grant_ids]}).fetchall()
+
+        grants: dict[UUID, GrantData] = {}
+        for row in rows:
+            grant_id = row.grant_id if isinstance(row.grant_id, UUID) else UUID(str(row.grant_id))
+            grants[grant_id] = self._row_to_grant_data(grant_id, row)
+
+        missing = len(grant_ids) - len(grants)
+        if missing:
+            logger.warning("grants_not_found", requested=len(grant_ids), missing=missing)
+
+        return grants
+
+    def _row_to_grant_data(self, grant_id: UUID, row: Any) -> GrantData:
+        """
+        Build GrantData from a grants table row.
+
+        Args:
+            grant_id: Grant identifier.
+            row: Result row with grant columns.
+
+        Returns:
+            GrantData instance.
+        """
         # Extract keywords from categories if available
         keywords = []
-        if result.categories:
-            keywords = result.categories
+        if row.categories:
+            keywords = row.categories
 
         # Parse eligibility criteria
         eligibility_criteria = []
-        if result.eligibility:
-            elig = result.eligibility
+        if row.eligibility:
+            elig = row.eligibility
             if isinstance(elig, dict) and elig.get("applicant_types"):
                 eligibility_criteria = elig["applicant_types"]
 
         return GrantData(
             grant_id=grant_id,
-            title=result.title,
-            description=result.description or "",
-            funding_agency=result.agency,
-            funding_amount=result.amount_max or result.amount_min,
-            deadline=result.deadline,
+            title=row.title,
+            description=row.description or "",
+            funding_agency=row.agency,
+            funding_amount=row.amount_max or row.amount_min,
+            deadline=row.deadline,
             eligibility_criteria=eligibility_criteria,
-            categories=result.categories or [],
+            categories=row.categories or [],
             keywords=keywords,
-            embedding=result.embedding,
+            embedding=decode_embedding(row.embedding),
         )
 
     def find_similar_profiles(self, grant_embedding: list[float], session: Session) -> list[ProfileMatch]:
@@ -156,6 +314,8 @@ class GrantMatcher:
         Find user profiles similar to grant using pgvector.
 
         Uses cosine similarity to find top 50 matches above threshold.
+        When the in-process profile index is available the ranking is done
+        in memory and only the matched profile rows are read from Postgres.
 
         Args:
             grant_embedding: Grant embedding vector.
@@ -164,8 +324,9 @@ class GrantMatcher:
         Returns:
             List of ProfileMatch with similarity scores.
         """
-        # Convert embedding to pgvector format
-        embedding_str = "[" + ",".join(map(str, grant_embedding)) + "]"
+        index = get_vector_index(PROFILES)
+        if index is not None:
+            return self._find_similar_profiles_indexed(index, grant_embedding, session)
 
         query = text("""
             SELECT
@@ -187,39 +348,180 @@ class GrantMatcher:
         results = session.execute(
             query,
             {
-                "grant_embedding": embedding_str,
+                "grant_embedding": encode_embedding(grant_embedding),
                 "threshold": self.VECTOR_SIMILARITY_THRESHOLD,
                 "limit": self.TOP_CANDIDATES_LIMIT,
             },
         ).fetchall()
 
-        matches = []
-        for row in results:
-            profile = UserProfile(
-                user_id=UUID(row.user_id),
-                research_areas=row.research_areas or [],
-                methods=row.methods or [],
-                past_grants=row.past_grants or [],
-                institution=row.institution,
-                department=row.department,
-                keywords=row.keywords or [],
-            )
-            matches.append(
-                ProfileMatch(
-                    user_id=profile.user_id,
-                    vector_similarity=float(row.similarity),
-                    profile=profile,
-                )
-            )
+        matches = [self._row_to_profile_match(row) for row in results]
+
+        logger.info(
+            "vector_search_complete",
+            candidates_found=len(matches),
+            threshold=self.VECTOR_SIMILARITY_THRESHOLD,
+        )
+
+        return matches
+
+    def _find_similar_profiles_indexed(
+        self,
+        index: VectorIndex,
+        grant_embedding: list[float],
+        session: Session,
+    ) -> list[ProfileMatch]:
+        """
+        Rank profiles with the in-process index and load the winners.
+
+        Args:
+            index: Profile vector index.
+            grant_embedding: Grant embedding vector.
+            session: Database session.
+
+        Returns:
+            List of ProfileMatch with similarity scores, best first.
+        """
+        hits = index.search(
+            grant_embedding,
+            self.TOP_CANDIDATES_LIMIT,
+            threshold=self.VECTOR_SIMILARITY_THRESHOLD,
+        )
+        if not hits:
+            return []
+
+        query = text("""
+            SELECT
+                lp.user_id,
+                c.similarity,
+                lp.research_areas,
+                lp.methods,
+                lp.past_grants,
+                lp.institution,
+                lp.department,
+                lp.keywords
+            FROM unnest(CAST(:user_ids AS uuid[]), CAST(:similarities AS float8[])) AS c(user_id, similarity)
+            JOIN lab_profiles lp ON lp.user_id = c.user_id
+            ORDER BY c.similarity DESC
+        """)
+
+        results = session.execute(
+            query,
+            {
+                "user_ids": [user_id for user_id, _ in hits],
+                "similarities": [similarity for _, similarity in hits],
+            },
+        ).fetchall()
+
+        matches = [self._row_to_profile_match(row) for row in results]
 
         logger.info(
             "vector_search_complete",
             candidates_found=len(matches),
             threshold=self.VECTOR_SIMILARITY_THRESHOLD,
+            source="vector_index",
         )
 
         return matches
 
+    def find_similar_profiles_batch(self, grant_ids: list[UUID], session: Session) -> dict[UUID, list[ProfileMatch]]:
+        """
+        Find similar profiles for several grants with one set-based query.
+
+        Joins each grant's stored embedding laterally against lab_profiles,
+        so the candidate search for the whole batch is a single round trip
+        and no embedding is serialized on the client.
+
+        Args:
+            grant_ids: Grant identifiers (grants must have embeddings).
+            session: Database session.
+
+        Returns:
+            Mapping of grant_id to its ProfileMatch list, best first.
+        """
+        candidates: dict[UUID, list[ProfileMatch]] = {gid: [] for gid in grant_ids}
+        if not grant_ids:
+            return candidates
+
+        query = text("""
+            SELECT
+                g.id AS grant_id,
+                c.user_id,
+                c.similarity,
+                c.research_areas,
+                c.methods,
+                c.past_grants,
+                c.institution,
+                c.department,
+                c.keywords
+            FROM grants g
+            CROSS JOIN LATERAL (
+                SELECT
+                    lp.user_id,
+                    1 - (lp.profile_embedding <=> g.embedding) AS similarity,
+                    lp.research_areas,
+                    lp.methods,
+                    lp.past_grants,
+                    lp.institution,
+                    lp.department,
+                    lp.keywords
+                FROM lab_profiles lp
+                WHERE lp.profile_embedding IS NOT NULL
+                ORDER BY lp.profile_embedding <=> g.embedding
+                LIMIT :limit
+            ) c
+            WHERE g.id = ANY(CAST(:grant_ids AS uuid[]))
+              AND g.embedding IS NOT NULL
+              AND c.similarity > :threshold
+            ORDER BY g.id, c.similarity DESC
+        """)
+
+        results = session.execute(
+            query,
+            {
+                "grant_ids": [str(gid) for gid in grant_ids],
+                "threshold": self.VECTOR_SIMILARITY_THRESHOLD,
+                "limit": self.TOP_CANDIDATES_LIMIT,
+            },
+        ).fetchall()
+
+        for row in results:
+            grant_id = row.grant_id if isinstance(row.grant_id, UUID) else UUID(str(row.grant_id))
+            candidates.setdefault(grant_id, []).append(self._row_to_profile_match(row))
+
+        logger.info(
+            "batch_vector_search_complete",
+            grants=len(grant_ids),
+            candidates_found=len(results),
+            threshold=self.VECTOR_SIMILARITY_THRESHOLD,
+        )
+
+        return candidates
+
+    def _row_to_profile_match(self, row: Any) -> ProfileMatch:
+        """
+        Build a ProfileMatch from a lab_profiles similarity row.
+
+        Args:
+            row: Result row with profile columns and similarity.
+
+        Returns:
+            ProfileMatch instance.
+        """
+        profile = UserProfile(
+            user_id=UUID(str(row.user_id)),
+            research_areas=row.research_areas or [],
+            methods=row.methods or [],
+            past_grants=row.past_grants or [],
+            institution=row.institution,
+            department=row.department,
+            keywords=row.keywords or [],
+        )
+        return ProfileMatch(
+            user_id=profile.user_id,
+            vector_similarity=float(row.similarity),
+            profile=profile,
+        )
+
     def _build_llm_prompt(self, grant: GrantData, profiles: list[ProfileMatch]) -> str:
         """
         Build LLM prompt for batch match evaluation.
@@ -260,19 +562,7 @@ Return a JSON array with one object per profile, in the same order as provided:
   ...
 ]
 
-Scoring Guidelines:
-- 90-100: Exceptional fit - researcher's expertise directly aligns with grant focus
-- 70-89: Strong fit - significant overlap in research areas and methods
-- 50-69: Moderate fit - some relevant experience but gaps exist
-- 30-49: Weak fit - limited alignment, would require significant adaptation
-- 0-29: Poor fit - minimal relevance to researcher's expertise
-
-Consider:
-1. Research area alignment
-2. Methodological expertise match
-3. Prior grant experience relevance
-4. Institutional fit and resources
-5. Eligibility criteria match
+{MATCH_SCORING_GUIDELINES}
 
 Return ONLY the JSON array, no additional text."""
 
@@ -300,20 +590,7 @@ Return ONLY the JSON array, no additional text."""
             )
 
             # Parse response
-            response_text = response.choices[0].message.content
-            results_json = json.loads(response_text)
-
-            results = []
-            for item in results_json:
-                user_id = UUID(item["user_id"])
-                match_result = MatchResult(
-                    match_score=item["match_score"],
-                    reasoning=item["reasoning"],
-                    key_strengths=item.get("key_strengths", []),
-                    concerns=item.get("concerns", []),
-                    predicted_success=item["predicted_success"],
-                )
-                results.append((user_id, match_result))
+            results = self._parse_match_results(response.choices[0].message.content)
 
             processing_time = (time.time() - start_time) * 1000
 
@@ -338,6 +615,439 @@ Return ONLY the JSON array, no additional text."""
             )
             raise
 
+    def _parse_match_result_item(self, item: dict[str, Any]) -> MatchResult:
+        """Build a MatchResult from one item of an LLM JSON response."""
+        return MatchResult(
+            match_score=item["match_score"],
+            reasoning=item["reasoning"],
+            key_strengths=item.get("key_strengths", []),
+            concerns=item.get("concerns", []),
+            predicted_success=item["predicted_success"],
+        )
+
+    def _parse_match_results(self, response_text: str) -> list[tuple[UUID, MatchResult]]:
+        """
+        Parse a single-grant LLM response.
+
+        Args:
+            response_text: Raw JSON array returned by the LLM.
+
+        Returns:
+            List of (user_id, match_result) tuples.
+
+        Raises:
+            json.JSONDecodeError: If the response is not valid JSON.
+        """
+        return [(UUID(item["user_id"]), self._parse_match_result_item(item)) for item in json.loads(response_text)]
+
+    def _parse_cross_grant_results(
+        self,
+        response_text: str,
+        requested: set[tuple[UUID, UUID]],
+    ) -> list[tuple[UUID, UUID, MatchResult]]:
+        """
+        Parse a multi-grant LLM response, keeping only requested pairs.
+
+        Args:
+            response_text: Raw JSON array returned by the LLM.
+            requested: Set of (grant_id, user_id) pairs that were asked for.
+
+        Returns:
+            List of (grant_id, user_id, match_result) tuples.
+
+        Raises:
+            json.JSONDecodeError: If the response is not valid JSON.
+        """
+        results = []
+        for item in json.loads(response_text):
+            grant_id = UUID(item["grant_id"])
+            user_id = UUID(item["user_id"])
+            if (grant_id, user_id) not in requested:
+                # Ignore pairs the model invented
+                continue
+            results.append((grant_id, user_id, self._parse_match_result_item(item)))
+        return results
+
+    def lookup_cached_results(
+        self,
+        pairs: list[tuple[GrantData, ProfileMatch]],
+    ) -> tuple[dict[tuple[UUID, UUID], MatchResult], list[tuple[GrantData, ProfileMatch]]]:
+        """
+        Split (grant, candidate) pairs into cached results and misses.
+
+        Args:
+            pairs: Pairs about to be re-ranked.
+
+        Returns:
+            Tuple of ((grant_id, user_id) -> cached MatchResult, uncached pairs).
+        """
+        cache = self.score_cache
+        if cache is None or not pairs:
+            return {}, list(pairs)
+
+        grant_hashes = {grant.grant_id: grant_text_hash(grant) for grant, _ in pairs}
+        keys = [(grant_hashes[grant.grant_id], profile_text_hash(pm.profile)) for grant, pm in pairs]
+        found = cache.get_many(keys)
+
+        cached: dict[tuple[UUID, UUID], MatchResult] = {}
+        misses: list[tuple[GrantData, ProfileMatch]] = []
+        for (grant, pm), key in zip(pairs, keys):
+            if key in found:
+                cached[(grant.grant_id, pm.user_id)] = found[key]
+            else:
+                misses.append((grant, pm))
+
+        return cached, misses
+
+    def cache_results(self, entries: list[tuple[GrantData, ProfileMatch, MatchResult]]) -> None:
+        """
+        Store fresh LLM results in the match score cache.
+
+        Args:
+            entries: List of (grant, candidate, result) tuples.
+        """
+        cache = self.score_cache
+        if cache is None or not entries:
+            return
+
+        grant_hashes = {grant.grant_id: grant_text_hash(grant) for grant, _, _ in entries}
+        cache.set_many(
+            [(grant_hashes[grant.grant_id], profile_text_hash(pm.profile), result) for grant, pm, result in entries]
+        )
+
+    async def _complete_async(self, client: Any, prompt: str) -> str:
+        """
+        Run one chat completion on an async client under the per-call timeout.
+
+        Args:
+            client: AsyncOpenAI-compatible client.
+            prompt: User prompt.
+
+        Returns:
+            Response message content.
+
+        Raises:
+            asyncio.TimeoutError: If the call exceeds llm_rerank_timeout_seconds.
+        """
+        response = await asyncio.wait_for(
+            client.chat.completions.create(
+                model=settings.llm_model,
+                max_tokens=settings.llm_max_tokens,
+                messages=[
+                    {"role": "user", "content": prompt},
+                ],
+            ),
+            timeout=settings.llm_rerank_timeout_seconds,
+        )
+        return response.choices[0].message.content
+
+    async def evaluate_matches_batch_async(self, request: BatchMatchRequest, client: Any) -> BatchMatchResponse:
+        """
+        Async counterpart of evaluate_matches_batch.
+
+        Args:
+            request: Batch match request with grant and profiles.
+            client: AsyncOpenAI-compatible client.
+
+        Returns:
+            BatchMatchResponse with results for all profiles.
+        """
+        start_time = time.time()
+
+        response_text = await self._complete_async(client, self._build_llm_prompt(request.grant, request.profiles))
+
+        return BatchMatchResponse(
+            grant_id=request.grant.grant_id,
+            results=self._parse_match_results(response_text),
+            processing_time_ms=(time.time() - start_time) * 1000,
+        )
+
+    async def evaluate_cross_grant_batch_async(
+        self,
+        request: CrossGrantMatchRequest,
+        client: Any,
+    ) -> CrossGrantMatchResponse:
+        """
+        Evaluate (grant, profile) pairs from several grants in one LLM call.
+
+        Args:
+            request: Cross-grant match request.
+            client: AsyncOpenAI-compatible client.
+
+        Returns:
+            CrossGrantMatchResponse with results for the evaluated pairs.
+        """
+        start_time = time.time()
+
+        response_text = await self._complete_async(client, self._build_cross_grant_llm_prompt(request))
+        requested = {(gid, pm.user_id) for gid, pm in request.candidates}
+
+        return CrossGrantMatchResponse(
+            results=self._parse_cross_grant_results(response_text, requested),
+            processing_time_ms=(time.time() - start_time) * 1000,
+        )
+
+    async def _run_llm_requests_async(
+        self,
+        requests: list[Any],
+        evaluate: Callable[[Any, Any], Awaitable[Any]],
+    ) -> list[Optional[Any]]:
+        """
+        Run LLM evaluations concurrently under a bounded semaphore.
+
+        Failed or timed-out calls are logged and yield None so the caller
+        can keep the partial results of the calls that succeeded.
+
+        Args:
+            requests: Request objects, one per LLM call.
+            evaluate: Coroutine function taking (request, client).
+
+        Returns:
+            Responses in request order, None for failed calls.
+        """
+        if not requests:
+            return []
+
+        semaphore = asyncio.Semaphore(max(1, settings.llm_rerank_concurrency))
+        owns_client = self.async_llm_client is None
+        client = self.async_llm_client or openai.AsyncOpenAI(api_key=settings.openai_api_key)
+
+        async def run_one(index: int, request: Any) -> Optional[Any]:
+            async with semaphore:
+                try:
+                    return await evaluate(request, client)
+                except asyncio.TimeoutError:
+                    logger.error(
+                        "llm_call_timeout",
+                        batch_index=index,
+                        timeout_seconds=settings.llm_rerank_timeout_seconds,
+                    )
+                except Exception as e:
+                    logger.error(
+                        "batch_evaluation_failed",
+                        batch_index=index,
+                        error=str(e),
+                    )
+                return None
+
+        try:
+            return await asyncio.gather(*(run_one(i, r) for i, r in enumerate(requests)))
+        finally:
+            if owns_client:
+                await client.close()
+
+    async def rerank_candidates_async(
+        self,
+        grant: GrantData,
+        candidates: list[ProfileMatch],
+    ) -> tuple[dict[UUID, MatchResult], int]:
+        """
+        Re-rank a grant's candidates with concurrent LLM calls.
+
+        Candidates are split into LLM_BATCH_SIZE chunks that run in
+        parallel, so latency approaches one LLM round trip.
+
+        Args:
+            grant: Grant data.
+            candidates: Candidates to evaluate.
+
+        Returns:
+            Tuple of (user_id -> MatchResult, number of failed LLM calls).
+        """
+        requests = [
+            BatchMatchRequest(grant=grant, profiles=candidates[i : i + self.LLM_BATCH_SIZE])
+            for i in range(0, len(candidates), self.LLM_BATCH_SIZE)
+        ]
+
+        responses = await self._run_llm_requests_async(requests, self.evaluate_matches_batch_async)
+
+        results: dict[UUID, MatchResult] = {}
+        failed = 0
+        for response in responses:
+            if response is None:
+                failed += 1
+                continue
+            for user_id, result in response.results:
+                results[user_id] = result
+
+        return results, failed
+
+    def _build_cross_grant_llm_prompt(self, request: CrossGrantMatchRequest) -> str:
+        """
+        Build LLM prompt for evaluating pairs that span several grants.
+
+        Each grant and each profile is listed once; the model scores only the
+        explicitly enumerated (grant, profile) pairs.
+
+        Args:
+            request: Cross-grant match request.
+
+        Returns:
+            Formatted prompt string.
+        """
+        grants_text = ""
+        for grant in request.grants:
+            grants_text += f"\n--- Grant (Grant ID: {grant.grant_id}) ---\n"
+            grants_text += grant.to_matching_text() + "\n"
+
+        profiles_text = ""
+        seen_users: set[UUID] = set()
+        for _, pm in request.candidates:
+            if pm.user_id in seen_users:
+                continue
+            seen_users.add(pm.user_id)
+            profiles_text += f"\n--- Profile (User ID: {pm.user_id}) ---\n"
+            profiles_text += pm.profile.to_embedding_text() + "\n"
+
+        pairs_text = ""
+        for i, (grant_id, pm) in enumerate(request.candidates, 1):
+            pairs_text += (
+                f"{i}. Grant ID: {grant_id} | User ID: {pm.user_id} | Vector Similarity: {pm.vector_similarity:.3f}\n"
+            )
+
+        return f"""You are evaluating grant-researcher matches for a grant intelligence platform.
+
+GRANTS:
+{grants_text}
+RESEARCHER PROFILES:
+{profiles_text}
+PAIRS TO EVALUATE:
+{pairs_text}
+For each pair, evaluate the fit between the researcher and that grant opportunity.
+
+Return a JSON array with one object per pair, in the same order as provided:
+[
+  {{
+    "grant_id": "<grant_id>",
+    "user_id": "<user_id>",
+    "match_score": <0-100>,
+    "reasoning": "<detailed explanation>",
+    "key_strengths": ["<strength1>", "<strength2>", ...],
+    "concerns": ["<concern1>", "<concern2>", ...],
+    "predicted_success": <0-100>
+  }},
+  ...
+]
+
+{MATCH_SCORING_GUIDELINES}
+
+Return ONLY the JSON array, no additional text."""
+
+    def _pack_cross_grant_requests(
+        self,
+        grants: dict[UUID, GrantData],
+        candidates_by_grant: dict[UUID, list[ProfileMatch]],
+    ) -> list[CrossGrantMatchRequest]:
+        """
+        Pack re-rank candidates from many grants into shared LLM requests.
+
+        Pairs are taken grant by grant (each grant limited to its top
+        LLM_RERANK_LIMIT candidates) and cut into requests of at most
+        CROSS_GRANT_PAIRS_PER_CALL pairs, so grants with few candidates
+        share a call instead of each paying a full round trip.
+
+        Args:
+            grants: Mapping of grant_id to GrantData.
+            candidates_by_grant: Mapping of grant_id to ranked candidates.
+
+        Returns:
+            List of CrossGrantMatchRequest.
+        """
+        pairs: list[tuple[UUID, ProfileMatch]] = []
+        for grant_id, candidates in candidates_by_grant.items():
+            if grant_id not in grants:
+                continue
+            for candidate in candidates[: self.LLM_RERANK_LIMIT]:
+                pairs.append((grant_id, candidate))
+
+        requests = []
+        for i in range(0, len(pairs), self.CROSS_GRANT_PAIRS_PER_CALL):
+            chunk = pairs[i : i + self.CROSS_GRANT_PAIRS_PER_CALL]
+            chunk_grant_ids = list(dict.fromkeys(gid for gid, _ in chunk))
+            requests.append(
+                CrossGrantMatchRequest(
+                    grants=[grants[gid] for gid in chunk_grant_ids],
+                    candidates=chunk,
+                )
+            )
+
+        return requests
+
+    def rerank_pairs(
+        self,
+        pairs: list[tuple[GrantData, ProfileMatch]],
+    ) -> tuple[dict[tuple[UUID, UUID], MatchResult], dict[str, int]]:
+        """
+        Synchronous wrapper around rerank_pairs_async.
+
+        Safe to call whether or not an event loop is running.
+
+        Args:
+            pairs: (grant, candidate) pairs to score.
+
+        Returns:
+            Same as rerank_pairs_async.
+        """
+        return _run_coroutine(self.rerank_pairs_async(pairs))
+
+    async def rerank_pairs_async(
+        self,
+        pairs: list[tuple[GrantData, ProfileMatch]],
+    ) -> tuple[dict[tuple[UUID, UUID], MatchResult], dict[str, int]]:
+        """
+        Re-rank arbitrary (grant, candidate) pairs with the LLM.
+
+        Pairs whose grant and profile text are unchanged since they were
+        last scored come from the score cache; the rest are packed into
+        shared multi-grant calls that run concurrently.
+
+        Args:
+            pairs: (grant, candidate) pairs to score.
+
+        Returns:
+            Tuple of ((grant_id, user_id) -> MatchResult, counters with
+            llm_calls, llm_cache_hits, llm_evaluated and llm_batches_failed).
+        """
+        results, misses = self.lookup_cached_results(pairs)
+        counts = {
+            "llm_calls": 0,
+            "llm_cache_hits": len(results),
+            "llm_evaluated": 0,
+            "llm_batches_failed": 0,
+        }
+        if not misses:
+            return results, counts
+
+        grants: dict[UUID, GrantData] = {}
+        uncached_by_grant: dict[UUID, list[ProfileMatch]] = {}
+        for grant, candidate in misses:
+            grants[grant.grant_id] = grant
+            uncached_by_grant.setdefault(grant.grant_id, []).append(candidate)
+
+        requests = self._pack_cross_grant_requests(grants, uncached_by_grant)
+        counts["llm_calls"] = len(requests)
+
+        fresh_results: dict[tuple[UUID, UUID], MatchResult] = {}
+        responses = await self._run_llm_requests_async(requests, self.evaluate_cross_grant_batch_async)
+        for response in responses:
+            if response is None:
+                counts["llm_batches_failed"] += 1
+                continue
+            for grant_id, user_id, result in response.results:
+                fresh_results[(grant_id, user_id)] = result
+
+        self.cache_results(
+            [
+                (grant, c, fresh_results[(grant.grant_id, c.user_id)])
+                for grant, c in misses
+                if (grant.grant_id, c.user_id) in fresh_results
+            ]
+        )
+        results.update(fresh_results)
+        counts["llm_evaluated"] = len(fresh_results)
+
+        return results, counts
+
     def _compute_priority_level(self, match_score: float, deadline: Optional[datetime]) -> PriorityLevel:
         """
         Compute priority level based on score and deadline.
@@ -383,59 +1093,40 @@ Return ONLY the JSON array, no additional text."""
             match: Final match to store.
             session: Database session.
         """
-        query = text("""
-            INSERT INTO matches (
-                id,
-                grant_id,
-                user_id,
-                match_score,
-                vector_similarity,
-                llm_match_score,
-                reasoning,
-                key_strengths,
-                concerns,
-                predicted_success,
-                created_at
-            ) VALUES (
-                :id,
-                :grant_id,
-                :user_id,
-                :match_score,
-                :vector_similarity,
-                :llm_match_score,
-                :reasoning,
-                :key_strengths,
-                :concerns,
-                :predicted_success,
-                :created_at
-            )
-            ON CONFLICT (grant_id, user_id) DO UPDATE SET
-                match_score = EXCLUDED.match_score,
-                vector_similarity = EXCLUDED.vector_similarity,
-                llm_match_score = EXCLUDED.llm_match_score,
-                reasoning = EXCLUDED.reasoning,
-                key_strengths = EXCLUDED.key_strengths,
-                concerns = EXCLUDED.concerns,
-                predicted_success = EXCLUDED.predicted_success,
-                created_at = EXCLUDED.created_at
-        """)
+        session.execute(_MATCH_UPSERT_SQL, self._match_params(match))
 
-        session.execute(
-            query,
-            {
-                "id": str(match.match_id),
-                "grant_id": str(match.grant_id),
-                "user_id": str(match.user_id),
-                "match_score": match.final_score,
-                "vector_similarity": match.vector_similarity,
-                "llm_match_score": match.llm_match_score,
-                "reasoning": match.reasoning,
-                "key_strengths": match.key_strengths,
-                "concerns": match.concerns,
-                "predicted_success": match.predicted_success,
-                "created_at": match.created_at,
-            },
-        )
+    def store_matches_bulk(self, matches: list[FinalMatch], session: Session) -> int:
+        """
+        Store several matches with a single executemany upsert.
+
+        Args:
+            matches: Final matches to store.
+            session: Database session.
+
+        Returns:
+            Number of matches written.
+        """
+        if not matches:
+            return 0
+
+        session.execute(_MATCH_UPSERT_SQL, [self._match_params(m) for m in matches])
+        return len(matches)
+
+    def _match_params(self, match: FinalMatch) -> dict[str, Any]:
+        """Build bind parameters for the match upsert statement."""
+        return {
+            "id": str(match.match_id),
+            "grant_id": str(match.grant_id),
+            "user_id": str(match.user_id),
+            "match_score": match.final_score,
+            "vector_similarity": match.vector_similarity,
+            "llm_match_score": match.llm_match_score,
+            "reasoning": match.reasoning,
+            "key_strengths": match.key_strengths,
+            "concerns": match.concerns,
+            "predicted_success": match.predicted_success,
+            "created_at": match.created_at,
+        }
 
     def publish_match(
         self,
@@ -452,9 +1143,51 @@ Return ONLY the JSON array, no additional text."""
         Returns:
             Redis stream message ID.
         """
+        event = self._build_match_event(match, grant)
+        priority = event.priority_level
+
+        message = {"data": event.model_dump_json()}
+        message_id = self.redis_client.xadd(self.MATCHES_STREAM, message)
+
+        logger.info(
+            "match_published",
+            match_id=str(match.match_id),
+            user_id=str(match.user_id),
+            score=match.final_score,
+            priority=priority.value,
+            message_id=message_id,
+        )
+
+        return message_id
+
+    def publish_matches_bulk(self, matches: list[tuple[FinalMatch, GrantData]]) -> list[str]:
+        """
+        Publish several matches to the Redis stream in one pipeline.
+
+        Args:
+            matches: List of (match, grant) pairs to publish.
+
+        Returns:
+            Redis stream message IDs, in input order.
+        """
+        if not matches:
+            return []
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        for match, grant in matches:
+            event = self._build_match_event(match, grant)
+            pipe.xadd(self.MATCHES_STREAM, {"data": event.model_dump_json()})
+        message_ids = pipe.execute()
+
+        logger.info("matches_published_bulk", count=len(message_ids))
+
+        return message_ids
+
+    def _build_match_event(self, match: FinalMatch, grant: GrantData) -> MatchComputedEvent:
+        """Build the MatchComputedEvent published for a match."""
         priority = self._compute_priority_level(match.final_score, grant.deadline)
 
-        event = MatchComputedEvent(
+        return MatchComputedEvent(
             event_id=uuid4(),
             match_id=match.match_id,
             grant_id=match.grant_id,
@@ -466,19 +1199,41 @@ Return ONLY the JSON array, no additional text."""
             grant_deadline=grant.deadline,
         )
 
-        message = {"data": event.model_dump_json()}
-        message_id = self.redis_client.xadd(self.MATCHES_STREAM, message)
+    def _build_final_match(
+        self,
+        grant_id: UUID,
+        candidate: ProfileMatch,
+        llm_result: MatchResult,
+    ) -> FinalMatch:
+        """
+        Combine vector and LLM results into a FinalMatch.
 
-        logger.info(
-            "match_published",
-            match_id=str(match.match_id),
-            user_id=str(match.user_id),
-            score=match.final_score,
-            priority=priority.value,
-            message_id=message_id,
+        Args:
+            grant_id: Grant identifier.
+            candidate: Vector search candidate.
+            llm_result: LLM evaluation for the candidate.
+
+        Returns:
+            FinalMatch with weighted final score.
+        """
+        final_score = FinalMatch.compute_final_score(
+            candidate.vector_similarity,
+            llm_result.match_score,
         )
 
-        return message_id
+        return FinalMatch(
+            match_id=uuid4(),
+            grant_id=grant_id,
+            user_id=candidate.user_id,
+            vector_similarity=candidate.vector_similarity,
+            llm_match_score=llm_result.match_score,
+            final_score=final_score,
+            reasoning=llm_result.reasoning,
+            key_strengths=llm_result.key_strengths,
+            concerns=llm_result.concerns,
+            predicted_success=llm_result.predicted_success,
+            created_at=datetime.now(timezone.utc),
+        )
 
     def process_grant(self, grant_id: UUID) -> dict[str, Any]:
         """
@@ -496,7 +1251,9 @@ Return ONLY the JSON array, no additional text."""
         stats = {
             "grant_id": str(grant_id),
             "candidates_found": 0,
+            "llm_cache_hits": 0,
             "llm_evaluated": 0,
+            "llm_batches_failed": 0,
             "matches_stored": 0,
             "matches_published": 0,
             "processing_time_seconds": 0,
@@ -527,61 +1284,32 @@ Return ONLY the JSON array, no additional text."""
             # Take top 20 for LLM re-ranking
             top_candidates = candidates[: self.LLM_RERANK_LIMIT]
 
-            # Phase 2: LLM re-ranking in batches
-            all_results: dict[UUID, MatchResult] = {}
+            # Phase 2: Concurrent LLM re-ranking in batches, skipping cached pairs
+            cached, misses = self.lookup_cached_results([(grant, c) for c in top_candidates])
+            stats["llm_cache_hits"] = len(cached)
 
-            for i in range(0, len(top_candidates), self.LLM_BATCH_SIZE):
-                batch = top_candidates[i : i + self.LLM_BATCH_SIZE]
-                request = BatchMatchRequest(grant=grant, profiles=batch)
-
-                try:
-                    response = self.evaluate_matches_batch(request)
-                    for user_id, result in response.results:
-                        all_results[user_id] = result
-                except Exception as e:
-                    logger.error(
-                        "batch_evaluation_failed",
-                        grant_id=str(grant_id),
-                        batch_index=i,
-                        error=str(e),
-                    )
-                    continue
+            uncached = [c for _, c in misses]
+            fresh_results, failed_batches = _run_coroutine(self.rerank_candidates_async(grant, uncached))
+            self.cache_results([(grant, c, fresh_results[c.user_id]) for c in uncached if c.user_id in fresh_results])
 
-            stats["llm_evaluated"] = len(all_results)
+            all_results = {user_id: result for (_, user_id), result in cached.items()}
+            all_results.update(fresh_results)
+            stats["llm_evaluated"] = len(fresh_results)
+            stats["llm_batches_failed"] = failed_batches
 
             # Phase 3: Compute final scores and store/publish matches
             for candidate in top_candidates:
                 if candidate.user_id not in all_results:
                     continue
 
-                llm_result = all_results[candidate.user_id]
-
-                # Compute weighted final score
-                final_score = FinalMatch.compute_final_score(
-                    candidate.vector_similarity,
-                    llm_result.match_score,
-                )
-
-                match = FinalMatch(
-                    match_id=uuid4(),
-                    grant_id=grant_id,
-                    user_id=candidate.user_id,
-                    vector_similarity=candidate.vector_similarity,
-                    llm_match_score=llm_result.match_score,
-                    final_score=final_score,
-                    reasoning=llm_result.reasoning,
-                    key_strengths=llm_result.key_strengths,
-                    concerns=llm_result.concerns,
-                    predicted_success=llm_result.predicted_success,
-                    created_at=datetime.now(timezone.utc),
-                )
+                match = self._build_final_match(grant_id, candidate, all_results[candidate.user_id])
 
                 # Store match
                 self.store_match(match, session)
                 stats["matches_stored"] += 1
 
                 # Publish if score > threshold
-                if final_score > self.FINAL_MATCH_THRESHOLD:
+                if match.final_score > self.FINAL_MATCH_THRESHOLD:
                     self.publish_match(match, grant)
                     stats["matches_published"] += 1
 
@@ -596,6 +1324,102 @@ Return ONLY the JSON array, no additional text."""
 
         return stats
 
+    def process_grants_batch(self, grant_ids: list[UUID]) -> dict[str, Any]:
+        """
+        Process several grants for matching as one batch.
+
+        Batch counterpart of process_grant for bursts such as a Grants.gov
+        XML extract landing:
+        1. One query loads all grants, one set-based query finds candidates
+        2. Candidates from all grants are packed into shared LLM calls
+        3. Matches are upserted with one executemany and published
+           through one Redis pipeline
+
+        Args:
+            grant_ids: Grant identifiers.
+
+        Returns:
+            Statistics about the batch, including grants_per_minute.
+        """
+        start_time = time.time()
+        grant_ids = list(dict.fromkeys(grant_ids))
+        stats = {
+            "grants_requested": len(grant_ids),
+            "grants_processed": 0,
+            "candidates_found": 0,
+            "llm_calls": 0,
+            "llm_cache_hits": 0,
+            "llm_evaluated": 0,
+            "llm_batches_failed": 0,
+            "matches_stored": 0,
+            "matches_published": 0,
+            "processing_time_seconds": 0,
+            "grants_per_minute": 0.0,
+        }
+
+        if not grant_ids:
+            return stats
+
+        with Session(self.db_engine) as session:
+            grants = self.fetch_grants_data_batch(grant_ids, session)
+
+            missing_embedding = [gid for gid, g in grants.items() if not g.embedding]
+            if missing_embedding:
+                logger.error(
+                    "grants_missing_embedding",
+                    grant_ids=[str(gid) for gid in missing_embedding],
+                )
+                for gid in missing_embedding:
+                    del grants[gid]
+
+            if not grants:
+                return stats
+
+            # Phase 1: Set-based vector similarity search
+            candidates_by_grant = self.find_similar_profiles_batch(list(grants), session)
+            stats["grants_processed"] = len(grants)
+            stats["candidates_found"] = sum(len(c) for c in candidates_by_grant.values())
+
+            # Phase 2: Concurrent LLM re-ranking with candidates shared across grants
+            pairs = [
+                (grants[gid], c)
+                for gid, candidates in candidates_by_grant.items()
+                for c in candidates[: self.LLM_RERANK_LIMIT]
+            ]
+            all_results, rerank_stats = self.rerank_pairs(pairs)
+            stats.update(rerank_stats)
+
+            # Phase 3: Compute final scores, bulk store and publish
+            matches: list[FinalMatch] = []
+            to_publish: list[tuple[FinalMatch, GrantData]] = []
+            for grant_id, candidates in candidates_by_grant.items():
+                for candidate in candidates[: self.LLM_RERANK_LIMIT]:
+                    llm_result = all_results.get((grant_id, candidate.user_id))
+                    if llm_result is None:
+                        continue
+
+                    match = self._build_final_match(grant_id, candidate, llm_result)
+                    matches.append(match)
+                    if match.final_score > self.FINAL_MATCH_THRESHOLD:
+                        to_publish.append((match, grants[grant_id]))
+
+            stats["matches_stored"] = self.store_matches_bulk(matches, session)
+            session.commit()
+
+        stats["matches_published"] = len(self.publish_matches_bulk(to_publish))
+
+        elapsed = time.time() - start_time
+        stats["processing_time_seconds"] = elapsed
+        if elapsed > 0:
+            stats["grants_per_minute"] = round(stats["grants_processed"] * 60 / elapsed, 2)
+
+        logger.info(
+            "grant_batch_matching_complete",
+            **stats,
+        )
+
+        return stats
+
     def consume_validated_grants(self, block_ms: int = 5000) -> None:
         """
         Consume grants from validated stream and process matches.
@@ -654,6 +1478,77 @@ Return ONLY the JSON array, no additional text."""
                 logger.error("consumer_error", error=str(e))
                 time.sleep(5)  # Back off on errors
 
+    def consume_validated_grants_batch(
+        self,
+        batch_size: Optional[int] = None,
+        block_ms: int = 5000,
+    ) -> None:
+        """
+        Consume grants from validated stream in batches.
+
+        Reads up to batch_size messages at once, matches them with
+        process_grants_batch and acknowledges the whole batch together.
+
+        Args:
+            batch_size: Maximum grants per batch (defaults to GRANT_BATCH_SIZE).
+            block_ms: Milliseconds to block waiting for messages.
+        """
+        batch_size = batch_size or self.GRANT_BATCH_SIZE
+        self._ensure_consumer_group()
+
+        logger.info("starting_batch_grant_consumer", batch_size=batch_size)
+
+        while True:
+            try:
+                messages = self.redis_client.xreadgroup(
+                    self.CONSUMER_GROUP,
+                    self.CONSUMER_NAME,
+                    {self.VALIDATED_GRANTS_STREAM: ">"},
+                    count=batch_size,
+                    block=block_ms,
+                )
+
+                if not messages:
+                    continue
+
+                grant_ids: list[UUID] = []
+                message_ids: list[str] = []
+                for stream_name, stream_messages in messages:
+                    for message_id, message_data in stream_messages:
+                        try:
+                            data = json.loads(message_data.get("data", "{}"))
+                            grant_ids.append(UUID(data.get("grant_id")))
+                            message_ids.append(message_id)
+                        except Exception as e:
+                            logger.error(
+                                "message_processing_failed",
+                                message_id=message_id,
+                                error=str(e),
+                            )
+
+                if not grant_ids:
+                    continue
+
+                try:
+                    self.process_grants_batch(grant_ids)
+                except Exception as e:
+                    logger.error(
+                        "batch_processing_failed",
+                        batch_size=len(grant_ids),
+                        error=str(e),
+                    )
+                    continue
+
+                self.redis_client.xack(
+                    self.VALIDATED_GRANTS_STREAM,
+                    self.CONSUMER_GROUP,
+                    *message_ids,
+                )
+
+            except Exception as e:
+                logger.error("consumer_error", error=str(e))
+                time.sleep(5)  # Back off on errors
+
     def close(self) -> None:
         """Clean up resources."""
         if self._redis_client:
@@ -699,12 +1594,44 @@ def process_grant_matches(self, grant_id: str) -> dict[str, Any]:
     bind=True,
     queue="high",
     priority=7,
+    soft_time_limit=600,
+    time_limit=720,
 )
-def run_matching_consumer(self) -> None:
+def process_grant_matches_batch(self, grant_ids: list[str]) -> dict[str, Any]:
+    """
+    Celery task to process matches for a batch of grants.
+
+    Args:
+        grant_ids: Grant identifier strings.
+
+    Returns:
+        Batch matching statistics.
+    """
+    from sqlalchemy import create_engine
+
+    engine = create_engine(settings.database_url)
+    matcher = GrantMatcher(engine)
+
+    try:
+        return matcher.process_grants_batch([UUID(gid) for gid in grant_ids])
+    finally:
+        matcher.close()
+        engine.dispose()
+
+
+@celery_app.task(
+    bind=True,
+    queue="high",
+    priority=7,
+)
+def run_matching_consumer(self, batch_size: Optional[int] = None) -> None:
     """
     Celery task to run the matching consumer.
 
     Long-running task that consumes from grants:validated stream.
+
+    Args:
+        batch_size: When set, consume in batch mode with this many grants per batch.
     """
     from sqlalchemy import create_engine
 
@@ -712,7 +1639,10 @@ def run_matching_consumer(self) -> None:
     matcher = GrantMatcher(engine)
 
     try:
-        matcher.consume_validated_grants()
+        if batch_size:
+            matcher.consume_validated_grants_batch(batch_size=batch_size)
+        else:
+            matcher.consume_validated_grants()
     finally:
         matcher.close()
         engine.dispose()
@@ -254,6 +254,44 @@ class BatchMatchResponse(BaseModel):
     )
 
 
+class CrossGrantMatchRequest(BaseModel):
+    """
+    Request for LLM match evaluation spanning several grants.
+
+    Used by batch matching to pack (grant, profile) pairs from different
+    grants into one LLM call when each grant only has a few candidates.
+    """
+
+    grants: list[GrantData] = Field(
+        ...,
+        description="Grants referenced by the candidate pairs",
+        min_length=1,
+    )
+    candidates: list[tuple[UUID, ProfileMatch]] = Field(
+        ...,
+        description="List of (grant_id, profile_match) pairs to evaluate",
+        min_length=1,
+        max_length=10,  # Keeps multi-grant prompts within a single response budget
+    )
+
+
+class CrossGrantMatchResponse(BaseModel):
+    """
+    Response from multi-grant LLM match evaluation.
+
+    Contains match results keyed by both grant and user.
+    """
+
+    results: list[tuple[UUID, UUID, MatchResult]] = Field(
+        ...,
+        description="List of (grant_id, user_id, match_result) tuples",
+    )
+    processing_time_ms: float = Field(
+        ...,
+        description="Time taken to process batch in milliseconds",
+    )
+
+
 class FinalMatch(BaseModel):
     """
     Final computed match ready for storage and publishing.
@@ -15,6 +15,9 @@ from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
 from backend.core.config import settings
+from backend.core.embedding_codec import encode_embedding
+from backend.core.embedding_service import EmbeddingService
+from backend.core.vector_index import PROFILES, record_embedding_updates
 
 from .models import ProfileEmbedding, UserProfile
 
@@ -44,6 +47,15 @@ class ProfileBuilder:
         self.embedding_model = settings.embedding_model
         self.embedding_dimensions = settings.embedding_dimensions
 
+    @property
+    def embedding_service(self) -> EmbeddingService:
+        """Cached embedding service bound to the current OpenAI client."""
+        return EmbeddingService(
+            self.openai_client,
+            model=self.embedding_model,
+            dimensions=self.embedding_dimensions,
+        )
+
     def _compute_text_hash(self, text: str) -> str:
         """
         Compute hash of profile text for cache invalidation.
@@ -58,7 +70,7 @@ class ProfileBuilder:
 
     def _generate_embedding(self, text: str) -> list[float]:
         """
-        Generate embedding vector using OpenAI.
+        Generate embedding vector using OpenAI (through the shared cache).
 
         Args:
             text: Text to embed.
@@ -69,17 +81,15 @@ class ProfileBuilder:
         Raises:
             openai.OpenAIError: If API call fails.
         """
-        response = self.openai_client.embeddings.create(
-            model=self.embedding_model,
-            input=text,
-            dimensions=self.embedding_dimensions,
-        )
-        return response.data[0].embedding
+        return self.embedding_service.embed(text)
 
     def _generate_embeddings_batch(self, texts: list[str]) -> list[list[float]]:
         """
         Generate embeddings for multiple texts in a single API call.
 
+        Unchanged profiles are served from the shared cache; only the rest
+        are sent.
+
         Args:
             texts: List of texts to embed.
 
@@ -89,18 +99,7 @@ class ProfileBuilder:
         Raises:
             openai.OpenAIError: If API call fails.
         """
-        if not texts:
-            return []
-
-        response = self.openai_client.embeddings.create(
-            model=self.embedding_model,
-            input=texts,
-            dimensions=self.embedding_dimensions,
-        )
-
-        # Sort by index to ensure correct ordering
-        sorted_data = sorted(response.data, key=lambda x: x.index)
-        return [item.embedding for item in sorted_data]
+        return self.embedding_service.embed_many(texts)
 
     def fetch_user_profile(self, user_id: UUID, session: Session) -> Optional[UserProfile]:
         """
@@ -239,6 +238,7 @@ class ProfileBuilder:
             # Store in database
             self._store_embedding(profile_embedding, session)
             session.commit()
+            record_embedding_updates(PROFILES, [(user_id, embedding)])
 
             logger.info(
                 "embedding_generated",
@@ -309,6 +309,7 @@ class ProfileBuilder:
                 results.append(profile_embedding)
 
             session.commit()
+            record_embedding_updates(PROFILES, [(r.user_id, r.embedding) for r in results])
 
             logger.info(
                 "batch_embeddings_generated",
@@ -325,9 +326,6 @@ class ProfileBuilder:
             profile_embedding: Embedding to store.
             session: Database session.
         """
-        # Convert embedding to pgvector format
-        embedding_str = "[" + ",".join(map(str, profile_embedding.embedding)) + "]"
-
         query = text("""
             UPDATE lab_profiles
             SET profile_embedding = CAST(:embedding AS vector)
@@ -338,7 +336,7 @@ class ProfileBuilder:
             query,
             {
                 "user_id": str(profile_embedding.user_id),
-                "embedding": embedding_str,
+                "embedding": encode_embedding(profile_embedding.embedding),
             },
         )
 
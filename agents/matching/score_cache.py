@@ -0,0 +1,180 @@
+"""
+Match Score Cache
+Content-addressed cache of LLM re-rank results.
+
+Results are keyed on the hash of the grant text and the profile text that
+go into the re-rank prompt plus the prompt version, so redeliveries and
+recomputes for unchanged grant/profile pairs skip the LLM entirely.
+"""
+
+import hashlib
+from typing import Any, Optional
+
+import redis
+import structlog
+
+from .models import GrantData, MatchResult, UserProfile
+
+logger = structlog.get_logger().bind(agent="matcher", component="score_cache")
+
+
+def grant_text_hash(grant: GrantData) -> str:
+    """
+    Compute SHA-256 hash of the grant text used in match prompts.
+
+    Args:
+        grant: Grant data.
+
+    Returns:
+        Hex digest of hash.
+    """
+    return hashlib.sha256(grant.to_matching_text().encode()).hexdigest()
+
+
+def profile_text_hash(profile: UserProfile) -> str:
+    """
+    Compute SHA-256 hash of the profile text used in match prompts.
+
+    Matches ProfileBuilder._compute_text_hash for the same profile.
+
+    Args:
+        profile: User profile.
+
+    Returns:
+        Hex digest of hash.
+    """
+    return hashlib.sha256(profile.to_embedding_text().encode()).hexdigest()
+
+
+class MatchScoreCache:
+    """
+    Redis-backed cache of LLM match results.
+
+    Lookups and writes are batched (MGET / pipelined SET) so a full
+    re-rank costs at most two Redis round trips. Redis errors are logged
+    and treated as misses so the cache can never fail a matching run.
+    """
+
+    KEY_PREFIX = "match_score_cache"
+    METRICS_KEY = "match_score_cache:metrics"
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        prompt_version: str,
+        ttl_seconds: int,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            redis_client: Synchronous Redis client (decode_responses=True).
+            prompt_version: Version tag of the re-rank prompt and model;
+                changing it invalidates all cached results.
+            ttl_seconds: Expiry for cached entries.
+        """
+        self.redis_client = redis_client
+        self.prompt_version = prompt_version
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, grant_hash: str, profile_hash: str) -> str:
+        return f"{self.KEY_PREFIX}:{self.prompt_version}:{grant_hash}:{profile_hash}"
+
+    def get_many(self, keys: list[tuple[str, str]]) -> dict[tuple[str, str], MatchResult]:
+        """
+        Look up cached results for several (grant_hash, profile_hash) pairs.
+
+        Args:
+            keys: List of (grant_hash, profile_hash) pairs.
+
+        Returns:
+            Mapping of pair to cached MatchResult for the pairs that hit.
+        """
+        if not keys:
+            return {}
+
+        try:
+            values = self.redis_client.mget([self._key(g, p) for g, p in keys])
+        except redis.RedisError as e:
+            logger.warning("score_cache_lookup_failed", error=str(e))
+            self.misses += len(keys)
+            return {}
+
+        found: dict[tuple[str, str], MatchResult] = {}
+        for key, value in zip(keys, values):
+            if value is None:
+                continue
+            try:
+                found[key] = MatchResult.model_validate_json(value)
+            except ValueError:
+                continue
+
+        hits = len(found)
+        misses = len(keys) - hits
+        self.hits += hits
+        self.misses += misses
+        self._record_metrics(hits, misses)
+
+        return found
+
+    def set_many(self, entries: list[tuple[str, str, MatchResult]]) -> None:
+        """
+        Store results for several (grant_hash, profile_hash) pairs.
+
+        Args:
+            entries: List of (grant_hash, profile_hash, result) tuples.
+        """
+        if not entries:
+            return
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for grant_hash, profile_hash, result in entries:
+                pipe.set(self._key(grant_hash, profile_hash), result.model_dump_json(), ex=self.ttl_seconds)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning("score_cache_store_failed", error=str(e), entries=len(entries))
+
+    def _record_metrics(self, hits: int, misses: int) -> None:
+        """Add hit/miss counts to the cumulative Redis metrics hash."""
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            if hits:
+                pipe.hincrby(self.METRICS_KEY, "hits", hits)
+            if misses:
+                pipe.hincrby(self.METRICS_KEY, "misses", misses)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.debug("score_cache_metrics_failed", error=str(e))
+
+    def get_metrics(self) -> dict[str, Any]:
+        """
+        Get hit/miss metrics for this process and cumulatively.
+
+        Returns:
+            Dictionary with local and cumulative hits, misses and hit rates.
+        """
+        cumulative: dict[str, Any] = {}
+        try:
+            cumulative = self.redis_client.hgetall(self.METRICS_KEY) or {}
+        except redis.RedisError as e:
+            logger.debug("score_cache_metrics_failed", error=str(e))
+
+        total_hits = int(cumulative.get("hits", 0))
+        total_misses = int(cumulative.get("misses", 0))
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": _rate(self.hits, self.misses),
+            "total_hits": total_hits,
+            "total_misses": total_misses,
+            "total_hit_rate": _rate(total_hits, total_misses),
+        }
+
+
+def _rate(hits: int, misses: int) -> Optional[float]:
+    total = hits + misses
+    return round(hits / total, 4) if total else None
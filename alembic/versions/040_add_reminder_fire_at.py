@@ -0,0 +1,69 @@
+"""Add fire_at due-time column to reminder_schedules
+
+Revision ID: 040
+Revises: 039
+Create Date: 2026-10-16
+
+Adds to reminder_schedules:
+- fire_at: When the reminder is due (sponsor deadline minus remind_before_minutes)
+- ix_reminder_schedules_due: (is_sent, fire_at) index for the due-reminder query
+
+Existing rows are backfilled from their deadline's sponsor_deadline.
+"""
+from alembic import op
+from sqlalchemy import inspect
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '040'
+down_revision = '039'
+branch_labels = None
+depends_on = None
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    """Check if a column exists in a table."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [col["name"] for col in inspector.get_columns(table_name)]
+    return column_name in columns
+
+
+def index_exists(index_name: str, table_name: str) -> bool:
+    """Check if an index exists on a table."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    indexes = inspector.get_indexes(table_name)
+    return any(idx["name"] == index_name for idx in indexes)
+
+
+def upgrade() -> None:
+    """Add and backfill reminder_schedules.fire_at (idempotent)."""
+    if not column_exists('reminder_schedules', 'fire_at'):
+        op.add_column(
+            'reminder_schedules',
+            sa.Column(
+                'fire_at',
+                sa.TIMESTAMP(timezone=True),
+                nullable=True,
+            )
+        )
+
+    # Backfill from the deadline's sponsor date
+    op.execute(
+        """
+        UPDATE reminder_schedules AS r
+        SET fire_at = d.sponsor_deadline - make_interval(mins => r.remind_before_minutes)
+        FROM deadlines AS d
+        WHERE r.deadline_id = d.id AND r.fire_at IS NULL
+        """
+    )
+
+    if not index_exists('ix_reminder_schedules_due', 'reminder_schedules'):
+        op.create_index('ix_reminder_schedules_due', 'reminder_schedules', ['is_sent', 'fire_at'])
+
+
+def downgrade() -> None:
+    """Remove reminder_schedules.fire_at."""
+    op.drop_index('ix_reminder_schedules_due', table_name='reminder_schedules')
+    op.drop_column('reminder_schedules', 'fire_at')
@@ -0,0 +1,77 @@
+"""Add next_send_at to funding_alert_preferences
+
+Revision ID: 041
+Revises: 040
+Create Date: 2026-10-16
+
+Adds to funding_alert_preferences:
+- next_send_at: When the next funding alert is due
+- ix_funding_alert_preferences_due: (enabled, next_send_at) index for the scheduler
+
+Existing rows are backfilled from last_sent_at and frequency; rows that
+never sent an alert are due immediately.
+"""
+from alembic import op
+from sqlalchemy import inspect
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '041'
+down_revision = '040'
+branch_labels = None
+depends_on = None
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    """Check if a column exists in a table."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [col["name"] for col in inspector.get_columns(table_name)]
+    return column_name in columns
+
+
+def index_exists(index_name: str, table_name: str) -> bool:
+    """Check if an index exists on a table."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    indexes = inspector.get_indexes(table_name)
+    return any(idx["name"] == index_name for idx in indexes)
+
+
+def upgrade() -> None:
+    """Add and backfill funding_alert_preferences.next_send_at (idempotent)."""
+    if not column_exists('funding_alert_preferences', 'next_send_at'):
+        op.add_column(
+            'funding_alert_preferences',
+            sa.Column(
+                'next_send_at',
+                sa.TIMESTAMP(timezone=True),
+                server_default=sa.func.now(),
+                nullable=False,
+            )
+        )
+
+        op.execute(
+            """
+            UPDATE funding_alert_preferences
+            SET next_send_at = last_sent_at + CASE frequency
+                WHEN 'weekly' THEN INTERVAL '7 days'
+                WHEN 'monthly' THEN INTERVAL '30 days'
+                ELSE INTERVAL '1 day'
+            END
+            WHERE last_sent_at IS NOT NULL
+            """
+        )
+
+    if not index_exists('ix_funding_alert_preferences_due', 'funding_alert_preferences'):
+        op.create_index(
+            'ix_funding_alert_preferences_due',
+            'funding_alert_preferences',
+            ['enabled', 'next_send_at'],
+        )
+
+
+def downgrade() -> None:
+    """Remove funding_alert_preferences.next_send_at."""
+    op.drop_index('ix_funding_alert_preferences_due', table_name='funding_alert_preferences')
+    op.drop_column('funding_alert_preferences', 'next_send_at')
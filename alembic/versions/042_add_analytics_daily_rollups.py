@@ -0,0 +1,68 @@
+"""Add analytics_daily_rollups and created_at indexes
+
+Revision ID: 042
+Revises: 041
+Create Date: 2026-10-16
+
+Adds:
+- analytics_daily_rollups: per-day grants, matches and alerts created,
+  maintained incrementally by compute_daily_analytics
+- ix_grants_created_at and ix_matches_created_at so the rollup refresh
+  only reads rows since its last checkpoint
+
+The table starts empty; the first analytics run backfills it.
+"""
+from alembic import op
+from sqlalchemy import inspect
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '042'
+down_revision = '041'
+branch_labels = None
+depends_on = None
+
+
+def table_exists(table_name: str) -> bool:
+    """Check if a table exists."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def index_exists(index_name: str, table_name: str) -> bool:
+    """Check if an index exists on a table."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    indexes = inspector.get_indexes(table_name)
+    return any(idx["name"] == index_name for idx in indexes)
+
+
+def upgrade() -> None:
+    """Create analytics_daily_rollups and created_at indexes (idempotent)."""
+    if not table_exists('analytics_daily_rollups'):
+        op.create_table(
+            'analytics_daily_rollups',
+            sa.Column('day', sa.Date(), primary_key=True),
+            sa.Column('grants_created', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('grants_by_source', postgresql.JSONB(), nullable=False, server_default='{}'),
+            sa.Column('matches_created', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('match_score_sum', sa.Float(), nullable=False, server_default='0'),
+            sa.Column('alerts_sent', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('alerts_by_channel', postgresql.JSONB(), nullable=False, server_default='{}'),
+            sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=False, server_default=sa.func.now()),
+        )
+
+    if not index_exists('ix_grants_created_at', 'grants'):
+        op.create_index('ix_grants_created_at', 'grants', ['created_at'])
+
+    if not index_exists('ix_matches_created_at', 'matches'):
+        op.create_index('ix_matches_created_at', 'matches', ['created_at'])
+
+
+def downgrade() -> None:
+    """Drop analytics_daily_rollups and created_at indexes."""
+    op.drop_index('ix_matches_created_at', table_name='matches')
+    op.drop_index('ix_grants_created_at', table_name='grants')
+    op.drop_table('analytics_daily_rollups')
@@ -13,7 +13,7 @@ from fastapi.responses import Response
 from sqlalchemy import and_, select
 
 from backend.api.deps import AsyncSessionDep, CurrentUser
-from backend.models import Deadline, DeadlineStatusHistory, Grant
+from backend.models import Deadline, DeadlineStatusHistory, Grant, ReminderSchedule
 from backend.schemas.deadlines import (
     DeadlineCreate,
     DeadlineList,
@@ -29,6 +29,12 @@ from backend.schemas.deadlines import (
     StatusChangeRequest,
     StatusHistoryList,
 )
+from backend.services.reminder_index import (
+    MINUTES_PER_DAY,
+    build_config_reminders,
+    index_reminders,
+    refresh_fire_times,
+)
 
 router = APIRouter(prefix="/api/deadlines", tags=["Deadlines"])
 
@@ -145,7 +151,12 @@ async def create_deadline(
     )
     db.add(history_entry)
 
+    # Schedule the configured reminders with their fire times
+    reminders = build_config_reminders(deadline, existing_minutes=())
+    db.add_all(reminders)
+
     await db.commit()
+    await index_reminders({r.id: r.fire_at for r in reminders})
     await db.refresh(deadline)
     return deadline
 
@@ -281,8 +292,15 @@ async def update_deadline(
             else:
                 setattr(deadline, field, value)
 
+    # Move unsent reminders with the sponsor deadline
+    rescheduled = []
+    if update_data.get("sponsor_deadline") is not None:
+        result = await db.execute(select(ReminderSchedule).where(ReminderSchedule.deadline_id == deadline.id))
+        rescheduled = refresh_fire_times(deadline, result.scalars().all())
+
     deadline.updated_at = datetime.now(timezone.utc)
     await db.commit()
+    await index_reminders({r.id: r.fire_at for r in rescheduled})
     await db.refresh(deadline)
     return deadline
 
@@ -366,7 +384,11 @@ async def link_grant_to_deadline(
     )
     db.add(history_entry)
 
+    reminders = build_config_reminders(deadline, existing_minutes=())
+    db.add_all(reminders)
+
     await db.commit()
+    await index_reminders({r.id: r.fire_at for r in reminders})
     await db.refresh(deadline)
     return deadline
 
@@ -492,11 +514,27 @@ async def update_reminder_config(
             detail="Deadline not found",
         )
 
+    previous_minutes = {days * MINUTES_PER_DAY for days in deadline.reminder_config or []}
+
     # Sort and deduplicate reminder config
     deadline.reminder_config = sorted(set(data.reminder_config), reverse=True)
     deadline.updated_at = datetime.now(timezone.utc)
 
+    # Drop unsent reminders for removed config days and schedule added ones
+    configured_minutes = {days * MINUTES_PER_DAY for days in deadline.reminder_config}
+    result = await db.execute(select(ReminderSchedule).where(ReminderSchedule.deadline_id == deadline.id))
+    kept_minutes = set()
+    for schedule in result.scalars().all():
+        removed = schedule.remind_before_minutes in previous_minutes - configured_minutes
+        if removed and schedule.reminder_type == "email" and not schedule.is_sent:
+            await db.delete(schedule)
+        else:
+            kept_minutes.add(schedule.remind_before_minutes)
+    reminders = build_config_reminders(deadline, existing_minutes=kept_minutes)
+    db.add_all(reminders)
+
     await db.commit()
+    await index_reminders({r.id: r.fire_at for r in reminders})
     await db.refresh(deadline)
     return deadline
 
@@ -15,6 +15,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.config import settings
+from backend.core.principal_cache import get_user
 from backend.database import get_db
 from backend.models import User
 from backend.schemas.auth import TokenData
@@ -165,9 +166,8 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Fetch user from database
-    result = await db.execute(select(User).where(User.id == token_data.user_id))
-    user = result.scalar_one_or_none()
+    # Fetch user (cached for a short TTL, invalidated on change)
+    user = await get_user(db, token_data.user_id)
 
     if user is None:
         raise credentials_exception
@@ -196,9 +196,8 @@ async def get_current_user_optional(
     if token_data.exp and token_data.exp < datetime.now(timezone.utc):
         return None
 
-    # Fetch user from database
-    result = await db.execute(select(User).where(User.id == token_data.user_id))
-    return result.scalar_one_or_none()
+    # Fetch user (cached for a short TTL, invalidated on change)
+    return await get_user(db, token_data.user_id)
 
 
 # Type aliases for cleaner dependency injection
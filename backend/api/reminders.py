@@ -18,6 +18,7 @@ from backend.schemas.reminders import (
     ReminderSettingsResponse,
     ReminderSettingsUpdate,
 )
+from backend.services.reminder_index import compute_fire_at, index_reminders
 
 logger = logging.getLogger(__name__)
 
@@ -123,11 +124,13 @@ async def create_deadline_reminders(
             deadline_id=deadline_id,
             reminder_type=reminder.reminder_type,
             remind_before_minutes=reminder.remind_before_minutes,
+            fire_at=compute_fire_at(deadline.sponsor_deadline, reminder.remind_before_minutes),
         )
         db.add(schedule)
         created.append(schedule)
 
     await db.commit()
+    await index_reminders({s.id: s.fire_at for s in created})
 
     # Refresh all created reminders
     for schedule in created:
@@ -197,11 +200,13 @@ async def create_default_reminders(
                 deadline_id=deadline_id,
                 reminder_type=reminder_type,
                 remind_before_minutes=remind_before,
+                fire_at=compute_fire_at(deadline.sponsor_deadline, remind_before),
             )
             db.add(schedule)
             created.append(schedule)
 
     await db.commit()
+    await index_reminders({s.id: s.fire_at for s in created})
 
     for schedule in created:
         await db.refresh(schedule)
@@ -71,6 +71,7 @@ TASK_ROUTES = {
     # High priority tasks
     "backend.tasks.grants.process_new_grant": {"queue": "high"},
     "backend.tasks.grants.validate_grant": {"queue": "high"},
+    "backend.tasks.grants.consume_grant_updates": {"queue": "high"},
     "backend.tasks.matching.compute_grant_matches": {"queue": "high"},
     "backend.tasks.polling.poll_grants_gov": {"queue": "high"},
     "backend.tasks.polling.poll_nsf": {"queue": "high"},
@@ -78,6 +79,7 @@ TASK_ROUTES = {
     "backend.tasks.polling.poll_nih_reporter": {"queue": "high"},
     # Normal priority tasks (default)
     "backend.tasks.indexing.reindex_grants": {"queue": "normal"},
+    "backend.tasks.indexing.rebuild_vector_index_snapshots": {"queue": "normal"},
     "backend.tasks.analytics.compute_analytics": {"queue": "normal"},
     "backend.tasks.cleanup.cleanup_expired_data": {"queue": "normal"},
     "backend.tasks.cleanup.cleanup_old_alerts": {"queue": "normal"},
@@ -200,6 +202,11 @@ def create_celery_app() -> Celery:
                 "schedule": timedelta(minutes=15),
                 "options": {"queue": "high"},
             },
+            "grant-updates-apply": {
+                "task": "backend.tasks.grants.consume_grant_updates",
+                "schedule": timedelta(minutes=5),
+                "options": {"queue": "high"},
+            },
             "deadline-reminder": {
                 "task": "backend.tasks.notifications.send_deadline_reminders",
                 "schedule": timedelta(hours=1),
@@ -210,6 +217,11 @@ def create_celery_app() -> Celery:
                 "schedule": timedelta(minutes=5),
                 "options": {"queue": "normal"},
             },
+            "sync-deadline-reminder-index": {
+                "task": "backend.tasks.deadline_reminders.check_reminder_config_reminders",
+                "schedule": timedelta(hours=1),
+                "options": {"queue": "normal"},
+            },
             "analytics-compute": {
                 "task": "backend.tasks.analytics.compute_daily_analytics",
                 "schedule": timedelta(hours=6),
@@ -222,7 +234,7 @@ def create_celery_app() -> Celery:
             },
             "send-funding-alerts": {
                 "task": "backend.tasks.funding_alerts.send_scheduled_alerts",
-                "schedule": timedelta(hours=24),  # Daily at the same time
+                "schedule": timedelta(hours=1),  # Sends only users whose next_send_at has passed
                 "options": {"queue": "normal"},
             },
             "precalculate-workflow-analytics": {
@@ -230,6 +242,11 @@ def create_celery_app() -> Celery:
                 "schedule": timedelta(hours=1),  # Hourly pre-calculation
                 "options": {"queue": "normal"},
             },
+            "vector-index-snapshot": {
+                "task": "backend.tasks.indexing.rebuild_vector_index_snapshots",
+                "schedule": timedelta(hours=6),
+                "options": {"queue": "normal"},
+            },
             "aggregate-workflow-analytics": {
                 "task": "backend.tasks.workflow_analytics.aggregate_workflow_analytics",
                 "schedule": timedelta(hours=24),  # Daily aggregation
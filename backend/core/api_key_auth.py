@@ -11,6 +11,7 @@ from fastapi import Depends, HTTPException, Request, Security, status
 from fastapi.security import APIKeyHeader
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.core.principal_cache import get_user
 from backend.database import get_db
 from backend.models.api_key import APIKey
 from backend.services.api_key import update_last_used, validate_api_key
@@ -167,15 +168,11 @@ class APIKeyOrBearerAuth:
         if credentials:
             from backend.api.deps import decode_token
             from jose import JWTError
-            from sqlalchemy import select
 
             try:
-                from backend.models import User as UserModel
-
                 token_data = decode_token(credentials.credentials)
                 if token_data.exp and token_data.exp >= datetime.now(timezone.utc):
-                    result = await db.execute(select(UserModel).where(UserModel.id == token_data.user_id))
-                    user = result.scalar_one_or_none()
+                    user = await get_user(db, token_data.user_id)
                     if user:
                         return (None, user)
             except JWTError:
@@ -205,11 +202,7 @@ async def get_api_key_user(
     Returns:
         User model associated with the API key
     """
-    from sqlalchemy import select
-    from backend.models import User as UserModel
-
-    result = await db.execute(select(UserModel).where(UserModel.id == api_key.user_id))
-    user = result.scalar_one_or_none()
+    user = await get_user(db, api_key.user_id)
 
     if not user:
         raise HTTPException(
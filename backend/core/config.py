@@ -28,6 +28,11 @@ class Settings(BaseSettings):
     backend_url: str = "http://localhost:8000"
     frontend_url: str = "http://localhost:5173"
 
+    # ===== Principal Cache =====
+    principal_cache_ttl_seconds: float = 30.0  # Authenticated users and API keys reused for this long (0 = off)
+    principal_cache_size: int = 10000  # Users and API keys kept per process (each)
+    api_key_usage_flush_seconds: float = 5.0  # API key usage write-behind interval (0 = write-through)
+
     # ===== Development Auth Bypass =====
     # SECURITY: These must be False in production - only enable for local development
     dev_bypass_auth: bool = False  # Backend auth bypass
@@ -58,6 +63,12 @@ class Settings(BaseSettings):
     celery_broker_url: str = "redis://localhost:6379/1"
     celery_result_backend: str = "redis://localhost:6379/2"
 
+    # ===== WebSocket Tier =====
+    # Comma-separated WebSocket worker URLs; users are consistent-hashed across them (empty = one unsharded worker)
+    ws_workers: str = ""
+    ws_worker_url: str = ""  # This process's entry in ws_workers
+    ws_coalesce_window_ms: int = 25  # Events for one user within this window go out as one frame
+
     # ===== AI API Keys =====
     anthropic_api_key: Optional[str] = None
     openai_api_key: Optional[str] = None
@@ -68,6 +79,12 @@ class Settings(BaseSettings):
     twilio_auth_token: Optional[str] = None
     twilio_phone_number: Optional[str] = None
     slack_webhook_url: Optional[str] = None  # Default Slack webhook for system notifications
+    sendgrid_api_base_url: str = "https://api.sendgrid.com"
+    sendgrid_requests_per_second: float = 10.0  # Bulk mail/send requests (each up to 1000 recipients)
+    twilio_api_base_url: str = "https://api.twilio.com"
+    twilio_messages_per_second: float = 1.0  # Sender number throughput (long codes: 1/s)
+    delivery_bulk_concurrency: int = 8  # Provider requests in flight per bulk send
+    delivery_http_max_connections: int = 20  # Pooled connections shared by the bulk provider paths
 
     # ===== Stripe =====
     stripe_secret_key: Optional[str] = None
@@ -88,13 +105,50 @@ class Settings(BaseSettings):
     grants_gov_api_url: str = "https://api.grants.gov/v1/api/search2"
     grants_gov_rss_url: str = "https://www.grants.gov/rss/GG_NewOps.xml"
 
+    # ===== Discovery Pagination =====
+    discovery_page_concurrency: int = 4  # Pages fetched in parallel once a source reports its total
+    discovery_page_rate: float = 2.0  # Starting request rate per source (pages/sec)
+    discovery_page_min_rate: float = 0.5  # Floor after repeated 429/5xx responses
+    discovery_page_max_rate: float = 8.0  # Ceiling reached by ramping up on success
+
+    # ===== Discovery Dedup =====
+    discovery_seen_backend: str = "set"  # "set" (exact) or "bloom" (fixed memory, rare false positives)
+    discovery_bloom_capacity: int = 1_000_000  # Expected seen IDs per source when using the Bloom filter
+    discovery_bloom_error_rate: float = 0.001  # Target false-positive rate at capacity
+
     # ===== Embedding Config =====
     embedding_model: str = "text-embedding-3-small"
     embedding_dimensions: int = 1536
+    embedding_batch_concurrency: int = 4  # Embedding requests in flight during bulk reindex
+    embedding_tokens_per_minute: int = 1_000_000  # Token budget shared by bulk reindex requests
+    embedding_cache_lru_size: int = 4096  # In-process embeddings kept per worker (~6 KB each)
+    embedding_cache_ttl_seconds: int = 30 * 24 * 3600  # Redis tier expiry (30 days)
 
     # ===== LLM Config =====
     llm_model: str = "gpt-4o"
     llm_max_tokens: int = 4096
+    llm_rerank_concurrency: int = 4  # Concurrent LLM calls per re-rank
+    llm_rerank_timeout_seconds: float = 30.0  # Per-call timeout for re-rank calls
+    llm_score_cache_enabled: bool = True  # Reuse LLM match scores for unchanged grant/profile text
+    llm_score_cache_ttl_seconds: int = 30 * 24 * 3600  # 30 days
+
+    # ===== Curation =====
+    curation_concurrency: int = 8  # Discovered grants validated in parallel per consumed batch
+    curation_dedup_retention_days: int = 365  # Drop duplicate-index entries not re-validated for this long
+
+    # ===== Alert Delivery =====
+    alerter_concurrency: int = 16  # Match events routed in parallel per batch
+    alerter_batch_size: int = 100  # Match events read from the stream per batch
+    alert_email_llm_enrichment: bool = False  # Add an LLM-written overview per grant version to alert emails
+    digest_send_hour_utc: int = 13  # Hour daily and weekly digests go out
+    digest_weekly_day: int = 0  # Weekday weekly digests go out (0 = Monday)
+    digest_users_per_task: int = 200  # Users per digest send task (one bulk query and send each)
+
+    # ===== Vector Index =====
+    vector_index_enabled: bool = False  # Serve similarity search from an in-process index, pgvector as fallback
+    vector_index_dir: str = "data/vector_index"  # Snapshot directory (one subdirectory per index)
+    vector_index_sync_interval_seconds: float = 5.0  # How often a process replays embedding updates
+    vector_index_stream_maxlen: int = 100000  # Approximate cap on the embedding update stream
 
     # ===== Sentry Error Tracking =====
     sentry_dsn: Optional[str] = None
@@ -104,6 +158,10 @@ class Settings(BaseSettings):
 
     # ===== Rate Limiting =====
     rate_limit_enabled: bool = True  # Set to False to disable rate limiting
+    # "sliding_window" (sorted set per key) or "token_bucket" (Lua, O(1) per key)
+    rate_limit_backend: str = "sliding_window"
+    rate_limit_local_lease_fraction: float = 0.0  # token_bucket: bucket share a worker may reserve locally (0 = off)
+    rate_limit_local_lease_seconds: float = 1.0  # Unused locally reserved tokens are forfeited after this
 
     # Auth endpoints (login, register) - strict limits
     rate_limit_auth_requests: int = 5
@@ -0,0 +1,256 @@
+"""
+Embedding Codec Module
+Shared encoding of embedding vectors for pgvector parameters and results.
+
+Call sites wrap query vectors with ``encode_embedding`` and keep their
+``CAST(:param AS vector)``. How the vector then travels depends on the
+driver:
+
+- asyncpg: a binary ``vector`` codec is registered on every connection, so
+  the parameter is sent as pgvector's wire format (4-byte header plus
+  big-endian float32s) and results come back as float32 arrays.
+- psycopg2: parameters are always client-side literals, so a registered
+  adapter renders the float32 values with ``%.9g`` (the shortest format
+  that round-trips float32) in one C-level format call, and a typecaster
+  parses results with NumPy.
+
+``install_vector_codecs`` hooks both up for every engine in the process.
+"""
+
+import logging
+import struct
+from functools import lru_cache
+from typing import Any, Optional, Sequence, Union
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+
+logger = logging.getLogger(__name__)
+
+EmbeddingLike = Union[Sequence[float], np.ndarray, str]
+
+
+class VectorParam(np.ndarray):
+    """Float32 vector marked for pgvector parameter encoding."""
+
+
+# =============================================================================
+# Encoding
+# =============================================================================
+
+
+def encode_embedding(embedding: EmbeddingLike) -> VectorParam:
+    """
+    Prepare an embedding for use as a pgvector query parameter.
+
+    Args:
+        embedding: Vector as a list, array, or pgvector text literal.
+
+    Returns:
+        1-D float32 array that both database drivers encode natively.
+    """
+    if isinstance(embedding, str):
+        embedding = parse_vector_text(embedding)
+    vector = np.ascontiguousarray(embedding, dtype=np.float32)
+    if vector.ndim != 1:
+        raise ValueError(f"Expected a 1-D embedding, got shape {vector.shape}")
+    return vector.view(VectorParam)
+
+
+def decode_embedding(value: Any) -> Optional[list[float]]:
+    """
+    Convert a vector column value into a list of floats.
+
+    Handles arrays from the registered codecs as well as text literals
+    from connections without them.
+
+    Args:
+        value: Column value (array, list, text literal, or None).
+
+    Returns:
+        List of floats, or None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return parse_vector_text(value).tolist()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return [float(v) for v in value]
+
+
+@lru_cache(maxsize=8)
+def _literal_format(dimensions: int) -> str:
+    return "[" + ",".join(["%.9g"] * dimensions) + "]"
+
+
+def to_vector_text(embedding: EmbeddingLike) -> str:
+    """
+    Render an embedding as a compact pgvector text literal.
+
+    Args:
+        embedding: Vector values.
+
+    Returns:
+        Literal such as ``[0.1,0.2]`` with float32 precision.
+    """
+    vector = encode_embedding(embedding)
+    return _literal_format(len(vector)) % tuple(vector.tolist())
+
+
+def parse_vector_text(value: str) -> np.ndarray:
+    """
+    Parse a pgvector text literal.
+
+    Args:
+        value: Literal such as ``[0.1,0.2]``.
+
+    Returns:
+        Float32 array.
+    """
+    return np.array(value.strip()[1:-1].split(","), dtype=np.float32)
+
+
+def to_vector_binary(embedding: EmbeddingLike) -> bytes:
+    """
+    Encode an embedding in pgvector's binary wire format.
+
+    Args:
+        embedding: Vector values (text literals are accepted so ORM
+            ``Vector`` columns, which bind text, keep working).
+
+    Returns:
+        Dimension header followed by big-endian float32 values.
+    """
+    if isinstance(embedding, str):
+        embedding = parse_vector_text(embedding)
+    vector = np.asarray(embedding, dtype=">f4")
+    return struct.pack(">HH", vector.shape[0], 0) + vector.tobytes()
+
+
+def from_vector_binary(value: bytes) -> np.ndarray:
+    """
+    Decode pgvector's binary wire format.
+
+    Args:
+        value: Binary vector value.
+
+    Returns:
+        Float32 array.
+    """
+    dimensions, _ = struct.unpack(">HH", value[:4])
+    return np.frombuffer(value, dtype=">f4", count=dimensions, offset=4).astype(np.float32)
+
+
+# =============================================================================
+# Driver Registration
+# =============================================================================
+
+try:
+    import psycopg2
+    from psycopg2.extensions import AsIs, new_type, register_adapter, register_type
+
+    def _adapt_vector(vector: VectorParam) -> AsIs:
+        return AsIs("'" + to_vector_text(vector) + "'")
+
+    def _cast_vector(value: Optional[str], cursor: Any) -> Optional[np.ndarray]:
+        return None if value is None else parse_vector_text(value)
+
+    register_adapter(VectorParam, _adapt_vector)
+except ImportError:  # pragma: no cover - psycopg2 is a runtime dependency
+    psycopg2 = None
+
+
+def _register_psycopg2(dbapi_connection: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("SELECT to_regtype('vector')::oid")
+        row = cursor.fetchone()
+    finally:
+        cursor.close()
+
+    if row and row[0]:
+        register_type(new_type((row[0],), "VECTOR", _cast_vector), dbapi_connection)
+
+
+async def _register_asyncpg(connection: Any) -> None:
+    await connection.set_type_codec(
+        "vector",
+        encoder=to_vector_binary,
+        decoder=from_vector_binary,
+        format="binary",
+    )
+
+
+def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+    """Register vector codecs on a new Postgres connection."""
+    try:
+        if psycopg2 is not None and isinstance(dbapi_connection, psycopg2.extensions.connection):
+            _register_psycopg2(dbapi_connection)
+            # Registration queried the catalog; don't leave a transaction open
+            dbapi_connection.rollback()
+        elif type(getattr(dbapi_connection, "driver_connection", None)).__module__.startswith("asyncpg"):
+            dbapi_connection.run_async(_register_asyncpg)
+    except Exception as e:
+        # Missing extension or non-Postgres target: fall back to text literals
+        logger.debug(f"Vector codec registration skipped: {e}")
+
+
+_installed = False
+
+
+def install_vector_codecs() -> None:
+    """
+    Register the vector codecs on every new database connection.
+
+    Idempotent; applies to all engines in the process, including ones
+    created after the call.
+    """
+    global _installed
+    if not _installed:
+        event.listen(Pool, "connect", _on_connect)
+        _installed = True
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+
+def benchmark_codec(dimensions: int = 1536, iterations: int = 2000) -> dict[str, Any]:
+    """
+    Compare the per-query cost of each vector parameter encoding.
+
+    Args:
+        dimensions: Embedding dimensionality.
+        iterations: Encodings timed per method.
+
+    Returns:
+        Mean encode time (microseconds) and payload size (bytes) per method.
+    """
+    import timeit
+
+    embedding = np.random.default_rng(0).standard_normal(dimensions).tolist()
+
+    methods = {
+        "str_join": lambda: "[" + ",".join(map(str, embedding)) + "]",
+        "float32_text": lambda: to_vector_text(embedding),
+        "binary": lambda: to_vector_binary(embedding),
+    }
+
+    report: dict[str, Any] = {"dimensions": dimensions}
+    for name, encode in methods.items():
+        seconds = timeit.timeit(encode, number=iterations)
+        report[name] = {
+            "encode_us": round(1e6 * seconds / iterations, 1),
+            "bytes": len(encode()),
+        }
+    return report
+
+
+if __name__ == "__main__":
+    """Run the codec microbenchmark."""
+    import json
+
+    print(json.dumps(benchmark_codec(), indent=2))
@@ -0,0 +1,396 @@
+"""
+Embedding Service Module
+Shared, cached access to the embeddings API.
+
+Every embedding in the system (grants, profiles, chat and research
+queries, curation) goes through ``EmbeddingService``. Results are cached
+by a hash of model, dimensions and text in two tiers:
+
+- L1: a process-wide LRU of float32 arrays
+- L2: Redis, as raw float32 bytes with a TTL, shared by all processes
+
+Identical texts are therefore embedded once no matter which component
+asks. Hit and API call counts are kept per process and cumulatively in
+Redis; see ``get_embedding_cache_metrics``.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import numpy as np
+import openai
+import redis
+
+from backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "embedding_cache"
+METRICS_KEY = "embedding_cache:metrics"
+
+# After a Redis error, skip the L2 tier for this long instead of failing every call
+REDIS_RETRY_SECONDS = 30.0
+
+# Cumulative metrics are written to Redis at most this often per process
+METRICS_FLUSH_SECONDS = 10.0
+
+# Output size of each model when no dimensions are requested
+MODEL_DEFAULT_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+
+
+# =============================================================================
+# Cache Tiers
+# =============================================================================
+
+
+class EmbeddingLRU:
+    """Thread-safe LRU of embeddings keyed by content hash."""
+
+    def __init__(self, max_entries: int):
+        """
+        Initialize LRU.
+
+        Args:
+            max_entries: Maximum number of embeddings held.
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: np.ndarray) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_lru = EmbeddingLRU(settings.embedding_cache_lru_size)
+_redis_client: Optional[redis.Redis] = None
+_default_client: Optional[openai.OpenAI] = None
+_redis_retry_at = 0.0
+
+_counters_lock = threading.Lock()
+_counters = {
+    "l1_hits": 0,
+    "l2_hits": 0,
+    "misses": 0,
+    "api_calls": 0,
+    "api_calls_saved": 0,
+}
+_unflushed = dict.fromkeys(_counters, 0)
+_last_flush = 0.0
+
+
+def _get_redis() -> Optional[redis.Redis]:
+    """Shared binary Redis client, or None while Redis is backing off."""
+    global _redis_client
+    if time.monotonic() < _redis_retry_at:
+        return None
+    if _redis_client is None:
+        _redis_client = redis.from_url(settings.redis_url)
+    return _redis_client
+
+
+def _redis_failed(operation: str, error: Exception) -> None:
+    global _redis_retry_at
+    _redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+    logger.warning(f"Embedding cache {operation} failed, using L1 only for {REDIS_RETRY_SECONDS:.0f}s: {error}")
+
+
+def _count(**increments: int) -> None:
+    """Add to the local counters; cumulative Redis counters are flushed periodically."""
+    global _last_flush
+    with _counters_lock:
+        for name, value in increments.items():
+            _counters[name] += value
+            _unflushed[name] += value
+        if time.monotonic() - _last_flush < METRICS_FLUSH_SECONDS:
+            return
+    _flush_metrics()
+
+
+def _flush_metrics() -> None:
+    global _last_flush
+    with _counters_lock:
+        pending = {name: value for name, value in _unflushed.items() if value}
+        for name in _unflushed:
+            _unflushed[name] = 0
+        _last_flush = time.monotonic()
+
+    client = _get_redis()
+    if not pending or client is None:
+        return
+    try:
+        pipe = client.pipeline(transaction=False)
+        for name, value in pending.items():
+            pipe.hincrby(METRICS_KEY, name, value)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.debug(f"Embedding cache metrics update failed: {e}")
+
+
+def _rate(hits: int, total: int) -> Optional[float]:
+    return round(hits / total, 4) if total else None
+
+
+def get_embedding_cache_metrics() -> dict[str, Any]:
+    """
+    Get embedding cache effectiveness for this process and cumulatively.
+
+    ``api_calls_saved`` counts embed requests answered entirely from cache;
+    ``hit_rate`` is per text.
+
+    Returns:
+        Dictionary with local and cumulative hit, miss and API call counts.
+    """
+    _flush_metrics()
+    with _counters_lock:
+        local = dict(_counters)
+
+    cumulative: dict[Any, Any] = {}
+    client = _get_redis()
+    if client is not None:
+        try:
+            cumulative = client.hgetall(METRICS_KEY) or {}
+        except redis.RedisError as e:
+            logger.debug(f"Embedding cache metrics read failed: {e}")
+    totals = {name: int(cumulative.get(name.encode(), cumulative.get(name, 0))) for name in _counters}
+
+    def summarize(counts: dict[str, int]) -> dict[str, Any]:
+        hits = counts["l1_hits"] + counts["l2_hits"]
+        return {**counts, "hit_rate": _rate(hits, hits + counts["misses"])}
+
+    return {
+        **summarize(local),
+        "lru_entries": len(_lru),
+        "total": summarize(totals),
+    }
+
+
+def reset_embedding_cache() -> None:
+    """Clear the in-process tier and counters (tests and model changes)."""
+    global _redis_retry_at
+    _lru.clear()
+    _redis_retry_at = 0.0
+    with _counters_lock:
+        for name in _counters:
+            _counters[name] = 0
+            _unflushed[name] = 0
+
+
+# =============================================================================
+# Embedding Service
+# =============================================================================
+
+
+class EmbeddingService:
+    """
+    Embeds texts through the shared two-tier cache.
+
+    Wraps an OpenAI client; only texts missing from both cache tiers are
+    sent to the API, de-duplicated and in a single request per call.
+    """
+
+    def __init__(
+        self,
+        client: Optional[Any] = None,
+        model: Optional[str] = None,
+        dimensions: Optional[int] = None,
+    ):
+        """
+        Initialize service.
+
+        Args:
+            client: OpenAI client (created from settings if omitted).
+            model: Embedding model (defaults to settings.embedding_model).
+            dimensions: Optional output dimensions passed to the API. The
+                model's own default size is treated as None, so callers that
+                pass it share cache entries with callers that don't.
+        """
+        self._client = client
+        self.model = model or settings.embedding_model
+        if dimensions is not None and dimensions == MODEL_DEFAULT_DIMENSIONS.get(self.model):
+            dimensions = None
+        self.dimensions = dimensions
+
+    @property
+    def client(self) -> Any:
+        """OpenAI client (a process-wide default if none was given)."""
+        global _default_client
+        if self._client is None:
+            if _default_client is None:
+                _default_client = openai.OpenAI(api_key=settings.openai_api_key)
+            self._client = _default_client
+        return self._client
+
+    def cache_key(self, text: str) -> str:
+        """
+        Content-hash cache key for a text under this model configuration.
+
+        Args:
+            text: Text to embed.
+
+        Returns:
+            Redis key for the embedding.
+        """
+        digest = hashlib.sha256(f"{self.model}:{self.dimensions or ''}:{text}".encode()).hexdigest()
+        return f"{REDIS_KEY_PREFIX}:{digest}"
+
+    def _request_kwargs(self) -> dict[str, Any]:
+        kwargs: dict[str, Any] = {"model": self.model}
+        if self.dimensions:
+            kwargs["dimensions"] = self.dimensions
+        return kwargs
+
+    def lookup_many(self, texts: list[str]) -> dict[str, list[float]]:
+        """
+        Look up cached embeddings without calling the API.
+
+        Args:
+            texts: Texts to look up.
+
+        Returns:
+            Mapping of text to embedding for the texts found in either tier.
+        """
+        unique = list(dict.fromkeys(texts))
+        keys = {text: self.cache_key(text) for text in unique}
+        found: dict[str, np.ndarray] = {}
+
+        for text in unique:
+            value = _lru.get(keys[text])
+            if value is not None:
+                found[text] = value
+        l1_hits = len(found)
+
+        remaining = [text for text in unique if text not in found]
+        client = _get_redis() if remaining else None
+        if client is not None:
+            try:
+                values = client.mget([keys[text] for text in remaining])
+            except redis.RedisError as e:
+                _redis_failed("lookup", e)
+                values = [None] * len(remaining)
+            for text, value in zip(remaining, values):
+                if value:
+                    vector = np.frombuffer(value, dtype=np.float32)
+                    _lru.set(keys[text], vector)
+                    found[text] = vector
+
+        _count(l1_hits=l1_hits, l2_hits=len(found) - l1_hits, misses=len(unique) - len(found))
+        return {text: vector.tolist() for text, vector in found.items()}
+
+    def store_many(self, embeddings: dict[str, list[float]]) -> None:
+        """
+        Add freshly generated embeddings to both cache tiers.
+
+        Args:
+            embeddings: Mapping of text to embedding.
+        """
+        if not embeddings:
+            return
+
+        encoded = {self.cache_key(text): np.asarray(e, dtype=np.float32) for text, e in embeddings.items()}
+        for key, vector in encoded.items():
+            _lru.set(key, vector)
+
+        client = _get_redis()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, vector in encoded.items():
+                pipe.set(key, vector.tobytes(), ex=settings.embedding_cache_ttl_seconds)
+            pipe.execute()
+        except redis.RedisError as e:
+            _redis_failed("store", e)
+
+    def record_api_call(self, served_from_cache: bool) -> None:
+        """
+        Count an embed request as an API call or as one saved by the cache.
+
+        Args:
+            served_from_cache: Whether the request needed no API call.
+        """
+        if served_from_cache:
+            _count(api_calls_saved=1)
+        else:
+            _count(api_calls=1)
+
+    def embed(self, text: str) -> list[float]:
+        """
+        Embed a single text.
+
+        Args:
+            text: Text to embed.
+
+        Returns:
+            Embedding vector.
+
+        Raises:
+            openai.OpenAIError: If the API call fails.
+        """
+        cached = self.lookup_many([text])
+        if text in cached:
+            self.record_api_call(served_from_cache=True)
+            return cached[text]
+
+        response = self.client.embeddings.create(input=text, **self._request_kwargs())
+        self.record_api_call(served_from_cache=False)
+        embedding = response.data[0].embedding
+        self.store_many({text: embedding})
+        return embedding
+
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed several texts with at most one API call.
+
+        Args:
+            texts: Texts to embed.
+
+        Returns:
+            Embedding vectors in input order.
+
+        Raises:
+            openai.OpenAIError: If the API call fails.
+        """
+        if not texts:
+            return []
+
+        embeddings = self.lookup_many(texts)
+        missing = [text for text in dict.fromkeys(texts) if text not in embeddings]
+
+        if missing:
+            response = self.client.embeddings.create(input=missing, **self._request_kwargs())
+            generated = {
+                missing[item.index]: item.embedding for item in sorted(response.data, key=lambda item: item.index)
+            }
+            self.store_many(generated)
+            embeddings.update(generated)
+        self.record_api_call(served_from_cache=not missing)
+
+        return [embeddings[text] for text in texts]
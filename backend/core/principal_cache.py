@@ -0,0 +1,422 @@
+"""
+Principal Cache Module
+Short-TTL cache of authenticated users and API keys.
+
+``get_current_user`` and API key validation run on every authenticated
+request. Instead of loading the ``User`` or ``APIKey`` row each time, the
+row's column values are kept in a process-wide LRU for
+``principal_cache_ttl_seconds`` and attached to the request's session
+with ``merge(load=False)``, so handlers can still modify and commit them.
+
+Entries are dropped when a session commits a change to the row. The
+dropped ids are published on a Redis channel that every API process
+listens to, so other processes evict them too. Commits on an event loop
+only evict locally and queue the message; the background task publishes
+it, so a slow Redis never blocks request handling. Bulk
+``UPDATE``/``DELETE`` statements clear the whole cache.
+
+API key usage (``last_used_at`` and ``request_count``) is buffered in
+process and written to the database in one statement every
+``api_key_usage_flush_seconds`` by the same background task.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Optional
+from uuid import UUID
+
+import redis
+import redis.asyncio as aioredis
+from sqlalchemy import bindparam, event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from backend.core.config import settings
+from backend.models import User
+from backend.models.api_key import APIKey
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "principal_cache:invalidate"
+
+# Set on statements that must not invalidate the cache (usage flushes)
+SKIP_INVALIDATION = "principal_cache_skip_invalidation"
+
+_PENDING_KEY = "principal_cache_pending"
+
+# Wait between attempts to resubscribe to invalidations after a Redis error
+REDIS_RETRY_SECONDS = 5.0
+
+# Connect and socket timeout for every Redis call made by this module
+REDIS_TIMEOUT_SECONDS = 2.0
+
+# Invalidations queued for the background task before new ones are dropped
+OUTBOX_SIZE = 10000
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+
+class PrincipalCache:
+    """Thread-safe LRU of row column values with a fixed TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, values: dict[str, Any]) -> None:
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, values)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, keys: list[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_users = PrincipalCache(settings.principal_cache_size, settings.principal_cache_ttl_seconds)
+_api_keys = PrincipalCache(settings.principal_cache_size, settings.principal_cache_ttl_seconds)
+_redis_client: Optional[redis.Redis] = None
+
+# Invalidations waiting for run_principal_cache_listener to publish them
+_outbox: "asyncio.Queue[dict[str, Any]]" = asyncio.Queue(maxsize=OUTBOX_SIZE)
+
+
+def _get_redis() -> redis.Redis:
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.from_url(
+            settings.redis_url,
+            socket_timeout=REDIS_TIMEOUT_SECONDS,
+            socket_connect_timeout=REDIS_TIMEOUT_SECONDS,
+        )
+    return _redis_client
+
+
+def _column_values(instance: Any) -> dict[str, Any]:
+    return {attr.key: getattr(instance, attr.key) for attr in type(instance).__mapper__.column_attrs}
+
+
+async def _attach(db: AsyncSession, model: type, values: dict[str, Any]) -> Any:
+    """Attach cached column values to the session as a clean persistent row."""
+    instance = model(**values)
+    make_transient_to_detached(instance)
+    return await db.merge(instance, load=False)
+
+
+# =============================================================================
+# Lookups
+# =============================================================================
+
+
+async def get_user(db: AsyncSession, user_id: UUID) -> Optional[User]:
+    """Load a user by id, from the cache when possible."""
+    values = _users.get(str(user_id))
+    if values is not None:
+        return await _attach(db, User, values)
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is not None:
+        _users.set(str(user_id), _column_values(user))
+    return user
+
+
+async def get_active_api_key(db: AsyncSession, key_hash: str) -> Optional[APIKey]:
+    """Load an active API key by hash, from the cache when possible."""
+    values = _api_keys.get(key_hash)
+    if values is not None:
+        return await _attach(db, APIKey, values)
+
+    result = await db.execute(select(APIKey).where(APIKey.key_hash == key_hash, APIKey.is_active))
+    api_key = result.scalar_one_or_none()
+    if api_key is not None:
+        _api_keys.set(key_hash, _column_values(api_key))
+    return api_key
+
+
+def get_principal_cache_stats() -> dict[str, int]:
+    """Hit and miss counts for this process."""
+    return {
+        "users": len(_users),
+        "user_hits": _users.hits,
+        "user_misses": _users.misses,
+        "api_keys": len(_api_keys),
+        "api_key_hits": _api_keys.hits,
+        "api_key_misses": _api_keys.misses,
+        "pending_usage_updates": len(_usage),
+    }
+
+
+def reset_principal_cache() -> None:
+    """Empty both caches, the invalidation queue and the usage buffer (tests)."""
+    _users.clear()
+    _api_keys.clear()
+    _users.hits = _users.misses = _api_keys.hits = _api_keys.misses = 0
+    while not _outbox.empty():
+        _outbox.get_nowait()
+    with _usage_lock:
+        _usage.clear()
+
+
+# =============================================================================
+# Invalidation
+# =============================================================================
+
+
+def _apply_invalidation(message: dict[str, Any]) -> None:
+    if message.get("all_users"):
+        _users.clear()
+    else:
+        _users.discard(message.get("users", []))
+    if message.get("all_api_keys"):
+        _api_keys.clear()
+    else:
+        _api_keys.discard(message.get("api_keys", []))
+
+
+def invalidate(
+    users: Optional[list[str]] = None,
+    api_keys: Optional[list[str]] = None,
+    all_users: bool = False,
+    all_api_keys: bool = False,
+) -> None:
+    """
+    Evict entries here and tell every other process to do the same.
+
+    On a thread running an event loop the message is queued for
+    ``run_principal_cache_listener`` instead of published inline. Threads
+    without a loop (Celery workers, scripts) publish directly.
+    """
+    message = {
+        "users": users or [],
+        "api_keys": api_keys or [],
+        "all_users": all_users,
+        "all_api_keys": all_api_keys,
+    }
+    _apply_invalidation(message)
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        try:
+            _get_redis().publish(INVALIDATION_CHANNEL, json.dumps(message))
+        except Exception as e:
+            logger.warning(f"Principal cache invalidation not published, other processes expire by TTL: {e}")
+        return
+
+    try:
+        _outbox.put_nowait(message)
+    except asyncio.QueueFull:
+        logger.warning("Principal cache invalidation queue full, other processes expire by TTL")
+
+
+async def _publish_queued(client: aioredis.Redis) -> None:
+    """Publish every queued invalidation."""
+    while not _outbox.empty():
+        message = _outbox.get_nowait()
+        try:
+            await client.publish(INVALIDATION_CHANNEL, json.dumps(message))
+        except Exception as e:
+            logger.warning(f"Principal cache invalidation not published, other processes expire by TTL: {e}")
+
+
+def _pending(session: Session) -> dict[str, Any]:
+    return session.info.setdefault(
+        _PENDING_KEY, {"users": set(), "api_keys": set(), "all_users": False, "all_api_keys": False}
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_principals(session: Session, flush_context: Any) -> None:
+    for instance in (*session.dirty, *session.deleted):
+        if isinstance(instance, User):
+            _pending(session)["users"].add(str(instance.id))
+        elif isinstance(instance, APIKey):
+            _pending(session)["api_keys"].add(instance.key_hash)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_changes(orm_execute_state: Any) -> None:
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if orm_execute_state.execution_options.get(SKIP_INVALIDATION):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None:
+        return
+    if mapper.class_ is User:
+        _pending(orm_execute_state.session)["all_users"] = True
+    elif mapper.class_ is APIKey:
+        _pending(orm_execute_state.session)["all_api_keys"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changed_principals(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending and any(pending.values()):
+        invalidate(
+            users=sorted(pending["users"]),
+            api_keys=sorted(pending["api_keys"]),
+            all_users=pending["all_users"],
+            all_api_keys=pending["all_api_keys"],
+        )
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_principals(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+# =============================================================================
+# API Key Usage Write-Behind
+# =============================================================================
+
+_usage_lock = threading.Lock()
+_usage: dict[UUID, tuple[int, datetime]] = {}
+
+
+def record_api_key_use(api_key_id: UUID) -> None:
+    """Count one request for a key; written out by ``flush_api_key_usage``."""
+    now = datetime.now(timezone.utc)
+    with _usage_lock:
+        count, _ = _usage.get(api_key_id, (0, now))
+        _usage[api_key_id] = (count + 1, now)
+
+
+async def flush_api_key_usage(db: Optional[AsyncSession] = None) -> int:
+    """
+    Write buffered API key usage in one statement.
+
+    Args:
+        db: Session to write with; a new one is opened and committed if None
+
+    Returns:
+        Number of API keys updated
+    """
+    with _usage_lock:
+        pending = dict(_usage)
+        _usage.clear()
+    if not pending:
+        return 0
+
+    table = APIKey.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("key_id"))
+        .values(request_count=table.c.request_count + bindparam("uses"), last_used_at=bindparam("used_at"))
+        .execution_options(**{SKIP_INVALIDATION: True})
+    )
+    params = [{"key_id": key_id, "uses": uses, "used_at": used_at} for key_id, (uses, used_at) in pending.items()]
+
+    try:
+        if db is not None:
+            await db.execute(stmt, params)
+        else:
+            from backend.database import get_async_session
+
+            async with get_async_session() as session:
+                await session.execute(stmt, params)
+                await session.commit()
+    except Exception as e:
+        # Put the counts back so the next flush retries them
+        with _usage_lock:
+            for key_id, (uses, used_at) in pending.items():
+                count, last = _usage.get(key_id, (0, used_at))
+                _usage[key_id] = (count + uses, max(last, used_at))
+        logger.warning(f"API key usage flush failed for {len(pending)} keys: {e}")
+        return 0
+    return len(pending)
+
+
+# =============================================================================
+# Background Task
+# =============================================================================
+
+
+async def run_principal_cache_listener(stop: asyncio.Event) -> None:
+    """
+    Exchange invalidations with other processes and flush usage until ``stop`` is set.
+
+    Started from the API lifespan. Publishes invalidations queued by local
+    commits and applies those published elsewhere. Redis errors clear the
+    local cache and resubscribe; usage keeps flushing meanwhile. The final
+    flush runs on shutdown.
+    """
+    client = aioredis.from_url(
+        settings.redis_url,
+        decode_responses=True,
+        socket_timeout=REDIS_TIMEOUT_SECONDS,
+        socket_connect_timeout=REDIS_TIMEOUT_SECONDS,
+    )
+    pubsub = client.pubsub()
+    subscribed = False
+    flush_interval = settings.api_key_usage_flush_seconds
+    next_flush = time.monotonic() + flush_interval
+    try:
+        while not stop.is_set():
+            message = None
+            try:
+                if not subscribed:
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    subscribed = True
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except Exception as e:
+                if subscribed:
+                    logger.warning(f"Principal cache listener lost Redis, clearing cache: {e}")
+                    _users.clear()
+                    _api_keys.clear()
+                subscribed = False
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=REDIS_RETRY_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+            if message is not None:
+                _apply_invalidation(json.loads(message["data"]))
+            await _publish_queued(client)
+            if flush_interval > 0 and time.monotonic() >= next_flush:
+                await flush_api_key_usage()
+                next_flush = time.monotonic() + flush_interval
+    finally:
+        await _publish_queued(client)
+        await flush_api_key_usage()
+        try:
+            await pubsub.aclose()
+            await client.aclose()
+        except Exception:
+            pass
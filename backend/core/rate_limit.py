@@ -3,8 +3,12 @@ Rate Limiting Module
 Redis-based distributed rate limiting for FastAPI endpoints.
 """
 
+import asyncio
+import json
 import logging
+import math
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
 from functools import wraps
@@ -168,6 +172,173 @@ class RedisRateLimiter:
         return await redis.zcard(key)
 
 
+# =============================================================================
+# Redis Token Bucket Rate Limiter
+# =============================================================================
+
+
+# Refills KEYS[1] from Redis server time, takes one token and, when the bucket
+# would still hold at least ARGV[4] tokens afterwards, up to ARGV[3] more as a
+# local lease. Returns {allowed, tokens_left, retry_after_ms, leased}.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local lease = tonumber(ARGV[3])
+local lease_floor = tonumber(ARGV[4])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local leased = 0
+local retry_ms = 0
+if tokens >= 1 then
+    allowed = 1
+    tokens = tokens - 1
+    if lease > 0 and tokens - lease >= lease_floor then
+        leased = lease
+        tokens = tokens - lease
+    end
+else
+    retry_ms = math.ceil((1 - tokens) / rate * 1000)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now, 'cap', capacity)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return {allowed, math.floor(tokens), retry_ms, leased}
+"""
+
+# A lease is only granted while the bucket stays at least this full
+LEASE_HEADROOM = 0.5
+
+
+@dataclass
+class _Lease:
+    """Tokens taken from a Redis bucket ahead of time by this process."""
+
+    tokens: int
+    remaining: int  # Bucket level reported by Redis when the lease was taken
+    expires_at: float
+
+
+class TokenBucketRateLimiter(RedisRateLimiter):
+    """
+    Redis token bucket rate limiter.
+
+    Each key is a two-field hash updated by one atomic Lua script, so memory
+    per key is constant and every check is a single round trip. The bucket
+    holds ``limit`` tokens and refills at ``limit / window`` per second.
+
+    With ``lease_fraction`` set, a check on a bucket that is well below its
+    limit also reserves that share of the bucket for this process. Later
+    requests for the key are answered from the lease without touching Redis
+    until it runs out or expires. Leased tokens are already spent in Redis,
+    so workers never admit more than the bucket allows; unused leases are
+    forfeited after ``lease_seconds``. Buckets too small for a whole-token
+    lease (such as the auth tier) are always checked in Redis.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        lease_fraction: float = 0.0,
+        lease_seconds: float = 1.0,
+        max_leases: int = 10000,
+    ):
+        super().__init__(redis_url)
+        self.lease_fraction = lease_fraction
+        self.lease_seconds = lease_seconds
+        self.max_leases = max_leases
+        self._leases: OrderedDict[str, _Lease] = OrderedDict()
+        self._script = None
+        self.local_hits = 0
+        self.redis_checks = 0
+
+    @staticmethod
+    def bucket_key(key: str) -> str:
+        """Return the hash key, kept apart from sliding-window sorted sets."""
+        return f"{key}:tb"
+
+    def _take_lease(self, key: str) -> Optional[tuple[bool, int, int]]:
+        """Answer from a local lease, or return None if Redis must be asked."""
+        lease = self._leases.get(key)
+        if lease is None:
+            return None
+        if lease.tokens <= 0 or lease.expires_at <= time.monotonic():
+            del self._leases[key]
+            return None
+        lease.tokens -= 1
+        self._leases.move_to_end(key)
+        self.local_hits += 1
+        return False, lease.remaining + lease.tokens, 0
+
+    def _store_lease(self, key: str, tokens: int, remaining: int) -> None:
+        """Keep a newly granted lease, evicting the least recently used."""
+        self._leases[key] = _Lease(tokens, remaining, time.monotonic() + self.lease_seconds)
+        self._leases.move_to_end(key)
+        while len(self._leases) > self.max_leases:
+            self._leases.popitem(last=False)
+
+    async def is_rate_limited(
+        self,
+        key: str,
+        limit: int,
+        window: int,
+    ) -> tuple[bool, int, int]:
+        """
+        Check if a key is rate limited using a token bucket.
+
+        Args:
+            key: Unique identifier (e.g., "rate_limit:auth:user_123")
+            limit: Bucket capacity (maximum burst)
+            window: Seconds for an empty bucket to refill completely
+
+        Returns:
+            Tuple of (is_limited, remaining_requests, retry_after_seconds)
+        """
+        if self.lease_fraction > 0:
+            local = self._take_lease(key)
+            if local is not None:
+                return local
+
+        redis = await self.get_redis()
+        if self._script is None:
+            self._script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+        lease = int(limit * self.lease_fraction) if self.lease_fraction > 0 else 0
+        allowed, remaining, retry_ms, leased = await self._script(
+            keys=[self.bucket_key(key)],
+            args=[limit, limit / window, lease, limit * LEASE_HEADROOM],
+        )
+        self.redis_checks += 1
+
+        if int(leased) > 0:
+            self._store_lease(key, int(leased), int(remaining))
+            return False, int(remaining) + int(leased), 0
+        if not int(allowed):
+            return True, 0, max(1, math.ceil(int(retry_ms) / 1000))
+        return False, int(remaining), 0
+
+    async def get_usage(self, key: str, window: int) -> int:
+        """Get tokens currently spent from a key's bucket."""
+        redis = await self.get_redis()
+        tokens, ts, capacity = await redis.hmget(self.bucket_key(key), "tokens", "ts", "cap")
+        if tokens is None or capacity is None:
+            return 0
+        capacity = float(capacity)
+        refilled = float(tokens) + max(0.0, time.time() - float(ts)) * capacity / window
+        return math.ceil(capacity - min(capacity, refilled))
+
+
 # =============================================================================
 # In-Memory Fallback Rate Limiter
 # =============================================================================
@@ -253,11 +424,22 @@ _fallback_limiter: Optional[InMemoryRateLimiter] = None
 _redis_available: bool = True  # Track Redis availability
 
 
+def create_rate_limiter(redis_url: str) -> RedisRateLimiter:
+    """Create the Redis rate limiter selected by ``rate_limit_backend``."""
+    if settings.rate_limit_backend == "token_bucket":
+        return TokenBucketRateLimiter(
+            redis_url,
+            lease_fraction=settings.rate_limit_local_lease_fraction,
+            lease_seconds=settings.rate_limit_local_lease_seconds,
+        )
+    return RedisRateLimiter(redis_url)
+
+
 async def get_rate_limiter() -> RedisRateLimiter:
     """Get the global Redis rate limiter instance."""
     global _rate_limiter
     if _rate_limiter is None:
-        _rate_limiter = RedisRateLimiter(settings.redis_url)
+        _rate_limiter = create_rate_limiter(settings.redis_url)
     return _rate_limiter
 
 
@@ -550,3 +732,105 @@ async def rate_limit_exception_handler(
         },
         headers=headers,
     )
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+
+async def benchmark_rate_limiters(
+    redis_url: Optional[str] = None,
+    requests: int = 20000,
+    keys: int = 100,
+    concurrency: int = 50,
+    limit: int = 1000,
+    window: int = 60,
+    lease_fraction: float = 0.1,
+) -> dict:
+    """
+    Compare request throughput of the rate limiter backends.
+
+    Sends ``requests`` checks spread evenly over ``keys`` clients with
+    ``concurrency`` checks in flight, against the sliding window, the token
+    bucket, and the token bucket with local leases. Uses an in-memory Redis
+    unless ``redis_url`` is given.
+    """
+    if redis_url:
+        client = aioredis.from_url(redis_url, encoding="utf-8", decode_responses=True)
+    else:
+        import fakeredis
+
+        client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+    limiters = {
+        "sliding_window": RedisRateLimiter(redis_url or "redis://"),
+        "token_bucket": TokenBucketRateLimiter(redis_url or "redis://"),
+        "token_bucket_leased": TokenBucketRateLimiter(redis_url or "redis://", lease_fraction=lease_fraction),
+    }
+    report: dict = {"requests": requests, "keys": keys, "concurrency": concurrency, "limit": limit}
+    run_id = int(time.time() * 1000)
+
+    for name, limiter in limiters.items():
+        limiter._redis = client
+        prefix = f"rate_limit:bench:{run_id}:{name}"
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        for i in range(requests):
+            queue.put_nowait(f"{prefix}:{i % keys}")
+        limited = 0
+
+        async def worker() -> None:
+            nonlocal limited
+            while not queue.empty():
+                is_limited, _, _ = await limiter.is_rate_limited(queue.get_nowait(), limit, window)
+                limited += is_limited
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+        result = {"rps": round(requests / elapsed, 1), "limited": limited}
+        sample_key = f"{prefix}:0"
+        if isinstance(limiter, TokenBucketRateLimiter):
+            sample_key = limiter.bucket_key(sample_key)
+            result["redis_round_trips"] = limiter.redis_checks
+        try:
+            result["bytes_per_key"] = await client.memory_usage(sample_key)
+        except Exception:
+            result["bytes_per_key"] = None
+        report[name] = result
+
+    await client.aclose()
+    return report
+
+
+if __name__ == "__main__":
+    """Run the rate limiter benchmark."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the Redis rate limiter backends")
+    parser.add_argument("--redis-url", default=None, help="Benchmark against this Redis instead of an in-memory one")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--keys", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--window", type=int, default=60)
+    parser.add_argument("--lease-fraction", type=float, default=0.1)
+    args = parser.parse_args()
+
+    print(
+        json.dumps(
+            asyncio.run(
+                benchmark_rate_limiters(
+                    args.redis_url,
+                    requests=args.requests,
+                    keys=args.keys,
+                    concurrency=args.concurrency,
+                    limit=args.limit,
+                    window=args.window,
+                    lease_fraction=args.lease_fraction,
+                )
+            ),
+            indent=2,
+        )
+    )
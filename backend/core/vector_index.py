@@ -0,0 +1,752 @@
+"""
+Vector Index Module
+In-process NumPy cosine similarity index for grant and profile embeddings.
+
+Embeddings are held as a normalized float32 matrix so a top-K query is a
+single matrix-vector product instead of a Postgres round trip. Each index
+is built from Postgres on first use, persisted as a local snapshot (a
+``vectors-*.npy`` matrix named by ``ids.json``) that other processes on
+the same host memory-map, and kept current by replaying the Redis stream
+the embedding tasks append to. Callers treat ``get_vector_index`` returning None as
+"use pgvector".
+"""
+
+import base64
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+import redis
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.core.config import settings
+from backend.core.embedding_codec import encode_embedding
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Index Sources
+# =============================================================================
+
+GRANTS = "grants"
+PROFILES = "profiles"
+
+# kind -> (table, id column, embedding column)
+INDEX_SOURCES: dict[str, tuple[str, str, str]] = {
+    GRANTS: ("grants", "id", "embedding"),
+    PROFILES: ("lab_profiles", "user_id", "profile_embedding"),
+}
+
+UPDATES_STREAM = "vector_index:{kind}:updates"
+VECTORS_FILE = "vectors.npy"
+VECTORS_PREFIX = "vectors-"
+IDS_FILE = "ids.json"
+SNAPSHOT_FILE_MODE = 0o644
+# Superseded vectors files are kept this long so a concurrent load() that
+# already read ids.json can still open the file it names
+STALE_VECTORS_SECONDS = 60.0
+
+
+def _stream_key(kind: str) -> str:
+    return UPDATES_STREAM.format(kind=kind)
+
+
+def _stream_id_tuple(stream_id: str) -> tuple[int, int]:
+    ms, _, seq = stream_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def _as_str(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def _remove_stale_vectors(directory: Path, keep: str) -> None:
+    """Delete superseded vectors files (and any legacy vectors.npy)."""
+    cutoff = time.time() - STALE_VECTORS_SECONDS
+    for path in [directory / VECTORS_FILE, *directory.glob(f"{VECTORS_PREFIX}*.npy")]:
+        if path.name == keep:
+            continue
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+
+# =============================================================================
+# Vector Index
+# =============================================================================
+
+
+class VectorIndex:
+    """
+    Exact top-K cosine similarity search over an in-memory matrix.
+
+    Rows are L2-normalized on insert so cosine similarity is a dot
+    product. A matrix loaded from a memory-mapped snapshot is read-only;
+    the first write copies it into process memory.
+    """
+
+    def __init__(self, dimensions: int):
+        """
+        Initialize an empty index.
+
+        Args:
+            dimensions: Embedding dimensionality.
+        """
+        self.dimensions = dimensions
+        self.last_update_id = "0-0"
+        self._matrix = np.empty((0, dimensions), dtype=np.float32)
+        self._ids: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: object) -> bool:
+        return str(item_id) in self._positions
+
+    def _normalize(self, vectors: Any) -> np.ndarray:
+        """Convert vectors to a normalized 2-D float32 array."""
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        if matrix.shape[1] != self.dimensions:
+            raise ValueError(f"Expected {self.dimensions}-dimensional vectors, got {matrix.shape[1]}")
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _ensure_writable(self) -> None:
+        if not self._matrix.flags.writeable:
+            self._matrix = np.array(self._matrix)
+
+    def upsert_many(self, items: Sequence[tuple[Any, Sequence[float]]]) -> None:
+        """
+        Insert or replace several vectors.
+
+        Args:
+            items: List of (id, embedding) pairs.
+        """
+        if not items:
+            return
+
+        vectors = self._normalize([embedding for _, embedding in items])
+
+        with self._lock:
+            self._ensure_writable()
+            new_ids: list[str] = []
+            new_rows: list[int] = []
+            for row, (item_id, _) in enumerate(items):
+                key = str(item_id)
+                position = self._positions.get(key)
+                if position is not None:
+                    self._matrix[position] = vectors[row]
+                elif key in new_ids:
+                    new_rows[new_ids.index(key)] = row
+                else:
+                    new_ids.append(key)
+                    new_rows.append(row)
+
+            if new_ids:
+                self._matrix = np.vstack([self._matrix, vectors[new_rows]])
+                for key in new_ids:
+                    self._positions[key] = len(self._ids)
+                    self._ids.append(key)
+
+    def upsert(self, item_id: Any, embedding: Sequence[float]) -> None:
+        """
+        Insert or replace a single vector.
+
+        Args:
+            item_id: Row identifier.
+            embedding: Embedding vector.
+        """
+        self.upsert_many([(item_id, embedding)])
+
+    def remove(self, item_id: Any) -> bool:
+        """
+        Remove a vector by moving the last row into its slot.
+
+        Args:
+            item_id: Row identifier.
+
+        Returns:
+            True if the id was present.
+        """
+        key = str(item_id)
+        with self._lock:
+            position = self._positions.pop(key, None)
+            if position is None:
+                return False
+
+            self._ensure_writable()
+            last = len(self._ids) - 1
+            if position != last:
+                last_key = self._ids[last]
+                self._matrix[position] = self._matrix[last]
+                self._ids[position] = last_key
+                self._positions[last_key] = position
+            self._ids.pop()
+            self._matrix = self._matrix[:last]
+            return True
+
+    def search(
+        self,
+        query: Sequence[float],
+        k: int,
+        threshold: Optional[float] = None,
+    ) -> list[tuple[str, float]]:
+        """
+        Find the k most similar vectors.
+
+        Args:
+            query: Query embedding.
+            k: Maximum number of results.
+            threshold: Only return results with similarity strictly above this.
+
+        Returns:
+            List of (id, cosine similarity), most similar first.
+        """
+        return self.search_many([query], k, threshold)[0]
+
+    def search_many(
+        self,
+        queries: Sequence[Sequence[float]],
+        k: int,
+        threshold: Optional[float] = None,
+    ) -> list[list[tuple[str, float]]]:
+        """
+        Find the k most similar vectors for several queries at once.
+
+        Args:
+            queries: Query embeddings.
+            k: Maximum number of results per query.
+            threshold: Only return results with similarity strictly above this.
+
+        Returns:
+            One result list per query, most similar first.
+        """
+        query_matrix = self._normalize(queries)
+
+        with self._lock:
+            ids = self._ids
+            count = len(ids)
+            if count == 0 or k <= 0:
+                return [[] for _ in range(len(query_matrix))]
+            similarities = query_matrix @ self._matrix.T
+            ids = list(ids)
+
+        k = min(k, count)
+
+        results: list[list[tuple[str, float]]] = []
+        for row in similarities:
+            if k < count:
+                top = np.argpartition(-row, k - 1)[:k]
+            else:
+                top = np.arange(count)
+            top = top[np.argsort(-row[top], kind="stable")]
+
+            hits = []
+            for position in top:
+                similarity = min(float(row[position]), 1.0)
+                if threshold is not None and similarity <= threshold:
+                    break
+                hits.append((ids[position], similarity))
+            results.append(hits)
+
+        return results
+
+    def save(self, directory: Path) -> None:
+        """
+        Write a snapshot atomically.
+
+        The vectors go to a uniquely named file and ids.json, which names
+        that file, is swapped in last, so concurrent saves from several
+        processes never pair one writer's vectors with another's ids.
+
+        Args:
+            directory: Snapshot directory (created if missing).
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            matrix = self._matrix
+            metadata = {
+                "dimensions": self.dimensions,
+                "last_update_id": self.last_update_id,
+                "ids": list(self._ids),
+            }
+
+        vectors_fd, vectors_path = tempfile.mkstemp(dir=directory, prefix=VECTORS_PREFIX, suffix=".npy")
+        ids_fd, ids_tmp = tempfile.mkstemp(dir=directory, prefix=f".{IDS_FILE}.", suffix=".tmp")
+        try:
+            with os.fdopen(vectors_fd, "wb") as f:
+                os.fchmod(f.fileno(), SNAPSHOT_FILE_MODE)
+                np.save(f, matrix)
+            metadata["vectors"] = os.path.basename(vectors_path)
+            with os.fdopen(ids_fd, "w") as f:
+                os.fchmod(f.fileno(), SNAPSHOT_FILE_MODE)
+                json.dump(metadata, f)
+            os.replace(ids_tmp, directory / IDS_FILE)
+        except BaseException:
+            for path in (vectors_path, ids_tmp):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            raise
+
+        _remove_stale_vectors(directory, keep=metadata["vectors"])
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True) -> Optional["VectorIndex"]:
+        """
+        Load a snapshot written by save().
+
+        Args:
+            directory: Snapshot directory.
+            mmap: Memory-map the vectors instead of reading them into memory.
+
+        Returns:
+            Loaded index, or None if the snapshot is missing or inconsistent.
+        """
+        try:
+            metadata = json.loads((directory / IDS_FILE).read_text())
+            vectors_file = metadata.get("vectors", VECTORS_FILE)
+            if os.path.basename(vectors_file) != vectors_file:
+                raise ValueError(f"unexpected vectors file {vectors_file!r}")
+            matrix = np.load(directory / vectors_file, mmap_mode="r" if mmap else None)
+        except (OSError, ValueError) as e:
+            logger.debug(f"No usable vector index snapshot in {directory}: {e}")
+            return None
+
+        ids = metadata.get("ids", [])
+        if matrix.ndim != 2 or matrix.shape[0] != len(ids) or matrix.shape[1] != metadata.get("dimensions"):
+            logger.warning(f"Vector index snapshot in {directory} is inconsistent, ignoring")
+            return None
+
+        index = cls(int(metadata["dimensions"]))
+        index._matrix = matrix
+        index._ids = ids
+        index._positions = {key: position for position, key in enumerate(ids)}
+        index.last_update_id = metadata.get("last_update_id", "0-0")
+        return index
+
+    def apply_updates(self, redis_client: redis.Redis, kind: str, batch_size: int = 1000) -> bool:
+        """
+        Replay embedding updates recorded after this index's last update.
+
+        Args:
+            redis_client: Redis client.
+            kind: Index kind (grants or profiles).
+            batch_size: Stream entries read per round trip.
+
+        Returns:
+            False if the stream was trimmed past the index's position, or the
+            index has no recorded position ("0-0") while the stream holds
+            entries, in which case the index may be missing updates and
+            should not be used.
+        """
+        stream = _stream_key(kind)
+
+        first = redis_client.xrange(stream, count=1)
+        if first and (
+            self.last_update_id == "0-0"
+            or _stream_id_tuple(_as_str(first[0][0])) > _stream_id_tuple(self.last_update_id)
+        ):
+            logger.warning(f"Vector index {kind} fell behind the update stream; rebuild required")
+            return False
+
+        while True:
+            response = redis_client.xread({stream: self.last_update_id}, count=batch_size)
+            if not response:
+                return True
+
+            entries = response[0][1]
+            upserts: list[tuple[str, np.ndarray]] = []
+            for _, fields in entries:
+                fields = {_as_str(key): _as_str(value) for key, value in fields.items()}
+                item_id = fields["id"]
+                if not item_id:
+                    # Position marker written by stream_position()
+                    continue
+                if fields.get("vector"):
+                    vector = np.frombuffer(base64.b64decode(fields["vector"]), dtype=np.float32)
+                    upserts.append((item_id, vector))
+                else:
+                    self.upsert_many(upserts)
+                    upserts = []
+                    self.remove(item_id)
+            self.upsert_many(upserts)
+
+            self.last_update_id = _as_str(entries[-1][0])
+            if len(entries) < batch_size:
+                return True
+
+
+# =============================================================================
+# Update Stream
+# =============================================================================
+
+_redis_client: Optional[redis.Redis] = None
+
+
+def _get_redis() -> redis.Redis:
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.from_url(settings.redis_url)
+    return _redis_client
+
+
+def record_embedding_updates(
+    kind: str,
+    items: Iterable[tuple[Any, Optional[Sequence[float]]]],
+    redis_client: Optional[redis.Redis] = None,
+) -> None:
+    """
+    Append embedding changes to the index update stream.
+
+    Called by the tasks that write embeddings so every process serving
+    an in-process index picks them up. No-op when the index is disabled;
+    failures are logged and never propagate to the caller.
+
+    Args:
+        kind: Index kind (grants or profiles).
+        items: (id, embedding) pairs; an embedding of None removes the id.
+        redis_client: Optional Redis client (defaults to a shared client).
+    """
+    if not settings.vector_index_enabled:
+        return
+
+    items = list(items)
+    if not items:
+        return
+
+    try:
+        client = redis_client or _get_redis()
+        pipe = client.pipeline(transaction=False)
+        for item_id, embedding in items:
+            vector = ""
+            if embedding is not None:
+                vector = base64.b64encode(np.asarray(embedding, dtype=np.float32).tobytes()).decode()
+            pipe.xadd(
+                _stream_key(kind),
+                {"id": str(item_id), "vector": vector},
+                maxlen=settings.vector_index_stream_maxlen,
+                approximate=True,
+            )
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Failed to record {len(items)} {kind} vector index updates: {e}")
+
+
+# =============================================================================
+# Snapshots
+# =============================================================================
+
+
+def snapshot_dir(kind: str) -> Path:
+    """Directory holding the snapshot for an index kind."""
+    return Path(settings.vector_index_dir) / kind
+
+
+def stream_position(kind: str, redis_client: Optional[redis.Redis] = None) -> str:
+    """
+    Current position of an index update stream.
+
+    An empty stream gets a marker entry so the returned id is a real entry,
+    which keeps trimming past it detectable by ``apply_updates``.
+
+    Args:
+        kind: Index kind (grants or profiles).
+        redis_client: Optional Redis client (defaults to a shared client).
+
+    Returns:
+        Id of the newest stream entry.
+    """
+    client = redis_client or _get_redis()
+    stream = _stream_key(kind)
+    latest = client.xrevrange(stream, count=1)
+    if latest:
+        return _as_str(latest[0][0])
+    return _as_str(
+        client.xadd(stream, {"id": "", "vector": ""}, maxlen=settings.vector_index_stream_maxlen, approximate=True)
+    )
+
+
+def build_index_from_database(
+    kind: str,
+    session: Session,
+    redis_client: Optional[redis.Redis] = None,
+    chunk_size: int = 5000,
+) -> VectorIndex:
+    """
+    Build an index from the embeddings stored in Postgres.
+
+    The update stream position is read before the table scan, so replaying
+    from it afterwards re-applies (idempotently) anything written meanwhile.
+
+    Args:
+        kind: Index kind (grants or profiles).
+        session: Database session.
+        redis_client: Optional Redis client (defaults to a shared client).
+        chunk_size: Rows fetched per round trip.
+
+    Returns:
+        Populated index.
+    """
+    table, id_column, embedding_column = INDEX_SOURCES[kind]
+    index = VectorIndex(settings.embedding_dimensions)
+
+    try:
+        index.last_update_id = stream_position(kind, redis_client)
+    except redis.RedisError as e:
+        logger.warning(f"Could not read {kind} vector index stream position: {e}")
+
+    result = session.execute(
+        text(f"""
+            SELECT {id_column}::text AS id, {embedding_column}::real[] AS embedding
+            FROM {table}
+            WHERE {embedding_column} IS NOT NULL
+        """).execution_options(stream_results=True, yield_per=chunk_size)
+    )
+    for rows in result.partitions(chunk_size):
+        index.upsert_many([(row.id, row.embedding) for row in rows])
+
+    return index
+
+
+# =============================================================================
+# Process Registry
+# =============================================================================
+
+_indexes: dict[str, VectorIndex] = {}
+_snapshot_mtimes: dict[str, float] = {}
+_last_sync: dict[str, float] = {}
+_registry_lock = threading.Lock()
+
+
+def _snapshot_mtime(kind: str) -> Optional[float]:
+    try:
+        return (snapshot_dir(kind) / IDS_FILE).stat().st_mtime
+    except OSError:
+        return None
+
+
+def _build_index(kind: str) -> Optional[VectorIndex]:
+    """Build an index from Postgres and write it as this host's snapshot."""
+    from backend.database import get_sync_session
+
+    start = time.monotonic()
+    try:
+        with get_sync_session() as session:
+            index = build_index_from_database(kind, session)
+    except Exception as e:
+        logger.warning(f"Could not build {kind} vector index, falling back to pgvector: {e}")
+        return None
+    logger.info(f"Built {kind} vector index with {len(index)} vectors in {time.monotonic() - start:.1f}s")
+
+    try:
+        index.save(snapshot_dir(kind))
+        _snapshot_mtimes[kind] = _snapshot_mtime(kind)
+    except OSError as e:
+        logger.warning(f"Could not write {kind} vector index snapshot: {e}")
+    return index
+
+
+def get_vector_index(kind: str) -> Optional[VectorIndex]:
+    """
+    Get the process-wide index for a kind, kept in sync with the update stream.
+
+    Loads the local snapshot on first use (and again whenever a newer
+    snapshot is written), then replays stream updates at most once per
+    ``vector_index_sync_interval_seconds``. When there is no snapshot on
+    this host, or the loaded index has fallen behind the stream, the index
+    is rebuilt from Postgres. This blocks on disk, Redis and the database,
+    so async callers should run it in a thread.
+
+    Args:
+        kind: Index kind (grants or profiles).
+
+    Returns:
+        The index, or None if disabled or unavailable; callers should
+        fall back to pgvector.
+    """
+    if not settings.vector_index_enabled:
+        return None
+
+    now = time.monotonic()
+    with _registry_lock:
+        index = _indexes.get(kind)
+        if index is not None and now - _last_sync.get(kind, 0.0) < settings.vector_index_sync_interval_seconds:
+            return index
+        _last_sync[kind] = now
+
+        mtime = _snapshot_mtime(kind)
+        if mtime is not None and mtime != _snapshot_mtimes.get(kind):
+            loaded = VectorIndex.load(snapshot_dir(kind))
+            if loaded is not None:
+                index = loaded
+                _snapshot_mtimes[kind] = mtime
+                logger.info(f"Loaded {kind} vector index snapshot with {len(index)} vectors")
+
+        try:
+            if index is not None and not index.apply_updates(_get_redis(), kind):
+                index = None
+            if index is None:
+                index = _build_index(kind)
+                if index is not None and not index.apply_updates(_get_redis(), kind):
+                    index = None
+        except redis.RedisError as e:
+            logger.warning(f"Vector index {kind} sync failed, falling back to pgvector: {e}")
+            index = None
+
+        if index is None:
+            _indexes.pop(kind, None)
+            _snapshot_mtimes.pop(kind, None)
+            return None
+
+        _indexes[kind] = index
+        return index
+
+
+def reset_vector_indexes() -> None:
+    """Drop all loaded indexes (tests and snapshot rebuilds)."""
+    with _registry_lock:
+        _indexes.clear()
+        _snapshot_mtimes.clear()
+        _last_sync.clear()
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+
+def benchmark_vector_index(
+    vectors: int = 20000,
+    queries: int = 200,
+    k: int = 50,
+    database_url: Optional[str] = None,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """
+    Measure query throughput and recall of the in-process index.
+
+    Without a database the index is compared against an exact float64
+    scan of synthetic clustered vectors. With ``database_url`` the index is
+    built from the grants table and compared with the pgvector query path,
+    using stored grant embeddings as queries.
+
+    Args:
+        vectors: Synthetic vector count (ignored with a database).
+        queries: Number of queries to run.
+        k: Results per query.
+        database_url: Optional sync SQLAlchemy database URL.
+        seed: Random seed.
+
+    Returns:
+        Throughput, latency and recall@k figures.
+    """
+    rng = np.random.default_rng(seed)
+    report: dict[str, Any] = {"k": k, "queries": queries}
+
+    if database_url is None:
+        dimensions = settings.embedding_dimensions
+        centers = rng.standard_normal((64, dimensions)).astype(np.float32)
+        data = centers[rng.integers(0, 64, vectors)] + 0.5 * rng.standard_normal((vectors, dimensions)).astype(
+            np.float32
+        )
+        query_vectors = data[rng.choice(vectors, queries, replace=False)] + 0.1 * rng.standard_normal(
+            (queries, dimensions)
+        ).astype(np.float32)
+
+        index = VectorIndex(dimensions)
+        start = time.perf_counter()
+        index.upsert_many([(str(i), row) for i, row in enumerate(data)])
+        report["build_seconds"] = round(time.perf_counter() - start, 3)
+
+        reference = data.astype(np.float64)
+        reference /= np.linalg.norm(reference, axis=1, keepdims=True)
+        start = time.perf_counter()
+        expected = []
+        for query in query_vectors.astype(np.float64):
+            scores = reference @ (query / np.linalg.norm(query))
+            expected.append({str(i) for i in np.argsort(-scores)[:k]})
+        report["reference"] = "exact_float64"
+        report["reference_qps"] = round(queries / (time.perf_counter() - start), 1)
+    else:
+        from sqlalchemy import create_engine
+
+        engine = create_engine(database_url)
+        with Session(engine) as session:
+            index = build_index_from_database(GRANTS, session)
+            sample = session.execute(
+                text("""
+                    SELECT embedding::real[] AS embedding FROM grants
+                    WHERE embedding IS NOT NULL
+                    ORDER BY random() LIMIT :queries
+                """),
+                {"queries": queries},
+            ).fetchall()
+            query_vectors = np.asarray([row.embedding for row in sample], dtype=np.float32)
+
+            sql = text("""
+                SELECT id::text AS id FROM grants
+                WHERE embedding IS NOT NULL
+                ORDER BY embedding <=> CAST(:embedding AS vector)
+                LIMIT :k
+            """)
+            start = time.perf_counter()
+            expected = []
+            for query in query_vectors:
+                rows = session.execute(sql, {"embedding": encode_embedding(query), "k": k}).fetchall()
+                expected.append({row.id for row in rows})
+            report["reference"] = "pgvector"
+            report["reference_qps"] = round(len(query_vectors) / (time.perf_counter() - start), 1)
+        engine.dispose()
+
+    report["vectors"] = len(index)
+
+    start = time.perf_counter()
+    found = [{item_id for item_id, _ in index.search(query, k)} for query in query_vectors]
+    elapsed = time.perf_counter() - start
+    report["index_qps"] = round(len(query_vectors) / elapsed, 1)
+    report["index_mean_latency_ms"] = round(1000 * elapsed / len(query_vectors), 3)
+
+    start = time.perf_counter()
+    index.search_many(query_vectors, k)
+    report["index_batched_qps"] = round(len(query_vectors) / (time.perf_counter() - start), 1)
+
+    overlaps = [len(got & want) / len(want) for got, want in zip(found, expected) if want]
+    report["recall_at_k"] = round(float(np.mean(overlaps)), 4) if overlaps else None
+    return report
+
+
+if __name__ == "__main__":
+    """Run the vector index benchmark."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the in-process vector index")
+    parser.add_argument("--vectors", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=50)
+    parser.add_argument("--database-url", default=None, help="Compare against pgvector on this database")
+    args = parser.parse_args()
+
+    print(
+        json.dumps(
+            benchmark_vector_index(args.vectors, args.queries, args.k, database_url=args.database_url),
+            indent=2,
+        )
+    )
@@ -11,9 +11,14 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
+from backend.core import principal_cache  # noqa: F401 - registers cache invalidation listeners
 from backend.core.config import settings
+from backend.core.embedding_codec import install_vector_codecs
 from backend.models import Base
 
+# Send pgvector parameters in native/compact encodings on every connection
+install_vector_codecs()
+
 # =============================================================================
 # Async Engine and Session (for FastAPI)
 # =============================================================================
@@ -37,6 +37,7 @@ class StreamNames:
     """Redis Stream names for the GrantRadar event bus."""
 
     GRANTS_DISCOVERED = "grants:discovered"
+    GRANTS_UPDATED = "grants:updated"
     GRANTS_VALIDATED = "grants:validated"
     MATCHES_COMPUTED = "matches:computed"
     ALERTS_PENDING = "alerts:pending"
@@ -57,6 +58,7 @@ class StreamNames:
         """Get all main stream names."""
         return [
             cls.GRANTS_DISCOVERED,
+            cls.GRANTS_UPDATED,
             cls.GRANTS_VALIDATED,
             cls.MATCHES_COMPUTED,
             cls.ALERTS_PENDING,
@@ -3,6 +3,7 @@ GrantRadar FastAPI Application
 Main entry point for the grant intelligence platform API.
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from typing import Any
@@ -66,6 +67,7 @@ from backend.api import (
     writing,
 )
 from backend.core.config import settings
+from backend.core.principal_cache import run_principal_cache_listener
 from backend.core.rate_limit import (
     RateLimitMiddleware,
     close_rate_limiter,
@@ -221,6 +223,7 @@ async def lifespan(app: FastAPI):
     - Validate security settings
     - Initialize database connection
     - Create tables if needed (dev only)
+    - Start the principal cache listener
 
     Shutdown:
     - Close database connections
@@ -252,6 +255,10 @@ async def lifespan(app: FastAPI):
     # Mark startup complete for health check probes
     from backend.api.health import mark_startup_complete
 
+    # Principal cache invalidations from other processes and API key usage flushes
+    principal_cache_stop = asyncio.Event()
+    principal_cache_task = asyncio.create_task(run_principal_cache_listener(principal_cache_stop))
+
     mark_startup_complete()
     logger.info("Application startup complete")
 
@@ -259,6 +266,11 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down GrantRadar API...")
+    principal_cache_stop.set()
+    try:
+        await principal_cache_task
+    except Exception as e:
+        logger.warning(f"Principal cache listener stopped with error: {e}")
     await close_rate_limiter()
     logger.info("Rate limiter closed")
     await close_db()
@@ -5,13 +5,14 @@ SQLAlchemy ORM models for the grant intelligence platform.
 
 import enum
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from typing import TYPE_CHECKING, Any, List, Optional
 
 from pgvector.sqlalchemy import Vector
 from sqlalchemy import (
     ARRAY,
     Boolean,
+    Date,
     TIMESTAMP,
     Enum,
     Float,
@@ -341,6 +342,7 @@ class Grant(Base):
         Index("ix_grants_posted_at_desc", posted_at.desc()),
         Index("ix_grants_deadline_asc", deadline.asc()),
         Index("ix_grants_source", source),
+        Index("ix_grants_created_at", created_at),
         Index(
             "ix_grants_embedding",
             embedding,
@@ -847,6 +849,7 @@ class Match(Base):
         Index("ix_matches_grant_id", grant_id),
         Index("ix_matches_user_id", user_id),
         Index("ix_matches_score_desc", match_score.desc()),
+        Index("ix_matches_created_at", created_at),
         UniqueConstraint("grant_id", "user_id", name="uq_matches_grant_user"),
     )
 
@@ -1472,6 +1475,11 @@ class ReminderSchedule(Base):
         nullable=False,
         doc="Minutes before deadline to send reminder (e.g., 1440 for 1 day)",
     )
+    fire_at: Mapped[Optional[datetime]] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=True,
+        doc="When the reminder is due (sponsor deadline minus remind_before_minutes)",
+    )
     is_sent: Mapped[bool] = mapped_column(
         default=False,
         doc="Whether the reminder has been sent",
@@ -1498,6 +1506,7 @@ class ReminderSchedule(Base):
         Index("ix_reminder_schedules_deadline_id", deadline_id),
         Index("ix_reminder_schedules_is_sent", is_sent),
         Index("ix_reminder_schedules_reminder_type", reminder_type),
+        Index("ix_reminder_schedules_due", is_sent, fire_at),
     )
 
     def __repr__(self) -> str:
@@ -1718,6 +1727,12 @@ class FundingAlertPreference(Base):
         nullable=True,
         doc="Timestamp of last sent funding alert",
     )
+    next_send_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        doc="When the next funding alert is due",
+    )
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
         server_default=func.now(),
@@ -1742,6 +1757,7 @@ class FundingAlertPreference(Base):
         Index("ix_funding_alert_preferences_user_id", user_id),
         Index("ix_funding_alert_preferences_enabled", enabled),
         Index("ix_funding_alert_preferences_frequency", frequency),
+        Index("ix_funding_alert_preferences_due", enabled, next_send_at),
     )
 
     def __repr__(self) -> str:
@@ -3209,3 +3225,66 @@ class TeamNotification(Base):
 
     def __repr__(self) -> str:
         return f"<TeamNotification(id={self.id}, type='{self.notification_type}', read={self.is_read})>"
+
+
+class AnalyticsDailyRollup(Base):
+    """
+    Per-day platform activity rollup.
+
+    One row per UTC calendar day with the grants, matches and alerts created
+    that day. Maintained incrementally by compute_daily_analytics from the
+    latest stored day onward, so each run only aggregates recent rows.
+    """
+
+    __tablename__ = "analytics_daily_rollups"
+
+    day: Mapped[date] = mapped_column(
+        Date,
+        primary_key=True,
+        doc="UTC calendar day",
+    )
+    grants_created: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        doc="Grants discovered on this day",
+    )
+    grants_by_source: Mapped[dict[str, int]] = mapped_column(
+        JSONB,
+        nullable=False,
+        default=dict,
+        doc="Grants discovered on this day per source",
+    )
+    matches_created: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        doc="Matches computed on this day",
+    )
+    match_score_sum: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        default=0.0,
+        doc="Sum of match scores computed on this day",
+    )
+    alerts_sent: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        doc="Alerts sent on this day",
+    )
+    alerts_by_channel: Mapped[dict[str, int]] = mapped_column(
+        JSONB,
+        nullable=False,
+        default=dict,
+        doc="Alerts sent on this day per channel",
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        default=datetime.utcnow,
+        doc="When this row was last recomputed",
+    )
+
+    def __repr__(self) -> str:
+        return f"<AnalyticsDailyRollup(day={self.day}, grants={self.grants_created}, matches={self.matches_created})>"
@@ -69,6 +69,9 @@ GrantAssignment = _models_py.GrantAssignment
 TeamComment = _models_py.TeamComment
 TeamNotification = _models_py.TeamNotification
 
+# Analytics rollups
+AnalyticsDailyRollup = _models_py.AnalyticsDailyRollup
+
 # Import models from submodules
 from backend.models.mechanisms import GrantMechanism, FundedProject, CompetitionSnapshot
 from backend.models.api_key import APIKey
@@ -123,6 +126,8 @@ __all__ = [
     "GrantAssignment",
     "TeamComment",
     "TeamNotification",
+    # Analytics rollups
+    "AnalyticsDailyRollup",
     # Grant Intelligence Graph models
     "GrantMechanism",
     "FundedProject",
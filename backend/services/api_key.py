@@ -13,6 +13,8 @@ from uuid import UUID
 from sqlalchemy import and_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.core.config import settings
+from backend.core.principal_cache import get_active_api_key, record_api_key_use
 from backend.models.api_key import APIKey
 
 logger = logging.getLogger(__name__)
@@ -130,16 +132,8 @@ async def validate_api_key(
     # Hash the provided key
     key_hash = _hash_api_key(api_key)
 
-    # Query for matching active key
-    result = await db.execute(
-        select(APIKey).where(
-            and_(
-                APIKey.key_hash == key_hash,
-                APIKey.is_active,
-            )
-        )
-    )
-    api_key_record = result.scalar_one_or_none()
+    # Look up the matching active key (cached for a short TTL, invalidated on change)
+    api_key_record = await get_active_api_key(db, key_hash)
 
     if not api_key_record:
         logger.debug("API key validation failed: key not found or inactive")
@@ -170,10 +164,17 @@ async def update_last_used(
     """
     Update the last_used_at timestamp and increment request count.
 
+    Buffered in process and flushed in bulk unless
+    api_key_usage_flush_seconds is 0.
+
     Args:
         db: Database session
         api_key_id: ID of the API key to update
     """
+    if settings.api_key_usage_flush_seconds > 0:
+        record_api_key_use(api_key_id)
+        return
+
     await db.execute(
         update(APIKey)
         .where(APIKey.id == api_key_id)
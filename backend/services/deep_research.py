@@ -13,6 +13,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text
 
 from backend.core.config import settings
+from backend.core.embedding_codec import encode_embedding
+from backend.core.embedding_service import EmbeddingService
+from backend.core.vector_index import GRANTS, get_vector_index
 from backend.models import User, Grant, LabProfile, ResearchSession
 from backend.schemas.research import (
     ResearchStatus,
@@ -23,6 +26,9 @@ from backend.schemas.research import (
 
 logger = structlog.get_logger(__name__)
 
+# Candidates taken from the in-process index per result slot, to survive the deadline filter
+INDEX_OVERFETCH = 4
+
 
 class DeepResearchService:
     """Service for intelligent grant discovery and research."""
@@ -293,11 +299,8 @@ Return ONLY the expanded query text, no explanations. Keep it under 300 words.""
 
     async def _generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for semantic search."""
-        response = self.openai.embeddings.create(
-            model=settings.embedding_model,
-            input=text[:8000],  # Truncate to model limit
-        )
-        return response.data[0].embedding
+        # The embedding cache is a blocking Redis client
+        return await asyncio.to_thread(EmbeddingService(self.openai).embed, text[:8000])  # Truncate to model limit
 
     async def _search_grants(
         self,
@@ -306,22 +309,39 @@ Return ONLY the expanded query text, no explanations. Keep it under 300 words.""
         profile: Optional[LabProfile],
     ) -> List[Grant]:
         """Search grants using vector similarity."""
-        # Convert embedding list to pgvector format string
-        embedding_str = "[" + ",".join(map(str, embedding)) + "]"
-
-        # Use pgvector for semantic search
-        query = text("""
-            SELECT id, title, description, agency, amount_min, amount_max,
-                   deadline, url, eligibility,
-                   1 - (embedding <=> CAST(:embedding AS vector)) as similarity
-            FROM grants
-            WHERE embedding IS NOT NULL
-              AND (deadline IS NULL OR deadline > NOW())
-            ORDER BY embedding <=> CAST(:embedding AS vector)
-            LIMIT 50
-        """)
-
-        result = await db.execute(query, {"embedding": embedding_str})
+        # Loading or syncing the index touches disk and Redis; keep it off the event loop
+        index = await asyncio.to_thread(get_vector_index, GRANTS)
+        if index is not None:
+            # Rank in-process; over-fetch since expired grants are filtered in SQL
+            hits = await asyncio.to_thread(index.search, embedding, 50 * INDEX_OVERFETCH, threshold=0.3)
+            query = text("""
+                SELECT g.id, g.title, g.description, g.agency, g.amount_min, g.amount_max,
+                       g.deadline, g.url, g.eligibility, c.similarity
+                FROM unnest(CAST(:ids AS uuid[]), CAST(:similarities AS float8[])) AS c(id, similarity)
+                JOIN grants g ON g.id = c.id
+                WHERE g.deadline IS NULL OR g.deadline > NOW()
+                ORDER BY c.similarity DESC
+                LIMIT 50
+            """)
+            params = {
+                "ids": [grant_id for grant_id, _ in hits],
+                "similarities": [similarity for _, similarity in hits],
+            }
+        else:
+            # Use pgvector for semantic search
+            query = text("""
+                SELECT id, title, description, agency, amount_min, amount_max,
+                       deadline, url, eligibility,
+                       1 - (embedding <=> CAST(:embedding AS vector)) as similarity
+                FROM grants
+                WHERE embedding IS NOT NULL
+                  AND (deadline IS NULL OR deadline > NOW())
+                ORDER BY embedding <=> CAST(:embedding AS vector)
+                LIMIT 50
+            """)
+            params = {"embedding": encode_embedding(embedding)}
+
+        result = await db.execute(query, params)
         rows = result.fetchall()
 
         grants = []
@@ -1,8 +1,9 @@
 """Funding alerts service for personalized email newsletters."""
 
 import openai
+from collections import defaultdict
 from datetime import datetime, timezone, timedelta
-from typing import Optional, List
+from typing import Optional, List, Sequence
 from uuid import UUID
 import structlog
 
@@ -20,6 +21,39 @@ from backend.schemas.alerts import (
 
 logger = structlog.get_logger(__name__)
 
+# Interval between alerts for each frequency
+ALERT_INTERVALS = {
+    "daily": timedelta(days=1),
+    "weekly": timedelta(days=7),
+    "monthly": timedelta(days=30),
+}
+
+# Matches considered when an alert has never been sent
+FIRST_ALERT_LOOKBACK = timedelta(days=7)
+
+# Items per alert section
+MAX_ALERT_ITEMS = 10
+
+
+def next_alert_time(frequency: str, last_sent_at: Optional[datetime] = None) -> datetime:
+    """
+    When the next alert is due.
+
+    Args:
+        frequency: Alert frequency ('daily', 'weekly', or 'monthly').
+        last_sent_at: When the last alert was sent, if ever.
+
+    Returns:
+        Next due time; now if no alert has been sent.
+    """
+    if last_sent_at is None:
+        return datetime.now(timezone.utc)
+    return last_sent_at + ALERT_INTERVALS.get(frequency, ALERT_INTERVALS["daily"])
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
 
 class FundingAlertsService:
     """Service for generating and sending funding alert emails."""
@@ -57,6 +91,8 @@ class FundingAlertsService:
     ) -> FundingAlertPreference:
         """Update funding alert preferences."""
         prefs = await self.get_or_create_preferences(db, user_id)
+        # Only a new schedule moves next_send_at; otherwise it may hold a send claim or retry time
+        reschedule = (frequency is not None and frequency.value != prefs.frequency) or (enabled and not prefs.enabled)
 
         if enabled is not None:
             prefs.enabled = enabled
@@ -72,6 +108,8 @@ class FundingAlertsService:
             prefs.include_insights = include_insights
         if preferred_funders is not None:
             prefs.preferred_funders = preferred_funders
+        if reschedule:
+            prefs.next_send_at = next_alert_time(prefs.frequency, prefs.last_sent_at)
 
         await db.commit()
         await db.refresh(prefs)
@@ -90,103 +128,139 @@ class FundingAlertsService:
                 reason="Alerts are disabled",
             )
 
-        # Get new matching grants
-        new_grants = await self._get_new_grants(db, user, prefs)
-
-        # Get upcoming deadlines
-        deadlines = await self._get_upcoming_deadlines(db, user, prefs)
+        return (await self.preview_alerts(db, [(user, prefs)]))[user.id]
 
-        # Generate personalized insights
-        insights = None
-        if prefs.include_insights and (new_grants or deadlines):
-            insights = await self._generate_insights(db, user, new_grants, deadlines)
-
-        would_send = bool(new_grants or deadlines)
-        reason = None if would_send else "No new grants or upcoming deadlines"
+    async def preview_alerts(
+        self,
+        db: AsyncSession,
+        recipients: Sequence[tuple[User, FundingAlertPreference]],
+    ) -> dict[UUID, FundingAlertPreview]:
+        """
+        Generate alert previews for several users.
 
-        return FundingAlertPreview(
-            new_grants=new_grants,
-            upcoming_deadlines=deadlines,
-            personalized_insights=insights,
-            would_send=would_send,
-            reason=reason,
-        )
+        New matches and upcoming deadlines are loaded for all recipients in
+        one query each; each user's sections are then filtered from that
+        shared set by their own preferences.
 
-    async def _get_new_grants(
-        self, db: AsyncSession, user: User, prefs: FundingAlertPreference
-    ) -> List[AlertGrantSummary]:
-        """Get new matching grants since last alert."""
-        if not prefs.include_new_grants:
-            return []
+        Args:
+            db: Database session.
+            recipients: Users with their (enabled) alert preferences.
 
-        since = prefs.last_sent_at or (datetime.now(timezone.utc) - timedelta(days=7))
+        Returns:
+            Mapping of user ID to alert preview.
+        """
+        now = datetime.now(timezone.utc)
+        grants_by_user = await self._new_grants_by_user(db, recipients, now)
+        deadlines_by_user = await self._upcoming_deadlines_by_user(db, recipients, now)
+
+        previews = {}
+        for user, prefs in recipients:
+            new_grants = grants_by_user.get(user.id, [])
+            deadlines = deadlines_by_user.get(user.id, [])
+
+            # Generate personalized insights
+            insights = None
+            if prefs.include_insights and (new_grants or deadlines):
+                insights = await self._generate_insights(db, user, new_grants, deadlines)
+
+            would_send = bool(new_grants or deadlines)
+            previews[user.id] = FundingAlertPreview(
+                new_grants=new_grants,
+                upcoming_deadlines=deadlines,
+                personalized_insights=insights,
+                would_send=would_send,
+                reason=None if would_send else "No new grants or upcoming deadlines",
+            )
+        return previews
 
+    async def _new_grants_by_user(
+        self,
+        db: AsyncSession,
+        recipients: Sequence[tuple[User, FundingAlertPreference]],
+        now: datetime,
+    ) -> dict[UUID, List[AlertGrantSummary]]:
+        """Get new matching grants since each user's last alert."""
+        wanted = {user.id: prefs for user, prefs in recipients if prefs.include_new_grants}
+        if not wanted:
+            return {}
+
+        since = {
+            user_id: _as_utc(prefs.last_sent_at) if prefs.last_sent_at else now - FIRST_ALERT_LOOKBACK
+            for user_id, prefs in wanted.items()
+        }
         # Convert min_match_score (0-100) to match_score (0-1) for comparison
-        min_score = prefs.min_match_score / 100.0
+        min_score = {user_id: prefs.min_match_score / 100.0 for user_id, prefs in wanted.items()}
 
-        # Get matches above threshold
-        query = (
+        # One candidate set covering every recipient's window and threshold
+        result = await db.execute(
             select(Match, Grant)
             .join(Grant, Match.grant_id == Grant.id)
-            .where(Match.user_id == user.id)
-            .where(Match.match_score >= min_score)
-            .where(Match.created_at > since)
+            .where(Match.user_id.in_(wanted))
+            .where(Match.match_score >= min(min_score.values()))
+            .where(Match.created_at > min(since.values()))
             .order_by(Match.match_score.desc())
-            .limit(10)
         )
 
-        if prefs.preferred_funders:
-            query = query.where(Grant.agency.in_(prefs.preferred_funders))
-
-        result = await db.execute(query)
-        matches = result.all()
-
-        return [
-            AlertGrantSummary(
-                id=grant.id,
-                title=grant.title,
-                funder=grant.agency or "Unknown",
-                mechanism=None,  # Grant model doesn't have mechanism field
-                amount_max=grant.amount_max,
-                deadline=grant.deadline,
-                match_score=int(match.match_score * 100),
-                match_reason=match.reasoning or "Strong alignment with your research",
+        grants: dict[UUID, List[AlertGrantSummary]] = defaultdict(list)
+        for match, grant in result.all():
+            user_id = match.user_id
+            prefs = wanted[user_id]
+            if len(grants[user_id]) >= MAX_ALERT_ITEMS:
+                continue
+            if match.match_score < min_score[user_id] or _as_utc(match.created_at) <= since[user_id]:
+                continue
+            if prefs.preferred_funders and grant.agency not in prefs.preferred_funders:
+                continue
+            grants[user_id].append(
+                AlertGrantSummary(
+                    id=grant.id,
+                    title=grant.title,
+                    funder=grant.agency or "Unknown",
+                    mechanism=None,  # Grant model doesn't have mechanism field
+                    amount_max=grant.amount_max,
+                    deadline=grant.deadline,
+                    match_score=int(match.match_score * 100),
+                    match_reason=match.reasoning or "Strong alignment with your research",
+                )
             )
-            for match, grant in matches
-        ]
+        return grants
 
-    async def _get_upcoming_deadlines(
-        self, db: AsyncSession, user: User, prefs: FundingAlertPreference
-    ) -> List[AlertDeadlineSummary]:
+    async def _upcoming_deadlines_by_user(
+        self,
+        db: AsyncSession,
+        recipients: Sequence[tuple[User, FundingAlertPreference]],
+        now: datetime,
+    ) -> dict[UUID, List[AlertDeadlineSummary]]:
         """Get upcoming deadlines within the next 30 days."""
-        if not prefs.include_deadlines:
-            return []
+        user_ids = [user.id for user, prefs in recipients if prefs.include_deadlines]
+        if not user_ids:
+            return {}
 
-        now = datetime.now(timezone.utc)
         cutoff = now + timedelta(days=30)
-
         result = await db.execute(
             select(Deadline)
-            .where(Deadline.user_id == user.id)
+            .where(Deadline.user_id.in_(user_ids))
             .where(Deadline.status == "active")
             .where(Deadline.sponsor_deadline >= now)
             .where(Deadline.sponsor_deadline <= cutoff)
             .order_by(Deadline.sponsor_deadline)
-            .limit(10)
         )
-        deadlines = result.scalars().all()
-
-        return [
-            AlertDeadlineSummary(
-                id=d.id,
-                title=d.title,
-                funder=d.funder,
-                sponsor_deadline=d.sponsor_deadline,
-                days_until=(d.sponsor_deadline - now).days,
-                priority=d.priority,
+
+        deadlines: dict[UUID, List[AlertDeadlineSummary]] = defaultdict(list)
+        for d in result.scalars().all():
+            if len(deadlines[d.user_id]) >= MAX_ALERT_ITEMS:
+                continue
+            deadlines[d.user_id].append(
+                AlertDeadlineSummary(
+                    id=d.id,
+                    title=d.title,
+                    funder=d.funder,
+                    sponsor_deadline=d.sponsor_deadline,
+                    days_until=(_as_utc(d.sponsor_deadline) - now).days,
+                    priority=d.priority,
+                )
             )
-            for d in deadlines
-        ]
+        return deadlines
 
     async def _generate_insights(
         self,
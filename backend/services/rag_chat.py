@@ -5,12 +5,16 @@ from datetime import datetime, timezone
 from typing import Optional, List, AsyncGenerator
 from uuid import UUID
 import json
+import asyncio
 import structlog
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text, func
 
 from backend.core.config import settings
+from backend.core.embedding_codec import encode_embedding
+from backend.core.embedding_service import EmbeddingService
+from backend.core.vector_index import GRANTS, get_vector_index
 from backend.models import User, Grant, ChatSession, ChatMessage, LabProfile
 from backend.schemas.chat import ChatSource, ChatMessageResponse
 
@@ -236,30 +240,46 @@ class RAGChatService:
 
         # Try vector similarity search with savepoint to isolate potential failures
         try:
-            # Generate embedding for query
-            embedding_response = self.openai.embeddings.create(
-                model=self.embedding_model,
-                input=query,
-            )
-            query_embedding = embedding_response.data[0].embedding
+            # Generate embedding for query (repeated queries hit the shared cache)
+            embedder = EmbeddingService(self.openai, model=self.embedding_model)
+            query_embedding = await asyncio.to_thread(embedder.embed, query)
+
+            # Loading or syncing the index touches disk and Redis; keep it off the event loop
+            hits = None
+            index = await asyncio.to_thread(get_vector_index, GRANTS)
+            if index is not None:
+                hits = await asyncio.to_thread(index.search, query_embedding, 5)
 
             # Search grants using pgvector inside a savepoint
             # This allows us to rollback just this query if it fails
             # without affecting the rest of the transaction
             async with db.begin_nested():
-                # Convert embedding list to pgvector format string
-                embedding_str = "[" + ",".join(map(str, query_embedding)) + "]"
-                grants_query = text("""
-                    SELECT id, title, description, agency, eligibility, categories,
-                           amount_min, amount_max, deadline,
-                           1 - (embedding <=> CAST(:embedding AS vector)) as similarity
-                    FROM grants
-                    WHERE embedding IS NOT NULL
-                    ORDER BY embedding <=> CAST(:embedding AS vector)
-                    LIMIT 5
-                """)
-
-                result = await db.execute(grants_query, {"embedding": embedding_str})
+                if hits is not None:
+                    # Ranked in-process, load only the top grants
+                    grants_query = text("""
+                        SELECT g.id, g.title, g.description, g.agency, g.eligibility, g.categories,
+                               g.amount_min, g.amount_max, g.deadline, c.similarity
+                        FROM unnest(CAST(:ids AS uuid[]), CAST(:similarities AS float8[])) AS c(id, similarity)
+                        JOIN grants g ON g.id = c.id
+                        ORDER BY c.similarity DESC
+                    """)
+                    params = {
+                        "ids": [grant_id for grant_id, _ in hits],
+                        "similarities": [similarity for _, similarity in hits],
+                    }
+                else:
+                    grants_query = text("""
+                        SELECT id, title, description, agency, eligibility, categories,
+                               amount_min, amount_max, deadline,
+                               1 - (embedding <=> CAST(:embedding AS vector)) as similarity
+                        FROM grants
+                        WHERE embedding IS NOT NULL
+                        ORDER BY embedding <=> CAST(:embedding AS vector)
+                        LIMIT 5
+                    """)
+                    params = {"embedding": encode_embedding(query_embedding)}
+
+                result = await db.execute(grants_query, params)
                 similar_grants = result.fetchall()
         except Exception as e:
             logger.warning("Vector search failed, continuing without RAG context", error=str(e))
@@ -0,0 +1,203 @@
+"""
+Reminder Index
+Due-time index for deadline reminders.
+
+Each ReminderSchedule row stores its computed fire time in ``fire_at``
+(indexed together with ``is_sent``), and unsent reminders are mirrored in
+a Redis sorted set scored by that time. The dispatcher claims due ids
+with ZRANGEBYSCORE, so its cost tracks reminders due now rather than all
+reminders. The database stays authoritative: claimed rows are re-checked
+before sending, and the hourly sync re-indexes near-term reminders a
+failed Redis write may have missed.
+
+Redis layout:
+- ``reminders:due``: sorted set of reminder schedule ids scored by the
+  Unix time the reminder fires.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+from uuid import UUID
+
+import redis
+import redis.asyncio as aioredis
+
+from backend.core.config import settings
+from backend.models import Deadline, ReminderSchedule
+
+logger = logging.getLogger(__name__)
+
+REMINDER_INDEX_KEY = "reminders:due"
+
+# How long a claimed reminder is hidden from dispatch while it is sent
+CLAIM_LEASE_SECONDS = 10 * 60
+
+# Reminders firing within this window are re-indexed by the hourly sync
+INDEX_HORIZON = timedelta(hours=2)
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def compute_fire_at(sponsor_deadline: datetime, remind_before_minutes: int) -> datetime:
+    """
+    Compute when a reminder fires.
+
+    Args:
+        sponsor_deadline: The deadline's sponsor due date.
+        remind_before_minutes: Minutes before the deadline to remind.
+
+    Returns:
+        Fire time (timezone-aware UTC).
+    """
+    if sponsor_deadline.tzinfo is None:
+        sponsor_deadline = sponsor_deadline.replace(tzinfo=timezone.utc)
+    return sponsor_deadline - timedelta(minutes=remind_before_minutes)
+
+
+def refresh_fire_times(deadline: Deadline, schedules: Iterable[ReminderSchedule]) -> list[ReminderSchedule]:
+    """
+    Recompute fire times for a deadline's unsent reminders.
+
+    Args:
+        deadline: Deadline the reminders belong to.
+        schedules: The deadline's reminders.
+
+    Returns:
+        The unsent reminders, with ``fire_at`` updated.
+    """
+    unsent = [s for s in schedules if not s.is_sent]
+    for schedule in unsent:
+        schedule.fire_at = compute_fire_at(deadline.sponsor_deadline, schedule.remind_before_minutes)
+    return unsent
+
+
+def build_config_reminders(deadline: Deadline, existing_minutes: Iterable[int]) -> list[ReminderSchedule]:
+    """
+    Create email reminders for a deadline's ``reminder_config``.
+
+    Config entries already covered by a reminder with the same offset are
+    skipped, as the config scan always did.
+
+    Args:
+        deadline: Deadline with a reminder_config (days before the deadline).
+        existing_minutes: Offsets of the deadline's existing reminders.
+
+    Returns:
+        New, unsaved ReminderSchedule rows.
+    """
+    existing = set(existing_minutes)
+    schedules = []
+    for days_before in sorted(set(deadline.reminder_config or []), reverse=True):
+        minutes_before = days_before * MINUTES_PER_DAY
+        if minutes_before in existing:
+            continue
+        schedules.append(
+            ReminderSchedule(
+                deadline_id=deadline.id,
+                reminder_type="email",
+                remind_before_minutes=minutes_before,
+                is_sent=False,
+                fire_at=compute_fire_at(deadline.sponsor_deadline, minutes_before),
+            )
+        )
+    return schedules
+
+
+def _scores(fire_times: dict[UUID | str, datetime]) -> dict[str, float]:
+    return {str(schedule_id): fire_at.timestamp() for schedule_id, fire_at in fire_times.items() if fire_at}
+
+
+class ReminderIndex:
+    """Redis sorted set of unsent reminders keyed by fire time."""
+
+    def __init__(self, redis_client: redis.Redis):
+        """
+        Initialize index.
+
+        Args:
+            redis_client: Redis client (decoded responses).
+        """
+        self.redis = redis_client
+
+    def add(self, fire_times: dict[UUID | str, datetime]) -> None:
+        """
+        Index reminders, replacing any previous fire time.
+
+        Args:
+            fire_times: Mapping of reminder schedule ID to fire time.
+        """
+        scores = _scores(fire_times)
+        if scores:
+            self.redis.zadd(REMINDER_INDEX_KEY, scores)
+
+    def remove(self, schedule_ids: Iterable[UUID | str]) -> None:
+        """
+        Drop reminders from the index.
+
+        Args:
+            schedule_ids: Reminders that were sent, deleted, or are no longer eligible.
+        """
+        ids = [str(schedule_id) for schedule_id in schedule_ids]
+        if ids:
+            self.redis.zrem(REMINDER_INDEX_KEY, *ids)
+
+    def claim_due(self, now: Optional[datetime] = None, limit: int = 200) -> list[str]:
+        """
+        Claim reminders whose fire time has passed.
+
+        Claimed reminders' scores move forward by CLAIM_LEASE_SECONDS, so a
+        reminder whose worker dies is retried once the lease expires. The
+        dispatcher removes or re-scores them once handled.
+
+        Args:
+            now: Reference time (defaults to the current time).
+            limit: Maximum reminders claimed.
+
+        Returns:
+            Claimed reminder schedule ids.
+        """
+        now = now or datetime.now(timezone.utc)
+        schedule_ids = self.redis.zrangebyscore(REMINDER_INDEX_KEY, "-inf", now.timestamp(), start=0, num=limit)
+        if schedule_ids:
+            lease_until = now.timestamp() + CLAIM_LEASE_SECONDS
+            self.redis.zadd(REMINDER_INDEX_KEY, dict.fromkeys(schedule_ids, lease_until), xx=True)
+        return schedule_ids
+
+    def due_count(self, now: Optional[datetime] = None) -> int:
+        """Number of indexed reminders due at ``now``."""
+        now = now or datetime.now(timezone.utc)
+        return self.redis.zcount(REMINDER_INDEX_KEY, "-inf", now.timestamp())
+
+
+def get_reminder_index() -> ReminderIndex:
+    """
+    Get a reminder index backed by the application Redis.
+
+    Returns:
+        ReminderIndex instance.
+    """
+    return ReminderIndex(redis.from_url(settings.redis_url, decode_responses=True))
+
+
+async def index_reminders(fire_times: dict[UUID | str, datetime]) -> None:
+    """
+    Index reminders from async request handlers.
+
+    Failures are logged and ignored: the row's ``fire_at`` is authoritative
+    and the hourly sync re-indexes reminders due soon.
+
+    Args:
+        fire_times: Mapping of reminder schedule ID to fire time.
+    """
+    scores = _scores(fire_times)
+    if not scores:
+        return
+    try:
+        client = aioredis.from_url(settings.redis_url, decode_responses=True)
+        try:
+            await client.zadd(REMINDER_INDEX_KEY, scores)
+        finally:
+            await client.aclose()
+    except redis.RedisError as e:
+        logger.warning(f"Failed to index {len(scores)} reminders: {e}")
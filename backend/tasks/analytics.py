@@ -13,17 +13,17 @@ Tasks:
 
 import json
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Any, Optional
 
 import redis
-from sqlalchemy import and_, func
+from sqlalchemy import and_, case, func, literal_column, true
 from sqlalchemy.orm import Session
 
 from backend.celery_app import celery_app, normal_task
 from backend.core.config import settings
 from backend.database import get_sync_db
-from backend.models import AlertSent, Grant, Match, User
+from backend.models import AlertSent, AnalyticsDailyRollup, Grant, Match, User
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +80,128 @@ def _calculate_percentage(numerator: int, denominator: int) -> float:
 # =============================================================================
 
 
+# Match score histogram: upper bounds of each bucket but the last (scores are 0-1)
+SCORE_BUCKETS = ["0-20", "20-40", "40-60", "60-80", "80-90", "90-100"]
+SCORE_BUCKET_BOUNDS = [0.2, 0.4, 0.6, 0.8, 0.9]
+
+# Days of rollup rows included in the daily summary
+DAILY_ACTIVITY_DAYS = 30
+
+
+def _score_bucket(db: Session) -> Any:
+    """
+    SQL expression for a match's SCORE_BUCKETS index.
+
+    Uses width_bucket over the bucket bounds on PostgreSQL and an
+    equivalent CASE elsewhere.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # Bounds inlined so the expression is identical in SELECT and GROUP BY
+        bounds = ", ".join(str(bound) for bound in SCORE_BUCKET_BOUNDS)
+        return func.width_bucket(Match.match_score, literal_column(f"ARRAY[{bounds}]::float8[]"))
+    return case(
+        *((Match.match_score < bound, index) for index, bound in enumerate(SCORE_BUCKET_BOUNDS)),
+        else_=len(SCORE_BUCKET_BOUNDS),
+    )
+
+
+def _refresh_daily_rollups(db: Session) -> Optional[date]:
+    """
+    Bring analytics_daily_rollups up to date from its last checkpoint.
+
+    The checkpoint is the latest stored day. That day (which may have been
+    partial when stored) and every later day are re-aggregated with one
+    grouped query per table over rows created since then; earlier days are
+    left as stored. The first run backfills all days.
+
+    Returns:
+        The checkpoint day the refresh started from, or None for a backfill
+    """
+    checkpoint = db.query(func.max(AnalyticsDailyRollup.day)).scalar()
+    if isinstance(checkpoint, str):
+        checkpoint = date.fromisoformat(checkpoint)
+    since = datetime.combine(checkpoint, datetime.min.time()) if checkpoint else None
+
+    def since_filter(column: Any) -> Any:
+        return column >= since if since is not None else true()
+
+    rollups: dict[date, dict[str, Any]] = {}
+
+    def row_for(day: Any) -> dict[str, Any]:
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        return rollups.setdefault(
+            day,
+            {
+                "grants_created": 0,
+                "grants_by_source": {},
+                "matches_created": 0,
+                "match_score_sum": 0.0,
+                "alerts_sent": 0,
+                "alerts_by_channel": {},
+            },
+        )
+
+    grant_day = func.date(Grant.created_at)
+    for day, source, count in (
+        db.query(grant_day, Grant.source, func.count(Grant.id))
+        .filter(since_filter(Grant.created_at))
+        .group_by(grant_day, Grant.source)
+    ):
+        row = row_for(day)
+        row["grants_created"] += count
+        row["grants_by_source"][source] = count
+
+    match_day = func.date(Match.created_at)
+    for day, count, score_sum in (
+        db.query(match_day, func.count(Match.id), func.sum(Match.match_score))
+        .filter(since_filter(Match.created_at))
+        .group_by(match_day)
+    ):
+        row = row_for(day)
+        row["matches_created"] = count
+        row["match_score_sum"] = float(score_sum or 0.0)
+
+    alert_day = func.date(AlertSent.sent_at)
+    for day, channel, count in (
+        db.query(alert_day, AlertSent.channel, func.count(AlertSent.id))
+        .filter(since_filter(AlertSent.sent_at))
+        .group_by(alert_day, AlertSent.channel)
+    ):
+        row = row_for(day)
+        row["alerts_sent"] += count
+        row["alerts_by_channel"][channel] = count
+
+    if checkpoint is not None:
+        db.query(AnalyticsDailyRollup).filter(AnalyticsDailyRollup.day >= checkpoint).delete()
+    updated_at = datetime.utcnow()
+    db.add_all(AnalyticsDailyRollup(day=day, updated_at=updated_at, **row) for day, row in rollups.items() if day)
+    db.commit()
+    return checkpoint
+
+
+def _daily_activity(db: Session, since: date) -> list[dict[str, Any]]:
+    """Read precomputed per-day activity from analytics_daily_rollups."""
+    rows = (
+        db.query(AnalyticsDailyRollup)
+        .filter(AnalyticsDailyRollup.day >= since)
+        .order_by(AnalyticsDailyRollup.day)
+        .all()
+    )
+    return [
+        {
+            "day": row.day.isoformat(),
+            "grants_created": row.grants_created,
+            "grants_by_source": row.grants_by_source,
+            "matches_created": row.matches_created,
+            "avg_match_score": round(row.match_score_sum / row.matches_created, 4) if row.matches_created else 0.0,
+            "alerts_sent": row.alerts_sent,
+            "alerts_by_channel": row.alerts_by_channel,
+        }
+        for row in rows
+    ]
+
+
 @normal_task
 @celery_app.task(bind=True, name="backend.tasks.analytics.compute_daily_analytics")
 def compute_daily_analytics(self) -> dict[str, Any]:
@@ -92,8 +214,14 @@ def compute_daily_analytics(self) -> dict[str, Any]:
     - Match score distribution
     - Alert delivery success rates
     - User engagement metrics
+    - Per-day activity for the last 30 days
 
-    Results are cached in Redis and can optionally be stored in a metrics table.
+    Each table is read with one grouped aggregate query (FILTER clauses for
+    the time windows, a width_bucket histogram for scores), so no rows are
+    loaded into Python. Per-day activity is maintained incrementally in
+    analytics_daily_rollups and read back from there.
+
+    Results are cached in Redis.
 
     Returns:
         dict: Analytics summary with all computed metrics
@@ -106,99 +234,78 @@ def compute_daily_analytics(self) -> dict[str, Any]:
         now = datetime.utcnow()
         last_24h = now - timedelta(hours=24)
         last_7d = now - timedelta(days=7)
-        now - timedelta(days=30)
 
         # ===== Grant Discovery Metrics =====
-        # Total grants by source
-        grants_by_source = db.query(Grant.source, func.count(Grant.id)).group_by(Grant.source).all()
-        total_grants = sum(count for _, count in grants_by_source)
-
-        # Recent grant discovery
-        grants_last_24h = db.query(func.count(Grant.id)).filter(Grant.created_at >= last_24h).scalar() or 0
-
-        grants_last_7d = db.query(func.count(Grant.id)).filter(Grant.created_at >= last_7d).scalar() or 0
-
-        # Active grants (deadline not passed)
-        active_grants = db.query(func.count(Grant.id)).filter(Grant.deadline >= now).scalar() or 0
-
-        # ===== Match Computation Metrics =====
-        # Total matches computed
-        total_matches = db.query(func.count(Match.id)).scalar() or 0
-
-        matches_last_24h = db.query(func.count(Match.id)).filter(Match.created_at >= last_24h).scalar() or 0
-
-        matches_last_7d = db.query(func.count(Match.id)).filter(Match.created_at >= last_7d).scalar() or 0
-
-        # ===== Match Score Distribution =====
-        # Calculate score buckets
-        score_buckets = {
-            "0-20": 0,
-            "20-40": 0,
-            "40-60": 0,
-            "60-80": 0,
-            "80-90": 0,
-            "90-100": 0,
-        }
-
-        # Convert match_score from 0-1 to 0-100 for bucketing
-        matches = db.query(Match.match_score).all()
-        for (score,) in matches:
-            score_percent = score * 100
-            if score_percent < 20:
-                score_buckets["0-20"] += 1
-            elif score_percent < 40:
-                score_buckets["20-40"] += 1
-            elif score_percent < 60:
-                score_buckets["40-60"] += 1
-            elif score_percent < 80:
-                score_buckets["60-80"] += 1
-            elif score_percent < 90:
-                score_buckets["80-90"] += 1
-            else:
-                score_buckets["90-100"] += 1
-
-        # Average match score
-        avg_match_score = db.query(func.avg(Match.match_score)).scalar() or 0.0
+        grants_by_source: dict[str, int] = {}
+        grants_last_24h = grants_last_7d = active_grants = 0
+        for source, count, count_24h, count_7d, count_active in db.query(
+            Grant.source,
+            func.count(Grant.id),
+            func.count(Grant.id).filter(Grant.created_at >= last_24h),
+            func.count(Grant.id).filter(Grant.created_at >= last_7d),
+            func.count(Grant.id).filter(Grant.deadline >= now),
+        ).group_by(Grant.source):
+            grants_by_source[source] = count
+            grants_last_24h += count_24h
+            grants_last_7d += count_7d
+            active_grants += count_active
+        total_grants = sum(grants_by_source.values())
+
+        # ===== Match Computation and User Engagement Metrics =====
+        (
+            total_matches,
+            matches_last_24h,
+            matches_last_7d,
+            avg_match_score,
+            active_users,
+            users_with_actions,
+        ) = db.query(
+            func.count(Match.id),
+            func.count(Match.id).filter(Match.created_at >= last_24h),
+            func.count(Match.id).filter(Match.created_at >= last_7d),
+            func.avg(Match.match_score),
+            func.count(func.distinct(Match.user_id)),
+            func.count(func.distinct(Match.user_id)).filter(Match.user_action.isnot(None)),
+        ).one()
+
+        # ===== Match Score Distribution and User Actions =====
+        score_buckets = dict.fromkeys(SCORE_BUCKETS, 0)
+        user_actions: dict[str, int] = {}
+        bucket = _score_bucket(db)
+        for bucket_index, action, count in db.query(bucket, Match.user_action, func.count(Match.id)).group_by(
+            bucket, Match.user_action
+        ):
+            score_buckets[SCORE_BUCKETS[min(max(int(bucket_index), 0), len(SCORE_BUCKETS) - 1)]] += count
+            if action is not None:
+                user_actions[action] = user_actions.get(action, 0) + count
 
         # ===== Alert Delivery Metrics =====
-        # Total alerts sent
-        total_alerts_sent = db.query(func.count(AlertSent.id)).scalar() or 0
-
-        alerts_by_channel = db.query(AlertSent.channel, func.count(AlertSent.id)).group_by(AlertSent.channel).all()
-
-        # Alert engagement rates
-        total_opened = db.query(func.count(AlertSent.id)).filter(AlertSent.opened_at.isnot(None)).scalar() or 0
-
-        total_clicked = db.query(func.count(AlertSent.id)).filter(AlertSent.clicked_at.isnot(None)).scalar() or 0
+        alerts_by_channel: dict[str, int] = {}
+        total_opened = total_clicked = alerts_last_24h = 0
+        for channel, count, opened, clicked, count_24h in db.query(
+            AlertSent.channel,
+            func.count(AlertSent.id),
+            func.count(AlertSent.id).filter(AlertSent.opened_at.isnot(None)),
+            func.count(AlertSent.id).filter(AlertSent.clicked_at.isnot(None)),
+            func.count(AlertSent.id).filter(AlertSent.sent_at >= last_24h),
+        ).group_by(AlertSent.channel):
+            alerts_by_channel[channel] = count
+            total_opened += opened
+            total_clicked += clicked
+            alerts_last_24h += count_24h
+        total_alerts_sent = sum(alerts_by_channel.values())
 
         open_rate = _calculate_percentage(total_opened, total_alerts_sent)
         click_rate = _calculate_percentage(total_clicked, total_alerts_sent)
         click_through_rate = _calculate_percentage(total_clicked, total_opened)
 
-        # Recent alert activity
-        alerts_last_24h = db.query(func.count(AlertSent.id)).filter(AlertSent.sent_at >= last_24h).scalar() or 0
-
-        # ===== User Engagement Metrics =====
-        # Total active users (users with matches)
-        active_users = db.query(func.count(func.distinct(Match.user_id))).scalar() or 0
-
         # Total registered users
         total_users = db.query(func.count(User.id)).scalar() or 0
-
-        # Users who took action on matches
-        users_with_actions = (
-            db.query(func.count(func.distinct(Match.user_id))).filter(Match.user_action.isnot(None)).scalar() or 0
-        )
-
         user_engagement_rate = _calculate_percentage(users_with_actions, active_users)
 
-        # User actions breakdown
-        user_actions = (
-            db.query(Match.user_action, func.count(Match.id))
-            .filter(Match.user_action.isnot(None))
-            .group_by(Match.user_action)
-            .all()
-        )
+        # ===== Per-Day Activity =====
+        _refresh_daily_rollups(db)
+        daily_activity = _daily_activity(db, (now - timedelta(days=DAILY_ACTIVITY_DAYS)).date())
 
         # ===== Compile Analytics Summary =====
         analytics_summary = {
@@ -207,7 +314,7 @@ def compute_daily_analytics(self) -> dict[str, Any]:
             "grant_discovery": {
                 "total_grants": total_grants,
                 "active_grants": active_grants,
-                "grants_by_source": dict(grants_by_source),
+                "grants_by_source": grants_by_source,
                 "grants_last_24h": grants_last_24h,
                 "grants_last_7d": grants_last_7d,
             },
@@ -215,13 +322,13 @@ def compute_daily_analytics(self) -> dict[str, Any]:
                 "total_matches": total_matches,
                 "matches_last_24h": matches_last_24h,
                 "matches_last_7d": matches_last_7d,
-                "avg_match_score": round(float(avg_match_score), 4),
+                "avg_match_score": round(float(avg_match_score or 0.0), 4),
                 "score_distribution": score_buckets,
             },
             "alert_delivery": {
                 "total_alerts_sent": total_alerts_sent,
                 "alerts_last_24h": alerts_last_24h,
-                "alerts_by_channel": dict(alerts_by_channel),
+                "alerts_by_channel": alerts_by_channel,
                 "open_rate_percent": open_rate,
                 "click_rate_percent": click_rate,
                 "click_through_rate_percent": click_through_rate,
@@ -231,8 +338,9 @@ def compute_daily_analytics(self) -> dict[str, Any]:
                 "active_users": active_users,
                 "users_with_actions": users_with_actions,
                 "engagement_rate_percent": user_engagement_rate,
-                "user_actions": dict(user_actions),
+                "user_actions": user_actions,
             },
+            "daily_activity": daily_activity,
         }
 
         # Cache the results
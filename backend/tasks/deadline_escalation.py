@@ -57,7 +57,7 @@ def check_deadline_escalations() -> dict:
             .where(
                 and_(
                     Deadline.status == DeadlineStatus.NOT_STARTED.value,
-                    not Deadline.escalation_sent,
+                    Deadline.escalation_sent.is_(False),
                     Deadline.sponsor_deadline <= threshold_date,
                     Deadline.sponsor_deadline > now,  # Not already past
                 )
@@ -4,8 +4,10 @@ Celery tasks for sending reminders for user-created deadlines.
 """
 
 import logging
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
+from typing import Optional
 
+import redis
 from sqlalchemy import and_, select
 
 from agents.delivery.channels import get_sendgrid_channel, get_twilio_channel
@@ -13,6 +15,12 @@ from backend.celery_app import celery_app
 from backend.core.config import settings
 from backend.database import get_sync_session
 from backend.models import Deadline, ReminderSchedule, User
+from backend.services.reminder_index import (
+    INDEX_HORIZON,
+    ReminderIndex,
+    build_config_reminders,
+    get_reminder_index,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,69 +32,160 @@ REMINDER_ELIGIBLE_STATUSES = {
     "internal_review",
 }
 
+# Reminders loaded and committed together
+REMINDER_BATCH_SIZE = 200
+
+# Upper bound on batches per run; the rest wait for the next run
+MAX_BATCHES_PER_RUN = 50
+
+# Deadlines materialized per config sync batch
+CONFIG_SYNC_BATCH_SIZE = 500
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
 
 @celery_app.task(queue="normal")
 def check_and_send_deadline_reminders() -> dict:
     """
-    Check for pending deadline reminders and send them.
+    Send deadline reminders whose fire time has passed.
 
-    Uses both ReminderSchedule table and per-deadline reminder_config.
+    Due reminder ids are claimed from the Redis due-time index and loaded
+    by primary key in batches, so a run only touches reminders that are
+    due. If Redis is unavailable, due rows are read from the
+    (is_sent, fire_at) index on reminder_schedules instead.
     Runs every 5 minutes via Celery Beat.
 
     Returns:
         Dictionary with reminder statistics.
     """
     now = datetime.now(timezone.utc)
+    index: Optional[ReminderIndex] = get_reminder_index()
     reminders_sent = 0
     errors = 0
+    attempted: set = set()
 
     with get_sync_session() as session:
-        # Method 1: Check ReminderSchedule table for pending reminders
-        result = session.execute(
-            select(ReminderSchedule, Deadline, User)
-            .join(Deadline, ReminderSchedule.deadline_id == Deadline.id)
-            .join(User, Deadline.user_id == User.id)
-            .where(
-                and_(
-                    not ReminderSchedule.is_sent,
-                    Deadline.status.in_(REMINDER_ELIGIBLE_STATUSES),
-                )
-            )
-        )
+        for _ in range(MAX_BATCHES_PER_RUN):
+            schedule_ids = None
+            if index is not None:
+                try:
+                    schedule_ids = index.claim_due(now, limit=REMINDER_BATCH_SIZE)
+                except redis.RedisError as e:
+                    logger.warning(f"Reminder index unavailable, falling back to database: {e}")
+                    index = None
+            if schedule_ids is None:
+                schedule_ids = _due_reminder_ids(session, now, exclude=attempted)
+            if not schedule_ids:
+                break
+
+            attempted.update(schedule_ids)
+            sent, failed = _dispatch_batch(session, schedule_ids, now, index)
+            reminders_sent += sent
+            errors += failed
 
-        pending = result.all()
+    logger.info(f"Deadline reminders: sent={reminders_sent}, errors={errors}")
+    return {"sent": reminders_sent, "errors": errors}
 
-        for schedule, deadline, user in pending:
-            # Calculate when reminder should be sent
-            reminder_time = deadline.sponsor_deadline - timedelta(minutes=schedule.remind_before_minutes)
 
-            if now >= reminder_time:
-                try:
-                    # Send the reminder
-                    _send_reminder(schedule, deadline, user)
+def _due_reminder_ids(session, now: datetime, exclude: set) -> list:
+    """Read due, unsent reminder ids for deadlines that have not passed."""
+    query = (
+        select(ReminderSchedule.id)
+        .join(Deadline, ReminderSchedule.deadline_id == Deadline.id)
+        .where(
+            and_(
+                ReminderSchedule.is_sent.is_(False),
+                ReminderSchedule.fire_at <= now,
+                Deadline.sponsor_deadline > now,
+                Deadline.status.in_(REMINDER_ELIGIBLE_STATUSES),
+            )
+        )
+        .order_by(ReminderSchedule.fire_at)
+        .limit(REMINDER_BATCH_SIZE)
+    )
+    if exclude:
+        query = query.where(ReminderSchedule.id.notin_(exclude))
+    return list(session.execute(query).scalars())
 
-                    # Mark as sent
-                    schedule.is_sent = True
-                    schedule.sent_at = now
-                    reminders_sent += 1
 
-                except Exception as e:
-                    logger.error(f"Failed to send reminder {schedule.id}: {e}")
-                    errors += 1
+def _dispatch_batch(session, schedule_ids: list, now: datetime, index: Optional[ReminderIndex]) -> tuple[int, int]:
+    """
+    Send one batch of claimed reminders.
 
-        session.commit()
+    Rows are re-checked before sending: reminders already sent, deleted,
+    or on a deadline that is no longer eligible leave the index, and
+    reminders whose deadline moved later are re-scored. Reminders for a
+    deadline that has already passed are closed without sending
+    (is_sent with no sent_at). Failed sends stay claimed and are retried
+    when their lease expires.
 
-    logger.info(f"Deadline reminders: sent={reminders_sent}, errors={errors}")
-    return {"sent": reminders_sent, "errors": errors}
+    Returns:
+        Tuple of (reminders sent, send failures).
+    """
+    rows = session.execute(
+        select(ReminderSchedule, Deadline, User)
+        .join(Deadline, ReminderSchedule.deadline_id == Deadline.id)
+        .join(User, Deadline.user_id == User.id)
+        .where(ReminderSchedule.id.in_(schedule_ids))
+    ).all()
+
+    done = {str(schedule_id) for schedule_id in schedule_ids}
+    not_yet_due = {}
+    sent = 0
+    expired = 0
+    errors = 0
+
+    for schedule, deadline, user in rows:
+        if schedule.is_sent or deadline.status not in REMINDER_ELIGIBLE_STATUSES:
+            continue
+        if _as_utc(deadline.sponsor_deadline) <= now:
+            schedule.is_sent = True
+            expired += 1
+            continue
+        if schedule.fire_at is None or _as_utc(schedule.fire_at) > now:
+            if schedule.fire_at is not None:
+                not_yet_due[str(schedule.id)] = _as_utc(schedule.fire_at)
+                done.discard(str(schedule.id))
+            continue
+
+        try:
+            _send_reminder(schedule, deadline, user)
+
+            schedule.is_sent = True
+            schedule.sent_at = now
+            sent += 1
+        except Exception as e:
+            logger.error(f"Failed to send reminder {schedule.id}: {e}")
+            done.discard(str(schedule.id))
+            errors += 1
+
+    session.commit()
+    if expired:
+        logger.info(f"Closed {expired} reminders for deadlines that have passed")
+
+    if index is not None:
+        try:
+            index.remove(done)
+            index.add(not_yet_due)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to update reminder index: {e}")
+
+    return sent, errors
 
 
 @celery_app.task(queue="normal")
 def check_reminder_config_reminders() -> dict:
     """
-    Check deadlines' reminder_config and create/send reminders.
+    Materialize config reminders and re-index reminders due soon.
 
-    This task uses the per-deadline reminder_config (days before deadline)
-    to send reminders. It creates ReminderSchedule entries for tracking.
+    Deadlines created through the API get ReminderSchedule rows for their
+    reminder_config up front; this backfills eligible future deadlines
+    that have none. It then re-adds unsent reminders firing within
+    INDEX_HORIZON on deadlines that have not passed to the Redis index,
+    covering index writes that failed.
+    Sending is left to check_and_send_deadline_reminders.
 
     Runs every hour via Celery Beat.
 
@@ -95,78 +194,55 @@ def check_reminder_config_reminders() -> dict:
     """
     now = datetime.now(timezone.utc)
     reminders_created = 0
+    reminders_indexed = 0
     errors = 0
 
     with get_sync_session() as session:
-        # Find deadlines with reminder_config that are eligible for reminders
-        result = session.execute(
-            select(Deadline, User)
-            .join(User, Deadline.user_id == User.id)
-            .where(
-                and_(
-                    Deadline.status.in_(REMINDER_ELIGIBLE_STATUSES),
-                    Deadline.reminder_config.isnot(None),
-                    Deadline.sponsor_deadline > now,  # Future deadlines only
+        has_reminders = select(ReminderSchedule.id).where(ReminderSchedule.deadline_id == Deadline.id).exists()
+        deadlines = (
+            session.execute(
+                select(Deadline).where(
+                    and_(
+                        Deadline.status.in_(REMINDER_ELIGIBLE_STATUSES),
+                        Deadline.reminder_config.isnot(None),
+                        Deadline.sponsor_deadline > now,  # Future deadlines only
+                        ~has_reminders,
+                    )
                 )
             )
+            .scalars()
+            .all()
         )
 
-        deadlines_users = result.all()
-
-        for deadline, user in deadlines_users:
-            if not deadline.reminder_config:
-                continue
+        for start in range(0, len(deadlines), CONFIG_SYNC_BATCH_SIZE):
+            for deadline in deadlines[start : start + CONFIG_SYNC_BATCH_SIZE]:
+                schedules = build_config_reminders(deadline, existing_minutes=())
+                session.add_all(schedules)
+                reminders_created += len(schedules)
+            session.commit()
 
-            for days_before in deadline.reminder_config:
-                # Calculate when this reminder should be sent
-                reminder_time = deadline.sponsor_deadline - timedelta(days=days_before)
-                minutes_before = days_before * 24 * 60
-
-                # Skip if reminder time hasn't arrived yet
-                if now < reminder_time:
-                    continue
-
-                # Check if we already have a reminder for this config
-                existing = session.execute(
-                    select(ReminderSchedule).where(
-                        and_(
-                            ReminderSchedule.deadline_id == deadline.id,
-                            ReminderSchedule.remind_before_minutes == minutes_before,
-                        )
-                    )
-                ).scalar_one_or_none()
-
-                if existing:
-                    # Already created this reminder
-                    continue
-
-                try:
-                    # Create and immediately send email reminder
-                    schedule = ReminderSchedule(
-                        deadline_id=deadline.id,
-                        remind_before_minutes=minutes_before,
-                        reminder_type="email",
-                        is_sent=False,
-                    )
-                    session.add(schedule)
-                    session.flush()
-
-                    # Send the reminder
-                    _send_reminder(schedule, deadline, user)
-
-                    # Mark as sent
-                    schedule.is_sent = True
-                    schedule.sent_at = now
-                    reminders_created += 1
-
-                except Exception as e:
-                    logger.error(f"Failed to create/send config reminder for deadline {deadline.id}: {e}")
-                    errors += 1
+        due_soon = session.execute(
+            select(ReminderSchedule.id, ReminderSchedule.fire_at)
+            .join(Deadline, ReminderSchedule.deadline_id == Deadline.id)
+            .where(
+                and_(
+                    ReminderSchedule.is_sent.is_(False),
+                    ReminderSchedule.fire_at <= now + INDEX_HORIZON,
+                    Deadline.sponsor_deadline > now,
+                    Deadline.status.in_(REMINDER_ELIGIBLE_STATUSES),
+                )
+            )
+        ).all()
 
-        session.commit()
+    try:
+        get_reminder_index().add({row.id: _as_utc(row.fire_at) for row in due_soon})
+        reminders_indexed = len(due_soon)
+    except redis.RedisError as e:
+        logger.error(f"Failed to re-index reminders: {e}")
+        errors += 1
 
-    logger.info(f"Config-based reminders: created/sent={reminders_created}, errors={errors}")
-    return {"reminders_created": reminders_created, "errors": errors}
+    logger.info(f"Config-based reminders: created={reminders_created}, indexed={reminders_indexed}, errors={errors}")
+    return {"reminders_created": reminders_created, "reminders_indexed": reminders_indexed, "errors": errors}
 
 
 def _send_reminder(schedule: ReminderSchedule, deadline: Deadline, user: User) -> None:
@@ -334,4 +410,5 @@ def _send_sms_reminder(user: User, deadline: Deadline, time_str: str) -> None:
 
 __all__ = [
     "check_and_send_deadline_reminders",
+    "check_reminder_config_reminders",
 ]
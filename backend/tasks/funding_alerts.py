@@ -1,6 +1,6 @@
 """Celery tasks for funding alert emails."""
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import logging
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail
@@ -8,119 +8,161 @@ from sendgrid.helpers.mail import Mail
 from backend.celery_app import celery_app
 from backend.core.config import settings
 from backend.models import User, FundingAlertPreference
-from backend.services.funding_alerts import FundingAlertsService
-from sqlalchemy import select
+from backend.services.funding_alerts import FundingAlertsService, next_alert_time
+from sqlalchemy import select, update
 
 logger = logging.getLogger(__name__)
 
+# Users previewed and sent per batch task
+ALERT_BATCH_SIZE = 100
+
+# How long claimed users are hidden from the scheduler while their batch runs
+CLAIM_LEASE = timedelta(hours=2)
+
+# Users with nothing to send are checked again after this long
+NO_CONTENT_RETRY = timedelta(days=1)
+
+
+async def _send_alerts(user_ids: list[str]) -> int:
+    """
+    Preview and send funding alerts for a batch of users.
+
+    Candidate matches and deadlines are loaded once for the whole batch.
+    Each user's next_send_at moves to their next alert after a send, or
+    one day out when there is nothing new.
+
+    Args:
+        user_ids: Users to alert.
+
+    Returns:
+        Number of alerts sent.
+    """
+    from backend.database import AsyncSessionLocal
+
+    if not settings.sendgrid_api_key:
+        logger.warning("SendGrid not configured, skipping funding alerts", extra={"users": len(user_ids)})
+        return 0
+
+    sent = 0
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(User, FundingAlertPreference)
+            .join(FundingAlertPreference, FundingAlertPreference.user_id == User.id)
+            .where(User.id.in_(user_ids))
+            .where(FundingAlertPreference.enabled)
+        )
+        recipients = result.all()
+        if len(recipients) < len(user_ids):
+            logger.info("Alerts disabled or user missing", extra={"skipped": len(user_ids) - len(recipients)})
+
+        service = FundingAlertsService()
+        previews = await service.preview_alerts(db, recipients)
+        sg = SendGridAPIClient(settings.sendgrid_api_key)
+
+        for user, prefs in recipients:
+            preview = previews[user.id]
+            now = datetime.now(timezone.utc)
+
+            if not preview.would_send:
+                logger.info("No content to send", extra={"user_id": str(user.id), "reason": preview.reason})
+                prefs.next_send_at = now + NO_CONTENT_RETRY
+                await db.commit()
+                continue
+
+            try:
+                message = Mail(
+                    from_email=f"{settings.from_name} <{settings.from_email}>",
+                    to_emails=user.email,
+                    subject=f"Your GrantRadar Funding Update - {datetime.now().strftime('%b %d')}",
+                    html_content=service.generate_email_html(user, preview),
+                )
+                response = sg.send(message)
+
+                logger.info(
+                    "Funding alert sent",
+                    extra={
+                        "user_id": str(user.id),
+                        "status_code": response.status_code,
+                        "grants": len(preview.new_grants),
+                        "deadlines": len(preview.upcoming_deadlines),
+                    },
+                )
+
+                prefs.last_sent_at = now
+                prefs.next_send_at = next_alert_time(prefs.frequency, now)
+                await db.commit()
+                sent += 1
+
+            except Exception as e:
+                # Left claimed; the scheduler retries once the lease expires
+                logger.error("Failed to send alert email", extra={"user_id": str(user.id), "error": str(e)})
+
+    return sent
+
 
 @celery_app.task(name="backend.tasks.funding_alerts.send_user_alert")
 def send_funding_alert(user_id: str):
     """Send funding alert to a specific user."""
     import asyncio
 
-    async def _send():
-        from backend.database import AsyncSessionLocal
+    asyncio.run(_send_alerts([user_id]))
 
-        async with AsyncSessionLocal() as db:
-            # Get user
-            result = await db.execute(select(User).where(User.id == user_id))
-            user = result.scalar_one_or_none()
-            if not user:
-                logger.warning("User not found for alert", extra={"user_id": user_id})
-                return
 
-            # Get preferences
-            result = await db.execute(select(FundingAlertPreference).where(FundingAlertPreference.user_id == user_id))
-            prefs = result.scalar_one_or_none()
+@celery_app.task(name="backend.tasks.funding_alerts.send_alert_batch")
+def send_funding_alert_batch(user_ids: list[str]) -> int:
+    """Send funding alerts to a batch of due users."""
+    import asyncio
 
-            if not prefs or not prefs.enabled:
-                logger.info("Alerts disabled for user", extra={"user_id": user_id})
-                return
+    return asyncio.run(_send_alerts(user_ids))
 
-            # Generate alert content
-            service = FundingAlertsService()
-            preview = await service.preview_alert(db, user)
 
-            if not preview.would_send:
-                logger.info("No content to send", extra={"user_id": user_id, "reason": preview.reason})
-                return
-
-            # Generate email HTML
-            html_content = service.generate_email_html(user, preview)
-
-            # Send via SendGrid
-            if settings.sendgrid_api_key:
-                try:
-                    message = Mail(
-                        from_email=f"{settings.from_name} <{settings.from_email}>",
-                        to_emails=user.email,
-                        subject=f"Your GrantRadar Funding Update - {datetime.now().strftime('%b %d')}",
-                        html_content=html_content,
-                    )
-
-                    sg = SendGridAPIClient(settings.sendgrid_api_key)
-                    response = sg.send(message)
-
-                    logger.info(
-                        "Funding alert sent",
-                        extra={
-                            "user_id": user_id,
-                            "status_code": response.status_code,
-                            "grants": len(preview.new_grants),
-                            "deadlines": len(preview.upcoming_deadlines),
-                        },
-                    )
-
-                    # Update last_sent_at
-                    prefs.last_sent_at = datetime.now(timezone.utc)
-                    await db.commit()
-
-                except Exception as e:
-                    logger.error("Failed to send alert email", extra={"user_id": user_id, "error": str(e)})
-                    raise
-            else:
-                logger.warning("SendGrid not configured, skipping email", extra={"user_id": user_id})
-
-    asyncio.run(_send())
+@celery_app.task(name="backend.tasks.funding_alerts.send_scheduled_alerts")
+def send_scheduled_alerts() -> int:
+    """
+    Queue funding alerts for users whose next alert is due.
 
+    Due users are selected with the (enabled, next_send_at) index and
+    claimed by pushing next_send_at forward by CLAIM_LEASE, then sent in
+    batches of ALERT_BATCH_SIZE.
 
-@celery_app.task(name="backend.tasks.funding_alerts.send_scheduled_alerts")
-def send_scheduled_alerts():
-    """Send scheduled funding alerts based on user preferences."""
+    Returns:
+        Number of users queued.
+    """
     import asyncio
 
-    async def _send_all():
+    async def _queue_due():
         from backend.database import AsyncSessionLocal
 
+        queued = 0
         async with AsyncSessionLocal() as db:
             now = datetime.now(timezone.utc)
 
-            # Find users due for alerts
-            result = await db.execute(select(FundingAlertPreference).where(FundingAlertPreference.enabled))
-            all_prefs = result.scalars().all()
-
-            for prefs in all_prefs:
-                # Check if due based on frequency
-                if prefs.last_sent_at:
-                    if prefs.frequency == "daily":
-                        delta = now - prefs.last_sent_at
-                        if delta.days < 1:
-                            continue
-                    elif prefs.frequency == "weekly":
-                        delta = now - prefs.last_sent_at
-                        if delta.days < 7:
-                            continue
-                    elif prefs.frequency == "monthly":
-                        delta = now - prefs.last_sent_at
-                        if delta.days < 30:
-                            continue
-
-                # Queue individual alert
-                send_funding_alert.delay(str(prefs.user_id))
-                logger.info("Queued funding alert", extra={"user_id": str(prefs.user_id)})
-
-    asyncio.run(_send_all())
+            while True:
+                result = await db.execute(
+                    select(FundingAlertPreference.user_id)
+                    .where(FundingAlertPreference.enabled)
+                    .where(FundingAlertPreference.next_send_at <= now)
+                    .order_by(FundingAlertPreference.next_send_at)
+                    .limit(ALERT_BATCH_SIZE)
+                )
+                user_ids = list(result.scalars().all())
+                if not user_ids:
+                    break
+
+                await db.execute(
+                    update(FundingAlertPreference)
+                    .where(FundingAlertPreference.user_id.in_(user_ids))
+                    .values(next_send_at=now + CLAIM_LEASE)
+                )
+                await db.commit()
+
+                send_funding_alert_batch.delay([str(user_id) for user_id in user_ids])
+                queued += len(user_ids)
+
+        logger.info("Queued funding alerts", extra={"users": queued})
+        return queued
+
+    return asyncio.run(_queue_due())
 
 
 # =============================================================================
@@ -129,5 +171,6 @@ def send_scheduled_alerts():
 
 __all__ = [
     "send_funding_alert",
+    "send_funding_alert_batch",
     "send_scheduled_alerts",
 ]
@@ -5,6 +5,7 @@ Celery tasks for processing, validating, and enriching grant data.
 Tasks consume from Redis streams and manage the grant lifecycle.
 """
 
+import asyncio
 import json
 import logging
 from datetime import datetime, timezone
@@ -20,8 +21,11 @@ from sqlalchemy.exc import IntegrityError
 from agents.curation.validator import CurationValidator
 from backend.celery_app import celery_app
 from backend.core.config import settings
+from backend.core.embedding_service import EmbeddingService
+from backend.core.vector_index import GRANTS, record_embedding_updates
 from backend.database import get_sync_db
 from backend.models import Grant
+from backend.tasks.notifications import notify_grant_update
 
 logger = logging.getLogger(__name__)
 
@@ -427,7 +431,6 @@ def compute_grant_embedding(self: Task, grant_id: str) -> dict[str, Any]:
     logger.info("Computing grant embedding", extra={"grant_id": grant_id})
 
     db = None
-    openai_client = None
 
     try:
         # Step 1: Fetch grant from database
@@ -476,19 +479,13 @@ def compute_grant_embedding(self: Task, grant_id: str) -> dict[str, Any]:
                 extra={"grant_id": grant_id, "original_length": len(embedding_text)},
             )
 
-        # Step 3: Call OpenAI API to generate embedding
+        # Step 3: Embed through the shared cache (calls OpenAI on a miss)
         if not settings.openai_api_key:
             raise ValueError("OPENAI_API_KEY not configured")
 
-        openai_client = openai.OpenAI(api_key=settings.openai_api_key)
-
         # Add rate limit handling with exponential backoff
         try:
-            response = openai_client.embeddings.create(
-                model=settings.embedding_model,
-                input=embedding_text,
-            )
-            embedding_vector = response.data[0].embedding
+            embedding_vector = EmbeddingService().embed(embedding_text)
 
         except openai.RateLimitError as e:
             logger.warning(
@@ -507,6 +504,7 @@ def compute_grant_embedding(self: Task, grant_id: str) -> dict[str, Any]:
         # Step 4: Store in grant.embedding field
         grant.embedding = embedding_vector
         db.commit()
+        record_embedding_updates(GRANTS, [(grant.id, embedding_vector)])
 
         logger.info(
             "Grant embedding stored successfully",
@@ -671,6 +669,189 @@ def consume_discovered_grants(batch_size: int = 10, block_ms: int = 5000) -> dic
             redis_client.close()
 
 
+# =============================================================================
+# Task 5: Apply Grant Updates
+# =============================================================================
+
+GRANT_UPDATES_STREAM = "grants:updated"
+GRANT_UPDATES_GROUP = "grant_updaters"
+GRANT_UPDATES_CONSUMER = "updater_worker"
+GRANT_UPDATES_DLQ = f"dlq:{GRANT_UPDATES_STREAM}"
+# Failed attempts per message ID; events move to the DLQ after the last one
+GRANT_UPDATES_ATTEMPTS_KEY = "grants:updated:attempts"
+GRANT_UPDATE_MAX_ATTEMPTS = 3
+# Pending events idle this long are reclaimed for a retry (shorter than the beat interval)
+GRANT_UPDATE_RETRY_IDLE_MS = 60_000
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    if not isinstance(value, str):
+        return value
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def apply_grant_update(db, update: dict[str, Any]) -> Optional[Grant]:
+    """
+    Apply an update event from "grants:updated" to the stored grant.
+
+    Args:
+        db: Sync database session; committed on success
+        update: Event with external_id, source, update_type, changes,
+            message and the current grant fields under "grant"
+
+    Returns:
+        The updated grant, or None if it is not in the database
+    """
+    grant = db.execute(
+        select(Grant).where(
+            Grant.external_id == update["external_id"],
+            Grant.source == update.get("source", "grants_gov"),
+        )
+    ).scalar_one_or_none()
+    if grant is None:
+        return None
+
+    data = update.get("grant", {})
+    grant.title = data.get("title") or grant.title
+    grant.description = data.get("description", grant.description)
+    grant.agency = data.get("agency") or grant.agency
+    grant.deadline = _parse_datetime(data.get("deadline"))
+    if data.get("award_floor") is not None:
+        grant.amount_min = int(data["award_floor"])
+    if data.get("award_ceiling") is not None:
+        grant.amount_max = int(data["award_ceiling"])
+    db.commit()
+    return grant
+
+
+def _handle_grant_update(db, update: dict[str, Any]) -> tuple[bool, int]:
+    """
+    Apply one update event and notify users about it.
+
+    Returns:
+        Whether the grant was found, and the number of users notified
+    """
+    grant = apply_grant_update(db, update)
+    if grant is None:
+        return False, 0
+    if {"title", "description"} & set(update.get("changes", {})):
+        compute_grant_embedding.delay(str(grant.id))
+    notified = asyncio.run(
+        notify_grant_update(
+            grant.id,
+            update["update_type"],
+            changes=update.get("changes"),
+            message=update.get("message"),
+        )
+    )
+    return True, notified
+
+
+@celery_app.task(
+    name="backend.tasks.grants.consume_grant_updates",
+    queue="high",
+)
+def consume_grant_updates(batch_size: int = 100, block_ms: int = 1000) -> dict[str, int]:
+    """
+    Apply changed grants from the "grants:updated" stream and notify users.
+
+    Discovery agents publish an update event when a known grant changes
+    between source snapshots. Each event updates the Grant row, re-queues
+    the embedding when the text changed, and calls notify_grant_update.
+
+    An event is only acknowledged once it has been applied and notified.
+    Failed events stay pending and are reclaimed (XAUTOCLAIM, from any
+    consumer) and retried before new ones on a later run; after
+    GRANT_UPDATE_MAX_ATTEMPTS failures they move to the DLQ.
+    Discovery does not re-emit an update once it is in the stream, so
+    events are never dropped silently.
+
+    Args:
+        batch_size: Number of events to read per call
+        block_ms: Milliseconds to block waiting for new events
+
+    Returns:
+        Dict with consumed, applied, notified, failed and dead_lettered counts
+    """
+    redis_client = None
+    db = None
+    stats = {"consumed": 0, "applied": 0, "notified": 0, "failed": 0, "dead_lettered": 0}
+
+    try:
+        redis_client = get_redis_client()
+        try:
+            redis_client.xgroup_create(GRANT_UPDATES_STREAM, GRANT_UPDATES_GROUP, id="0", mkstream=True)
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+        # Events that failed on an earlier run (or whose worker died) are still pending
+        _, reclaimed, *_ = redis_client.xautoclaim(
+            GRANT_UPDATES_STREAM,
+            GRANT_UPDATES_GROUP,
+            GRANT_UPDATES_CONSUMER,
+            min_idle_time=GRANT_UPDATE_RETRY_IDLE_MS,
+            start_id="0-0",
+            count=batch_size,
+        )
+        batch = [(message_id, fields) for message_id, fields in reclaimed if fields is not None]
+        if len(batch) < batch_size:
+            messages = redis_client.xreadgroup(
+                GRANT_UPDATES_GROUP,
+                GRANT_UPDATES_CONSUMER,
+                {GRANT_UPDATES_STREAM: ">"},
+                count=batch_size - len(batch),
+                block=None if batch else block_ms,
+            )
+            batch.extend(entry for _, entries in messages or [] for entry in entries)
+        if not batch:
+            return stats
+
+        db = get_sync_db()
+        for message_id, message_data in batch:
+            stats["consumed"] += 1
+            try:
+                update = json.loads(message_data.get("data", "{}"))
+                applied, notified = _handle_grant_update(db, update)
+                stats["applied"] += int(applied)
+                stats["notified"] += notified
+            except Exception as e:
+                db.rollback()
+                stats["failed"] += 1
+                attempts = redis_client.hincrby(GRANT_UPDATES_ATTEMPTS_KEY, message_id, 1)
+                if attempts < GRANT_UPDATE_MAX_ATTEMPTS:
+                    # Leave pending; retried on the next run
+                    logger.warning(
+                        "Error applying grant update, will retry",
+                        extra={"message_id": message_id, "attempts": attempts, "error": str(e)},
+                    )
+                    continue
+                redis_client.xadd(GRANT_UPDATES_DLQ, {**message_data, "error": str(e), "attempts": attempts})
+                stats["dead_lettered"] += 1
+                logger.error(
+                    "Grant update moved to DLQ",
+                    extra={"message_id": message_id, "attempts": attempts, "error": str(e)},
+                )
+            redis_client.hdel(GRANT_UPDATES_ATTEMPTS_KEY, message_id)
+            redis_client.xack(GRANT_UPDATES_STREAM, GRANT_UPDATES_GROUP, message_id)
+
+        logger.info("Applied grant updates", extra=stats)
+        return stats
+
+    except Exception as e:
+        logger.error("Error consuming grant updates", extra={"error": str(e)}, exc_info=True)
+        return {**stats, "error": str(e)}
+
+    finally:
+        if db:
+            db.close()
+        if redis_client:
+            redis_client.close()
+
+
 # =============================================================================
 # Exports
 # =============================================================================
@@ -680,4 +861,5 @@ __all__ = [
     "validate_grant",
     "compute_grant_embedding",
     "consume_discovered_grants",
+    "consume_grant_updates",
 ]
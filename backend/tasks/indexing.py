@@ -5,16 +5,29 @@ Celery tasks for generating and updating vector embeddings for grants
 and lab profiles, plus database index optimization.
 """
 
+import asyncio
 import logging
 import time
-from typing import Any
+from typing import Any, Iterable, Iterator, Optional
+from uuid import UUID
 
 import openai
+import redis
 from sqlalchemy import select, text
 from sqlalchemy.orm import Session
 
 from backend.celery_app import celery_app
 from backend.core.config import settings
+from backend.core.embedding_codec import to_vector_text
+from backend.core.embedding_service import EmbeddingService, get_embedding_cache_metrics
+from backend.core.vector_index import (
+    GRANTS,
+    INDEX_SOURCES,
+    PROFILES,
+    build_index_from_database,
+    record_embedding_updates,
+    snapshot_dir,
+)
 from backend.database import get_sync_db
 from backend.models import Grant, LabProfile
 
@@ -46,12 +59,7 @@ def generate_embedding(text: str, retry_count: int = 3) -> list[float] | None:
 
     for attempt in range(retry_count):
         try:
-            response = openai.embeddings.create(
-                model=settings.embedding_model,
-                input=text.strip(),
-                encoding_format="float",
-            )
-            embedding = response.data[0].embedding
+            embedding = EmbeddingService().embed(text.strip())
             logger.debug(f"Generated embedding of dimension {len(embedding)}")
             return embedding
 
@@ -190,6 +198,310 @@ def create_profile_text(profile: LabProfile) -> str:
     return "\n\n".join(parts)
 
 
+# =============================================================================
+# Bulk Grant Reindex Pipeline
+# =============================================================================
+
+REINDEX_CHECKPOINT_KEY = "indexing:reindex_grants:checkpoint"
+
+# Inputs are truncated to stay under the 8191-token embedding input limit
+MAX_EMBEDDING_INPUT_CHARS = 30000
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (about 4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+class TokenBudget:
+    """
+    Tokens-per-minute budget shared by concurrent embedding requests.
+
+    Refills continuously; acquire() waits until enough tokens are available.
+    """
+
+    def __init__(self, tokens_per_minute: int):
+        """
+        Initialize budget.
+
+        Args:
+            tokens_per_minute: Sustained token rate (also the burst size).
+        """
+        self.capacity = tokens_per_minute
+        self._tokens = float(tokens_per_minute)
+        self._rate = tokens_per_minute / 60.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Take tokens from the budget, waiting for refill if needed.
+
+        Args:
+            tokens: Estimated tokens for the request (capped at capacity).
+        """
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self._rate)
+
+
+def _iter_grant_pages(db: Session, after_id: Optional[str], page_size: int) -> Iterator[list[Any]]:
+    """
+    Stream grants without embeddings in id order through a server-side cursor.
+
+    Args:
+        db: Session used only for reading.
+        after_id: Resume after this grant id.
+        page_size: Rows per page.
+
+    Yields:
+        Pages of rows with the columns create_grant_text reads.
+    """
+    query = (
+        select(
+            Grant.id,
+            Grant.title,
+            Grant.agency,
+            Grant.source,
+            Grant.description,
+            Grant.categories,
+            Grant.eligibility,
+            Grant.amount_min,
+            Grant.amount_max,
+        )
+        .where(Grant.embedding.is_(None))
+        .order_by(Grant.id)
+    )
+    if after_id:
+        query = query.where(Grant.id > UUID(after_id))
+
+    result = db.execute(query.execution_options(stream_results=True, yield_per=page_size))
+    yield from result.partitions(page_size)
+
+
+async def _embed_texts(
+    client: Any,
+    texts: list[str],
+    budget: TokenBudget,
+    retry_count: int = 3,
+) -> list[list[float]]:
+    """
+    Embed several texts in one API call under the token budget.
+
+    Texts already in the shared embedding cache are not sent and do not
+    count against the budget.
+
+    Args:
+        client: AsyncOpenAI client.
+        texts: Texts to embed.
+        budget: Shared token budget.
+        retry_count: Attempts for rate limit and API errors.
+
+    Returns:
+        Embeddings in input order.
+    """
+    if not texts:
+        return []
+
+    service = EmbeddingService()
+    embeddings = service.lookup_many(texts)
+    missing = [t for t in dict.fromkeys(texts) if t not in embeddings]
+    if not missing:
+        service.record_api_call(served_from_cache=True)
+        return [embeddings[t] for t in texts]
+
+    await budget.acquire(sum(estimate_tokens(t) for t in missing))
+
+    for attempt in range(retry_count):
+        try:
+            response = await client.embeddings.create(
+                model=service.model,
+                input=missing,
+                encoding_format="float",
+            )
+            service.record_api_call(served_from_cache=False)
+            generated = {missing[item.index]: item.embedding for item in response.data}
+            service.store_many(generated)
+            embeddings.update(generated)
+            return [embeddings[t] for t in texts]
+
+        except openai.RateLimitError as e:
+            if attempt == retry_count - 1:
+                raise
+            wait_time = (2**attempt) * 2  # Exponential backoff: 2s, 4s, 8s
+            logger.warning(f"Rate limit hit (attempt {attempt + 1}/{retry_count}). Waiting {wait_time}s: {e}")
+            await asyncio.sleep(wait_time)
+
+        except openai.APIError as e:
+            if attempt == retry_count - 1:
+                raise
+            logger.warning(f"OpenAI API error during batch embedding (attempt {attempt + 1}/{retry_count}): {e}")
+            await asyncio.sleep(1)
+
+    return []
+
+
+def _bulk_update_grant_embeddings(db: Session, items: list[tuple[Any, list[float]]]) -> None:
+    """
+    Write a batch of grant embeddings with a single UPDATE and commit.
+
+    Args:
+        db: Session used for writing.
+        items: (grant_id, embedding) pairs.
+    """
+    db.execute(
+        text("""
+            UPDATE grants AS g
+            SET embedding = CAST(v.embedding AS vector)
+            FROM unnest(CAST(:ids AS uuid[]), CAST(:embeddings AS text[])) AS v(id, embedding)
+            WHERE g.id = v.id
+        """),
+        {
+            "ids": [str(grant_id) for grant_id, _ in items],
+            "embeddings": [to_vector_text(embedding) for _, embedding in items],
+        },
+    )
+    db.commit()
+
+
+class ReindexCheckpoint:
+    """
+    Resume position for reindex_grants, stored in Redis.
+
+    Holds the last grant id of the highest contiguous batch that finished,
+    so a restarted run skips everything already attempted.
+    """
+
+    def __init__(self, redis_client: redis.Redis, key: str = REINDEX_CHECKPOINT_KEY):
+        """
+        Initialize checkpoint.
+
+        Args:
+            redis_client: Redis client (decode_responses=True).
+            key: Redis key holding the checkpoint.
+        """
+        self.redis_client = redis_client
+        self.key = key
+
+    def load(self) -> Optional[str]:
+        """Get the saved grant id, or None if there is no checkpoint."""
+        try:
+            return self.redis_client.get(self.key)
+        except redis.RedisError as e:
+            logger.warning(f"Could not load reindex checkpoint: {e}")
+            return None
+
+    def save(self, grant_id: Any) -> None:
+        """Record that every grant up to grant_id has been attempted."""
+        try:
+            self.redis_client.set(self.key, str(grant_id))
+        except redis.RedisError as e:
+            logger.warning(f"Could not save reindex checkpoint: {e}")
+
+    def clear(self) -> None:
+        """Remove the checkpoint after a completed run."""
+        try:
+            self.redis_client.delete(self.key)
+        except redis.RedisError as e:
+            logger.warning(f"Could not clear reindex checkpoint: {e}")
+
+
+async def _reindex_grant_pages(
+    pages: Iterable[list[Any]],
+    write_db: Session,
+    checkpoint: ReindexCheckpoint,
+    stats: dict[str, Any],
+    client: Optional[Any] = None,
+    concurrency: Optional[int] = None,
+    budget: Optional[TokenBudget] = None,
+) -> None:
+    """
+    Embed and store grant pages with several embedding requests in flight.
+
+    Each page is one embedding request. Results are written as they
+    complete, and the checkpoint advances only past pages whose
+    predecessors have all finished.
+
+    Args:
+        pages: Pages of grant rows in id order.
+        write_db: Session used for bulk updates.
+        checkpoint: Resume position store.
+        stats: Statistics dictionary updated in place.
+        client: Optional AsyncOpenAI client (created if omitted).
+        concurrency: Maximum requests in flight.
+        budget: Token budget shared by requests.
+    """
+    concurrency = concurrency or settings.embedding_batch_concurrency
+    budget = budget or TokenBudget(settings.embedding_tokens_per_minute)
+    owns_client = client is None
+    if owns_client:
+        client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
+
+    pending: dict[asyncio.Task, tuple[int, list[Any], Any]] = {}
+    finished: dict[int, Any] = {}
+    next_sequence = 0
+
+    def complete(task: asyncio.Task) -> None:
+        nonlocal next_sequence
+        sequence, grant_ids, last_id = pending.pop(task)
+
+        try:
+            items = list(zip(grant_ids, task.result()))
+            if items:
+                _bulk_update_grant_embeddings(write_db, items)
+                record_embedding_updates(GRANTS, items)
+            stats["successful"] += len(items)
+            stats["failed"] += len(grant_ids) - len(items)
+        except Exception as e:
+            write_db.rollback()
+            stats["failed"] += len(grant_ids)
+            logger.error(f"Error embedding batch {sequence + 1} ({len(grant_ids)} grants): {e}", exc_info=True)
+
+        stats["batches"] += 1
+        finished[sequence] = last_id
+        while next_sequence in finished:
+            checkpoint.save(finished.pop(next_sequence))
+            next_sequence += 1
+
+    async def drain(limit: int) -> None:
+        while len(pending) > limit:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                complete(task)
+
+    try:
+        for sequence, rows in enumerate(pages):
+            grant_ids = []
+            texts = []
+            for row in rows:
+                grant_text = create_grant_text(row).strip()[:MAX_EMBEDDING_INPUT_CHARS]
+                if grant_text:
+                    grant_ids.append(row.id)
+                    texts.append(grant_text)
+                else:
+                    stats["failed"] += 1
+                    logger.warning(f"Empty text for grant {row.id}, skipping")
+
+            stats["total_processed"] += len(rows)
+            task = asyncio.create_task(_embed_texts(client, texts, budget))
+            pending[task] = (sequence, grant_ids, rows[-1].id)
+            await drain(concurrency - 1)
+
+        await drain(0)
+    finally:
+        for task in pending:
+            task.cancel()
+        if owns_client:
+            await client.close()
+
+
 # =============================================================================
 # Celery Tasks
 # =============================================================================
@@ -201,106 +513,74 @@ def create_profile_text(profile: LabProfile) -> str:
     max_retries=3,
     default_retry_delay=60,
 )
-def reindex_grants(self, batch_size: int = 100) -> dict[str, Any]:
+def reindex_grants(self, batch_size: int = 100, resume: bool = True) -> dict[str, Any]:
     """
-    Reindex all grants without embeddings or with outdated embeddings.
+    Reindex all grants without embeddings.
 
-    Processes grants in batches to manage memory and API rate limits.
-    Generates embeddings using OpenAI API and updates the database.
+    Streams grants through a server-side cursor in pages of batch_size,
+    embeds each page with one API call (several in flight under the
+    embedding token budget), and writes each page back with a single
+    bulk UPDATE. Progress is checkpointed in Redis, so a retried or
+    restarted run continues where the previous one stopped.
 
     Args:
-        batch_size: Number of grants to process in each batch.
+        batch_size: Grants per embedding request and per UPDATE.
+        resume: Continue from the saved checkpoint if one exists.
 
     Returns:
         Dictionary with reindexing statistics:
             - total_processed: Number of grants processed
             - successful: Number of successful embeddings
             - failed: Number of failed embeddings
+            - batches: Number of embedding requests completed
+            - resumed_from: Grant id the run resumed after, if any
             - duration: Time taken in seconds
     """
     start_time = time.time()
-    db: Session = get_sync_db()
+    read_db: Session = get_sync_db()
+    write_db: Session = get_sync_db()
+    checkpoint = ReindexCheckpoint(redis.from_url(settings.redis_url, decode_responses=True))
+
+    after_id = checkpoint.load() if resume else None
+    if not resume:
+        checkpoint.clear()
 
     stats = {
         "total_processed": 0,
         "successful": 0,
         "failed": 0,
+        "batches": 0,
+        "resumed_from": after_id,
         "duration": 0,
     }
 
     try:
-        # Find grants without embeddings
-        query = select(Grant).where(Grant.embedding.is_(None))
-        grants_to_index = db.execute(query).scalars().all()
-        total_grants = len(grants_to_index)
+        if after_id:
+            logger.info(f"Resuming grant reindex after {after_id}")
 
-        logger.info(f"Found {total_grants} grants without embeddings")
-
-        if total_grants == 0:
-            logger.info("No grants to reindex")
-            return stats
-
-        # Process in batches
-        for i in range(0, total_grants, batch_size):
-            batch = grants_to_index[i : i + batch_size]
-            batch_num = (i // batch_size) + 1
-            total_batches = (total_grants + batch_size - 1) // batch_size
-
-            logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} grants)")
-
-            for grant in batch:
-                try:
-                    # Create text representation
-                    grant_text = create_grant_text(grant)
-
-                    # Generate embedding
-                    embedding = generate_embedding(grant_text)
-
-                    if embedding:
-                        # Update grant with embedding
-                        grant.embedding = embedding
-                        stats["successful"] += 1
-                        logger.debug(f"Generated embedding for grant {grant.id}")
-                    else:
-                        stats["failed"] += 1
-                        logger.warning(f"Failed to generate embedding for grant {grant.id}")
-
-                    stats["total_processed"] += 1
-
-                except Exception as e:
-                    stats["failed"] += 1
-                    stats["total_processed"] += 1
-                    logger.error(f"Error processing grant {grant.id}: {e}", exc_info=True)
-
-            # Commit batch
-            try:
-                db.commit()
-                logger.info(f"Committed batch {batch_num}/{total_batches}")
-            except Exception as e:
-                db.rollback()
-                logger.error(f"Error committing batch {batch_num}: {e}", exc_info=True)
-                raise
-
-            # Rate limiting: small delay between batches
-            if i + batch_size < total_grants:
-                time.sleep(1)
+        pages = _iter_grant_pages(read_db, after_id, batch_size)
+        asyncio.run(_reindex_grant_pages(pages, write_db, checkpoint, stats))
+        checkpoint.clear()
+        stats["embedding_cache"] = get_embedding_cache_metrics()
 
         stats["duration"] = time.time() - start_time
         logger.info(
             f"Reindexing complete. Processed {stats['total_processed']} grants "
             f"({stats['successful']} successful, {stats['failed']} failed) "
-            f"in {stats['duration']:.2f}s"
+            f"in {stats['batches']} batches, {stats['duration']:.2f}s"
         )
 
         return stats
 
     except Exception as e:
-        db.rollback()
+        read_db.rollback()
+        write_db.rollback()
         logger.error(f"Fatal error in reindex_grants: {e}", exc_info=True)
         raise
 
     finally:
-        db.close()
+        read_db.close()
+        write_db.close()
 
 
 @celery_app.task(
@@ -356,6 +636,7 @@ def reindex_profiles(self, batch_size: int = 50) -> dict[str, Any]:
 
             logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} profiles)")
 
+            indexed = []
             for profile in batch:
                 try:
                     # Create text representation
@@ -367,6 +648,7 @@ def reindex_profiles(self, batch_size: int = 50) -> dict[str, Any]:
                     if embedding:
                         # Update profile with embedding
                         profile.profile_embedding = embedding
+                        indexed.append((profile.user_id, embedding))
                         stats["successful"] += 1
                         logger.debug(f"Generated embedding for profile {profile.id}")
                     else:
@@ -388,6 +670,7 @@ def reindex_profiles(self, batch_size: int = 50) -> dict[str, Any]:
                 db.rollback()
                 logger.error(f"Error committing batch {batch_num}: {e}", exc_info=True)
                 raise
+            record_embedding_updates(PROFILES, indexed)
 
             # Rate limiting: small delay between batches
             if i + batch_size < total_profiles:
@@ -541,6 +824,51 @@ def rebuild_vector_indexes(self) -> dict[str, Any]:
         db.close()
 
 
+@celery_app.task(
+    bind=True,
+    name="backend.tasks.indexing.rebuild_vector_index_snapshots",
+    max_retries=2,
+    default_retry_delay=120,
+)
+def rebuild_vector_index_snapshots(self) -> dict[str, Any]:
+    """
+    Rebuild the on-disk snapshots of the in-process vector indexes.
+
+    Reads every stored grant and profile embedding into a fresh index and
+    writes it to this worker's snapshot directory. Processes on the same
+    host pick up the new snapshot on their next sync and replay stream
+    updates recorded since; processes elsewhere build their own index from
+    Postgres on first use. Does nothing when the in-process index is disabled.
+
+    Returns:
+        Dictionary with vector counts per index and duration in seconds.
+    """
+    if not settings.vector_index_enabled:
+        return {"skipped": True, "reason": "vector index disabled"}
+
+    start_time = time.time()
+    db: Session = get_sync_db()
+
+    results: dict[str, Any] = {"duration": 0}
+
+    try:
+        for kind in INDEX_SOURCES:
+            index = build_index_from_database(kind, db)
+            index.save(snapshot_dir(kind))
+            results[kind] = len(index)
+            logger.info(f"Wrote {kind} vector index snapshot with {len(index)} vectors")
+
+        results["duration"] = time.time() - start_time
+        return results
+
+    except Exception as e:
+        logger.error(f"Fatal error in rebuild_vector_index_snapshots: {e}", exc_info=True)
+        raise
+
+    finally:
+        db.close()
+
+
 # =============================================================================
 # Exports
 # =============================================================================
@@ -549,6 +877,7 @@ __all__ = [
     "reindex_grants",
     "reindex_profiles",
     "rebuild_vector_indexes",
+    "rebuild_vector_index_snapshots",
     "generate_embedding",
     "create_grant_text",
     "create_profile_text",
@@ -340,6 +340,14 @@ def process_high_priority_match(self, match_id: str) -> dict[str, Any]:
 # =============================================================================
 
 
+# Candidate grants considered per recompute (nearest by embedding distance)
+RECOMPUTE_TOP_K = 50
+# Grants below this cosine similarity are not worth an LLM call
+RECOMPUTE_SIMILARITY_THRESHOLD = 0.3
+# Final score above which a newly strong match is published
+HIGH_MATCH_THRESHOLD = 70
+
+
 @celery_app.task(
     bind=True,
     queue="normal",
@@ -356,10 +364,11 @@ def recompute_user_matches(self, user_id: str) -> dict[str, Any]:
 
     This task:
     1. Validates user exists and has lab profile
-    2. Fetches all grants with embeddings
-    3. Re-computes matches using GrantMatcher
-    4. Updates existing Match records (upserts)
-    5. Publishes newly high-scoring matches to stream
+    2. Runs one ANN query for the RECOMPUTE_TOP_K nearest grants above
+       RECOMPUTE_SIMILARITY_THRESHOLD
+    3. Re-ranks those grants with concurrent, cached LLM calls via GrantMatcher
+    4. Upserts all Match records in one bulk statement
+    5. Publishes newly high-scoring matches to stream in one pipeline
 
     Args:
         user_id: UUID string of the user whose matches to recompute.
@@ -367,15 +376,22 @@ def recompute_user_matches(self, user_id: str) -> dict[str, Any]:
     Returns:
         Dictionary with recomputation statistics:
         - user_id: User identifier
-        - grants_evaluated: Number of grants checked
+        - grants_evaluated: Number of candidate grants re-ranked
         - matches_updated: Number of match records updated
         - new_high_matches: Number of new high-scoring matches
+        - llm_cache_hits: Grant/profile pairs scored from the LLM score cache
+        - llm_calls: Number of LLM calls made
         - processing_time_seconds: Time taken to process
 
     Raises:
         ValueError: If user_id is invalid or user has no lab profile.
         SQLAlchemyError: If database operations fail.
     """
+    from uuid import uuid4
+
+    from agents.matching.models import FinalMatch, GrantData, MatchResult, ProfileMatch, UserProfile
+    from backend.core.events import MatchComputedEvent
+
     start_time = time.time()
     task_id = self.request.id
 
@@ -405,6 +421,8 @@ def recompute_user_matches(self, user_id: str) -> dict[str, Any]:
         "grants_evaluated": 0,
         "matches_updated": 0,
         "new_high_matches": 0,
+        "llm_cache_hits": 0,
+        "llm_calls": 0,
         "processing_time_seconds": 0,
     }
 
@@ -414,10 +432,12 @@ def recompute_user_matches(self, user_id: str) -> dict[str, Any]:
             profile_query = text("""
                 SELECT
                     id,
-                    profile_embedding,
                     research_areas,
                     methods,
-                    past_grants
+                    past_grants,
+                    institution,
+                    department,
+                    keywords
                 FROM lab_profiles
                 WHERE user_id = :user_id
                   AND profile_embedding IS NOT NULL
@@ -434,27 +454,40 @@ def recompute_user_matches(self, user_id: str) -> dict[str, Any]:
                 )
                 raise ValueError(f"User {user_id} has no lab profile or profile lacks embedding")
 
-            # Fetch all grants with embeddings for re-matching
-            # Use vector similarity to find relevant grants
-            grants_query = text("""
-                SELECT
-                    id,
-                    title,
-                    description,
-                    agency as funding_agency,
-                    amount_max as funding_amount,
-                    deadline,
-                    eligibility as eligibility_criteria,
-                    categories,
-                    raw_data->>'keywords' as keywords,
-                    embedding
-                FROM grants
-                WHERE embedding IS NOT NULL
-                ORDER BY posted_at DESC
-                LIMIT 1000
+            # Single ANN query: nearest grants to the profile embedding. The profile
+            # vector is an InitPlan constant, so the grants embedding index is used.
+            candidates_query = text("""
+                SELECT *
+                FROM (
+                    SELECT
+                        g.id,
+                        g.title,
+                        g.description,
+                        g.agency AS funding_agency,
+                        COALESCE(g.amount_max, g.amount_min) AS funding_amount,
+                        g.deadline,
+                        g.eligibility,
+                        g.categories,
+                        g.embedding <=> (
+                            SELECT profile_embedding FROM lab_profiles WHERE user_id = :user_id LIMIT 1
+                        ) AS distance
+                    FROM grants g
+                    WHERE g.embedding IS NOT NULL
+                    ORDER BY distance
+                    LIMIT :top_k
+                ) nearest
+                WHERE nearest.distance <= :max_distance
+                ORDER BY nearest.distance
             """)
 
-            grants = session.execute(grants_query).fetchall()
+            grants = session.execute(
+                candidates_query,
+                {
+                    "user_id": str(user_uuid),
+                    "top_k": RECOMPUTE_TOP_K,
+                    "max_distance": 1 - RECOMPUTE_SIMILARITY_THRESHOLD,
+                },
+            ).fetchall()
             stats["grants_evaluated"] = len(grants)
 
             if not grants:
@@ -472,182 +505,166 @@ def recompute_user_matches(self, user_id: str) -> dict[str, Any]:
                 grant_count=len(grants),
             )
 
-            # Get existing match scores to detect improvements
+            user_profile = UserProfile(
+                user_id=user_uuid,
+                research_areas=profile_result.research_areas or [],
+                methods=profile_result.methods or [],
+                past_grants=[
+                    g.get("title", str(g)) if isinstance(g, dict) else str(g)
+                    for g in (profile_result.past_grants or [])
+                ],
+                institution=profile_result.institution,
+                department=profile_result.department,
+                keywords=profile_result.keywords or [],
+            )
+
+            pairs: list[tuple[GrantData, ProfileMatch]] = []
+            for grant in grants:
+                eligibility = grant.eligibility
+                eligibility_criteria = (
+                    eligibility.get("applicant_types", []) if isinstance(eligibility, dict) else eligibility or []
+                )
+                grant_data = GrantData(
+                    grant_id=grant.id if isinstance(grant.id, UUID) else UUID(str(grant.id)),
+                    title=grant.title,
+                    description=grant.description or "",
+                    funding_agency=grant.funding_agency,
+                    funding_amount=grant.funding_amount,
+                    deadline=grant.deadline,
+                    eligibility_criteria=eligibility_criteria,
+                    categories=grant.categories or [],
+                    keywords=grant.categories or [],
+                )
+                profile_match = ProfileMatch(
+                    user_id=user_uuid,
+                    vector_similarity=min(1.0, max(0.0, 1 - float(grant.distance))),
+                    profile=user_profile,
+                )
+                pairs.append((grant_data, profile_match))
+
+            # Concurrent, cached LLM re-ranking of the top-K grants
+            llm_results, rerank_stats = matcher.rerank_pairs(pairs)
+            stats["llm_cache_hits"] = rerank_stats["llm_cache_hits"]
+            stats["llm_calls"] = rerank_stats["llm_calls"]
+
+            # Existing scores for the candidate grants, to detect improvements
             existing_scores_query = text("""
                 SELECT grant_id, match_score
                 FROM matches
                 WHERE user_id = :user_id
+                  AND grant_id = ANY(CAST(:grant_ids AS uuid[]))
             """)
             existing_scores = {
                 str(row.grant_id): row.match_score
-                for row in session.execute(existing_scores_query, {"user_id": str(user_uuid)})
+                for row in session.execute(
+                    existing_scores_query,
+                    {"user_id": str(user_uuid), "grant_ids": [str(g.grant_id) for g, _ in pairs]},
+                )
             }
 
-            # Process each grant
-            for grant in grants:
-                try:
-                    grant_id = grant.id
-
-                    # Use the matcher to compute match for this specific grant-user pair
-                    # We'll use the vector similarity + LLM approach
-                    from agents.matching.models import (
-                        GrantData,
-                        ProfileMatch,
-                        UserProfile,
-                        BatchMatchRequest,
-                    )
-
-                    # Build GrantData object (embedding not needed - computed via SQL)
-                    grant_data = GrantData(
-                        grant_id=grant_id if isinstance(grant_id, UUID) else UUID(grant_id),
-                        title=grant.title,
-                        description=grant.description or "",
-                        funding_agency=grant.funding_agency,
-                        funding_amount=grant.funding_amount,
-                        deadline=grant.deadline,
-                        eligibility_criteria=grant.eligibility_criteria or [],
-                        categories=grant.categories or [],
-                        keywords=[],
-                        embedding=None,  # Similarity computed via SQL, not needed here
-                    )
-
-                    # Build UserProfile object
-                    user_profile = UserProfile(
-                        user_id=user_uuid,
-                        research_areas=profile_result.research_areas or [],
-                        methods=profile_result.methods or [],
-                        past_grants=[
-                            g.get("title", str(g)) if isinstance(g, dict) else str(g)
-                            for g in (profile_result.past_grants or [])
-                        ],
-                        institution=None,  # Not in current schema
-                        department=None,
-                        keywords=[],
-                    )
-
-                    # Calculate vector similarity
-                    similarity_query = text("""
-                        SELECT 1 - (
-                            (SELECT profile_embedding FROM lab_profiles WHERE user_id = :user_id LIMIT 1)
-                            <=>
-                            (SELECT embedding FROM grants WHERE id = :grant_id)
-                        ) AS similarity
-                    """)
-                    similarity_result = session.execute(
-                        similarity_query, {"user_id": str(user_uuid), "grant_id": str(grant_id)}
-                    ).fetchone()
-                    vector_similarity = float(similarity_result.similarity)
-
-                    # Only proceed with LLM if vector similarity is reasonable
-                    if vector_similarity < 0.3:
-                        continue  # Skip low-similarity grants
-
-                    # Build profile match for LLM evaluation
-                    profile_match = ProfileMatch(
-                        user_id=user_uuid,
-                        vector_similarity=vector_similarity,
-                        profile=user_profile,
-                    )
-
-                    # Call LLM for detailed evaluation
-                    batch_request = BatchMatchRequest(
-                        grant=grant_data,
-                        profiles=[profile_match],
-                    )
-
-                    batch_response = matcher.evaluate_matches_batch(batch_request)
-
-                    if not batch_response.results:
-                        continue
+            upsert_rows: list[dict[str, Any]] = []
+            high_matches: list[tuple[GrantData, MatchResult, float]] = []
+            for grant_data, profile_match in pairs:
+                match_result = llm_results.get((grant_data.grant_id, user_uuid))
+                if match_result is None:
+                    continue
 
-                    # Extract match result
-                    _, match_result = batch_response.results[0]
-
-                    # Compute final weighted score
-                    from agents.matching.models import FinalMatch
-
-                    final_score = FinalMatch.compute_final_score(
-                        vector_similarity,
-                        match_result.match_score,
-                    )
+                final_score = FinalMatch.compute_final_score(
+                    profile_match.vector_similarity,
+                    match_result.match_score,
+                )
 
-                    # Store/update match in database
-                    upsert_query = text("""
-                        INSERT INTO matches (
-                            id,
-                            grant_id,
-                            user_id,
-                            match_score,
-                            reasoning,
-                            predicted_success,
-                            created_at
-                        ) VALUES (
-                            gen_random_uuid(),
-                            :grant_id,
-                            :user_id,
-                            :match_score,
-                            :reasoning,
-                            :predicted_success,
-                            NOW()
-                        )
-                        ON CONFLICT (grant_id, user_id) DO UPDATE SET
-                            match_score = EXCLUDED.match_score,
-                            reasoning = EXCLUDED.reasoning,
-                            predicted_success = EXCLUDED.predicted_success,
-                            created_at = NOW()
-                    """)
-
-                    session.execute(
-                        upsert_query,
-                        {
-                            "grant_id": str(grant_id),
-                            "user_id": str(user_uuid),
-                            "match_score": final_score / 100,  # Convert to 0-1
-                            "reasoning": match_result.reasoning,
-                            "predicted_success": match_result.predicted_success / 100,
-                        },
-                    )
+                upsert_rows.append(
+                    {
+                        "grant_id": str(grant_data.grant_id),
+                        "user_id": str(user_uuid),
+                        "match_score": final_score / 100,  # Convert to 0-1
+                        "reasoning": match_result.reasoning,
+                        "predicted_success": match_result.predicted_success / 100,
+                    }
+                )
 
-                    stats["matches_updated"] += 1
-
-                    # Check if this is a newly high-scoring match
-                    old_score = existing_scores.get(str(grant_id), 0)
-                    if final_score > 70 and (old_score <= 70 or old_score == 0):
-                        # Publish to matches:computed stream
-                        from backend.core.events import MatchComputedEvent
-                        from uuid import uuid4
-
-                        priority = matcher._compute_priority_level(final_score, grant.deadline)
-
-                        event = MatchComputedEvent(
-                            event_id=uuid4(),
-                            match_id=uuid4(),  # Will be replaced with actual match_id
-                            grant_id=UUID(grant_id),
-                            user_id=user_uuid,
-                            match_score=final_score / 100,
-                            priority_level=priority,
-                            matching_criteria=match_result.key_strengths,
-                            explanation=match_result.reasoning,
-                            grant_deadline=grant.deadline,
-                        )
-
-                        redis_client.xadd(MATCHES_STREAM, {"data": event.model_dump_json()})
-
-                        stats["new_high_matches"] += 1
-
-                except Exception as e:
-                    logger.warning(
-                        "failed_to_compute_match_for_grant",
-                        task_id=task_id,
-                        user_id=user_id,
-                        grant_id=str(grant.id),
-                        error=str(e),
+                # Check if this is a newly high-scoring match (stored scores are 0-1)
+                old_score = existing_scores.get(str(grant_data.grant_id), 0) * 100
+                if final_score > HIGH_MATCH_THRESHOLD and old_score <= HIGH_MATCH_THRESHOLD:
+                    high_matches.append((grant_data, match_result, final_score))
+
+            match_ids: dict[str, Any] = {}
+            if upsert_rows:
+                # Store/update all matches in one statement; RETURNING gives the
+                # id of each row, whether it was inserted or already existed
+                upsert_query = text("""
+                    INSERT INTO matches (
+                        id,
+                        grant_id,
+                        user_id,
+                        match_score,
+                        reasoning,
+                        predicted_success,
+                        created_at
                     )
-                    continue  # Continue with other grants
+                    SELECT
+                        gen_random_uuid(),
+                        r.grant_id,
+                        CAST(:user_id AS uuid),
+                        r.match_score,
+                        r.reasoning,
+                        r.predicted_success,
+                        NOW()
+                    FROM unnest(
+                        CAST(:grant_ids AS uuid[]),
+                        CAST(:match_scores AS float8[]),
+                        CAST(:reasonings AS text[]),
+                        CAST(:predicted_successes AS float8[])
+                    ) AS r(grant_id, match_score, reasoning, predicted_success)
+                    ON CONFLICT (grant_id, user_id) DO UPDATE SET
+                        match_score = EXCLUDED.match_score,
+                        reasoning = EXCLUDED.reasoning,
+                        predicted_success = EXCLUDED.predicted_success,
+                        created_at = NOW()
+                    RETURNING id, grant_id
+                """)
+                upserted = session.execute(
+                    upsert_query,
+                    {
+                        "user_id": str(user_uuid),
+                        "grant_ids": [row["grant_id"] for row in upsert_rows],
+                        "match_scores": [row["match_score"] for row in upsert_rows],
+                        "reasonings": [row["reasoning"] for row in upsert_rows],
+                        "predicted_successes": [row["predicted_success"] for row in upsert_rows],
+                    },
+                )
+                match_ids = {str(row.grant_id): row.id for row in upserted}
+                stats["matches_updated"] = len(upsert_rows)
 
             # Commit all updates
             session.commit()
 
+            # Events carry the stored match ids, so they are built after the upsert
+            events = [
+                MatchComputedEvent(
+                    event_id=uuid4(),
+                    match_id=match_ids[str(grant_data.grant_id)],
+                    grant_id=grant_data.grant_id,
+                    user_id=user_uuid,
+                    match_score=final_score / 100,
+                    priority_level=matcher._compute_priority_level(final_score, grant_data.deadline),
+                    matching_criteria=match_result.key_strengths,
+                    explanation=match_result.reasoning,
+                    grant_deadline=grant_data.deadline,
+                )
+                for grant_data, match_result, final_score in high_matches
+                if str(grant_data.grant_id) in match_ids
+            ]
+
+            if events:
+                # Publish to matches:computed stream in one round trip
+                pipe = redis_client.pipeline(transaction=False)
+                for event in events:
+                    pipe.xadd(MATCHES_STREAM, {"data": event.model_dump_json()})
+                pipe.execute()
+                stats["new_high_matches"] = len(events)
+
             stats["processing_time_seconds"] = time.time() - start_time
 
             logger.info(
@@ -657,6 +674,8 @@ def recompute_user_matches(self, user_id: str) -> dict[str, Any]:
                 grants_evaluated=stats["grants_evaluated"],
                 matches_updated=stats["matches_updated"],
                 new_high_matches=stats["new_high_matches"],
+                llm_cache_hits=stats["llm_cache_hits"],
+                llm_calls=stats["llm_calls"],
                 duration_seconds=stats["processing_time_seconds"],
             )
 
@@ -433,6 +433,8 @@ async def notify_grant_update(
     """
     Notify all users who have saved/matched a grant about an update.
 
+    Errors propagate so the caller can retry the update event.
+
     Args:
         grant_id: UUID of the updated grant.
         update_type: Type of update (e.g., 'deadline_changed', 'amount_updated').
@@ -442,63 +444,55 @@ async def notify_grant_update(
     Returns:
         Number of users notified.
     """
-    async for session in get_async_session():
-        try:
-            # Fetch grant
-            result = await session.execute(select(Grant).where(Grant.id == grant_id))
-            grant = result.scalar_one_or_none()
+    async with get_async_session() as session:
+        # Fetch grant
+        result = await session.execute(select(Grant).where(Grant.id == grant_id))
+        grant = result.scalar_one_or_none()
 
-            if not grant:
-                logger.error(f"Grant {grant_id} not found for update notification")
-                return 0
+        if not grant:
+            logger.error(f"Grant {grant_id} not found for update notification")
+            return 0
 
-            # Find all users who have saved or matched this grant
-            result = await session.execute(
-                select(User.id)
-                .select_from(Match)
-                .join(User, Match.user_id == User.id)
-                .where(
-                    and_(
-                        Match.grant_id == grant_id,
-                        or_(
-                            Match.user_action == "saved",
-                            Match.match_score >= 0.7,  # High matches get updates
-                        ),
-                    )
+        # Find all users who have saved or matched this grant
+        result = await session.execute(
+            select(User.id)
+            .select_from(Match)
+            .join(User, Match.user_id == User.id)
+            .where(
+                and_(
+                    Match.grant_id == grant_id,
+                    or_(
+                        Match.user_action == "saved",
+                        Match.match_score >= 0.7,  # High matches get updates
+                    ),
                 )
-                .distinct()
             )
+            .distinct()
+        )
 
-            user_ids = [row[0] for row in result.all()]
-
-            if not user_ids:
-                logger.info(f"No users to notify for grant {grant_id} update")
-                return 0
+        user_ids = [row[0] for row in result.all()]
 
-            # Get notification service
-            notif_service = get_sync_notification_service()
+        if not user_ids:
+            logger.info(f"No users to notify for grant {grant_id} update")
+            return 0
 
-            # Send notifications
-            for user_id in user_ids:
-                notif_service.notify_grant_update(
-                    user_id=user_id,
-                    grant_id=grant_id,
-                    title=grant.title,
-                    update_type=update_type,
-                    changes=changes,
-                    message=message,
-                )
+        # Get notification service
+        notif_service = get_sync_notification_service()
 
-            logger.info(f"Sent grant update notifications: grant={grant_id}, users={len(user_ids)}, type={update_type}")
+        # Send notifications
+        for user_id in user_ids:
+            notif_service.notify_grant_update(
+                user_id=user_id,
+                grant_id=grant_id,
+                title=grant.title,
+                update_type=update_type,
+                changes=changes,
+                message=message,
+            )
 
-            return len(user_ids)
+        logger.info(f"Sent grant update notifications: grant={grant_id}, users={len(user_ids)}, type={update_type}")
 
-        except Exception as e:
-            logger.error(
-                f"Error sending grant update notifications: {e}",
-                exc_info=True,
-            )
-            return 0
+        return len(user_ids)
 
 
 # =============================================================================
@@ -173,11 +173,14 @@ async def _run_rss_agent(agent) -> dict[str, Any]:
 async def _run_xml_agent(agent) -> dict[str, Any]:
     """Helper to run XML agent and return results."""
     try:
-        grants = await agent.discover_new_grants()
+        stats = await agent.discover_new_grants()
         return {
             "status": "success",
-            "grants_discovered": len(grants),
-            "sample_ids": [g.external_id for g in grants[:10]],  # Sample IDs
+            "grants_discovered": stats.new_grants,
+            "grants_updated": stats.updated_grants,
+            "sample_ids": stats.sample_ids,
+            "records_per_second": stats.records_per_second,
+            "peak_rss_mb": stats.peak_rss_mb,
         }
     finally:
         await agent.close()
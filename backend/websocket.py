@@ -8,13 +8,24 @@ Features:
 - Redis pub/sub for horizontal scaling
 - Reconnection handling
 - Connection state tracking
+
+Sharding:
+When ``settings.ws_workers`` lists several worker URLs, users are
+consistent-hashed across them. A worker accepts connections only for users
+it owns (others are refused with the owner's URL), subscribes only to the
+pub/sub channels of its connected users, and emits locally. Bursts of
+events for one user are coalesced into a single ``batch`` frame.
 """
 
 import asyncio
+import bisect
+import hashlib
 import json
 import logging
+import time
+from collections import deque
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Iterable, Optional
 from uuid import UUID
 
 import redis.asyncio as redis
@@ -147,6 +158,10 @@ class ConnectionStateManager:
         if sid in self._session_metadata:
             self._session_metadata[sid]["last_activity"] = datetime.utcnow().isoformat()
 
+    def connected_user_ids(self) -> list[str]:
+        """Get the IDs of users with at least one connection."""
+        return list(self._user_sessions)
+
     def get_stats(self) -> dict[str, Any]:
         """Get connection statistics."""
         return {
@@ -156,6 +171,229 @@ class ConnectionStateManager:
         }
 
 
+# =============================================================================
+# Consistent Hashing
+# =============================================================================
+
+
+def _ring_hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class ConsistentHashRing:
+    """
+    Consistent hash ring mapping user IDs to WebSocket workers.
+
+    Each worker is placed on the ring at ``replicas`` points, so adding or
+    removing a worker only moves the users between it and its neighbours.
+    """
+
+    def __init__(self, nodes: Iterable[str], replicas: int = 160):
+        """
+        Initialize the ring.
+
+        Args:
+            nodes: Worker identifiers (URLs).
+            replicas: Virtual points per worker.
+        """
+        self.nodes = sorted(set(nodes))
+        if not self.nodes:
+            raise ValueError("ConsistentHashRing needs at least one node")
+
+        points = sorted((_ring_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(replicas))
+        self._hashes = [h for h, _ in points]
+        self._owners = [node for _, node in points]
+
+    def node_for(self, key: str | UUID) -> str:
+        """Get the worker that owns a key."""
+        index = bisect.bisect(self._hashes, _ring_hash(str(key))) % len(self._hashes)
+        return self._owners[index]
+
+
+def configured_workers() -> list[str]:
+    """Get the WebSocket worker URLs from settings."""
+    return [url.strip() for url in settings.ws_workers.split(",") if url.strip()]
+
+
+def worker_for_user(user_id: str | UUID) -> Optional[str]:
+    """
+    Get the WebSocket worker URL a user should connect to.
+
+    Returns:
+        Worker URL, or None when the tier is not sharded.
+    """
+    workers = configured_workers()
+    if not workers:
+        return None
+    return ConsistentHashRing(workers).node_for(user_id)
+
+
+# =============================================================================
+# Worker Stats
+# =============================================================================
+
+
+def latency_percentiles(samples: Iterable[float]) -> dict[str, Optional[float]]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {"p50": None, "p95": None, "p99": None}
+    return {
+        name: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+        for name, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+    }
+
+
+class WorkerStats:
+    """
+    Emit counters and latencies for one WebSocket worker.
+
+    Latencies are kept over the most recent ``window`` frames:
+    - emit: time spent in ``sio.emit`` for a frame
+    - delivery: publish timestamp to emit completion
+    """
+
+    def __init__(self, window: int = 2048):
+        self.events_received = 0
+        self.frames_emitted = 0
+        self.events_emitted = 0
+        self.emit_errors = 0
+        self._emit_ms: deque[float] = deque(maxlen=window)
+        self._delivery_ms: deque[float] = deque(maxlen=window)
+
+    def record_emit(self, events: int, emit_ms: float, delivery_ms: Iterable[float] = ()) -> None:
+        """Record one emitted frame carrying ``events`` events."""
+        self.frames_emitted += 1
+        self.events_emitted += events
+        self._emit_ms.append(emit_ms)
+        self._delivery_ms.extend(delivery_ms)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get counters and latency percentiles (milliseconds)."""
+        return {
+            "events_received": self.events_received,
+            "events_emitted": self.events_emitted,
+            "frames_emitted": self.frames_emitted,
+            "events_coalesced": self.events_emitted - self.frames_emitted,
+            "emit_errors": self.emit_errors,
+            "emit_latency_ms": latency_percentiles(self._emit_ms),
+            "delivery_latency_ms": latency_percentiles(self._delivery_ms),
+        }
+
+
+# =============================================================================
+# Emit Coalescing
+# =============================================================================
+
+# Events where only the latest in a burst matters
+SUPERSEDING_EVENTS = {"stats_update"}
+
+# Frame name for coalesced events: {"events": [{"event_type": ..., "payload": ...}]}
+BATCH_EVENT = "batch"
+
+
+def _published_at(timestamp: Optional[str]) -> Optional[float]:
+    """Parse a publisher's (naive UTC ISO) timestamp into epoch seconds."""
+    if not timestamp:
+        return None
+    try:
+        return (datetime.fromisoformat(timestamp) - datetime(1970, 1, 1)).total_seconds()
+    except (TypeError, ValueError):
+        return None
+
+
+class EmitCoalescer:
+    """
+    Buffers events per user and emits each burst as one frame.
+
+    The first event for a user opens a window of ``window_seconds``; events
+    arriving in that window join the same frame. A single event is emitted
+    as itself, several as one ``batch`` frame. Flushes for different users
+    run concurrently, so a slow room does not hold up the listener.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[str, Any, str], Awaitable[None]],
+        stats: WorkerStats,
+        window_seconds: float = 0.025,
+        max_batch: int = 100,
+    ):
+        """
+        Initialize the coalescer.
+
+        Args:
+            emit: Coroutine ``emit(event, data, room)``.
+            stats: Stats to record emits in.
+            window_seconds: Coalescing window per user.
+            max_batch: Events that force an immediate flush.
+        """
+        self._emit = emit
+        self._stats = stats
+        self._window = window_seconds
+        self._max_batch = max_batch
+        self._pending: dict[str, list[tuple[str, Any, Optional[float]]]] = {}
+        self._timers: dict[str, asyncio.Task] = {}
+        self._flushes: set[asyncio.Task] = set()
+
+    def add(self, user_id: str, event_type: str, payload: Any, published_at: Optional[float] = None) -> None:
+        """Queue an event for a user."""
+        events = self._pending.setdefault(user_id, [])
+        if event_type in SUPERSEDING_EVENTS:
+            events[:] = [e for e in events if e[0] != event_type]
+        events.append((event_type, payload, published_at))
+
+        if len(events) >= self._max_batch:
+            self._start_flush(user_id)
+        elif user_id not in self._timers:
+            self._timers[user_id] = asyncio.create_task(self._flush_after_window(user_id))
+
+    async def _flush_after_window(self, user_id: str) -> None:
+        await asyncio.sleep(self._window)
+        self._timers.pop(user_id, None)
+        await self._flush(user_id)
+
+    def _start_flush(self, user_id: str) -> None:
+        timer = self._timers.pop(user_id, None)
+        if timer:
+            timer.cancel()
+        task = asyncio.create_task(self._flush(user_id))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, user_id: str) -> None:
+        events = self._pending.pop(user_id, None)
+        if not events:
+            return
+
+        if len(events) == 1:
+            event, data = events[0][0], events[0][1]
+        else:
+            event = BATCH_EVENT
+            data = {"events": [{"event_type": e[0], "payload": e[1]} for e in events]}
+
+        start = time.perf_counter()
+        try:
+            await self._emit(event, data, f"user:{user_id}")
+        except Exception as e:
+            self._stats.emit_errors += 1
+            logger.error(f"Error emitting {event} to user {user_id}: {e}")
+            return
+        done = time.perf_counter()
+        now = time.time()
+        self._stats.record_emit(
+            len(events),
+            (done - start) * 1000,
+            [(now - e[2]) * 1000 for e in events if e[2] is not None],
+        )
+
+    async def close(self) -> None:
+        """Flush everything pending."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        await asyncio.gather(*(self._flush(user_id) for user_id in list(self._pending)), *self._flushes)
+
+
 # =============================================================================
 # JWT Authentication
 # =============================================================================
@@ -222,6 +460,8 @@ class GrantRadarWebSocket:
     - 'grant_update': When a saved grant is updated
     - 'stats_update': Dashboard counter updates
 
+    - 'batch': Several events for a user coalesced into one frame
+
     Internal events:
     - 'connect': Client connection
     - 'disconnect': Client disconnection
@@ -232,6 +472,10 @@ class GrantRadarWebSocket:
         self,
         redis_url: Optional[str] = None,
         cors_allowed_origins: Optional[list[str]] = None,
+        workers: Optional[list[str]] = None,
+        worker_url: Optional[str] = None,
+        coalesce_window_ms: Optional[int] = None,
+        redis_client: Optional[redis.Redis] = None,
     ):
         """
         Initialize the WebSocket server.
@@ -239,6 +483,10 @@ class GrantRadarWebSocket:
         Args:
             redis_url: Redis URL for pub/sub. Defaults to settings.redis_url.
             cors_allowed_origins: Allowed CORS origins. Defaults to frontend URL.
+            workers: WebSocket worker URLs to shard users across. Defaults to settings.ws_workers.
+            worker_url: This worker's URL. Defaults to settings.ws_worker_url.
+            coalesce_window_ms: Per-user coalescing window. Defaults to settings.ws_coalesce_window_ms.
+            redis_client: Pub/sub client to use instead of connecting to redis_url.
         """
         self._redis_url = redis_url or settings.redis_url
         self._cors_origins = cors_allowed_origins or [
@@ -247,8 +495,17 @@ class GrantRadarWebSocket:
             "http://localhost:3000",
         ]
 
-        # Initialize Socket.IO with Redis adapter for horizontal scaling
-        self._mgr = socketio.AsyncRedisManager(self._redis_url)
+        # Sharding: each user's sockets live on the worker that owns them
+        workers = configured_workers() if workers is None else workers
+        self._worker_url = worker_url or settings.ws_worker_url
+        self._ring: Optional[ConsistentHashRing] = None
+        if workers:
+            if self._worker_url not in workers:
+                raise ValueError(f"Worker URL {self._worker_url!r} is not in the worker list")
+            self._ring = ConsistentHashRing(workers)
+
+        # Sharded workers emit locally; otherwise use the Redis adapter for horizontal scaling
+        self._mgr = socketio.AsyncManager() if self._ring else socketio.AsyncRedisManager(self._redis_url)
         self._sio = socketio.AsyncServer(
             async_mode="asgi",
             client_manager=self._mgr,
@@ -268,10 +525,16 @@ class GrantRadarWebSocket:
         self._auth = JWTAuthenticator(settings.secret_key)
 
         # Redis pub/sub subscriber
-        self._redis: Optional[redis.Redis] = None
+        self._redis: Optional[redis.Redis] = redis_client
+        self._owns_redis = redis_client is None
         self._pubsub: Optional[redis.client.PubSub] = None
         self._listener_task: Optional[asyncio.Task] = None
 
+        # Per-user emit coalescing and stats
+        self._stats = WorkerStats()
+        window_ms = settings.ws_coalesce_window_ms if coalesce_window_ms is None else coalesce_window_ms
+        self._coalescer = EmitCoalescer(self._emit_frame, self._stats, window_seconds=window_ms / 1000)
+
         # Register event handlers
         self._register_handlers()
 
@@ -290,6 +553,33 @@ class GrantRadarWebSocket:
         """Get the connection state manager."""
         return self._state
 
+    def owns_user(self, user_id: str) -> bool:
+        """Check whether this worker serves a user's connections."""
+        return self._ring is None or self._ring.node_for(user_id) == self._worker_url
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get this worker's connection and emit statistics."""
+        connections = self._state.get_stats()
+        return {
+            "worker_url": self._worker_url or None,
+            "sharded": self._ring is not None,
+            "total_connections": connections["total_connections"],
+            "unique_users": connections["unique_users"],
+            "subscribed_channels": len(self._pubsub.channels) if self._pubsub else 0,
+            **self._stats.snapshot(),
+        }
+
+    async def _emit_frame(self, event: str, data: Any, room: str) -> None:
+        await self._sio.emit(event, data, room=room)
+
+    async def _subscribe_user(self, user_id: str) -> None:
+        if self._pubsub is not None:
+            await self._pubsub.subscribe(PubSubChannels.user_channel(user_id))
+
+    async def _unsubscribe_user(self, user_id: str) -> None:
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(PubSubChannels.user_channel(user_id))
+
     def _register_handlers(self) -> None:
         """Register Socket.IO event handlers."""
 
@@ -326,7 +616,14 @@ class GrantRadarWebSocket:
                 logger.warning(f"Connection rejected: no user_id in token, sid={sid}")
                 raise socketio.exceptions.ConnectionRefusedError("Invalid token: no user_id")
 
+            # Send users owned by another worker there
+            if not self.owns_user(user_id):
+                owner = self._ring.node_for(user_id)
+                logger.info(f"Connection redirected: sid={sid}, user_id={user_id}, worker={owner}")
+                raise socketio.exceptions.ConnectionRefusedError("wrong_shard", {"worker_url": owner})
+
             # Register connection
+            first_session = not self._state.is_user_connected(user_id)
             self._state.add_connection(
                 sid=sid,
                 user_id=user_id,
@@ -338,6 +635,8 @@ class GrantRadarWebSocket:
 
             # Join user's private room
             await self._sio.enter_room(sid, f"user:{user_id}")
+            if first_session:
+                await self._subscribe_user(user_id)
 
             logger.info(f"Connection established: sid={sid}, user_id={user_id}")
 
@@ -358,6 +657,8 @@ class GrantRadarWebSocket:
             if user_id:
                 # Leave user room
                 await self._sio.leave_room(sid, f"user:{user_id}")
+                if not self._state.is_user_connected(user_id):
+                    await self._unsubscribe_user(user_id)
                 logger.info(f"Disconnected: sid={sid}, user_id={user_id}")
             else:
                 logger.info(f"Disconnected: sid={sid} (unknown user)")
@@ -398,29 +699,31 @@ class GrantRadarWebSocket:
         Start listening to Redis pub/sub channels for cross-process events.
 
         This enables horizontal scaling where multiple WebSocket server
-        instances can communicate through Redis.
+        instances can communicate through Redis. User channels are
+        subscribed only while the user has a connection on this worker.
         """
-        if self._redis is not None:
+        if self._pubsub is not None:
             return
 
         logger.info("Starting Redis pub/sub listener")
 
-        self._redis = redis.from_url(
-            self._redis_url,
-            encoding="utf-8",
-            decode_responses=True,
-        )
+        if self._redis is None:
+            self._redis = redis.from_url(
+                self._redis_url,
+                encoding="utf-8",
+                decode_responses=True,
+            )
 
         self._pubsub = self._redis.pubsub()
 
-        # Subscribe to pattern channels
-        await self._pubsub.psubscribe(f"{PubSubChannels.USER_PREFIX}*")
+        # Subscribe to shared channels and the channels of connected users
         await self._pubsub.subscribe(
             PubSubChannels.BROADCAST,
             PubSubChannels.NEW_MATCH,
             PubSubChannels.DEADLINE_SOON,
             PubSubChannels.GRANT_UPDATE,
             PubSubChannels.STATS_UPDATE,
+            *(PubSubChannels.user_channel(user_id) for user_id in self._state.connected_user_ids()),
         )
 
         # Start listener task
@@ -437,13 +740,14 @@ class GrantRadarWebSocket:
                 pass
             self._listener_task = None
 
+        await self._coalescer.close()
+
         if self._pubsub:
             await self._pubsub.unsubscribe()
-            await self._pubsub.punsubscribe()
             await self._pubsub.aclose()
             self._pubsub = None
 
-        if self._redis:
+        if self._redis and self._owns_redis:
             await self._redis.aclose()
             self._redis = None
 
@@ -471,7 +775,12 @@ class GrantRadarWebSocket:
             logger.error(f"Pub/sub listener error: {e}", exc_info=True)
 
     async def _handle_pubsub_message(self, message: dict) -> None:
-        """Process a message from Redis pub/sub."""
+        """
+        Process a message from Redis pub/sub.
+
+        User-targeted events are handed to the coalescer and emitted in the
+        background, so the listener only pays for JSON decoding.
+        """
         channel = message.get("channel") or message.get("pattern", "")
         data_str = message.get("data", "{}")
 
@@ -484,26 +793,27 @@ class GrantRadarWebSocket:
         event_type = data.get("event_type", "message")
         payload = data.get("payload", data)
         target_user = data.get("user_id")
+        self._stats.events_received += 1
 
         # Handle user-specific messages
         if channel.startswith(PubSubChannels.USER_PREFIX):
             user_id = channel[len(PubSubChannels.USER_PREFIX) :]
-            room = f"user:{user_id}"
-            await self._sio.emit(event_type, payload, room=room)
-            logger.debug(f"Emitted {event_type} to user {user_id}")
+            self._coalescer.add(user_id, event_type, payload, _published_at(data.get("timestamp")))
             return
 
         # Handle broadcast messages
         if channel == PubSubChannels.BROADCAST:
+            start = time.perf_counter()
             await self._sio.emit(event_type, payload)
+            self._stats.record_emit(1, (time.perf_counter() - start) * 1000)
             logger.debug(f"Broadcast {event_type} to all clients")
             return
 
         # Handle event-specific channels
         if target_user:
-            room = f"user:{target_user}"
-            await self._sio.emit(event_type, payload, room=room)
-            logger.debug(f"Emitted {event_type} to user {target_user}")
+            # Every worker hears event channels; only the one holding the user emits
+            if self._ring is None or self._state.is_user_connected(str(target_user)):
+                self._coalescer.add(str(target_user), event_type, payload, _published_at(data.get("timestamp")))
         else:
             # Emit to subscribers of this event type
             await self._sio.emit(event_type, payload, room=f"event:{event_type}")
@@ -693,6 +1003,11 @@ def mount_websocket(app: Any) -> None:
         app: FastAPI application instance.
     """
     ws = get_websocket_server()
+
+    @app.get("/ws/stats", include_in_schema=False)
+    async def websocket_stats() -> dict[str, Any]:
+        return ws.get_stats()
+
     app.mount("/ws", ws.app)
     logger.info("WebSocket server mounted at /ws")
 
@@ -700,8 +1015,12 @@ def mount_websocket(app: Any) -> None:
 __all__ = [
     "GrantRadarWebSocket",
     "ConnectionStateManager",
+    "ConsistentHashRing",
+    "EmitCoalescer",
     "JWTAuthenticator",
     "PubSubChannels",
+    "WorkerStats",
+    "worker_for_user",
     "get_websocket_server",
     "start_websocket_server",
     "stop_websocket_server",
@@ -0,0 +1,241 @@
+"""
+GrantRadar WebSocket Load Test
+Simulates thousands of Socket.IO clients against a local sharded WebSocket tier.
+
+Starts ``--workers`` WebSocket workers on local ports, connects
+``--clients`` authenticated clients (spread over ``--users`` users) to the
+worker that owns each user, publishes bursts of events through the
+notification service, and reports client-side delivery latency along with
+each worker's connection and emit stats:
+
+    python -m backend.websocket_loadtest --workers 4 --clients 2000 --events-per-user 5
+
+Uses an in-memory Redis unless ``--redis-url`` is given.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import socket
+import time
+from typing import Any, Optional
+from uuid import uuid4
+
+import socketio
+import uvicorn
+
+from backend.api.deps import create_access_token
+from backend.notifications import NotificationService
+from backend.websocket import BATCH_EVENT, ConsistentHashRing, GrantRadarWebSocket, latency_percentiles
+
+logger = logging.getLogger(__name__)
+
+LOAD_TEST_EVENT = "load_test"
+
+
+class LocalWorker:
+    """One WebSocket worker served by uvicorn on a local port."""
+
+    def __init__(self, redis_client: Any, workers: list[str], url: str, sock: socket.socket, coalesce_ms: int):
+        self.url = url
+        self.ws = GrantRadarWebSocket(
+            workers=workers,
+            worker_url=url,
+            coalesce_window_ms=coalesce_ms,
+            redis_client=redis_client,
+        )
+        self._socket = sock
+        self._server = uvicorn.Server(
+            uvicorn.Config(self.ws.app, log_level="warning", access_log=False, ws="websockets")
+        )
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        await self.ws.start_pubsub_listener()
+        self._task = asyncio.create_task(self._server.serve(sockets=[self._socket]))
+        while not self._server.started:
+            await asyncio.sleep(0.01)
+
+    async def stop(self) -> None:
+        await self.ws.stop_pubsub_listener()
+        self._server.should_exit = True
+        if self._task:
+            await self._task
+
+
+class LoadClient:
+    """A Socket.IO client that records the events it receives."""
+
+    def __init__(self, user_id: str, results: "LoadResults", transport: str = "websocket"):
+        self.user_id = user_id
+        self.transport = transport
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.sio.on(LOAD_TEST_EVENT, lambda data: results.record([data]))
+        self.sio.on(
+            BATCH_EVENT,
+            lambda data: results.record([e["payload"] for e in data["events"] if e["event_type"] == LOAD_TEST_EVENT]),
+        )
+
+    async def connect(self, url: str) -> None:
+        token = create_access_token({"sub": self.user_id})
+        await self.sio.connect(
+            url, auth={"token": token}, transports=[self.transport], socketio_path="/ws/socket.io", wait_timeout=30
+        )
+
+
+class LoadResults:
+    """Client-side delivery counters."""
+
+    def __init__(self):
+        self.frames = 0
+        self.events = 0
+        self.latencies_ms: list[float] = []
+
+    def record(self, payloads: list[dict[str, Any]]) -> None:
+        now = time.time()
+        self.frames += 1
+        self.events += len(payloads)
+        self.latencies_ms.extend((now - p["sent_at"]) * 1000 for p in payloads)
+
+
+def _bind_local_socket() -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    return sock
+
+
+async def run_load_test(
+    workers: int = 2,
+    clients: int = 1000,
+    users: Optional[int] = None,
+    events_per_user: int = 5,
+    coalesce_ms: int = 25,
+    connect_concurrency: int = 200,
+    redis_url: Optional[str] = None,
+    transport: str = "websocket",
+    timeout: float = 30.0,
+) -> dict[str, Any]:
+    """
+    Run one load test.
+
+    Args:
+        workers: WebSocket workers to start.
+        clients: Socket.IO clients to connect.
+        users: Distinct users (defaults to one per client).
+        events_per_user: Events published to each user in one burst.
+        coalesce_ms: Worker coalescing window.
+        connect_concurrency: Client connections opened at once.
+        redis_url: Redis for pub/sub (in-memory if not given).
+        transport: Engine.IO transport the clients use ("websocket" or "polling").
+        timeout: Seconds to wait for delivery.
+
+    Returns:
+        Report with connect time, delivery counts, latency percentiles and per-worker stats.
+    """
+    if redis_url:
+        import redis.asyncio as aioredis
+
+        redis_client = aioredis.from_url(redis_url, encoding="utf-8", decode_responses=True)
+    else:
+        import fakeredis
+
+        redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+    sockets = [_bind_local_socket() for _ in range(workers)]
+    urls = [f"http://127.0.0.1:{sock.getsockname()[1]}" for sock in sockets]
+    local_workers = [LocalWorker(redis_client, urls, url, sock, coalesce_ms) for url, sock in zip(urls, sockets)]
+    ring = ConsistentHashRing(urls)
+
+    user_ids = [str(uuid4()) for _ in range(users or clients)]
+    results = LoadResults()
+    load_clients = [LoadClient(user_ids[i % len(user_ids)], results, transport) for i in range(clients)]
+
+    notifier = NotificationService()
+    notifier._redis = redis_client
+
+    for worker in local_workers:
+        await worker.start()
+
+    try:
+        semaphore = asyncio.Semaphore(connect_concurrency)
+
+        async def connect(client: LoadClient) -> None:
+            async with semaphore:
+                await client.connect(ring.node_for(client.user_id))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(connect(client) for client in load_clients))
+        connect_seconds = time.perf_counter() - start
+
+        sessions_per_user = {}
+        for client in load_clients:
+            sessions_per_user[client.user_id] = sessions_per_user.get(client.user_id, 0) + 1
+        expected = events_per_user * sum(sessions_per_user.values())
+
+        start = time.perf_counter()
+        for seq in range(events_per_user):
+            await asyncio.gather(
+                *(
+                    notifier.notify_user(user_id, LOAD_TEST_EVENT, {"sent_at": time.time(), "seq": seq})
+                    for user_id in sessions_per_user
+                )
+            )
+        deadline = time.monotonic() + timeout
+        while results.events < expected and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        deliver_seconds = time.perf_counter() - start
+
+        return {
+            "workers": workers,
+            "clients": clients,
+            "users": len(sessions_per_user),
+            "connect_seconds": round(connect_seconds, 3),
+            "events_expected": expected,
+            "events_received": results.events,
+            "frames_received": results.frames,
+            "deliver_seconds": round(deliver_seconds, 3),
+            "events_per_second": round(results.events / deliver_seconds, 1) if deliver_seconds else None,
+            "delivery_latency_ms": latency_percentiles(results.latencies_ms),
+            "worker_stats": [worker.ws.get_stats() for worker in local_workers],
+        }
+    finally:
+        await asyncio.gather(*(client.sio.disconnect() for client in load_clients), return_exceptions=True)
+        for worker in local_workers:
+            await worker.stop()
+        await redis_client.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the sharded WebSocket tier locally")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=None)
+    parser.add_argument("--events-per-user", type=int, default=5)
+    parser.add_argument("--coalesce-ms", type=int, default=25)
+    parser.add_argument("--redis-url", default=None)
+    parser.add_argument("--transport", choices=["websocket", "polling"], default="websocket")
+    args = parser.parse_args()
+
+    # Per-connection INFO logs would dominate the run
+    logging.basicConfig(level=logging.WARNING)
+    for name in ("backend", "socketio.server", "engineio.server"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    report = asyncio.run(
+        run_load_test(
+            workers=args.workers,
+            clients=args.clients,
+            users=args.users,
+            events_per_user=args.events_per_user,
+            coalesce_ms=args.coalesce_ms,
+            redis_url=args.redis_url,
+            transport=args.transport,
+        )
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
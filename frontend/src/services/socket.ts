@@ -3,16 +3,21 @@ import type { GrantMatch } from '../types';
 
 const SOCKET_URL = import.meta.env.VITE_WS_URL || 'http://localhost:8000';
 
+interface BatchedEvent {
+  event_type: string;
+  payload: unknown;
+}
+
 class SocketService {
   private socket: Socket | null = null;
   private listeners: Map<string, Set<(data: unknown) => void>> = new Map();
 
-  connect(token: string): void {
+  connect(token: string, url: string = SOCKET_URL): void {
     if (this.socket?.connected) {
       return;
     }
 
-    this.socket = io(SOCKET_URL, {
+    this.socket = io(url, {
       auth: { token },
       transports: ['websocket', 'polling'],
       reconnection: true,
@@ -28,7 +33,13 @@ class SocketService {
       console.log('Socket disconnected:', reason);
     });
 
-    this.socket.on('connect_error', (error) => {
+    this.socket.on('connect_error', (error: Error & { data?: { worker_url?: string } }) => {
+      // Each user is served by one WebSocket worker; reconnect to the owner
+      if (error.message === 'wrong_shard' && error.data?.worker_url && error.data.worker_url !== url) {
+        this.disconnect();
+        this.connect(token, error.data.worker_url);
+        return;
+      }
       console.error('Socket connection error:', error);
     });
 
@@ -44,6 +55,11 @@ class SocketService {
     this.socket.on('deadline_reminder', (data: { grant_id: string; deadline: string }) => {
       this.emit('deadline_reminder', data);
     });
+
+    // Bursts of events are coalesced by the server into one frame
+    this.socket.on('batch', (data: { events: BatchedEvent[] }) => {
+      data.events.forEach((event) => this.emit(event.event_type, event.payload));
+    });
   }
 
   disconnect(): void {
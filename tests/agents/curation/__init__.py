@@ -0,0 +1 @@
+"""Curation agent tests."""
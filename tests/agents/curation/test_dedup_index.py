@@ -0,0 +1,238 @@
+"""
+Tests for the curation near-duplicate index.
+Covers MinHash signatures, candidate lookup and validator integration.
+"""
+
+import random
+import string
+import time
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import fakeredis
+import pytest
+
+from agents.curation.dedup_index import (
+    DESCRIPTION_LENGTH,
+    DuplicateIndex,
+    levenshtein_distance,
+    minhash_signature,
+    normalize_title,
+    rebuild_from_database,
+)
+from agents.curation.validator import CurationValidator, EnrichedGrant
+
+
+@pytest.fixture
+def index():
+    return DuplicateIndex(fakeredis.FakeRedis(decode_responses=True))
+
+
+def _grant(title, **extra):
+    return {"grant_id": str(uuid4()), "title": title, "source": "nih", **extra}
+
+
+def _random_title(rng):
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(rng.randint(4, 9))]
+    return " ".join(words).title()
+
+
+class TestSignature:
+    """Tests for title normalization and MinHash."""
+
+    def test_normalization_ignores_case_and_punctuation(self):
+        assert normalize_title("  Cancer-Research: Phase II!  ") == "cancer research phase ii"
+
+    def test_identical_titles_share_signature(self):
+        assert (minhash_signature("Cancer Research") == minhash_signature("cancer research.")).all()
+
+    def test_empty_title_has_no_signature(self):
+        assert minhash_signature("  --  ") is None
+
+
+class TestLevenshtein:
+    """Tests for the bounded edit distance."""
+
+    @pytest.mark.parametrize("a,b,expected", [("kitten", "sitting", 3), ("", "abc", 3), ("same", "same", 0)])
+    def test_distance(self, a, b, expected):
+        assert levenshtein_distance(a, b) == expected
+
+    def test_stops_early_above_bound(self):
+        assert levenshtein_distance("a" * 50, "b" * 50, max_distance=2) > 2
+
+
+class TestCandidates:
+    """Tests for duplicate candidate lookup."""
+
+    def test_finds_near_duplicate_title(self, index):
+        existing = _grant("Neural Mechanisms of Memory Consolidation in Aging")
+        index.add(existing)
+        index.add(_grant("Coastal Erosion Modeling with Satellite Imagery"))
+
+        found = index.candidates(_grant("Neural Mechanisms of Memory Consolidation in Aging."))
+
+        assert [g["grant_id"] for g in found] == [existing["grant_id"]]
+
+    def test_distance_three_is_not_a_duplicate(self, index):
+        index.add(_grant("Neural Mechanisms of Memory"))
+
+        assert index.candidates(_grant("Neural Mechanisms of Mem")) == []
+
+    def test_same_external_id_from_other_source(self, index):
+        existing = _grant("Completely Different Title", external_id="RFA-1", source="grants_gov")
+        index.add(existing)
+
+        assert index.candidates(_grant("Another Title", external_id="RFA-1", source="nih")) != []
+        assert index.candidates(_grant("Another Title", external_id="RFA-1", source="grants_gov")) == []
+
+    def test_excludes_itself(self, index):
+        grant = _grant("Neural Mechanisms of Memory")
+        index.add(grant)
+
+        assert index.candidates(grant) == []
+
+    def test_retitled_grant_leaves_old_buckets(self, index):
+        grant = _grant("Neural Mechanisms of Memory Consolidation")
+        index.add(grant)
+        index.add({**grant, "title": "Coastal Erosion Modeling with Satellite Imagery"})
+
+        assert index.size() == 1
+        assert index.redis.sunion(list(index.redis.scan_iter("grants:dedup:band:*"))) == {f"id:{grant['grant_id']}"}
+        assert index.candidates(_grant("Neural Mechanisms of Memory Consolidation")) == []
+
+    def test_summary_truncates_description(self, index):
+        index.add(_grant("Neural Mechanisms of Memory", description="x" * 5000))
+
+        (found,) = index.candidates(_grant("Neural Mechanisms of Memory"))
+        assert len(found["description"]) == DESCRIPTION_LENGTH
+
+    def test_matches_brute_force_over_all_grants(self, index):
+        rng = random.Random(7)
+        titles = [_random_title(rng) for _ in range(500)]
+        index.add_many(_grant(t) for t in titles)
+
+        for title in rng.sample(titles, 20):
+            chars = list(title)
+            for _ in range(2):
+                chars[rng.randrange(len(chars))] = rng.choice(string.ascii_lowercase)
+            query = "".join(chars)
+
+            expected = {t for t in titles if levenshtein_distance(query.lower(), t.lower(), max_distance=2) < 3}
+            found = {g["title"] for g in index.candidates(_grant(query))}
+            assert found == expected
+
+    def test_lookup_cost_does_not_grow_with_index(self, index):
+        rng = random.Random(3)
+        index.add_many(_grant(_random_title(rng)) for _ in range(5000))
+        query = _grant(_random_title(rng))
+
+        start = time.perf_counter()
+        for _ in range(100):
+            index.candidates(query)
+        per_lookup = (time.perf_counter() - start) / 100
+
+        # fakeredis adds overhead; a linear scan of 5000 titles takes far longer
+        assert per_lookup < 0.01
+
+
+class TestPrune:
+    """Tests for retention-based eviction."""
+
+    def test_prune_removes_summary_and_bucket_memberships(self, index):
+        index.add_many(_grant(t, external_id=f"X-{i}") for i, t in enumerate(["Ocean Acidification", "Soil Carbon"]))
+
+        assert index.prune(max_age_seconds=0) == 2
+        assert index.size() == 0
+        assert list(index.redis.scan_iter("grants:dedup:*")) == []
+
+    def test_recently_indexed_entries_are_kept(self, index):
+        index.add(_grant("Ocean Acidification"))
+
+        assert index.prune(max_age_seconds=3600) == 0
+        assert index.size() == 1
+
+    def test_add_prunes_expired_entries_when_retention_set(self, index):
+        index.add(_grant("Ocean Acidification Monitoring"))
+        expiring = DuplicateIndex(index.redis, retention_seconds=0)
+
+        expiring.add(_grant("Soil Carbon Sequestration"))
+
+        assert expiring.candidates(_grant("Ocean Acidification Monitoring")) == []
+
+
+class TestRebuild:
+    """Tests for the database backfill."""
+
+    def test_indexes_every_row(self, index):
+        row = MagicMock(
+            id=uuid4(),
+            external_id="X-1",
+            source="nsf",
+            title="Ocean Acidification Monitoring",
+            description=None,
+            url="https://example.org",
+            agency="NSF",
+            amount_max=100000,
+            deadline=None,
+            created_at=None,
+        )
+        session = MagicMock()
+        session.execute.return_value.partitions.return_value = iter([[row]])
+
+        assert rebuild_from_database(index, session) == 1
+        found = index.candidates(_grant("Ocean Acidification Monitoring"))
+        assert found[0]["funding_agency"] == "NSF"
+
+    def test_rebuild_and_validator_share_keys(self, index):
+        row = MagicMock(
+            id=uuid4(),
+            external_id="X-1",
+            source="nsf",
+            title="Ocean Acidification Monitoring",
+            description=None,
+            url="https://example.org",
+            agency="NSF",
+            amount_max=None,
+            deadline=None,
+            created_at=None,
+        )
+        session = MagicMock()
+        session.execute.return_value.partitions.return_value = iter([[row]])
+        index.add(_grant("Ocean Acidification Monitoring", external_id="X-1", source="nsf"))
+
+        rebuild_from_database(index, session)
+
+        assert index.size() == 1
+
+
+class TestValidatorIntegration:
+    """Tests for CurationValidator using the index."""
+
+    @pytest.fixture
+    def validator(self):
+        validator = CurationValidator()
+        validator._redis_client = fakeredis.FakeRedis(decode_responses=True)
+        return validator
+
+    @pytest.mark.asyncio
+    async def test_published_grants_are_found_as_duplicates(self, validator):
+        grant = EnrichedGrant(
+            grant_id=uuid4(),
+            source="nih",
+            title="Immunotherapy Approaches for Pediatric Leukemia",
+            url="https://example.org/1",
+            embedding=[0.1, 0.2],
+        )
+        await validator.publish_validated_grant(grant)
+
+        found = await validator.find_potential_duplicates(
+            {"title": "Immunotherapy Approaches for Pediatric Leukaemia", "source": "nsf"}
+        )
+
+        assert [d["grant_id"] for d in found] == [str(grant.grant_id)]
+        assert "embedding" not in found[0]
+
+    @pytest.mark.asyncio
+    async def test_index_errors_return_no_duplicates(self, validator):
+        with patch.object(DuplicateIndex, "candidates", side_effect=RuntimeError("boom")):
+            assert await validator.find_potential_duplicates({"title": "x"}) == []
@@ -0,0 +1,134 @@
+"""
+Tests for CurationValidator stream consumption.
+Covers concurrent processing, bulk acknowledgement and DLQ routing.
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fakeredis
+import pytest
+
+from agents.curation.validator import CurationValidator, ValidationResult
+from backend.core.events import DeadLetterEvent
+
+
+class NonBlockingFakeRedis(fakeredis.FakeRedis):
+    """fakeredis returns no queued entries from XREADGROUP when BLOCK is set."""
+
+    def xreadgroup(self, *args, block=None, **kwargs):
+        return super().xreadgroup(*args, **kwargs)
+
+
+@pytest.fixture
+def validator():
+    validator = CurationValidator()
+    validator._redis_client = NonBlockingFakeRedis(decode_responses=True)
+    validator._ensure_consumer_group()
+    return validator
+
+
+def _add_messages(validator, count):
+    return [
+        validator.redis_client.xadd(validator.INPUT_STREAM, {"data": json.dumps({"title": f"Grant {i}"})})
+        for i in range(count)
+    ]
+
+
+def _pending(validator):
+    return validator.redis_client.xpending(validator.INPUT_STREAM, validator.CONSUMER_GROUP)["pending"]
+
+
+class TestConsumeStream:
+    """Tests for the concurrent consumer."""
+
+    @pytest.mark.asyncio
+    async def test_processes_batch_concurrently_within_limit(self, validator):
+        _add_messages(validator, 8)
+        in_flight = 0
+        peak = 0
+
+        async def slow_process(grant_data):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return MagicMock()
+
+        with patch.object(validator, "process_grant", side_effect=slow_process):
+            start = time.monotonic()
+            processed = await validator.consume_stream(count=8, block_ms=10, concurrency=4)
+            elapsed = time.monotonic() - start
+
+        assert processed == 8
+        assert peak == 4
+        assert elapsed < 8 * 0.05
+        assert _pending(validator) == 0
+
+    @pytest.mark.asyncio
+    async def test_acknowledges_batch_with_one_xack(self, validator):
+        message_ids = _add_messages(validator, 3)
+        pipeline = validator.redis_client.pipeline(transaction=False)
+
+        with (
+            patch.object(validator, "process_grant", AsyncMock(return_value=None)),
+            patch.object(validator.redis_client, "pipeline", return_value=pipeline),
+            patch.object(pipeline, "xack", wraps=pipeline.xack) as xack,
+        ):
+            processed = await validator.consume_stream(count=3, block_ms=10)
+
+        assert processed == 0
+        xack.assert_called_once_with(validator.INPUT_STREAM, validator.CONSUMER_GROUP, *message_ids)
+        assert _pending(validator) == 0
+
+    @pytest.mark.asyncio
+    async def test_failures_are_moved_to_dlq(self, validator):
+        message_ids = _add_messages(validator, 3)
+        validator.redis_client.xadd(validator.INPUT_STREAM, {"data": "not json"})
+
+        async def process(grant_data):
+            if grant_data["title"] == "Grant 1":
+                raise RuntimeError("llm unavailable")
+            return MagicMock()
+
+        with patch.object(validator, "process_grant", side_effect=process):
+            processed = await validator.consume_stream(count=10, block_ms=10)
+
+        assert processed == 2
+        assert _pending(validator) == 0
+
+        entries = validator.redis_client.xrange("dlq:grants:discovered")
+        events = [DeadLetterEvent.model_validate_json(fields["payload"]) for _, fields in entries]
+        assert [e.error_type for e in events] == ["RuntimeError", "JSONDecodeError"]
+        assert events[0].original_message_id == message_ids[1]
+        assert events[0].original_payload == {"title": "Grant 1"}
+        assert events[1].original_payload == {"raw": "not json"}
+        assert entries[0][1]["event_type"] == "DeadLetterEvent"
+
+    @pytest.mark.asyncio
+    async def test_empty_stream_returns_zero(self, validator):
+        assert await validator.consume_stream(count=10, block_ms=10) == 0
+
+
+class TestProcessGrant:
+    """Tests for per-grant parallelism."""
+
+    @pytest.mark.asyncio
+    async def test_categorization_and_embedding_run_together(self, validator):
+        async def slow(*args):
+            await asyncio.sleep(0.05)
+            return ["Other"] if len(args) == 2 else None
+
+        validator.validate_quality = AsyncMock(return_value=ValidationResult(is_valid=True, quality_score=90))
+        validator.categorize_grant = slow
+        validator.generate_embedding = slow
+        validator.publish_validated_grant = AsyncMock()
+
+        start = time.monotonic()
+        result = await validator.process_grant({"title": "Grant", "url": "https://example.org"})
+
+        assert result is not None
+        assert time.monotonic() - start < 0.1
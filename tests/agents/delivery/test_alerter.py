@@ -3,6 +3,7 @@ Tests for Alert Delivery Agent.
 Tests priority determination, channel selection, and alert routing.
 """
 
+import fakeredis
 import pytest
 from datetime import datetime, timedelta
 from unittest.mock import MagicMock, AsyncMock, patch
@@ -12,6 +13,7 @@ from agents.delivery.alerter import AlertDeliveryAgent
 from agents.delivery.models import (
     AlertPriority,
     DeliveryChannel,
+    UserInfo,
     UserNotificationPreferences,
 )
 
@@ -137,57 +139,64 @@ class TestChannelDetermination:
 class TestDigestBatching:
     """Tests for digest batching logic."""
 
-    def test_should_batch_medium_priority_over_threshold(self, mock_redis_client):
-        """Test batching when >3 medium alerts in a day."""
+    @pytest.fixture
+    def agent(self):
         agent = AlertDeliveryAgent()
-        agent._redis_client = mock_redis_client
-        mock_redis_client.llen.return_value = 4  # >3 alerts
+        agent._redis_client = fakeredis.FakeRedis(decode_responses=True)
+        return agent
+
+    def _batch(self, agent, user_id, count):
+        for _ in range(count):
+            agent.digests.add(user_id, uuid4(), uuid4(), 0.8, "daily")
 
+    def test_should_batch_medium_priority_over_threshold(self, agent):
+        """Test batching once 3 or more alerts are pending."""
         user_id = uuid4()
+        self._batch(agent, user_id, 4)
+
         should_batch = agent.should_batch_for_digest(user_id, AlertPriority.MEDIUM)
 
         assert should_batch is True
 
-    def test_should_not_batch_medium_below_threshold(self, mock_redis_client):
-        """Test no batching when <3 medium alerts in a day."""
-        agent = AlertDeliveryAgent()
-        agent._redis_client = mock_redis_client
-        mock_redis_client.llen.return_value = 2  # <3 alerts
-
+    def test_should_not_batch_medium_below_threshold(self, agent):
+        """Test no batching when fewer than 3 alerts are pending."""
         user_id = uuid4()
+        self._batch(agent, user_id, 2)
+
         should_batch = agent.should_batch_for_digest(user_id, AlertPriority.MEDIUM)
 
         assert should_batch is False
 
-    def test_should_not_batch_high_priority(self, mock_redis_client):
-        """Test that HIGH priority is never batched."""
+    def test_should_batch_uses_prefetched_count(self, mock_redis_client):
+        """Test a known pending count skips the Redis lookup."""
         agent = AlertDeliveryAgent()
         agent._redis_client = mock_redis_client
 
-        user_id = uuid4()
-        should_batch = agent.should_batch_for_digest(user_id, AlertPriority.HIGH)
+        assert agent.should_batch_for_digest(uuid4(), AlertPriority.MEDIUM, pending_count=3) is True
+        mock_redis_client.pipeline.assert_not_called()
+
+    def test_should_not_batch_high_priority(self, agent):
+        """Test that HIGH priority is never batched."""
+        should_batch = agent.should_batch_for_digest(uuid4(), AlertPriority.HIGH)
 
         assert should_batch is False
 
-    def test_should_not_batch_critical_priority(self, mock_redis_client):
+    def test_should_not_batch_critical_priority(self, agent):
         """Test that CRITICAL priority is never batched."""
-        agent = AlertDeliveryAgent()
-        agent._redis_client = mock_redis_client
-
-        user_id = uuid4()
-        should_batch = agent.should_batch_for_digest(user_id, AlertPriority.CRITICAL)
+        should_batch = agent.should_batch_for_digest(uuid4(), AlertPriority.CRITICAL)
 
         assert should_batch is False
 
-    def test_add_to_digest_batch(self, mock_redis_client, sample_alert_payload):
-        """Test adding alert to digest batch."""
-        agent = AlertDeliveryAgent()
-        agent._redis_client = mock_redis_client
-
-        agent.add_to_digest_batch(sample_alert_payload)
+    def test_add_to_digest_batch(self, agent, sample_alert_payload):
+        """Test adding alert stores a compact entry and indexes the user."""
+        count = agent.add_to_digest_batch(sample_alert_payload, "weekly")
 
-        mock_redis_client.lpush.assert_called_once()
-        mock_redis_client.expireat.assert_called_once()
+        user_id = str(sample_alert_payload.user.user_id)
+        entries = agent.digests.entries([user_id])[user_id]
+        assert count == 1
+        assert entries[0].match_id == sample_alert_payload.match_id
+        assert entries[0].grant_id == sample_alert_payload.grant.grant_id
+        assert agent.redis_client.zscore("digest:due", user_id) is not None
 
 
 class TestContentGeneration:
@@ -327,3 +336,142 @@ class TestAlertLogging:
 
         # Check that latency was logged
         mock_logger.info.assert_called()
+
+
+class TestBatchProcessing:
+    """Tests for concurrent batch processing of match events."""
+
+    @pytest.fixture
+    def agent(self):
+        import fakeredis
+
+        agent = AlertDeliveryAgent()
+        agent._redis_client = fakeredis.FakeRedis(decode_responses=True)
+        agent._ensure_consumer_group()
+        return agent
+
+    def _add_events(self, agent, users, grant_id, score=0.9):
+        import json
+
+        for user in users:
+            event = {
+                "event_id": str(uuid4()),
+                "match_id": str(uuid4()),
+                "grant_id": str(grant_id),
+                "user_id": str(user.user_id),
+                "match_score": score,
+                "priority_level": "high",
+            }
+            agent.redis_client.xadd(agent.MATCHES_STREAM, {"data": json.dumps(event)})
+
+    def _user(self):
+        user_id = uuid4()
+        return UserInfo(user_id=user_id, name="Researcher", email=f"{user_id}@example.edu")
+
+    def _pending(self, agent):
+        return agent.redis_client.xpending(agent.MATCHES_STREAM, agent.CONSUMER_GROUP)["pending"]
+
+    @pytest.mark.asyncio
+    async def test_batch_uses_one_lookup_per_table_and_one_ack(self, agent, sample_grant_info):
+        users = [self._user() for _ in range(5)]
+        self._add_events(agent, users, sample_grant_info.grant_id)
+        preferences = UserNotificationPreferences()
+        fetch_users = AsyncMock(return_value={u.user_id: (u, preferences) for u in users})
+        fetch_grants = AsyncMock(return_value={sample_grant_info.grant_id: sample_grant_info})
+        pipeline = agent.redis_client.pipeline(transaction=False)
+
+        with (
+            patch.object(agent, "_fetch_users", fetch_users),
+            patch.object(agent, "_fetch_grants", fetch_grants),
+            patch.object(agent.redis_client, "pipeline", return_value=pipeline),
+            patch.object(pipeline, "xack", wraps=pipeline.xack) as xack,
+            patch("agents.delivery.alerter.send_high_priority_alert") as task,
+        ):
+            acknowledged = await agent.process_batch(block_ms=None)
+
+        assert acknowledged == 5
+        assert task.delay.call_count == 5
+        assert fetch_users.await_count == 1
+        assert set(fetch_users.await_args[0][0]) == {u.user_id for u in users}
+        assert fetch_grants.await_count == 1
+        xack.assert_called_once()
+        assert self._pending(agent) == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_events_stay_pending(self, agent, sample_grant_info):
+        users = [self._user() for _ in range(3)]
+        self._add_events(agent, users, sample_grant_info.grant_id)
+        failing = users[1].user_id
+
+        async def route(event, user_result, grant, digest_counts=None):
+            if event.user_id == failing:
+                raise RuntimeError("broker unavailable")
+
+        with (
+            patch.object(agent, "_fetch_users", AsyncMock(return_value={})),
+            patch.object(agent, "_fetch_grants", AsyncMock(return_value={})),
+            patch.object(agent, "_route_match", side_effect=route),
+        ):
+            acknowledged = await agent.process_batch(block_ms=None)
+
+        assert acknowledged == 2
+        assert self._pending(agent) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_lookup_leaves_batch_pending(self, agent, sample_grant_info):
+        self._add_events(agent, [self._user() for _ in range(3)], sample_grant_info.grant_id)
+
+        with (
+            patch.object(agent, "_fetch_users", AsyncMock(side_effect=ConnectionError("db down"))),
+            patch.object(agent, "_fetch_grants", AsyncMock(return_value={})),
+            patch.object(agent, "_route_match") as route,
+        ):
+            acknowledged = await agent.process_batch(block_ms=None)
+
+        assert acknowledged == 0
+        route.assert_not_called()
+        assert self._pending(agent) == 3
+
+    @pytest.mark.asyncio
+    async def test_routing_concurrency_is_bounded(self, agent, sample_grant_info):
+        import asyncio
+
+        self._add_events(agent, [self._user() for _ in range(8)], sample_grant_info.grant_id)
+        in_flight = 0
+        peak = 0
+
+        async def route(event, user_result, grant, digest_counts=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+
+        with (
+            patch.object(agent, "_fetch_users", AsyncMock(return_value={})),
+            patch.object(agent, "_fetch_grants", AsyncMock(return_value={})),
+            patch.object(agent, "_route_match", side_effect=route),
+        ):
+            await agent.process_batch(block_ms=None, concurrency=3)
+
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_records_stage_and_alerting_latency(self, agent, sample_grant_info):
+        self._add_events(agent, [self._user() for _ in range(2)], sample_grant_info.grant_id)
+
+        with (
+            patch.object(agent, "_fetch_users", AsyncMock(return_value={})),
+            patch.object(agent, "_fetch_grants", AsyncMock(return_value={})),
+        ):
+            await agent.process_batch(block_ms=None)
+
+        stats = agent.get_latency_stats()
+        assert all(stats[stage]["sample_count"] == 1 for stage in agent.STAGES)
+        assert stats["alerting"]["sample_count"] == 2
+        assert stats["alerting"]["target_ms"] == 30000
+        assert agent.redis_client.zcard(agent.ALERTING_LATENCY_KEY) == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_stream(self, agent):
+        assert await agent.process_batch(block_ms=None) == 0
@@ -3,19 +3,35 @@ Tests for Delivery Channels.
 Tests SendGrid, Twilio, and Slack channel implementations.
 """
 
+import time
+
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
+from uuid import uuid4
 
 from agents.delivery.channels import (
+    SENDGRID_MAX_PERSONALIZATIONS,
+    SENDGRID_MAX_SUBSTITUTION_BYTES,
     SendGridChannel,
+    TokenBucket,
     TwilioChannel,
     SlackChannel,
+    close_delivery_http_client,
     get_sendgrid_channel,
     get_twilio_channel,
     get_slack_channel,
 )
+from agents.delivery.fake_providers import (
+    FAKE_ACCOUNT_SID,
+    FAKE_API_KEY,
+    FAKE_AUTH_TOKEN,
+    FAKE_FROM_NUMBER,
+    FakeProviderServer,
+)
 from agents.delivery.models import (
     DeliveryChannel,
+    EmailContent,
+    SMSContent,
     SlackContent,
 )
 
@@ -271,6 +287,226 @@ class TestSlackChannel:
         assert channel._http_client is None
 
 
+class TestTokenBucket:
+    """Tests for provider request pacing."""
+
+    def test_burst_within_capacity_does_not_wait(self):
+        bucket = TokenBucket(rate=10)
+
+        assert all(bucket.reserve() == 0 for _ in range(10))
+
+    def test_reservations_queue_behind_each_other(self):
+        bucket = TokenBucket(rate=10, capacity=1)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+        assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_acquire_paces_to_rate(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+
+        start = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+
+        assert time.monotonic() - start >= 0.09
+
+
+@pytest.fixture(scope="module")
+def fake_providers():
+    """Local fake SendGrid/Twilio server shared by the bulk tests."""
+    with FakeProviderServer(latency_ms=5) as server:
+        yield server
+
+
+@pytest.fixture
+def fake_server():
+    """Fake server with rate limiting, for retry tests."""
+    with FakeProviderServer(latency_ms=0, email_requests_per_second=1, sms_per_second=2) as server:
+        yield server
+
+
+def _emails(count, body="<p>Hi -name-</p>"):
+    return [
+        EmailContent(
+            subject=f"Match {i}",
+            body_html=body,
+            body_text="Hi -name-",
+            from_email="alerts@grantradar.com",
+            from_name="GrantRadar",
+            to_email=f"user{i}@example.edu",
+            tracking_id=str(uuid4()),
+            substitutions={"-name-": f"User {i}"},
+        )
+        for i in range(count)
+    ]
+
+
+def _sendgrid(server, **kwargs):
+    return SendGridChannel(api_key=FAKE_API_KEY, api_base_url=server.url, requests_per_second=1000, **kwargs)
+
+
+def _twilio(server, messages_per_second=1000):
+    return TwilioChannel(
+        account_sid=FAKE_ACCOUNT_SID,
+        auth_token=FAKE_AUTH_TOKEN,
+        from_number=FAKE_FROM_NUMBER,
+        api_base_url=server.url,
+        messages_per_second=messages_per_second,
+    )
+
+
+class TestSendGridBulk:
+    """Tests for SendGrid personalization batching."""
+
+    def test_bulk_payload_has_one_personalization_per_email(self):
+        payload = SendGridChannel._build_bulk_payload(_emails(3))
+
+        assert len(payload["personalizations"]) == 3
+        first = payload["personalizations"][0]
+        assert first["to"] == [{"email": "user0@example.edu"}]
+        assert first["subject"] == "Match 0"
+        assert first["substitutions"] == {"-name-": "User 0"}
+        assert "match_id" in first["custom_args"]
+        assert payload["content"][1] == {"type": "text/html", "value": "<p>Hi -name-</p>"}
+
+    @pytest.mark.asyncio
+    async def test_shared_body_is_chunked_into_max_personalizations(self, fake_providers):
+        before = fake_providers.stats
+        emails = _emails(SENDGRID_MAX_PERSONALIZATIONS + 5)
+
+        try:
+            statuses = await _sendgrid(fake_providers).send_bulk(emails)
+        finally:
+            await close_delivery_http_client()
+
+        after = fake_providers.stats
+        assert after["email_requests"] - before["email_requests"] == 2
+        assert after["emails"] - before["emails"] == len(emails)
+        assert all(s.status == "sent" and s.provider_message_id for s in statuses)
+        assert [str(s.match_id) for s in statuses] == [e.tracking_id for e in emails]
+
+    @pytest.mark.asyncio
+    async def test_distinct_bodies_are_separate_requests(self, fake_providers):
+        before = fake_providers.stats
+        emails = _emails(2) + _emails(2, body="<p>Digest</p>")
+
+        try:
+            statuses = await _sendgrid(fake_providers).send_bulk(emails)
+        finally:
+            await close_delivery_http_client()
+
+        assert fake_providers.stats["email_requests"] - before["email_requests"] == 2
+        assert len(statuses) == 4
+
+    @pytest.mark.asyncio
+    async def test_oversized_substitutions_are_filled_in_and_sent_alone(self):
+        channel = SendGridChannel(api_key=FAKE_API_KEY, api_base_url="http://fake", requests_per_second=1000)
+        emails = _emails(3)
+        emails[1].substitutions = {"-name-": "x" * SENDGRID_MAX_SUBSTITUTION_BYTES}
+
+        with patch.object(
+            channel, "_send_bulk_request", AsyncMock(side_effect=lambda c: [MagicMock()] * len(c))
+        ) as bulk:
+            await channel.send_bulk(emails)
+
+        requests = sorted((call.args[0] for call in bulk.await_args_list), key=len)
+        assert [len(contents) for contents in requests] == [1, 2]
+        assert requests[0][0].substitutions is None
+        assert requests[0][0].body_text == "Hi " + "x" * SENDGRID_MAX_SUBSTITUTION_BYTES
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_request_is_retried(self, fake_server):
+        channel = _sendgrid(fake_server)
+        channel.RETRY_DELAYS = (0.0, 0.0, 0.0)
+
+        try:
+            statuses = await channel.send_bulk(_emails(1) + _emails(1, body="other"), concurrency=2)
+        finally:
+            await close_delivery_http_client()
+
+        assert all(s.status == "sent" for s in statuses)
+        assert fake_server.stats["rate_limited"] >= 1
+        assert max(s.retry_count for s in statuses) >= 1
+
+    @pytest.mark.asyncio
+    async def test_client_error_fails_without_retry(self):
+        channel = SendGridChannel(api_key=FAKE_API_KEY, api_base_url="http://fake", requests_per_second=1000)
+        response = MagicMock(is_success=False, status_code=400, text="bad request")
+        client = MagicMock()
+        client.post = AsyncMock(return_value=response)
+
+        with patch("agents.delivery.channels.get_delivery_http_client", return_value=client):
+            statuses = await channel.send_bulk(_emails(3))
+
+        assert client.post.await_count == 1
+        assert all(s.status == "failed" and "400" in s.error_message for s in statuses)
+
+    @pytest.mark.asyncio
+    async def test_unconfigured_fails_all(self):
+        with patch("agents.delivery.channels.settings") as mock_settings:
+            mock_settings.sendgrid_api_key = None
+            statuses = await SendGridChannel().send_bulk(_emails(2))
+
+        assert [s.status for s in statuses] == ["failed", "failed"]
+
+
+class TestTwilioBulk:
+    """Tests for concurrent SMS fan-out."""
+
+    @pytest.mark.asyncio
+    async def test_fan_out_is_concurrency_limited(self):
+        messages = [SMSContent(message="New match", phone_number=f"+1415555{i:04d}") for i in range(40)]
+
+        with FakeProviderServer(latency_ms=10) as server:
+            try:
+                statuses = await _twilio(server).send_bulk(messages, concurrency=4)
+            finally:
+                await close_delivery_http_client()
+            stats = server.stats
+
+        assert stats["sms"] == 40
+        assert stats["max_in_flight"] == 4
+        assert all(s.status == "sent" and s.provider_message_id.startswith("SM") for s in statuses)
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_paces_messages(self, fake_providers):
+        messages = [SMSContent(message="New match", phone_number=f"+1415555{i:04d}") for i in range(4)]
+
+        try:
+            start = time.monotonic()
+            statuses = await _twilio(fake_providers, messages_per_second=5).send_bulk(messages, concurrency=4)
+            elapsed = time.monotonic() - start
+        finally:
+            await close_delivery_http_client()
+
+        # Burst of 5 tokens, then 5/s: four messages fit the burst, a fifth would wait
+        assert all(s.status == "sent" for s in statuses)
+        assert elapsed < 0.2
+
+        channel = _twilio(fake_providers, messages_per_second=10)
+        channel.bucket.reserve(10)
+        try:
+            start = time.monotonic()
+            await channel.send_bulk(messages[:2], concurrency=2)
+            elapsed = time.monotonic() - start
+        finally:
+            await close_delivery_http_client()
+
+        assert elapsed >= 0.15
+
+    @pytest.mark.asyncio
+    async def test_unconfigured_fails_all(self):
+        with patch("agents.delivery.channels.settings") as mock_settings:
+            mock_settings.twilio_account_sid = None
+            mock_settings.twilio_auth_token = None
+            mock_settings.twilio_phone_number = None
+            statuses = await TwilioChannel().send_bulk([SMSContent(message="x", phone_number="+14155550000")])
+
+        assert statuses[0].status == "failed"
+
+
 class TestChannelSingletons:
     """Tests for channel singleton getters."""
 
@@ -3,12 +3,22 @@ Tests for Digest Email Generation.
 Tests batching logic and digest email content generation.
 """
 
+import fakeredis
 import pytest
 from datetime import datetime, timezone, timedelta
 from unittest.mock import MagicMock, AsyncMock, patch
 from uuid import uuid4
 
-from agents.delivery.alerter import AlertDeliveryAgent, process_digest_batch
+from agents.delivery.alerter import AlertDeliveryAgent, process_all_digests, process_digest_batch
+from agents.delivery.channels import SendGridChannel, close_delivery_http_client
+from agents.delivery.digest import (
+    CLAIM_LEASE_SECONDS,
+    DUE_KEY,
+    MAX_ENTRIES_PER_USER,
+    DigestStore,
+    next_send_time,
+)
+from agents.delivery.fake_providers import FAKE_API_KEY, FakeProviderServer
 from agents.delivery.models import (
     AlertPayload,
     AlertPriority,
@@ -175,94 +185,327 @@ class TestDigestEmailGeneration:
         assert "we found" in content.body_text.lower()
 
 
-class TestSendDigestEmail:
-    """Tests for sending digest emails."""
+class TestProcessDigestBatch:
+    """Tests for the process_digest_batch Celery task."""
 
-    @pytest.mark.asyncio
-    async def test_send_digest_email_success(self, sample_alerts_for_digest, mock_anthropic_client):
-        """Test successful digest email sending."""
-        agent = AlertDeliveryAgent()
-        agent._anthropic_client = mock_anthropic_client
+    def test_process_digest_batch_no_alerts(self):
+        """Test processing when no alerts are batched."""
+        with patch("agents.delivery.alerter.AlertDeliveryAgent") as mock_agent_class:
+            mock_agent = MagicMock()
+            mock_agent.send_digests = AsyncMock(
+                return_value={"digests_sent": 0, "digests_failed": 0, "digests_skipped": 0, "alerts_sent": 0}
+            )
+            mock_agent_class.return_value = mock_agent
 
-        mock_status = MagicMock()
-        mock_status.status = "sent"
+            result = process_digest_batch("user-123", "2025-01-08")
 
-        with patch("agents.delivery.alerter.settings") as mock_settings:
-            mock_settings.llm_model = "claude-3-haiku-20240307"
-            mock_settings.from_email = "alerts@grantradar.com"
-            mock_settings.from_name = "GrantRadar"
-            mock_settings.frontend_url = "https://grantradar.com"
+        assert result["alerts_sent"] == 0
+        mock_agent.send_digests.assert_awaited_once_with(["user-123"])
 
-            with patch("agents.delivery.alerter.get_sendgrid_channel") as mock_sendgrid:
-                mock_sendgrid.return_value.send = AsyncMock(return_value=mock_status)
+    def test_process_digest_batch_with_alerts(self, sample_alert_payload):
+        """Test processing with batched alerts."""
+        user_id = str(sample_alert_payload.user.user_id)
+        with patch("agents.delivery.alerter.AlertDeliveryAgent") as mock_agent_class:
+            mock_agent = MagicMock()
+            mock_agent.send_digests = AsyncMock(
+                return_value={"digests_sent": 1, "digests_failed": 0, "digests_skipped": 0, "alerts_sent": 1}
+            )
+            mock_agent_class.return_value = mock_agent
 
-                status = await agent._send_digest_email(sample_alerts_for_digest)
+            result = process_digest_batch(user_id)
 
-        assert status is not None
-        assert status.status == "sent"
+        assert result == {
+            "user_id": user_id,
+            "digests_sent": 1,
+            "digests_failed": 0,
+            "digests_skipped": 0,
+            "alerts_sent": 1,
+        }
+        mock_agent.close.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_send_digest_email_empty_alerts(self):
-        """Test that empty alerts returns None."""
-        agent = AlertDeliveryAgent()
 
-        status = await agent._send_digest_email([])
+class TestNextSendTime:
+    """Tests for digest send time calculation."""
 
-        assert status is None
+    def test_daily_later_today(self):
+        now = datetime(2025, 1, 8, 9, 30, tzinfo=timezone.utc)  # Wednesday
 
-    @pytest.mark.asyncio
-    async def test_send_digest_email_generation_failure(self, sample_alerts_for_digest):
-        """Test handling when digest generation fails."""
-        agent = AlertDeliveryAgent()
+        assert next_send_time("daily", now) == datetime(2025, 1, 8, 13, tzinfo=timezone.utc)
 
-        with patch.object(agent, "_generate_digest_email_content", new_callable=AsyncMock) as mock_gen:
-            mock_gen.return_value = None
+    def test_daily_after_send_hour_is_tomorrow(self):
+        now = datetime(2025, 1, 8, 13, 0, tzinfo=timezone.utc)
 
-            status = await agent._send_digest_email(sample_alerts_for_digest)
+        assert next_send_time("daily", now) == datetime(2025, 1, 9, 13, tzinfo=timezone.utc)
 
-        assert status is None
+    def test_weekly_is_next_monday(self):
+        now = datetime(2025, 1, 8, 9, 30, tzinfo=timezone.utc)
 
+        assert next_send_time("weekly", now) == datetime(2025, 1, 13, 13, tzinfo=timezone.utc)
 
-class TestProcessDigestBatch:
-    """Tests for the process_digest_batch Celery task."""
+    def test_weekly_after_monday_send_is_following_week(self):
+        now = datetime(2025, 1, 13, 14, 0, tzinfo=timezone.utc)
 
-    def test_process_digest_batch_no_alerts(self, mock_redis_client):
-        """Test processing when no alerts are batched."""
-        with patch("agents.delivery.alerter.AlertDeliveryAgent") as mock_agent_class:
-            mock_agent = MagicMock()
-            mock_agent.redis_client = mock_redis_client
-            mock_agent.DIGEST_KEY_PREFIX = "digest:pending:"
-            mock_redis_client.lrange.return_value = []
-            mock_agent_class.return_value = mock_agent
+        assert next_send_time("weekly", now) == datetime(2025, 1, 20, 13, tzinfo=timezone.utc)
 
-            result = process_digest_batch("user-123", "2025-01-08")
+    def test_immediate_overflow_is_daily(self):
+        now = datetime(2025, 1, 8, 9, 30)
 
-        assert result["alerts_processed"] == 0
+        assert next_send_time("immediate", now) == datetime(2025, 1, 8, 13, tzinfo=timezone.utc)
 
-    def test_process_digest_batch_with_alerts(self, mock_redis_client, sample_alert_payload):
-        """Test processing with batched alerts."""
-        with patch("agents.delivery.alerter.AlertDeliveryAgent") as mock_agent_class:
-            mock_agent = MagicMock()
-            mock_agent.redis_client = mock_redis_client
-            mock_agent.DIGEST_KEY_PREFIX = "digest:pending:"
 
-            # Mock Redis returning alert data
-            mock_redis_client.lrange.return_value = [sample_alert_payload.model_dump_json()]
+class TestDigestStore:
+    """Tests for pending digest storage and the due index."""
 
-            # Mock the send method
-            mock_status = MagicMock()
-            mock_status.status = "sent"
-            mock_agent._send_digest_email = AsyncMock(return_value=mock_status)
+    @pytest.fixture
+    def store(self):
+        return DigestStore(fakeredis.FakeRedis(decode_responses=True))
 
-            mock_agent_class.return_value = mock_agent
+    def test_entries_are_compact_and_sorted(self, store):
+        user_id = uuid4()
+        low, high = uuid4(), uuid4()
+        store.add(user_id, uuid4(), low, 0.72, "daily")
+        store.add(user_id, uuid4(), high, 0.81, "daily")
 
-            result = process_digest_batch(
-                str(sample_alert_payload.user.user_id),
-                "2025-01-08",
-            )
+        entries = store.entries([user_id])[str(user_id)]
+
+        assert [e.grant_id for e in entries] == [high, low]
+        member = store.redis.zrange(f"digest:entries:{user_id}", 0, 0)[0]
+        assert len(member) == 73
+
+    def test_same_match_is_stored_once(self, store):
+        user_id, match_id, grant_id = uuid4(), uuid4(), uuid4()
+
+        store.add(user_id, match_id, grant_id, 0.8, "daily")
+        count = store.add(user_id, match_id, grant_id, 0.8, "daily")
+
+        assert count == 1
+
+    def test_entries_are_capped(self, store):
+        user_id = uuid4()
+        for i in range(MAX_ENTRIES_PER_USER + 5):
+            store.add(user_id, uuid4(), uuid4(), 0.7 + i / 1000, "daily")
+
+        assert store.pending_counts([user_id])[user_id] == MAX_ENTRIES_PER_USER
+
+    def test_first_alert_sets_due_time(self, store):
+        user_id = uuid4()
+        store.add(user_id, uuid4(), uuid4(), 0.8, "weekly")
+        due = store.redis.zscore(DUE_KEY, str(user_id))
+
+        store.add(user_id, uuid4(), uuid4(), 0.8, "daily")
+
+        assert store.redis.zscore(DUE_KEY, str(user_id)) == due
+        assert due == next_send_time("weekly").timestamp()
+
+    def test_claim_due_only_returns_due_users_and_leases_them(self, store):
+        now = datetime.now(timezone.utc)
+        store.redis.zadd(DUE_KEY, {"due": now.timestamp() - 60, "later": now.timestamp() + 3600})
+
+        claimed = store.claim_due(now)
+
+        assert claimed == ["due"]
+        assert store.claim_due(now) == []
+        assert store.claim_due(now + timedelta(seconds=CLAIM_LEASE_SECONDS + 1)) == ["due"]
+
+    def test_complete_clears_user_without_new_entries(self, store):
+        user_id = str(uuid4())
+        store.add(user_id, uuid4(), uuid4(), 0.8, "daily")
+        entries = store.entries([user_id])
+
+        store.complete(entries, {user_id: "daily"})
+
+        assert store.pending_counts([user_id])[user_id] == 0
+        assert store.due_count() == 0
+
+    def test_complete_keeps_entries_added_during_send(self, store):
+        user_id = str(uuid4())
+        store.add(user_id, uuid4(), uuid4(), 0.8, "daily")
+        entries = store.entries([user_id])
+        store.add(user_id, uuid4(), uuid4(), 0.75, "daily")
+
+        store.complete(entries, {user_id: "weekly"})
+
+        assert store.pending_counts([user_id])[user_id] == 1
+        assert store.redis.zscore(DUE_KEY, user_id) == next_send_time("weekly").timestamp()
 
-        assert result["alerts_processed"] == 1
-        mock_redis_client.delete.assert_called_once()
+    def test_reschedule(self, store):
+        store.reschedule(["u1"], delay_seconds=60)
+
+        assert store.redis.zscore(DUE_KEY, "u1") > datetime.now(timezone.utc).timestamp()
+
+
+class TestSendDigests:
+    """Tests for bulk digest sending."""
+
+    @pytest.fixture
+    def agent(self):
+        agent = AlertDeliveryAgent()
+        agent._redis_client = fakeredis.FakeRedis(decode_responses=True)
+        return agent
+
+    def _sent(self, contents):
+        return [MagicMock(status="sent") for _ in contents]
+
+    @pytest.mark.asyncio
+    async def test_sends_one_bulk_request_and_clears_entries(
+        self, agent, sample_user_info, sample_notification_preferences, sample_grant_info
+    ):
+        other = sample_user_info.model_copy(update={"user_id": uuid4(), "email": "other@example.edu"})
+        for user in (sample_user_info, other):
+            agent.digests.add(user.user_id, uuid4(), sample_grant_info.grant_id, 0.8, "daily")
+        sendgrid = MagicMock()
+        sendgrid.send_bulk = AsyncMock(side_effect=self._sent)
+
+        with (
+            patch.object(
+                agent,
+                "_fetch_users",
+                AsyncMock(
+                    return_value={u.user_id: (u, sample_notification_preferences) for u in (sample_user_info, other)}
+                ),
+            ),
+            patch.object(
+                agent, "_fetch_grants", AsyncMock(return_value={sample_grant_info.grant_id: sample_grant_info})
+            ),
+            patch.object(agent, "_fetch_match_details", AsyncMock(return_value={})),
+            patch("agents.delivery.alerter.get_sendgrid_channel", return_value=sendgrid),
+        ):
+            result = await agent.send_digests([str(sample_user_info.user_id), str(other.user_id)])
+
+        assert result["digests_sent"] == 2
+        assert result["alerts_sent"] == 2
+        sendgrid.send_bulk.assert_awaited_once()
+        assert {c.to_email for c in sendgrid.send_bulk.await_args[0][0]} == {sample_user_info.email, other.email}
+        assert agent.digests.due_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_digests_for_different_users_share_one_request(
+        self, agent, sample_user_info, sample_notification_preferences, sample_grant_info
+    ):
+        users = [
+            sample_user_info.model_copy(update={"user_id": uuid4(), "name": f"Dr. User {i}", "email": f"u{i}@x.edu"})
+            for i in range(3)
+        ]
+        grants = {
+            user.user_id: sample_grant_info.model_copy(update={"grant_id": uuid4(), "title": f"Grant for {user.name}"})
+            for user in users
+        }
+        for user in users:
+            agent.digests.add(user.user_id, uuid4(), grants[user.user_id].grant_id, 0.8, "daily")
+
+        with FakeProviderServer(latency_ms=0) as server:
+            channel = SendGridChannel(api_key=FAKE_API_KEY, api_base_url=server.url, requests_per_second=1000)
+            try:
+                with (
+                    patch.object(
+                        agent,
+                        "_fetch_users",
+                        AsyncMock(return_value={u.user_id: (u, sample_notification_preferences) for u in users}),
+                    ),
+                    patch.object(
+                        agent, "_fetch_grants", AsyncMock(return_value={g.grant_id: g for g in grants.values()})
+                    ),
+                    patch.object(agent, "_fetch_match_details", AsyncMock(return_value={})),
+                    patch("agents.delivery.alerter.get_sendgrid_channel", return_value=channel),
+                    patch.object(channel, "_send_bulk_request", wraps=channel._send_bulk_request) as bulk_request,
+                ):
+                    result = await agent.send_digests([str(u.user_id) for u in users])
+            finally:
+                await close_delivery_http_client()
+            stats = server.stats
+
+        assert result["digests_sent"] == 3
+        assert stats["email_requests"] == 1
+        assert stats["emails"] == 3
+        sent = bulk_request.await_args[0][0]
+        assert len({(c.body_html, c.body_text) for c in sent}) == 1
+        for content, user in zip(sent, users):
+            body = content.personalized().body_text
+            assert f"Hi {user.name}," in body
+            assert grants[user.user_id].title in body
+
+    @pytest.mark.asyncio
+    async def test_failed_send_keeps_entries_and_retries(
+        self, agent, sample_user_info, sample_notification_preferences, sample_grant_info
+    ):
+        user_id = str(sample_user_info.user_id)
+        agent.digests.add(sample_user_info.user_id, uuid4(), sample_grant_info.grant_id, 0.8, "daily")
+        sendgrid = MagicMock()
+        sendgrid.send_bulk = AsyncMock(return_value=[MagicMock(status="failed")])
+
+        with (
+            patch.object(
+                agent,
+                "_fetch_users",
+                AsyncMock(return_value={sample_user_info.user_id: (sample_user_info, sample_notification_preferences)}),
+            ),
+            patch.object(
+                agent, "_fetch_grants", AsyncMock(return_value={sample_grant_info.grant_id: sample_grant_info})
+            ),
+            patch.object(agent, "_fetch_match_details", AsyncMock(return_value={})),
+            patch("agents.delivery.alerter.get_sendgrid_channel", return_value=sendgrid),
+        ):
+            result = await agent.send_digests([user_id])
+
+        assert result["digests_failed"] == 1
+        assert agent.digests.pending_counts([user_id])[user_id] == 1
+        assert agent.digests.due_count() == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_user_entries_are_dropped(self, agent):
+        user_id = uuid4()
+        agent.digests.add(user_id, uuid4(), uuid4(), 0.8, "daily")
+
+        with (
+            patch.object(agent, "_fetch_users", AsyncMock(return_value={})),
+            patch.object(agent, "_fetch_grants", AsyncMock(return_value={})),
+            patch.object(agent, "_fetch_match_details", AsyncMock(return_value={})),
+        ):
+            result = await agent.send_digests([str(user_id)])
+
+        assert result["digests_skipped"] == 1
+        assert agent.digests.due_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_lookup_keeps_entries_and_retries(self, agent):
+        user = uuid4()
+        user_id = str(user)
+        agent.digests.add(user, uuid4(), uuid4(), 0.8, "daily")
+        sendgrid = MagicMock()
+
+        with (
+            patch.object(agent, "_fetch_users", AsyncMock(side_effect=ConnectionError("db down"))),
+            patch.object(agent, "_fetch_grants", AsyncMock(return_value={})),
+            patch("agents.delivery.alerter.get_sendgrid_channel", return_value=sendgrid),
+        ):
+            result = await agent.send_digests([user_id])
+
+        assert result == {"digests_sent": 0, "digests_failed": 1, "digests_skipped": 0, "alerts_sent": 0}
+        sendgrid.send_bulk.assert_not_called()
+        assert agent.digests.pending_counts([user_id])[user_id] == 1
+        assert agent.digests.due_count() == 1
+
+
+class TestProcessAllDigests:
+    """Tests for the digest dispatch task."""
+
+    def test_dispatches_due_users_in_chunks_without_keys(self):
+        redis_client = fakeredis.FakeRedis(decode_responses=True)
+        past = datetime.now(timezone.utc).timestamp() - 60
+        redis_client.zadd(DUE_KEY, {f"user-{i}": past for i in range(5)})
+        redis_client.zadd(DUE_KEY, {"later": past + 7200})
+
+        with (
+            patch("agents.delivery.alerter.redis.from_url", return_value=redis_client),
+            patch("agents.delivery.alerter.settings") as mock_settings,
+            patch("agents.delivery.alerter.send_digest_chunk") as send_chunk,
+        ):
+            mock_settings.digest_users_per_task = 2
+            result = process_all_digests()
+
+        assert result == {"digests_queued": 5, "tasks": 3}
+        chunks = [c[0][0] for c in send_chunk.delay.call_args_list]
+        assert sorted(u for chunk in chunks for u in chunk) == [f"user-{i}" for i in range(5)]
 
 
 class TestDigestPlainText:
@@ -0,0 +1,157 @@
+"""
+Tests for templated email rendering.
+Tests grant section caching, per-user fill-in and optional LLM enrichment.
+"""
+
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import fakeredis
+import pytest
+
+from agents.delivery.models import MatchInfo, UserInfo
+from agents.delivery.templates import (
+    EmailRenderer,
+    get_render_stats,
+    grant_content_hash,
+    reset_section_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_section_cache():
+    reset_section_cache()
+    yield
+    reset_section_cache()
+
+
+def _user(name="Dr. Ada Lovelace"):
+    return UserInfo(user_id=uuid4(), name=name, email=f"{uuid4().hex[:8]}@example.edu")
+
+
+def _match(score=0.9, **kwargs):
+    return MatchInfo(match_id=uuid4(), match_score=score, **kwargs)
+
+
+def _llm(text="A well-funded program for climate ML."):
+    client = MagicMock()
+    client.chat.completions.create.return_value = MagicMock(choices=[MagicMock(message=MagicMock(content=text))])
+    return client
+
+
+class TestAlertRendering:
+    """Tests for single-grant alert emails."""
+
+    def test_grant_section_rendered_once_for_many_recipients(self, sample_grant_info):
+        llm = _llm()
+        renderer = EmailRenderer(llm_client_factory=lambda: llm, enrich=False)
+
+        emails = [renderer.render_alert(_user(), sample_grant_info, _match()) for _ in range(200)]
+
+        stats = get_render_stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 199
+        llm.chat.completions.create.assert_not_called()
+        assert len({e.to_email for e in emails}) == 200
+
+    def test_fills_per_recipient_fields(self, sample_grant_info):
+        renderer = EmailRenderer(enrich=False)
+        match = _match(0.93, matching_criteria=["Climate modeling"], explanation="Strong ML track record.")
+
+        email = renderer.render_alert(_user("Dr. <Grace>"), sample_grant_info, match)
+
+        assert "93% Match" in email.body_html
+        assert "Dr. &lt;Grace&gt;" in email.body_html
+        assert "<li>Climate modeling</li>" in email.body_html
+        assert "Strong ML track record." in email.body_text
+        assert sample_grant_info.url in email.body_text
+        assert email.tracking_id == str(match.match_id)
+        assert len(email.subject) <= 100
+
+    def test_content_change_invalidates_section(self, sample_grant_info):
+        renderer = EmailRenderer(enrich=False)
+        before = grant_content_hash(sample_grant_info)
+        renderer.render_alert(_user(), sample_grant_info, _match())
+
+        sample_grant_info.title = "Revised Title"
+        email = renderer.render_alert(_user(), sample_grant_info, _match())
+
+        assert grant_content_hash(sample_grant_info) != before
+        assert "Revised Title" in email.body_html
+        assert get_render_stats()["misses"] == 2
+
+    def test_redis_tier_shared_across_processes(self, sample_grant_info):
+        redis_client = fakeredis.FakeRedis(decode_responses=True)
+        EmailRenderer(redis_client_factory=lambda: redis_client, enrich=False).grant_section(sample_grant_info)
+
+        reset_section_cache()
+        EmailRenderer(redis_client_factory=lambda: redis_client, enrich=False).grant_section(sample_grant_info)
+
+        assert get_render_stats()["redis_hits"] == 1
+
+    def test_broken_redis_still_renders(self, sample_grant_info):
+        broken = MagicMock()
+        broken.get.side_effect = ConnectionError("down")
+        broken.setex.side_effect = ConnectionError("down")
+
+        email = EmailRenderer(redis_client_factory=lambda: broken, enrich=False).render_alert(
+            _user(), sample_grant_info, _match()
+        )
+
+        assert sample_grant_info.title in email.body_html
+
+
+class TestEnrichment:
+    """Tests for the optional LLM enrichment."""
+
+    def test_summary_generated_once_per_grant(self, sample_grant_info):
+        llm = _llm("Funds ML methods for climate prediction.")
+        renderer = EmailRenderer(llm_client_factory=lambda: llm, enrich=True)
+
+        for _ in range(50):
+            email = renderer.render_alert(_user(), sample_grant_info, _match())
+
+        assert llm.chat.completions.create.call_count == 1
+        assert "Funds ML methods for climate prediction." in email.body_html
+
+    def test_llm_failure_renders_without_summary(self, sample_grant_info):
+        llm = MagicMock()
+        llm.chat.completions.create.side_effect = RuntimeError("rate limited")
+
+        email = EmailRenderer(llm_client_factory=lambda: llm, enrich=True).render_alert(
+            _user(), sample_grant_info, _match()
+        )
+
+        assert sample_grant_info.title in email.body_html
+
+
+class TestDigestRendering:
+    """Tests for digest emails."""
+
+    def test_digest_reuses_grant_sections(self, sample_alerts_for_digest):
+        renderer = EmailRenderer(enrich=False)
+        user = sample_alerts_for_digest[0].user
+
+        renderer.render_digest(user, sample_alerts_for_digest)
+        email = renderer.render_digest(user, sample_alerts_for_digest)
+
+        assert get_render_stats()["misses"] == len(sample_alerts_for_digest)
+        assert "we found" in email.body_text
+        for alert in sample_alerts_for_digest:
+            assert alert.grant.title in email.body_html
+
+    def test_shared_digest_layout_is_the_same_for_every_user(self, sample_alerts_for_digest):
+        renderer = EmailRenderer(enrich=False)
+        ada, grace = _user(), _user("Dr. Grace Hopper")
+
+        first = renderer.render_digest(ada, sample_alerts_for_digest, shared_body=True)
+        second = renderer.render_digest(grace, sample_alerts_for_digest[:2], shared_body=True)
+
+        assert (first.body_html, first.body_text) == (second.body_html, second.body_text)
+        assert "-matches_html-" in first.body_html
+        assert first.personalized() == renderer.render_digest(ada, sample_alerts_for_digest)
+        assert "Hi Dr. Grace Hopper," in second.personalized().body_text
+        assert sample_alerts_for_digest[2].grant.title not in second.personalized().body_html
+
+    def test_empty_digest(self, sample_user_info):
+        assert EmailRenderer(enrich=False).render_digest(sample_user_info, []) is None
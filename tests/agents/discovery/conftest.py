@@ -18,6 +18,7 @@ def mock_redis_client():
 
     # Duplicate detection - default to not duplicate
     redis.sismember = MagicMock(return_value=False)
+    redis.smismember = MagicMock(side_effect=lambda key, members: [False] * len(members))
     redis.sadd = MagicMock(return_value=1)
     redis.expire = MagicMock(return_value=True)
 
@@ -28,6 +29,10 @@ def mock_redis_client():
     # Stream publishing
     redis.xadd = MagicMock(return_value="1234567890-0")
 
+    # Pipelines queue onto the same mock so calls can be asserted directly
+    redis.pipeline = MagicMock(return_value=redis)
+    redis.execute = MagicMock(return_value=["1234567890-0"])
+
     return redis
 
 
@@ -2,13 +2,17 @@
 Tests for Grants.gov RSS Discovery Agent
 """
 
+import asyncio
 import json
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import fakeredis
+import httpx
 import pytest
 
 from agents.discovery.grants_gov_rss import (
+    ConditionalCacheTransport,
     DiscoveredGrant,
     GrantsGovDetails,
     GrantsGovEntry,
@@ -448,6 +452,131 @@ class TestGrantsGovRSSAgent:
         assert agent._http_client is None
 
 
+class MockGrantsGov:
+    """Stand-in for the Grants.gov feed and search API that honours ETags."""
+
+    def __init__(self, opportunity_ids: list[str], missing: tuple[str, ...] = ()):
+        self.opportunity_ids = opportunity_ids
+        self.missing = set(missing)
+        self.feed_status: list[int] = []
+        self.detail_status: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def feed(self) -> str:
+        items = "".join(
+            f"<item><title>RSS {opp_id}</title><guid>{opp_id}</guid>"
+            f"<link>https://www.grants.gov/view-opportunity.html?oppId={opp_id}</link></item>"
+            for opp_id in self.opportunity_ids
+        )
+        return f'<?xml version="1.0"?><rss version="2.0"><channel>{items}</channel></rss>'
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            etag = f'"feed-{len(self.opportunity_ids)}"'
+            status = 304 if request.headers.get("If-None-Match") == etag else 200
+            self.feed_status.append(status)
+            return httpx.Response(status, text=self.feed() if status == 200 else "", headers={"ETag": etag})
+
+        opp_id = json.loads(request.content)["oppNum"]
+        etag = f'"opp-{opp_id}"'
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.02)
+        finally:
+            self.in_flight -= 1
+        if request.headers.get("If-None-Match") == etag:
+            self.detail_status.append(304)
+            return httpx.Response(304, headers={"ETag": etag})
+        self.detail_status.append(200)
+        hits = [] if opp_id in self.missing else [{"id": opp_id, "title": f"API {opp_id}", "agencyName": "NSF"}]
+        return httpx.Response(200, json={"oppHits": hits}, headers={"ETag": etag})
+
+
+class TestConcurrentDiscovery:
+    """Tests for concurrent detail fetches and conditional requests."""
+
+    @pytest.fixture
+    def agent(self):
+        """Agent on fake Redis with a fast rate limit window."""
+        agent = GrantsGovRSSAgent()
+        agent._redis = fakeredis.aioredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+        agent.rate_limiter = RateLimiter(max_requests=3, time_window=0.05)
+        return agent
+
+    def _connect(self, agent: GrantsGovRSSAgent, api: MockGrantsGov) -> ConditionalCacheTransport:
+        transport = ConditionalCacheTransport(
+            httpx.MockTransport(api.handler),
+            agent._get_redis,
+            agent.REDIS_HTTP_CACHE_PREFIX,
+            agent.HTTP_CACHE_TTL_SECONDS,
+        )
+        agent._http_client = httpx.AsyncClient(transport=transport)
+        return transport
+
+    @pytest.mark.asyncio
+    async def test_fetches_details_concurrently_within_rate_limit(self, agent):
+        """Test detail lookups overlap but never exceed the rate limit."""
+        api = MockGrantsGov([str(i) for i in range(1, 9)], missing=("5",))
+        self._connect(agent, api)
+        await agent.mark_processed("1")
+
+        grants = await agent.discover_new_grants()
+
+        assert [grant.external_id for grant in grants] == [str(i) for i in range(2, 9)]
+        assert 1 < api.max_in_flight <= 3
+        # A missing detail record falls back to the RSS entry
+        assert {grant.external_id: grant.title for grant in grants}["5"] == "RSS 5"
+        assert grants[0].title == "API 2"
+
+        messages = await agent._redis.xrange(agent.REDIS_STREAM)
+        assert [json.loads(fields["data"])["external_id"] for _, fields in messages] == [str(i) for i in range(2, 9)]
+        assert await agent._redis.smembers(agent.REDIS_PROCESSED_SET) == {str(i) for i in range(1, 9)}
+        assert await agent._redis.get(agent.REDIS_LAST_ID_KEY) == "8"
+
+    @pytest.mark.asyncio
+    async def test_repeated_feed_entries_published_once(self, agent):
+        """Test an opportunity listed twice in the feed is handled once."""
+        api = MockGrantsGov(["1", "2", "1"])
+        self._connect(agent, api)
+
+        grants = await agent.discover_new_grants()
+
+        assert [grant.external_id for grant in grants] == ["1", "2"]
+        assert api.detail_status == [200, 200]
+
+    @pytest.mark.asyncio
+    async def test_unchanged_feed_revalidated(self, agent):
+        """Test a second poll of an unchanged feed is answered by a 304."""
+        api = MockGrantsGov(["1", "2"])
+        transport = self._connect(agent, api)
+        await agent.discover_new_grants()
+
+        entries = await agent.fetch_rss_feed()
+        grants = await agent.discover_new_grants()
+
+        assert api.feed_status == [200, 304, 304]
+        # The cached feed still parses into the same entries
+        assert [entry.opportunity_id for entry in entries] == ["1", "2"]
+        assert grants == []
+        assert transport.revalidated == 2
+
+    @pytest.mark.asyncio
+    async def test_unchanged_details_revalidated(self, agent):
+        """Test details fetched again are answered from the cache on a 304."""
+        api = MockGrantsGov(["1"])
+        transport = self._connect(agent, api)
+
+        first = await agent.fetch_grant_details("1")
+        second = await agent.fetch_grant_details("1")
+
+        assert api.detail_status == [200, 304]
+        assert second == first
+        assert transport.revalidated == 1
+        assert transport.downloaded == 1
+
+
 # ============================================================================
 # Integration Tests (require actual services)
 # ============================================================================
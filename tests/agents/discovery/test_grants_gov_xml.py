@@ -0,0 +1,230 @@
+"""
+Tests for the Grants.gov XML extract agent.
+Covers streaming download, incremental parsing, batched publishing and
+delta detection between extracts.
+"""
+
+import io
+import json
+import zipfile
+from datetime import datetime, timezone
+
+import fakeredis
+import httpx
+import pytest
+
+from agents.discovery import grants_gov_xml
+from agents.discovery.grants_gov_xml import (
+    REDIS_FINGERPRINTS,
+    REDIS_PROCESSED_SET,
+    REDIS_STREAM,
+    REDIS_UPDATE_STREAM,
+    GrantsGovXMLAgent,
+)
+
+NS = "http://apply.grants.gov/system/OpportunityDetail-V1.0"
+
+
+def _opportunity_xml(
+    opportunity_id: str,
+    status: str = "Posted",
+    close_date: str = "12312030",
+    ceiling: str = "500,000",
+    description: str = "Climate research.",
+) -> str:
+    return (
+        "<OpportunitySynopsisDetail_1_0>"
+        f"<OpportunityID>{opportunity_id}</OpportunityID>"
+        f"<OpportunityTitle>Opportunity {opportunity_id}</OpportunityTitle>"
+        "<AgencyName>National Science Foundation</AgencyName>"
+        f"<OpportunityStatus>{status}</OpportunityStatus>"
+        f"<CloseDate>{close_date}</CloseDate>"
+        f"<AwardCeiling>{ceiling}</AwardCeiling>"
+        f"<Description>{description}</Description>"
+        "<CFDANumbers>47.070; 47.041</CFDANumbers>"
+        "</OpportunitySynopsisDetail_1_0>"
+    )
+
+
+def _extract(*opportunities: str) -> bytes:
+    """Build a zipped extract holding the given opportunity elements."""
+    xml = f'<?xml version="1.0"?><Grants xmlns="{NS}">{"".join(opportunities)}</Grants>'
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("GrantsDBExtract20301231v2.xml", xml)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def agent():
+    """Agent wired to fake Redis."""
+    agent = GrantsGovXMLAgent()
+    agent._redis = fakeredis.aioredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+    return agent
+
+
+def _serve(agent: GrantsGovXMLAgent, content: bytes) -> list[str]:
+    """Serve ``content`` for every extract URL; returns the requested URLs."""
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        return httpx.Response(200, content=content)
+
+    agent._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return requested
+
+
+class TestParsing:
+    """Tests for incremental extract parsing."""
+
+    def test_iter_opportunities_parses_namespaced_records(self, agent):
+        opportunities = list(agent.iter_opportunities(_extract(_opportunity_xml("1"), _opportunity_xml("2"))))
+
+        assert [opp.opportunity_id for opp in opportunities] == ["1", "2"]
+        assert opportunities[0].award_ceiling == 500000.0
+        assert opportunities[0].cfda_numbers == ["47.070", "47.041"]
+        assert opportunities[0].close_date == datetime(2030, 12, 31)
+
+    def test_skips_unparseable_records(self, agent):
+        broken = "<OpportunitySynopsisDetail_1_0><OpportunityID>3</OpportunityID></OpportunitySynopsisDetail_1_0>"
+
+        opportunities = agent.parse_xml_extract(_extract(_opportunity_xml("1"), broken))
+
+        assert [opp.opportunity_id for opp in opportunities] == ["1"]
+
+    def test_archive_without_xml(self, agent):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zf:
+            zf.writestr("README.txt", "empty")
+
+        assert agent.parse_xml_extract(buffer.getvalue()) == []
+
+
+class TestDownload:
+    """Tests for the streamed download."""
+
+    async def test_download_spools_to_file(self, agent, monkeypatch):
+        content = _extract(*[_opportunity_xml(str(i)) for i in range(50)])
+        requested = _serve(agent, content)
+        monkeypatch.setattr(grants_gov_xml, "DOWNLOAD_SPOOL_MAX_BYTES", len(content) // 2)
+
+        extract = await agent.download_extract(datetime(2030, 12, 31))
+
+        assert requested[0].endswith("GrantsDBExtract20301231v2.zip")
+        # Larger than the spool threshold, so it was moved to disk
+        assert extract._rolled
+        assert extract.read() == content
+        extract.close()
+
+
+class TestDiscoverNewGrants:
+    """Tests for the end-to-end run."""
+
+    async def test_publishes_new_active_grants_in_batches(self, agent, monkeypatch):
+        monkeypatch.setattr(grants_gov_xml, "PUBLISH_BATCH_SIZE", 2)
+        _serve(
+            agent,
+            _extract(
+                _opportunity_xml("1"),
+                _opportunity_xml("2", status="Closed"),
+                _opportunity_xml("3", status="Forecasted"),
+                _opportunity_xml("4"),
+                _opportunity_xml("4"),
+                _opportunity_xml("5"),
+            ),
+        )
+        await agent._redis.sadd(REDIS_PROCESSED_SET, "4")
+
+        stats = await agent.discover_new_grants(datetime(2030, 12, 31, tzinfo=timezone.utc))
+
+        assert stats.extract_date == "2030-12-31"
+        assert stats.total_opportunities == 6
+        assert stats.active_opportunities == 5
+        assert stats.new_grants == 3
+        assert stats.updated_grants == 0
+        assert stats.skipped == 3
+        assert stats.sample_ids == ["1", "3", "5"]
+        assert stats.records_per_second > 0
+        assert stats.peak_rss_mb > 0
+
+        messages = await agent._redis.xrange(REDIS_STREAM)
+        published = [json.loads(fields["data"]) for _, fields in messages]
+        assert [grant["external_id"] for grant in published] == ["1", "3", "5"]
+        assert published[0]["source"] == "grants_gov"
+        assert await agent._redis.smembers(REDIS_PROCESSED_SET) == {"1", "3", "4", "5"}
+        # "4" predates fingerprints and is baselined; closed "2" is not tracked
+        assert set(await agent._redis.hkeys(REDIS_FINGERPRINTS)) == {"1", "3", "4", "5"}
+        assert (await agent.get_last_extract_date()).date().isoformat() == "2030-12-31"
+
+    async def test_second_run_publishes_nothing(self, agent):
+        _serve(agent, _extract(_opportunity_xml("1"), _opportunity_xml("2")))
+        await agent.discover_new_grants(datetime(2030, 12, 31, tzinfo=timezone.utc))
+
+        stats = await agent.discover_new_grants(datetime(2030, 12, 31, tzinfo=timezone.utc))
+
+        assert stats.new_grants == 0
+        assert stats.updated_grants == 0
+        assert stats.skipped == 2
+        assert await agent._redis.xlen(REDIS_STREAM) == 2
+
+
+class TestExtractDelta:
+    """Tests for fingerprint diffs between extracts."""
+
+    async def _run(self, agent, *opportunities):
+        _serve(agent, _extract(*opportunities))
+        return await agent.discover_new_grants(datetime(2030, 12, 31, tzinfo=timezone.utc))
+
+    async def _updates(self, agent):
+        return [json.loads(fields["data"]) for _, fields in await agent._redis.xrange(REDIS_UPDATE_STREAM)]
+
+    async def test_deadline_change_emits_update_event(self, agent):
+        await self._run(agent, _opportunity_xml("1"), _opportunity_xml("2"))
+
+        stats = await self._run(agent, _opportunity_xml("1", close_date="01152031"), _opportunity_xml("2"))
+
+        assert (stats.new_grants, stats.updated_grants, stats.skipped) == (0, 1, 1)
+        [update] = await self._updates(agent)
+        assert update["external_id"] == "1"
+        assert update["update_type"] == "deadline_changed"
+        assert update["changes"] == {"close_date": {"old": "2030-12-31T00:00:00", "new": "2031-01-15T00:00:00"}}
+        assert update["message"] == "Deadline changed from 2030-12-31 to 2031-01-15"
+        assert update["grant"]["deadline"].startswith("2031-01-15")
+        assert await agent._redis.xlen(REDIS_STREAM) == 2
+
+    async def test_field_level_changes(self, agent):
+        await self._run(agent, _opportunity_xml("1"), _opportunity_xml("2"), _opportunity_xml("3"))
+
+        await self._run(
+            agent,
+            _opportunity_xml("1", ceiling="750,000"),
+            _opportunity_xml("2", status="Closed"),
+            _opportunity_xml("3", description="Climate and ocean research."),
+        )
+
+        updates = {update["external_id"]: update for update in await self._updates(agent)}
+        assert updates["1"]["update_type"] == "amount_updated"
+        assert updates["1"]["changes"] == {"award_ceiling": {"old": 500000.0, "new": 750000.0}}
+        assert updates["2"]["update_type"] == "status_changed"
+        assert updates["2"]["message"] == "Status changed from Posted to Closed"
+        assert updates["3"]["update_type"] == "details_updated"
+        assert updates["3"]["changes"] == {"description": {"updated": True}}
+
+    async def test_change_reported_once(self, agent):
+        await self._run(agent, _opportunity_xml("1"))
+        await self._run(agent, _opportunity_xml("1", ceiling="750,000"))
+
+        stats = await self._run(agent, _opportunity_xml("1", ceiling="750,000"))
+
+        assert stats.updated_grants == 0
+        assert len(await self._updates(agent)) == 1
+
+    async def test_new_fingerprint_version_rebaselines(self, agent, monkeypatch):
+        await self._run(agent, _opportunity_xml("1"))
+        monkeypatch.setattr(grants_gov_xml, "FINGERPRINT_VERSION", 2)
+
+        stats = await self._run(agent, _opportunity_xml("1", ceiling="750,000"))
+
+        assert stats.updated_grants == 0
+        assert json.loads(await agent._redis.hget(REDIS_FINGERPRINTS, "1"))["v"] == 2
@@ -239,13 +239,12 @@ class TestNSFDiscoveryAgent:
         mock_nsf_agent.http_client = AsyncMock()
         mock_nsf_agent.http_client.get = mock_get
 
-        # First call not duplicate, second call is duplicate
-        mock_nsf_agent._redis_client.sismember.side_effect = [False, True]
-
         grants = await mock_nsf_agent.discover()
 
-        # Should only return 1 grant (duplicate filtered)
+        # Should only return 1 grant (repeat within the page filtered)
         assert len(grants) == 1
+        # One membership check for the whole page
+        mock_nsf_agent._redis_client.smismember.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_discover_marks_as_seen(self, mock_nsf_agent, sample_nsf_api_response):
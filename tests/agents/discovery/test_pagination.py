@@ -0,0 +1,250 @@
+"""
+Tests for the shared discovery paginator.
+Covers concurrent fetches of known offsets, adaptive rate control and
+per-source throughput, against a local mock of the NIH RePORTER and NSF APIs.
+"""
+
+import asyncio
+import json
+
+import fakeredis
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from agents.discovery.base import AdaptiveRateLimiter, ConcurrentPaginator
+from agents.discovery.nih_reporter import NIHReporterDiscoveryAgent
+from agents.discovery.nsf_api import NSFDiscoveryAgent
+from backend.core.config import settings
+
+
+class MockSourceAPI:
+    """In-process stand-in for the NIH RePORTER and NSF search endpoints."""
+
+    def __init__(self, total: int, throttled_requests: int = 0, failing_offsets: tuple[int, ...] = ()):
+        self.total = total
+        self.throttled_requests = throttled_requests
+        self.failing_offsets = set(failing_offsets)
+        self.report_total = True
+        self.offsets: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/nih", self.nih)
+        app.router.add_get("/nsf", self.nsf)
+        return app
+
+    async def _respond(self, offset: int, build) -> web.Response:
+        self.offsets.append(offset)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.02)
+            # The first page always succeeds so the total is known
+            if len(self.offsets) > 1 and self.throttled_requests > 0:
+                self.throttled_requests -= 1
+                return web.Response(status=429, headers={"Retry-After": "0"})
+            if offset in self.failing_offsets:
+                return web.Response(status=400)
+            return web.json_response(build())
+        finally:
+            self.in_flight -= 1
+
+    async def nih(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        offset, limit = body["offset"], body["limit"]
+        indexes = range(offset, min(offset + limit, self.total))
+
+        def build():
+            return {
+                "meta": {"total": self.total, "offset": offset, "limit": limit},
+                "results": [{"project_num": f"P{i}", "project_title": f"Project {i}"} for i in indexes],
+            }
+
+        return await self._respond(offset, build)
+
+    async def nsf(self, request: web.Request) -> web.Response:
+        offset, rpp = int(request.query["offset"]), int(request.query["rpp"])
+        # 1-indexed offsets
+        indexes = range(offset - 1, min(offset - 1 + rpp, self.total))
+
+        def build():
+            response = {"award": [{"id": str(i), "title": f"Award {i}"} for i in indexes]}
+            if self.report_total:
+                response["metadata"] = {"totalCount": self.total}
+            return {"response": response}
+
+        return await self._respond(offset, build)
+
+
+@pytest.fixture(autouse=True)
+def fast_pacing(monkeypatch):
+    """Start fast so tests measure concurrency, not pacing."""
+    monkeypatch.setattr(settings, "discovery_page_concurrency", 4)
+    monkeypatch.setattr(settings, "discovery_page_rate", 500.0)
+    monkeypatch.setattr(settings, "discovery_page_min_rate", 50.0)
+    monkeypatch.setattr(settings, "discovery_page_max_rate", 1000.0)
+
+
+@pytest.fixture
+async def serve():
+    """Start a MockSourceAPI on a local port; returns (api, base_url)."""
+    servers = []
+
+    async def start(api: MockSourceAPI) -> str:
+        server = TestServer(api.app())
+        await server.start_server()
+        servers.append(server)
+        return str(server.make_url("")).rstrip("/")
+
+    yield start
+    for server in servers:
+        await server.close()
+
+
+def _agent(cls, url: str, page_size: int):
+    agent = cls()
+    agent.API_URL = url
+    agent.RESULTS_PER_PAGE = page_size
+    agent._redis_client = fakeredis.FakeRedis(decode_responses=True)
+    return agent
+
+
+class TestNIHReporterPagination:
+    """Tests for NIH RePORTER pages fetched through the shared paginator."""
+
+    async def test_fetches_known_offsets_concurrently(self, serve):
+        api = MockSourceAPI(total=95)
+        agent = _agent(NIHReporterDiscoveryAgent, f"{await serve(api)}/nih", page_size=10)
+
+        projects = await agent._fetch_all_pages(agent._build_request())
+        await agent.close_async()
+
+        assert sorted(p.project_num for p in projects) == sorted(f"P{i}" for i in range(95))
+        assert sorted(api.offsets) == list(range(0, 95, 10))
+        assert api.max_in_flight > 1
+        assert agent.last_pagination.pages == 10
+        assert agent.last_pagination.items == 95
+
+    async def test_records_throughput_per_source(self, serve):
+        api = MockSourceAPI(total=30)
+        agent = _agent(NIHReporterDiscoveryAgent, f"{await serve(api)}/nih", page_size=10)
+        redis_client = agent._redis_client
+
+        await agent._fetch_all_pages(agent._build_request())
+        await agent.close_async()
+
+        recorded = redis_client.hgetall("discovery:pagination:nih_reporter")
+        assert recorded["pages"] == "3"
+        assert float(recorded["pages_per_second"]) > 0
+
+    async def test_backs_off_and_retries_throttled_pages(self, serve):
+        api = MockSourceAPI(total=60, throttled_requests=3)
+        agent = _agent(NIHReporterDiscoveryAgent, f"{await serve(api)}/nih", page_size=10)
+
+        projects = await agent._fetch_all_pages(agent._build_request())
+        await agent.close_async()
+
+        assert len(projects) == 60
+        assert agent.last_pagination.throttled == 3
+        assert agent.last_pagination.failed_pages == 0
+
+    async def test_skips_page_on_client_error(self, serve):
+        api = MockSourceAPI(total=40, failing_offsets=(20,))
+        agent = _agent(NIHReporterDiscoveryAgent, f"{await serve(api)}/nih", page_size=10)
+
+        projects = await agent._fetch_all_pages(agent._build_request())
+        await agent.close_async()
+
+        assert len(projects) == 30
+        assert api.offsets.count(20) == 1
+        assert agent.last_pagination.failed_pages == 1
+
+
+class TestNSFPagination:
+    """Tests for NSF pages fetched through the shared paginator."""
+
+    async def test_run_publishes_each_page(self, serve):
+        api = MockSourceAPI(total=60)
+        agent = _agent(NSFDiscoveryAgent, f"{await serve(api)}/nsf", page_size=25)
+        redis_client = agent._redis_client
+
+        count = await agent.run()
+
+        assert count == 60
+        assert sorted(api.offsets) == [1, 26, 51]
+        messages = redis_client.xrange(agent.GRANTS_STREAM)
+        assert sorted(json.loads(fields["data"])["external_id"] for _, fields in messages) == sorted(
+            str(i) for i in range(60)
+        )
+
+    async def test_walks_pages_when_total_unknown(self, serve):
+        api = MockSourceAPI(total=60)
+        api.report_total = False
+        agent = _agent(NSFDiscoveryAgent, f"{await serve(api)}/nsf", page_size=25)
+
+        awards = await agent._fetch_all_pages(agent._build_params())
+        await agent.close_async()
+
+        assert len(awards) == 60
+        assert api.offsets == [1, 26, 51]
+        assert api.max_in_flight == 1
+
+
+class TestConcurrentPaginator:
+    """Tests for the paginator independent of any source."""
+
+    async def test_skips_page_that_fails_to_parse(self):
+        async def fetch_page(offset):
+            return {"offset": offset, "total": 40}
+
+        def parse_page(data):
+            if data["offset"] == 20:
+                raise KeyError("results")
+            return [data["offset"]], data["total"]
+
+        paginator = ConcurrentPaginator("test", fetch_page, parse_page, page_size=10)
+
+        async def collect():
+            return [items async for items in paginator.pages()]
+
+        pages = await asyncio.wait_for(collect(), timeout=5)
+
+        assert sorted(item for items in pages for item in items) == [0, 10, 30]
+        assert paginator.stats.pages == 3
+        assert paginator.stats.failed_pages == 1
+
+
+class TestAdaptiveRateLimiter:
+    """Tests for the AIMD rate controller."""
+
+    def test_throttle_halves_down_to_floor(self):
+        limiter = AdaptiveRateLimiter(rate=4.0, min_rate=1.5, max_rate=8.0)
+
+        limiter.on_throttle()
+        assert limiter.rate == 2.0
+        limiter.on_throttle()
+        assert limiter.rate == 1.5
+        assert limiter.throttled == 2
+
+    def test_success_ramps_up_to_ceiling(self):
+        limiter = AdaptiveRateLimiter(rate=7.0, min_rate=0.5, max_rate=8.0, increase=0.5)
+
+        limiter.on_success()
+        assert limiter.rate == 7.5
+        limiter.on_success()
+        limiter.on_success()
+        assert limiter.rate == 8.0
+
+    async def test_spaces_requests_by_rate(self):
+        limiter = AdaptiveRateLimiter(rate=20.0, min_rate=1.0, max_rate=20.0)
+        loop = asyncio.get_running_loop()
+
+        start = loop.time()
+        for _ in range(4):
+            await limiter.acquire()
+
+        # First slot is immediate, then three 50ms gaps
+        assert loop.time() - start >= 0.14
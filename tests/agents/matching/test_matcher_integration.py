@@ -6,7 +6,7 @@ Tests the full matching workflow with mocked external services.
 import json
 import pytest
 from datetime import datetime, timezone
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 from agents.matching.matcher import GrantMatcher
@@ -368,3 +368,342 @@ class TestProcessGrantWorkflow:
 
         assert stats["candidates_found"] == 0
         assert stats["llm_evaluated"] == 0
+
+
+class TestBatchMatching:
+    """Tests for batched multi-grant matching."""
+
+    def _make_candidates(self, count, similarity=0.9):
+        from agents.matching.models import ProfileMatch, UserProfile
+
+        candidates = []
+        for _ in range(count):
+            profile = UserProfile(user_id=uuid4(), research_areas=["biology"])
+            candidates.append(
+                ProfileMatch(
+                    user_id=profile.user_id,
+                    vector_similarity=similarity,
+                    profile=profile,
+                )
+            )
+        return candidates
+
+    def _make_grant(self):
+        from agents.matching.models import GrantData
+
+        return GrantData(
+            grant_id=uuid4(),
+            title="Batch Grant",
+            description="Description",
+            embedding=[0.1] * 8,
+        )
+
+    def test_pack_shares_llm_calls_across_grants(self, mock_db_engine):
+        """Grants with few candidates share one LLM request."""
+        matcher = GrantMatcher(mock_db_engine)
+        grants = {g.grant_id: g for g in (self._make_grant() for _ in range(3))}
+        candidates = {gid: self._make_candidates(3) for gid in grants}
+
+        requests = matcher._pack_cross_grant_requests(grants, candidates)
+
+        assert len(requests) == 1
+        assert len(requests[0].grants) == 3
+        assert len(requests[0].candidates) == 9
+
+    def test_pack_respects_rerank_limit_and_call_size(self, mock_db_engine):
+        """Each grant is capped at LLM_RERANK_LIMIT and calls are chunked."""
+        matcher = GrantMatcher(mock_db_engine)
+        grant = self._make_grant()
+        candidates = {grant.grant_id: self._make_candidates(30)}
+
+        requests = matcher._pack_cross_grant_requests({grant.grant_id: grant}, candidates)
+
+        total_pairs = sum(len(r.candidates) for r in requests)
+        assert total_pairs == matcher.LLM_RERANK_LIMIT
+        assert all(len(r.candidates) <= matcher.CROSS_GRANT_PAIRS_PER_CALL for r in requests)
+
+    async def test_evaluate_cross_grant_batch_ignores_unrequested_pairs(self, mock_db_engine):
+        """Results for pairs that were not requested are dropped."""
+        from agents.matching.models import CrossGrantMatchRequest
+
+        grant = self._make_grant()
+        candidate = self._make_candidates(1)[0]
+        items = [
+            {
+                "grant_id": str(grant.grant_id),
+                "user_id": str(candidate.user_id),
+                "match_score": 88,
+                "reasoning": "Strong fit",
+                "predicted_success": 60,
+            },
+            {
+                "grant_id": str(grant.grant_id),
+                "user_id": str(uuid4()),
+                "match_score": 99,
+                "reasoning": "Invented",
+                "predicted_success": 99,
+            },
+        ]
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content=json.dumps(items)))]
+
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(return_value=mock_response)
+        matcher = GrantMatcher(mock_db_engine)
+
+        response = await matcher.evaluate_cross_grant_batch_async(
+            CrossGrantMatchRequest(grants=[grant], candidates=[(grant.grant_id, candidate)]),
+            client,
+        )
+
+        assert len(response.results) == 1
+        assert response.results[0][0] == grant.grant_id
+        assert response.results[0][1] == candidate.user_id
+        assert response.results[0][2].match_score == 88
+
+    async def test_rerank_pairs_inside_running_loop(self, mock_db_engine):
+        """The sync wrapper works when called from code already on an event loop."""
+        from agents.matching.fake_llm import FakeAsyncLLMClient
+
+        grant = self._make_grant()
+        candidates = self._make_candidates(3)
+        matcher = GrantMatcher(mock_db_engine, async_llm_client=FakeAsyncLLMClient(latency_seconds=0))
+
+        with patch("agents.matching.matcher.settings.llm_score_cache_enabled", False):
+            results, counts = matcher.rerank_pairs([(grant, c) for c in candidates])
+
+        assert set(results) == {(grant.grant_id, c.user_id) for c in candidates}
+        assert counts["llm_calls"] == 1
+        assert counts["llm_batches_failed"] == 0
+
+    def test_store_matches_bulk_single_execute(self, mock_db_engine):
+        """Bulk store issues one executemany call."""
+        mock_session = MagicMock()
+        matcher = GrantMatcher(mock_db_engine)
+        matches = [
+            FinalMatch(
+                match_id=uuid4(),
+                grant_id=uuid4(),
+                user_id=uuid4(),
+                vector_similarity=0.8,
+                llm_match_score=80,
+                final_score=80,
+                reasoning="Good match",
+                predicted_success=70,
+            )
+            for _ in range(3)
+        ]
+
+        stored = matcher.store_matches_bulk(matches, mock_session)
+
+        assert stored == 3
+        mock_session.execute.assert_called_once()
+        assert len(mock_session.execute.call_args[0][1]) == 3
+
+    def test_process_grants_batch_end_to_end(self, mock_db_engine, mock_redis_client):
+        """Batch processing uses one LLM call and bulk writes for small grants."""
+        from tests.agents.matching.conftest import create_mock_db_result
+
+        grant_ids = [uuid4(), uuid4()]
+        user_ids = [uuid4(), uuid4()]
+        grant_rows = [
+            create_mock_db_result(
+                {
+                    "grant_id": gid,
+                    "title": "Grant",
+                    "description": "Description",
+                    "agency": "NSF",
+                    "amount_min": None,
+                    "amount_max": 100000,
+                    "deadline": None,
+                    "eligibility": None,
+                    "categories": ["biology"],
+                    "embedding": [0.1] * 8,
+                }
+            )
+            for gid in grant_ids
+        ]
+        candidate_rows = [
+            create_mock_db_result(
+                {
+                    "grant_id": gid,
+                    "user_id": str(uid),
+                    "similarity": 0.9,
+                    "research_areas": ["biology"],
+                    "methods": [],
+                    "past_grants": [],
+                    "institution": None,
+                    "department": None,
+                    "keywords": [],
+                }
+            )
+            for gid in grant_ids
+            for uid in user_ids
+        ]
+
+        call_count = [0]
+
+        def mock_execute(*args, **kwargs):
+            call_count[0] += 1
+            result = MagicMock()
+            if call_count[0] == 1:
+                result.fetchall.return_value = grant_rows
+            elif call_count[0] == 2:
+                result.fetchall.return_value = candidate_rows
+            return result
+
+        mock_session = MagicMock()
+        mock_session.execute = MagicMock(side_effect=mock_execute)
+
+        items = [
+            {
+                "grant_id": str(gid),
+                "user_id": str(uid),
+                "match_score": 90,
+                "reasoning": "Strong fit",
+                "predicted_success": 70,
+            }
+            for gid in grant_ids
+            for uid in user_ids
+        ]
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content=json.dumps(items)))]
+
+        pipe = MagicMock()
+        pipe.execute.return_value = ["1-0", "2-0", "3-0", "4-0"]
+        mock_redis_client.pipeline = MagicMock(return_value=pipe)
+        mock_redis_client.mget = MagicMock(return_value=[None] * 4)
+
+        async_client = MagicMock()
+        async_client.chat.completions.create = AsyncMock(return_value=mock_response)
+
+        matcher = GrantMatcher(mock_db_engine, async_llm_client=async_client)
+        matcher._redis_client = mock_redis_client
+
+        with patch("agents.matching.matcher.Session") as mock_session_class:
+            mock_context = MagicMock()
+            mock_context.__enter__ = MagicMock(return_value=mock_session)
+            mock_context.__exit__ = MagicMock(return_value=False)
+            mock_session_class.return_value = mock_context
+
+            stats = matcher.process_grants_batch(grant_ids)
+
+        assert stats["grants_processed"] == 2
+        assert stats["candidates_found"] == 4
+        assert stats["llm_calls"] == 1
+        assert stats["llm_evaluated"] == 4
+        assert stats["matches_stored"] == 4
+        assert stats["matches_published"] == 4
+        assert stats["grants_per_minute"] > 0
+        # fetch + candidate search + one bulk upsert
+        assert mock_session.execute.call_count == 3
+        assert pipe.xadd.call_count == 4
+        mock_redis_client.xadd.assert_not_called()
+
+
+class TestConcurrentRerank:
+    """Tests for the async concurrent LLM re-rank path."""
+
+    def _make_candidates(self, count):
+        from agents.matching.models import ProfileMatch, UserProfile
+
+        return [
+            ProfileMatch(
+                user_id=profile.user_id,
+                vector_similarity=0.8,
+                profile=profile,
+            )
+            for profile in (UserProfile(user_id=uuid4(), research_areas=["biology"]) for _ in range(count))
+        ]
+
+    async def test_rerank_runs_batches_concurrently(self, mock_db_engine, grant_data_full):
+        """Four 5-profile chunks complete in about one LLM round trip."""
+        import time
+
+        from agents.matching.fake_llm import FakeAsyncLLMClient
+
+        client = FakeAsyncLLMClient(latency_seconds=0.2)
+        matcher = GrantMatcher(mock_db_engine, async_llm_client=client)
+        candidates = self._make_candidates(20)
+
+        start = time.perf_counter()
+        results, failed = await matcher.rerank_candidates_async(grant_data_full, candidates)
+        elapsed = time.perf_counter() - start
+
+        assert client.calls == 4
+        assert failed == 0
+        assert set(results) == {c.user_id for c in candidates}
+        assert elapsed < 0.6
+
+    async def test_rerank_respects_concurrency_limit(self, mock_db_engine, grant_data_full):
+        """No more than llm_rerank_concurrency calls are in flight."""
+        import asyncio
+
+        from agents.matching.fake_llm import build_fake_response
+
+        in_flight = [0]
+        peak = [0]
+
+        async def create(**kwargs):
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            await asyncio.sleep(0.01)
+            in_flight[0] -= 1
+            content = build_fake_response(kwargs["messages"][0]["content"])
+            return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+        client = MagicMock()
+        client.chat.completions.create = create
+        matcher = GrantMatcher(mock_db_engine, async_llm_client=client)
+
+        with patch("agents.matching.matcher.settings.llm_rerank_concurrency", 2):
+            results, failed = await matcher.rerank_candidates_async(grant_data_full, self._make_candidates(20))
+
+        assert peak[0] == 2
+        assert len(results) == 20
+        assert failed == 0
+
+    async def test_rerank_keeps_partial_results_on_timeout(self, mock_db_engine, grant_data_full):
+        """A timed-out call is dropped while other chunks still return."""
+        import asyncio
+
+        from agents.matching.fake_llm import build_fake_response
+
+        calls = [0]
+
+        async def create(**kwargs):
+            calls[0] += 1
+            if calls[0] == 1:
+                await asyncio.sleep(1)
+            content = build_fake_response(kwargs["messages"][0]["content"])
+            return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+        client = MagicMock()
+        client.chat.completions.create = create
+        matcher = GrantMatcher(mock_db_engine, async_llm_client=client)
+
+        with patch("agents.matching.matcher.settings.llm_rerank_timeout_seconds", 0.1):
+            results, failed = await matcher.rerank_candidates_async(grant_data_full, self._make_candidates(10))
+
+        assert failed == 1
+        assert len(results) == 5
+
+    async def test_rerank_keeps_partial_results_on_error(self, mock_db_engine, grant_data_full):
+        """Malformed responses count as failed calls without aborting the rerank."""
+        from agents.matching.fake_llm import build_fake_response
+
+        calls = [0]
+
+        async def create(**kwargs):
+            calls[0] += 1
+            content = "not json" if calls[0] == 2 else build_fake_response(kwargs["messages"][0]["content"])
+            return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+        client = MagicMock()
+        client.chat.completions.create = create
+        matcher = GrantMatcher(mock_db_engine, async_llm_client=client)
+
+        results, failed = await matcher.rerank_candidates_async(grant_data_full, self._make_candidates(15))
+
+        assert failed == 1
+        assert len(results) == 10
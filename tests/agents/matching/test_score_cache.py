@@ -0,0 +1,139 @@
+"""
+Tests for the content-addressed LLM match score cache.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import fakeredis
+import pytest
+import redis
+
+from agents.matching.matcher import GrantMatcher
+from agents.matching.models import GrantData, MatchResult, ProfileMatch, UserProfile
+from agents.matching.score_cache import MatchScoreCache, grant_text_hash, profile_text_hash
+
+
+@pytest.fixture
+def fake_redis():
+    """In-memory Redis with decoded responses."""
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def match_result():
+    return MatchResult(match_score=82, reasoning="Good fit", predicted_success=60)
+
+
+def _candidate(research_area: str = "biology") -> ProfileMatch:
+    profile = UserProfile(user_id=uuid4(), research_areas=[research_area])
+    return ProfileMatch(user_id=profile.user_id, vector_similarity=0.8, profile=profile)
+
+
+class TestHashes:
+    """Tests for content hashes."""
+
+    def test_grant_hash_changes_with_text(self, grant_data_full):
+        changed = grant_data_full.model_copy(update={"description": "Different description"})
+        assert grant_text_hash(grant_data_full) != grant_text_hash(changed)
+
+    def test_grant_hash_ignores_identity(self, grant_data_full):
+        same_text = grant_data_full.model_copy(update={"grant_id": uuid4(), "embedding": None})
+        assert grant_text_hash(grant_data_full) == grant_text_hash(same_text)
+
+    def test_profile_hash_matches_profile_builder(self, user_profile_full):
+        from agents.matching.profile_builder import ProfileBuilder
+
+        builder = ProfileBuilder.__new__(ProfileBuilder)
+        assert profile_text_hash(user_profile_full) == builder._compute_text_hash(user_profile_full.to_embedding_text())
+
+
+class TestMatchScoreCache:
+    """Tests for MatchScoreCache."""
+
+    def test_miss_then_hit(self, fake_redis, match_result):
+        cache = MatchScoreCache(fake_redis, prompt_version="v1", ttl_seconds=60)
+
+        assert cache.get_many([("g", "p")]) == {}
+        cache.set_many([("g", "p", match_result)])
+        found = cache.get_many([("g", "p"), ("g", "other")])
+
+        assert found[("g", "p")].match_score == 82
+        assert cache.hits == 1
+        assert cache.misses == 2
+
+        metrics = cache.get_metrics()
+        assert metrics["total_hits"] == 1
+        assert metrics["total_misses"] == 2
+        assert metrics["hit_rate"] == pytest.approx(1 / 3, abs=1e-3)
+
+    def test_prompt_version_isolates_entries(self, fake_redis, match_result):
+        MatchScoreCache(fake_redis, prompt_version="v1", ttl_seconds=60).set_many([("g", "p", match_result)])
+
+        assert MatchScoreCache(fake_redis, prompt_version="v2", ttl_seconds=60).get_many([("g", "p")]) == {}
+
+    def test_entries_expire(self, fake_redis, match_result):
+        cache = MatchScoreCache(fake_redis, prompt_version="v1", ttl_seconds=60)
+        cache.set_many([("g", "p", match_result)])
+
+        assert 0 < fake_redis.ttl(cache._key("g", "p")) <= 60
+
+    def test_redis_errors_are_misses(self, match_result):
+        broken = MagicMock()
+        broken.mget.side_effect = redis.ConnectionError("down")
+        broken.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+        cache = MatchScoreCache(broken, prompt_version="v1", ttl_seconds=60)
+
+        cache.set_many([("g", "p", match_result)])
+        assert cache.get_many([("g", "p")]) == {}
+        assert cache.misses == 1
+
+
+class TestMatcherCacheIntegration:
+    """Tests for cache use in the matcher re-rank."""
+
+    def test_lookup_splits_hits_and_misses(self, mock_db_engine, fake_redis, grant_data_full, match_result):
+        matcher = GrantMatcher(mock_db_engine)
+        matcher._redis_client = fake_redis
+        cached_candidate = _candidate("biology")
+        new_candidate = _candidate("chemistry")
+
+        matcher.cache_results([(grant_data_full, cached_candidate, match_result)])
+        cached, misses = matcher.lookup_cached_results(
+            [(grant_data_full, cached_candidate), (grant_data_full, new_candidate)]
+        )
+
+        assert list(cached) == [(grant_data_full.grant_id, cached_candidate.user_id)]
+        assert [pm.user_id for _, pm in misses] == [new_candidate.user_id]
+
+    def test_process_grants_batch_skips_llm_on_redelivery(self, mock_db_engine, fake_redis):
+        """Second run over unchanged grants is served entirely from cache."""
+        from unittest.mock import patch
+
+        from agents.matching.fake_llm import build_fake_response
+
+        grant = GrantData(grant_id=uuid4(), title="Cached Grant", description="Description", embedding=[0.1] * 8)
+        candidates = [_candidate(area) for area in ("biology", "chemistry", "physics")]
+
+        async def create(**kwargs):
+            content = build_fake_response(kwargs["messages"][0]["content"])
+            return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(side_effect=create)
+
+        matcher = GrantMatcher(mock_db_engine, async_llm_client=client)
+        matcher._redis_client = fake_redis
+        matcher.fetch_grants_data_batch = MagicMock(return_value={grant.grant_id: grant})
+        matcher.find_similar_profiles_batch = MagicMock(return_value={grant.grant_id: candidates})
+
+        with patch("agents.matching.matcher.Session"):
+            first = matcher.process_grants_batch([grant.grant_id])
+            second = matcher.process_grants_batch([grant.grant_id])
+
+        assert first["llm_calls"] == 1
+        assert first["llm_cache_hits"] == 0
+        assert second["llm_calls"] == 0
+        assert second["llm_cache_hits"] == 3
+        assert second["matches_stored"] == first["matches_stored"] == 3
+        assert client.chat.completions.create.await_count == 1
@@ -282,6 +282,42 @@ class TestAlertPreview:
             for grant in preview.new_grants:
                 assert grant.funder == "NIH"
 
+    @pytest.mark.asyncio
+    async def test_preview_alerts_filters_shared_candidates_per_user(self, async_session, db_user, db_grant):
+        """Batch previews apply each user's own window and threshold."""
+        other = User(email="other@university.edu", password_hash="x", name="Other")
+        async_session.add(other)
+        await async_session.flush()
+
+        prefs = FundingAlertPreference(user_id=db_user.id, enabled=True, min_match_score=70, include_insights=False)
+        other_prefs = FundingAlertPreference(
+            user_id=other.id,
+            enabled=True,
+            min_match_score=95,
+            include_insights=False,
+            last_sent_at=datetime.now(timezone.utc) - timedelta(days=1),
+        )
+        async_session.add_all([prefs, other_prefs])
+        async_session.add_all(
+            [
+                Match(user_id=db_user.id, grant_id=db_grant.id, match_score=0.8, created_at=datetime.now(timezone.utc)),
+                Match(
+                    user_id=other.id,
+                    grant_id=db_grant.id,
+                    match_score=0.99,
+                    created_at=datetime.now(timezone.utc) - timedelta(days=2),
+                ),
+            ]
+        )
+        await async_session.commit()
+
+        service = FundingAlertsService()
+        previews = await service.preview_alerts(async_session, [(db_user, prefs), (other, other_prefs)])
+
+        assert [g.match_score for g in previews[db_user.id].new_grants] == [80]
+        assert previews[other.id].new_grants == []
+        assert not previews[other.id].would_send
+
 
 class TestAlertEmailGeneration:
     """Tests for email HTML generation."""
@@ -654,3 +690,53 @@ class TestFrequencySettings:
         )
 
         assert updated.frequency == "monthly"
+
+    @pytest.mark.asyncio
+    async def test_unchanged_schedule_keeps_next_send_at(self, async_session, db_user):
+        """Re-sending enabled and the current frequency leaves a claimed send time alone."""
+        last_sent = datetime.now(timezone.utc) - timedelta(days=1)
+        claimed_until = datetime.now(timezone.utc) + timedelta(hours=2)
+        async_session.add(
+            FundingAlertPreference(
+                user_id=db_user.id,
+                enabled=True,
+                frequency="weekly",
+                last_sent_at=last_sent,
+                next_send_at=claimed_until,
+            )
+        )
+        await async_session.commit()
+        service = FundingAlertsService()
+
+        updated = await service.update_preferences(
+            db=async_session,
+            user_id=db_user.id,
+            enabled=True,
+            frequency=AlertFrequency.WEEKLY,
+            min_match_score=80,
+        )
+
+        assert updated.min_match_score == 80
+        assert updated.next_send_at.replace(tzinfo=timezone.utc) == claimed_until
+
+    @pytest.mark.asyncio
+    async def test_new_frequency_or_re_enabling_reschedules(self, async_session, db_user):
+        """Changing the frequency or turning alerts back on recomputes next_send_at."""
+        last_sent = datetime.now(timezone.utc) - timedelta(days=1)
+        async_session.add(
+            FundingAlertPreference(
+                user_id=db_user.id,
+                enabled=False,
+                frequency="weekly",
+                last_sent_at=last_sent,
+                next_send_at=last_sent + timedelta(days=30),
+            )
+        )
+        await async_session.commit()
+        service = FundingAlertsService()
+
+        updated = await service.update_preferences(db=async_session, user_id=db_user.id, enabled=True)
+        assert updated.next_send_at.replace(tzinfo=timezone.utc) == last_sent + timedelta(days=7)
+
+        updated = await service.update_preferences(db=async_session, user_id=db_user.id, frequency=AlertFrequency.DAILY)
+        assert updated.next_send_at.replace(tzinfo=timezone.utc) == last_sent + timedelta(days=1)
@@ -284,6 +284,32 @@ def fake_redis():
     return FakeRedis()
 
 
+@pytest.fixture(autouse=True)
+def isolated_embedding_cache():
+    """Keep the shared embedding cache from leaking between tests."""
+    import fakeredis
+
+    from backend.core import embedding_service
+
+    embedding_service.reset_embedding_cache()
+    with patch.object(embedding_service, "_redis_client", fakeredis.FakeRedis()):
+        yield
+    embedding_service.reset_embedding_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolated_principal_cache():
+    """Keep cached users and API keys from leaking between tests."""
+    import fakeredis
+
+    from backend.core import principal_cache
+
+    principal_cache.reset_principal_cache()
+    with patch.object(principal_cache, "_redis_client", fakeredis.FakeRedis()):
+        yield
+    principal_cache.reset_principal_cache()
+
+
 # =============================================================================
 # Sample Data Fixtures
 # =============================================================================
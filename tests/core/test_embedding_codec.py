@@ -0,0 +1,107 @@
+"""
+Tests for the shared embedding codec.
+Covers parameter encoding, result decoding and driver registration.
+"""
+
+import numpy as np
+import psycopg2.extensions
+import pytest
+from sqlalchemy import create_engine, text
+
+from backend.core.embedding_codec import (
+    VectorParam,
+    benchmark_codec,
+    decode_embedding,
+    encode_embedding,
+    from_vector_binary,
+    install_vector_codecs,
+    parse_vector_text,
+    to_vector_binary,
+    to_vector_text,
+)
+
+
+class TestEncodeEmbedding:
+    """Tests for encode_embedding."""
+
+    def test_returns_float32_vector_param(self):
+        vector = encode_embedding([0.1, 0.2, 0.3])
+
+        assert isinstance(vector, VectorParam)
+        assert vector.dtype == np.float32
+        assert vector.shape == (3,)
+
+    def test_accepts_text_literal(self):
+        assert encode_embedding("[1,2.5]").tolist() == [1.0, 2.5]
+
+    def test_rejects_matrix(self):
+        with pytest.raises(ValueError):
+            encode_embedding([[1.0, 2.0]])
+
+
+class TestTextFormat:
+    """Tests for the compact text literal."""
+
+    def test_round_trips_float32_exactly(self):
+        values = np.random.default_rng(0).standard_normal(1536).astype(np.float32)
+
+        parsed = parse_vector_text(to_vector_text(values))
+
+        assert np.array_equal(parsed, values)
+
+    def test_psycopg2_adapter_renders_quoted_literal(self):
+        quoted = psycopg2.extensions.adapt(encode_embedding([0.5, 1.0, -2.0])).getquoted()
+
+        assert quoted == b"'[0.5,1,-2]'"
+
+
+class TestBinaryFormat:
+    """Tests for the pgvector binary wire format."""
+
+    def test_round_trip(self):
+        values = np.random.default_rng(1).standard_normal(16).astype(np.float32)
+
+        encoded = to_vector_binary(values)
+
+        assert len(encoded) == 4 + 4 * 16
+        assert np.array_equal(from_vector_binary(encoded), values)
+
+    def test_accepts_text_literal(self):
+        assert to_vector_binary("[1,2]") == to_vector_binary([1.0, 2.0])
+
+
+class TestDecodeEmbedding:
+    """Tests for decode_embedding."""
+
+    @pytest.mark.parametrize(
+        "value",
+        ["[1,2]", np.array([1.0, 2.0], dtype=np.float32), [1, 2], (1.0, 2.0)],
+    )
+    def test_returns_float_list(self, value):
+        assert decode_embedding(value) == [1.0, 2.0]
+
+    def test_none(self):
+        assert decode_embedding(None) is None
+
+
+class TestInstall:
+    """Tests for connection hook registration."""
+
+    def test_non_postgres_connections_are_unaffected(self):
+        install_vector_codecs()
+        install_vector_codecs()
+        engine = create_engine("sqlite://")
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+
+
+class TestBenchmark:
+    """Smoke test for the codec microbenchmark."""
+
+    def test_binary_is_smallest_and_fastest(self):
+        report = benchmark_codec(iterations=50)
+
+        assert report["binary"]["bytes"] == 4 + 4 * 1536
+        assert report["binary"]["bytes"] < report["float32_text"]["bytes"] < report["str_join"]["bytes"]
+        assert report["binary"]["encode_us"] < report["str_join"]["encode_us"]
@@ -0,0 +1,157 @@
+"""
+Tests for the shared embedding service.
+Covers both cache tiers, batch de-duplication and cache metrics.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+import redis
+
+from backend.core import embedding_service
+from backend.core.embedding_service import (
+    EmbeddingService,
+    get_embedding_cache_metrics,
+    reset_embedding_cache,
+)
+
+
+def _fake_client():
+    """OpenAI stand-in whose embedding is derived from the text length."""
+    client = MagicMock()
+
+    def create(input, **kwargs):
+        texts = [input] if isinstance(input, str) else input
+        data = [SimpleNamespace(index=i, embedding=[float(len(t)), 1.0]) for i, t in enumerate(texts)]
+        return SimpleNamespace(data=list(reversed(data)))
+
+    client.embeddings.create.side_effect = create
+    return client
+
+
+class TestEmbed:
+    """Tests for single-text embedding."""
+
+    def test_second_call_served_from_memory(self):
+        client = _fake_client()
+        service = EmbeddingService(client, model="m")
+
+        first = service.embed("hello")
+        second = service.embed("hello")
+
+        assert first == second == [5.0, 1.0]
+        assert client.embeddings.create.call_count == 1
+
+    def test_redis_tier_shared_across_processes(self):
+        client = _fake_client()
+        EmbeddingService(client, model="m").embed("hello")
+
+        # Simulate another process: empty L1, same Redis
+        embedding_service._lru.clear()
+        other = _fake_client()
+        assert EmbeddingService(other, model="m").embed("hello") == [5.0, 1.0]
+
+        other.embeddings.create.assert_not_called()
+        assert get_embedding_cache_metrics()["l2_hits"] == 1
+
+    def test_model_and_dimensions_are_part_of_the_key(self):
+        client = _fake_client()
+
+        EmbeddingService(client, model="m").embed("hello")
+        EmbeddingService(client, model="m", dimensions=2).embed("hello")
+        EmbeddingService(client, model="other").embed("hello")
+
+        assert client.embeddings.create.call_count == 3
+        assert client.embeddings.create.call_args_list[1].kwargs["dimensions"] == 2
+
+    def test_model_default_dimensions_share_the_key(self):
+        client = _fake_client()
+
+        EmbeddingService(client, model="text-embedding-3-small").embed("hello")
+        EmbeddingService(client, model="text-embedding-3-small", dimensions=1536).embed("hello")
+
+        assert client.embeddings.create.call_count == 1
+        assert "dimensions" not in client.embeddings.create.call_args.kwargs
+
+    def test_redis_errors_fall_back_to_memory(self):
+        broken = MagicMock()
+        broken.mget.side_effect = redis.ConnectionError("down")
+        client = _fake_client()
+
+        with patch.object(embedding_service, "_redis_client", broken):
+            service = EmbeddingService(client, model="m")
+            assert service.embed("hello") == [5.0, 1.0]
+            assert service.embed("hello") == [5.0, 1.0]
+
+        assert client.embeddings.create.call_count == 1
+        # Backing off: the second lookup skipped Redis entirely
+        assert broken.mget.call_count == 1
+        broken.pipeline.assert_not_called()
+
+
+class TestEmbedMany:
+    """Tests for batch embedding."""
+
+    def test_requests_only_unique_missing_texts(self):
+        client = _fake_client()
+        service = EmbeddingService(client, model="m")
+        service.embed("a")
+
+        result = service.embed_many(["bb", "a", "bb", "ccc"])
+
+        assert result == [[2.0, 1.0], [1.0, 1.0], [2.0, 1.0], [3.0, 1.0]]
+        assert client.embeddings.create.call_args.kwargs["input"] == ["bb", "ccc"]
+
+    def test_fully_cached_batch_makes_no_call(self):
+        client = _fake_client()
+        service = EmbeddingService(client, model="m")
+        service.embed_many(["a", "b"])
+
+        service.embed_many(["b", "a"])
+
+        assert client.embeddings.create.call_count == 1
+
+    def test_empty_input(self):
+        client = _fake_client()
+
+        assert EmbeddingService(client, model="m").embed_many([]) == []
+        client.embeddings.create.assert_not_called()
+
+
+class TestMetrics:
+    """Tests for cache metrics."""
+
+    def test_counts_hits_and_saved_calls(self):
+        service = EmbeddingService(_fake_client(), model="m")
+
+        service.embed("a")
+        service.embed("a")
+        service.embed_many(["a", "b"])
+
+        metrics = get_embedding_cache_metrics()
+        assert metrics["api_calls"] == 2
+        assert metrics["api_calls_saved"] == 1
+        assert metrics["l1_hits"] == 2
+        assert metrics["misses"] == 2
+        assert metrics["hit_rate"] == pytest.approx(0.5)
+        assert metrics["total"]["api_calls"] == 2
+
+    def test_reset_clears_local_state(self):
+        EmbeddingService(_fake_client(), model="m").embed("a")
+
+        reset_embedding_cache()
+
+        metrics = get_embedding_cache_metrics()
+        assert metrics["api_calls"] == 0
+        assert metrics["lru_entries"] == 0
+        assert metrics["hit_rate"] is None
+
+    def test_cached_vectors_are_float32(self):
+        service = EmbeddingService(_fake_client(), model="m")
+        service.embed("a")
+
+        stored = embedding_service._lru.get(service.cache_key("a"))
+
+        assert stored.dtype == np.float32
@@ -0,0 +1,208 @@
+"""
+Tests for the principal cache.
+Covers cached user and API key lookups, invalidation and usage write-behind.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import fakeredis
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.core import principal_cache
+from backend.core.config import settings
+from backend.core.principal_cache import (
+    INVALIDATION_CHANNEL,
+    flush_api_key_usage,
+    get_principal_cache_stats,
+    get_user,
+)
+from backend.models import User
+from backend.models.api_key import APIKey
+from backend.services.api_key import create_api_key, revoke_api_key, update_last_used, validate_api_key
+
+
+@pytest.fixture
+def new_session(async_engine):
+    """Factory for fresh sessions, standing in for separate requests."""
+    return async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+class TestUserCache:
+    """Tests for cached user lookups."""
+
+    async def test_second_lookup_skips_database(self, db_user, new_session):
+        async with new_session() as session:
+            await get_user(session, db_user.id)
+
+        async with new_session() as session:
+            with patch.object(session, "execute", AsyncMock(side_effect=AssertionError("queried"))):
+                user = await get_user(session, db_user.id)
+
+            assert user.email == db_user.email
+            assert user in session
+
+        assert get_principal_cache_stats()["user_hits"] == 1
+
+    async def test_cached_user_changes_are_persisted(self, db_user, new_session):
+        async with new_session() as session:
+            await get_user(session, db_user.id)
+
+        async with new_session() as session:
+            user = await get_user(session, db_user.id)
+            user.institution = "New University"
+            await session.commit()
+
+        async with new_session() as session:
+            row = (await session.execute(select(User).where(User.id == db_user.id))).scalar_one()
+        assert row.institution == "New University"
+
+    async def test_commit_invalidates_and_queues_message(self, db_user, new_session):
+        async with new_session() as session:
+            user = await get_user(session, db_user.id)
+            user.name = "Renamed"
+            with patch.object(principal_cache, "_get_redis", side_effect=AssertionError("blocking publish")):
+                await session.commit()
+
+        async with new_session() as session:
+            assert (await get_user(session, db_user.id)).name == "Renamed"
+
+        assert principal_cache._outbox.get_nowait()["users"] == [str(db_user.id)]
+        assert get_principal_cache_stats()["user_misses"] == 2
+
+    async def test_listener_publishes_queued_invalidations(self):
+        server = fakeredis.FakeServer()
+        pubsub = fakeredis.FakeRedis(server=server).pubsub()
+        pubsub.subscribe(INVALIDATION_CHANNEL)
+        pubsub.get_message()
+
+        principal_cache.invalidate(users=["u1"])
+        stop = asyncio.Event()
+        with patch.object(
+            principal_cache.aioredis,
+            "from_url",
+            return_value=fakeredis.aioredis.FakeRedis(server=server, decode_responses=True),
+        ):
+            listener = asyncio.create_task(principal_cache.run_principal_cache_listener(stop))
+            await asyncio.sleep(0.1)
+            stop.set()
+            await listener
+
+        message = json.loads(pubsub.get_message()["data"])
+        assert message["users"] == ["u1"]
+        assert principal_cache._outbox.empty()
+
+    async def test_invalidation_without_event_loop_publishes_directly(self):
+        pubsub = principal_cache._redis_client.pubsub()
+        pubsub.subscribe(INVALIDATION_CHANNEL)
+        pubsub.get_message()
+
+        await asyncio.to_thread(principal_cache.invalidate, users=["u1"])
+
+        assert json.loads(pubsub.get_message()["data"])["users"] == ["u1"]
+        assert principal_cache._outbox.empty()
+
+    async def test_rollback_does_not_invalidate(self, db_user, new_session):
+        async with new_session() as session:
+            user = await get_user(session, db_user.id)
+            user.name = "Discarded"
+            await session.flush()
+            await session.rollback()
+
+        assert get_principal_cache_stats()["users"] == 1
+
+    async def test_bulk_update_clears_users(self, db_user, new_session):
+        async with new_session() as session:
+            await get_user(session, db_user.id)
+            await session.execute(update(User).values(minimum_match_score=0.5))
+            await session.commit()
+
+        assert get_principal_cache_stats()["users"] == 0
+
+    async def test_message_from_other_process_evicts(self, db_user, new_session):
+        async with new_session() as session:
+            await get_user(session, db_user.id)
+
+        principal_cache._apply_invalidation({"users": [str(db_user.id)]})
+
+        assert get_principal_cache_stats()["users"] == 0
+
+
+class TestAPIKeyCache:
+    """Tests for cached API key validation."""
+
+    async def test_validation_cached_until_revoked(self, db_user, new_session):
+        async with new_session() as session:
+            api_key, plain_key = await create_api_key(session, db_user.id, "ci", scopes=["read:grants"])
+            await session.commit()
+
+        async with new_session() as session:
+            assert await validate_api_key(session, plain_key, ["read:grants"])
+        async with new_session() as session:
+            cached = await validate_api_key(session, plain_key, ["read:grants"])
+            assert cached.id == api_key.id
+            # Scopes are still checked against the cached key
+            assert await validate_api_key(session, plain_key, ["write:grants"]) is None
+        assert get_principal_cache_stats()["api_key_hits"] == 2
+
+        async with new_session() as session:
+            assert await revoke_api_key(session, api_key.id, db_user.id)
+            await session.commit()
+
+        async with new_session() as session:
+            assert await validate_api_key(session, plain_key) is None
+
+
+class TestUsageWriteBehind:
+    """Tests for buffered API key usage."""
+
+    async def test_uses_flushed_in_bulk(self, db_user, new_session):
+        async with new_session() as session:
+            api_key, _ = await create_api_key(session, db_user.id, "ci")
+            other_key, _ = await create_api_key(session, db_user.id, "other")
+            await session.commit()
+
+        async with new_session() as session:
+            for _ in range(3):
+                await update_last_used(session, api_key.id)
+            await update_last_used(session, other_key.id)
+            assert get_principal_cache_stats()["pending_usage_updates"] == 2
+
+            assert await flush_api_key_usage(session) == 2
+            await session.commit()
+
+        async with new_session() as session:
+            rows = {row.id: row for row in (await session.execute(select(APIKey))).scalars()}
+        assert rows[api_key.id].request_count == 3
+        assert rows[other_key.id].request_count == 1
+        assert rows[api_key.id].last_used_at is not None
+        assert get_principal_cache_stats()["pending_usage_updates"] == 0
+
+    async def test_failed_flush_keeps_counts(self, db_user, new_session):
+        async with new_session() as session:
+            api_key, _ = await create_api_key(session, db_user.id, "ci")
+            await session.commit()
+
+        async with new_session() as session:
+            await update_last_used(session, api_key.id)
+            with patch.object(session, "execute", AsyncMock(side_effect=RuntimeError("db down"))):
+                assert await flush_api_key_usage(session) == 0
+
+        assert get_principal_cache_stats()["pending_usage_updates"] == 1
+
+    async def test_write_through_when_disabled(self, db_user, new_session):
+        async with new_session() as session:
+            api_key, _ = await create_api_key(session, db_user.id, "ci")
+            await session.commit()
+
+        with patch.object(settings, "api_key_usage_flush_seconds", 0):
+            async with new_session() as session:
+                await update_last_used(session, api_key.id)
+                await session.commit()
+
+        async with new_session() as session:
+            row = (await session.execute(select(APIKey).where(APIKey.id == api_key.id))).scalar_one()
+        assert row.request_count == 1
@@ -0,0 +1,163 @@
+"""
+Tests for the Redis rate limiter backends.
+Covers the token bucket script, local leases and backend selection.
+"""
+
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+
+from backend.core.config import settings
+from backend.core.rate_limit import (
+    RedisRateLimiter,
+    TokenBucketRateLimiter,
+    benchmark_rate_limiters,
+    create_rate_limiter,
+)
+
+
+@pytest.fixture
+def fake_redis():
+    """Async fakeredis client shared by the limiters under test."""
+    return fakeredis.aioredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+
+
+def _limiter(fake_redis, **kwargs) -> TokenBucketRateLimiter:
+    limiter = TokenBucketRateLimiter("redis://", **kwargs)
+    limiter._redis = fake_redis
+    return limiter
+
+
+class TestTokenBucket:
+    """Tests for the Lua token bucket."""
+
+    async def test_allows_burst_up_to_limit(self, fake_redis):
+        limiter = _limiter(fake_redis)
+
+        results = [await limiter.is_rate_limited("rate_limit:auth:ip_1", 5, 60) for _ in range(5)]
+
+        assert [limited for limited, _, _ in results] == [False] * 5
+        assert [remaining for _, remaining, _ in results] == [4, 3, 2, 1, 0]
+
+    async def test_limits_when_bucket_empty(self, fake_redis):
+        limiter = _limiter(fake_redis)
+        for _ in range(5):
+            await limiter.is_rate_limited("rate_limit:auth:ip_1", 5, 60)
+
+        is_limited, remaining, retry_after = await limiter.is_rate_limited("rate_limit:auth:ip_1", 5, 60)
+
+        assert is_limited
+        assert remaining == 0
+        # One token refills every 12 seconds
+        assert 1 <= retry_after <= 12
+
+    async def test_keys_are_independent(self, fake_redis):
+        limiter = _limiter(fake_redis)
+        for _ in range(5):
+            await limiter.is_rate_limited("rate_limit:auth:ip_1", 5, 60)
+
+        is_limited, _, _ = await limiter.is_rate_limited("rate_limit:auth:ip_2", 5, 60)
+
+        assert not is_limited
+
+    async def test_one_hash_per_key(self, fake_redis):
+        limiter = _limiter(fake_redis)
+        for _ in range(50):
+            await limiter.is_rate_limited("rate_limit:search:user_1", 60, 60)
+
+        assert await fake_redis.keys("*") == ["rate_limit:search:user_1:tb"]
+        assert await fake_redis.type("rate_limit:search:user_1:tb") == "hash"
+        assert await fake_redis.ttl("rate_limit:search:user_1:tb") > 0
+        assert await limiter.get_usage("rate_limit:search:user_1", 60) == 50
+
+    async def test_does_not_collide_with_sliding_window_keys(self, fake_redis):
+        sliding = RedisRateLimiter("redis://")
+        sliding._redis = fake_redis
+        await sliding.is_rate_limited("rate_limit:standard:user_1", 120, 60)
+
+        is_limited, _, _ = await _limiter(fake_redis).is_rate_limited("rate_limit:standard:user_1", 120, 60)
+
+        assert not is_limited
+
+
+class TestLocalLease:
+    """Tests for the in-process pre-check."""
+
+    async def test_lease_serves_requests_without_redis(self, fake_redis):
+        limiter = _limiter(fake_redis, lease_fraction=0.1)
+
+        for _ in range(11):
+            is_limited, _, _ = await limiter.is_rate_limited("rate_limit:standard:user_1", 100, 60)
+            assert not is_limited
+
+        # First call took 1 + 10 leased tokens; the next 10 were local
+        assert limiter.redis_checks == 1
+        assert limiter.local_hits == 10
+        assert await limiter.get_usage("rate_limit:standard:user_1", 60) == 11
+
+    async def test_no_lease_near_limit(self, fake_redis):
+        limiter = _limiter(fake_redis, lease_fraction=0.1)
+        other_worker = _limiter(fake_redis)
+        for _ in range(45):
+            await other_worker.is_rate_limited("rate_limit:standard:user_1", 100, 60)
+
+        await limiter.is_rate_limited("rate_limit:standard:user_1", 100, 60)
+        await limiter.is_rate_limited("rate_limit:standard:user_1", 100, 60)
+
+        assert limiter.redis_checks == 2
+        assert limiter.local_hits == 0
+
+    async def test_small_buckets_always_checked_in_redis(self, fake_redis):
+        limiter = _limiter(fake_redis, lease_fraction=0.1)
+
+        results = [await limiter.is_rate_limited("rate_limit:auth:ip_1", 5, 60) for _ in range(6)]
+
+        assert [limited for limited, _, _ in results] == [False] * 5 + [True]
+        assert limiter.local_hits == 0
+
+    async def test_expired_lease_is_dropped(self, fake_redis):
+        limiter = _limiter(fake_redis, lease_fraction=0.1, lease_seconds=0.0)
+
+        await limiter.is_rate_limited("rate_limit:standard:user_1", 100, 60)
+        await limiter.is_rate_limited("rate_limit:standard:user_1", 100, 60)
+
+        assert limiter.redis_checks == 2
+
+    async def test_leases_bounded(self, fake_redis):
+        limiter = _limiter(fake_redis, lease_fraction=0.1, max_leases=2)
+
+        for i in range(5):
+            await limiter.is_rate_limited(f"rate_limit:standard:user_{i}", 100, 60)
+
+        assert list(limiter._leases) == ["rate_limit:standard:user_3", "rate_limit:standard:user_4"]
+
+
+class TestBackendSelection:
+    """Tests for choosing the limiter from settings."""
+
+    def test_default_is_sliding_window(self):
+        with patch.object(settings, "rate_limit_backend", "sliding_window"):
+            limiter = create_rate_limiter("redis://")
+
+        assert type(limiter) is RedisRateLimiter
+
+    def test_token_bucket_with_lease(self):
+        with (
+            patch.object(settings, "rate_limit_backend", "token_bucket"),
+            patch.object(settings, "rate_limit_local_lease_fraction", 0.2),
+        ):
+            limiter = create_rate_limiter("redis://")
+
+        assert isinstance(limiter, TokenBucketRateLimiter)
+        assert limiter.lease_fraction == 0.2
+
+
+async def test_benchmark_reports_each_backend():
+    report = await benchmark_rate_limiters(requests=200, keys=4, concurrency=8)
+
+    for name in ("sliding_window", "token_bucket", "token_bucket_leased"):
+        assert report[name]["rps"] > 0
+        assert report[name]["limited"] == 0
+    assert report["token_bucket"]["redis_round_trips"] == 200
+    assert report["token_bucket_leased"]["redis_round_trips"] < 200
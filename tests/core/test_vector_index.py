@@ -0,0 +1,314 @@
+"""
+Tests for the in-process vector index.
+Covers search, snapshots, stream sync and the process registry.
+"""
+
+import json
+import os
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import fakeredis
+import numpy as np
+import pytest
+
+from backend.core import vector_index
+from backend.core.config import settings
+from backend.core.vector_index import (
+    GRANTS,
+    PROFILES,
+    VectorIndex,
+    benchmark_vector_index,
+    get_vector_index,
+    record_embedding_updates,
+    reset_vector_indexes,
+    stream_position,
+)
+
+
+@pytest.fixture
+def fake_redis():
+    """Binary fakeredis client, matching the module's shared client."""
+    return fakeredis.FakeRedis()
+
+
+@pytest.fixture
+def enabled(tmp_path, fake_redis):
+    """Enable the index with a temporary snapshot dir and fake Redis."""
+    reset_vector_indexes()
+    with (
+        patch.object(settings, "vector_index_enabled", True),
+        patch.object(settings, "vector_index_dir", str(tmp_path)),
+        patch.object(settings, "vector_index_sync_interval_seconds", 0.0),
+        patch.object(vector_index, "_redis_client", fake_redis),
+    ):
+        yield fake_redis
+    reset_vector_indexes()
+
+
+def unit(*values):
+    vector = np.zeros(4, dtype=np.float32)
+    vector[: len(values)] = values
+    return vector
+
+
+class TestVectorIndexSearch:
+    """Tests for top-K cosine search."""
+
+    def test_returns_top_k_most_similar_first(self):
+        index = VectorIndex(4)
+        index.upsert_many([("a", unit(1, 0)), ("b", unit(1, 1)), ("c", unit(0, 1)), ("d", unit(-1, 0))])
+
+        hits = index.search(unit(1, 0), k=2)
+
+        assert [item_id for item_id, _ in hits] == ["a", "b"]
+        assert hits[0][1] == pytest.approx(1.0)
+        assert hits[1][1] == pytest.approx(0.7071, abs=1e-4)
+
+    def test_threshold_is_exclusive(self):
+        index = VectorIndex(4)
+        index.upsert_many([("a", unit(1, 0)), ("c", unit(0, 1))])
+
+        assert [i for i, _ in index.search(unit(1, 0), k=10, threshold=0.0)] == ["a"]
+
+    def test_search_many_matches_single_queries(self):
+        rng = np.random.default_rng(1)
+        index = VectorIndex(4)
+        index.upsert_many([(str(i), rng.standard_normal(4)) for i in range(50)])
+        queries = rng.standard_normal((5, 4))
+
+        batched = index.search_many(queries, k=5)
+
+        for hits, query in zip(batched, queries):
+            single = index.search(query, k=5)
+            assert [i for i, _ in hits] == [i for i, _ in single]
+            assert [s for _, s in hits] == pytest.approx([s for _, s in single], abs=1e-5)
+
+    def test_empty_index_returns_no_results(self):
+        assert VectorIndex(4).search(unit(1), k=5) == []
+
+    def test_rejects_wrong_dimensions(self):
+        with pytest.raises(ValueError):
+            VectorIndex(4).upsert("a", [1.0, 2.0])
+
+
+class TestVectorIndexMutation:
+    """Tests for upsert and remove."""
+
+    def test_upsert_replaces_existing_vector(self):
+        index = VectorIndex(4)
+        index.upsert("a", unit(1, 0))
+        index.upsert("a", unit(0, 1))
+
+        assert len(index) == 1
+        assert index.search(unit(0, 1), k=1)[0][1] == pytest.approx(1.0)
+
+    def test_remove_keeps_remaining_ids_aligned(self):
+        index = VectorIndex(4)
+        index.upsert_many([("a", unit(1)), ("b", unit(0, 1)), ("c", unit(0, 0, 1))])
+
+        assert index.remove("a") is True
+        assert index.remove("a") is False
+        assert "a" not in index
+        assert index.search(unit(0, 0, 1), k=1)[0][0] == "c"
+        assert index.search(unit(0, 1), k=1)[0][0] == "b"
+
+
+class TestVectorIndexSnapshot:
+    """Tests for snapshot save/load."""
+
+    def test_round_trip_memory_maps_and_copies_on_write(self, tmp_path):
+        index = VectorIndex(4)
+        index.upsert_many([("a", unit(1)), ("b", unit(0, 1))])
+        index.last_update_id = "5-0"
+        index.save(tmp_path)
+
+        loaded = VectorIndex.load(tmp_path)
+
+        assert loaded is not None
+        assert isinstance(loaded._matrix, np.memmap)
+        assert loaded.last_update_id == "5-0"
+        assert loaded.search(unit(0, 1), k=1)[0][0] == "b"
+
+        loaded.upsert("c", unit(0, 0, 1))
+        assert len(loaded) == 3
+        assert len(VectorIndex.load(tmp_path)) == 2
+
+    def test_concurrent_saves_keep_vectors_and_ids_paired(self, tmp_path):
+        first = VectorIndex(4)
+        first.upsert_many([("a", unit(1)), ("b", unit(0, 1))])
+        second = VectorIndex(4)
+        second.upsert_many([("b", unit(1)), ("a", unit(0, 1))])
+
+        real_replace = os.replace
+
+        def save_second_then_replace(src, dst):
+            # The second writer runs to completion between the first one's writes and its swap
+            replace.side_effect = real_replace
+            second.save(tmp_path)
+            real_replace(src, dst)
+
+        with patch("backend.core.vector_index.os.replace", side_effect=save_second_then_replace) as replace:
+            first.save(tmp_path)
+
+        loaded = VectorIndex.load(tmp_path)
+
+        assert loaded.search(unit(1), k=1)[0][0] == "a"
+        assert loaded.search(unit(0, 1), k=1)[0][0] == "b"
+
+    def test_save_removes_superseded_vectors(self, tmp_path):
+        index = VectorIndex(4)
+        index.upsert("a", unit(1))
+        index.save(tmp_path)
+        old_vectors = json.loads((tmp_path / "ids.json").read_text())["vectors"]
+        os.utime(tmp_path / old_vectors, (0, 0))
+
+        index.save(tmp_path)
+
+        current_vectors = json.loads((tmp_path / "ids.json").read_text())["vectors"]
+        assert sorted(path.name for path in tmp_path.iterdir()) == sorted(["ids.json", current_vectors])
+        assert current_vectors != old_vectors
+
+    def test_missing_snapshot_returns_none(self, tmp_path):
+        assert VectorIndex.load(tmp_path / "missing") is None
+
+
+class TestUpdateStream:
+    """Tests for recording and replaying embedding updates."""
+
+    def test_disabled_records_nothing(self, fake_redis):
+        with patch.object(settings, "vector_index_enabled", False):
+            record_embedding_updates(GRANTS, [("a", unit(1))], redis_client=fake_redis)
+
+        assert fake_redis.exists("vector_index:grants:updates") == 0
+
+    def test_replays_upserts_and_removals(self, enabled):
+        index = VectorIndex(4)
+        index.upsert("stale", unit(1))
+        index.last_update_id = stream_position(PROFILES)
+
+        record_embedding_updates(PROFILES, [("a", unit(1)), ("b", unit(0, 1)), ("stale", None)])
+
+        assert index.apply_updates(enabled, PROFILES) is True
+        assert len(index) == 2
+        assert "stale" not in index
+        assert index.search(unit(0, 1), k=1)[0][0] == "b"
+
+        record_embedding_updates(PROFILES, [("a", unit(0, 0, 1))])
+        index.apply_updates(enabled, PROFILES)
+        assert index.search(unit(0, 0, 1), k=1)[0] == ("a", pytest.approx(1.0))
+
+    def test_detects_trimmed_stream(self, enabled):
+        index = VectorIndex(4)
+        index.last_update_id = "1-0"
+        enabled.xadd("vector_index:grants:updates", {"id": "a", "vector": ""}, id="5-0")
+
+        assert index.apply_updates(enabled, GRANTS) is False
+
+    def test_unknown_position_is_stale_once_stream_has_entries(self, enabled):
+        index = VectorIndex(4)
+        assert index.apply_updates(enabled, GRANTS) is True
+
+        record_embedding_updates(GRANTS, [("a", unit(1))])
+
+        assert index.apply_updates(enabled, GRANTS) is False
+
+
+class TestRegistry:
+    """Tests for get_vector_index."""
+
+    def test_disabled_returns_none(self):
+        with patch.object(settings, "vector_index_enabled", False):
+            assert get_vector_index(GRANTS) is None
+
+    def test_builds_from_database_without_snapshot(self, enabled, tmp_path):
+        built = VectorIndex(settings.embedding_dimensions)
+        built.upsert("a", np.eye(settings.embedding_dimensions)[0])
+        built.last_update_id = stream_position(GRANTS)
+        record_embedding_updates(GRANTS, [("b", np.eye(settings.embedding_dimensions)[1])])
+
+        with (
+            patch("backend.database.get_sync_session"),
+            patch.object(vector_index, "build_index_from_database", return_value=built) as build,
+        ):
+            index = get_vector_index(GRANTS)
+
+        assert index is built
+        assert len(index) == 2
+        assert build.call_count == 1
+        assert len(VectorIndex.load(tmp_path / GRANTS)) == 1
+
+    def test_rebuilds_when_snapshot_fell_behind(self, enabled, tmp_path):
+        snapshot = VectorIndex(settings.embedding_dimensions)
+        snapshot.upsert("old", np.eye(settings.embedding_dimensions)[0])
+        snapshot.last_update_id = "1-0"
+        snapshot.save(tmp_path / GRANTS)
+        enabled.xadd("vector_index:grants:updates", {"id": "x", "vector": ""}, id="5-0")
+
+        rebuilt = VectorIndex(settings.embedding_dimensions)
+        rebuilt.last_update_id = "5-0"
+        with (
+            patch("backend.database.get_sync_session"),
+            patch.object(vector_index, "build_index_from_database", return_value=rebuilt),
+        ):
+            assert get_vector_index(GRANTS) is rebuilt
+
+    def test_build_failure_returns_none(self, enabled):
+        with patch("backend.database.get_sync_session", side_effect=RuntimeError("db down")):
+            assert get_vector_index(GRANTS) is None
+
+    def test_loads_snapshot_and_applies_updates(self, enabled, tmp_path):
+        snapshot = VectorIndex(settings.embedding_dimensions)
+        snapshot.upsert("a", np.eye(settings.embedding_dimensions)[0])
+        snapshot.last_update_id = stream_position(GRANTS)
+        snapshot.save(tmp_path / GRANTS)
+
+        record_embedding_updates(GRANTS, [("b", np.eye(settings.embedding_dimensions)[1])])
+        index = get_vector_index(GRANTS)
+
+        assert index is not None
+        assert len(index) == 2
+        assert get_vector_index(GRANTS) is index
+
+
+class TestMatcherIntegration:
+    """Tests for GrantMatcher using the profile index."""
+
+    def test_find_similar_profiles_uses_index(self):
+        from agents.matching.matcher import GrantMatcher
+
+        user_id = uuid4()
+        index = VectorIndex(4)
+        index.upsert(user_id, unit(1))
+
+        row = MagicMock(
+            user_id=user_id,
+            similarity=1.0,
+            research_areas=["biology"],
+            methods=[],
+            past_grants=[],
+            institution=None,
+            department=None,
+            keywords=[],
+        )
+        session = MagicMock()
+        session.execute.return_value.fetchall.return_value = [row]
+
+        with patch("agents.matching.matcher.get_vector_index", return_value=index):
+            matches = GrantMatcher(MagicMock()).find_similar_profiles(list(unit(1)), session)
+
+        assert [m.user_id for m in matches] == [user_id]
+        params = session.execute.call_args[0][1]
+        assert params["user_ids"] == [str(user_id)]
+        assert "embedding" not in str(session.execute.call_args[0][0])
+
+
+class TestBenchmark:
+    """Smoke test for the offline benchmark."""
+
+    def test_synthetic_benchmark_has_full_recall(self):
+        report = benchmark_vector_index(vectors=500, queries=10, k=10)
+
+        assert report["vectors"] == 500
+        assert report["recall_at_k"] == pytest.approx(1.0)
+        assert report["index_qps"] > 0
@@ -0,0 +1,80 @@
+"""
+Tests for the reminder due-time index.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+
+from backend.services.reminder_index import (
+    CLAIM_LEASE_SECONDS,
+    REMINDER_INDEX_KEY,
+    ReminderIndex,
+    build_config_reminders,
+    compute_fire_at,
+    refresh_fire_times,
+)
+
+
+@pytest.fixture
+def index():
+    return ReminderIndex(fakeredis.FakeRedis(decode_responses=True))
+
+
+class TestFireTimes:
+    """Tests for fire time computation."""
+
+    def test_compute_fire_at_treats_naive_as_utc(self):
+        deadline = datetime(2026, 3, 1, 17, 0)
+        assert compute_fire_at(deadline, 60) == datetime(2026, 3, 1, 16, 0, tzinfo=timezone.utc)
+
+    def test_refresh_fire_times_skips_sent(self):
+        deadline = SimpleNamespace(sponsor_deadline=datetime(2026, 3, 1, tzinfo=timezone.utc))
+        sent = SimpleNamespace(is_sent=True, remind_before_minutes=60, fire_at=None)
+        unsent = SimpleNamespace(is_sent=False, remind_before_minutes=1440, fire_at=None)
+
+        assert refresh_fire_times(deadline, [sent, unsent]) == [unsent]
+        assert unsent.fire_at == datetime(2026, 2, 28, tzinfo=timezone.utc)
+        assert sent.fire_at is None
+
+    def test_build_config_reminders_skips_existing_offsets(self):
+        deadline = SimpleNamespace(
+            id=uuid.uuid4(),
+            sponsor_deadline=datetime(2026, 3, 31, tzinfo=timezone.utc),
+            reminder_config=[1, 7, 7, 30],
+        )
+
+        schedules = build_config_reminders(deadline, existing_minutes={1440})
+
+        assert [s.remind_before_minutes for s in schedules] == [30 * 1440, 7 * 1440]
+        assert schedules[0].fire_at == datetime(2026, 3, 1, tzinfo=timezone.utc)
+        assert all(s.reminder_type == "email" and not s.is_sent for s in schedules)
+
+
+class TestReminderIndex:
+    """Tests for the Redis sorted set index."""
+
+    def test_claim_due_returns_only_due_and_leases(self, index):
+        now = datetime.now(timezone.utc)
+        due, future = uuid.uuid4(), uuid.uuid4()
+        index.add({due: now - timedelta(minutes=1), future: now + timedelta(hours=1)})
+
+        assert index.claim_due(now) == [str(due)]
+        assert index.redis.zscore(REMINDER_INDEX_KEY, str(due)) == pytest.approx(now.timestamp() + CLAIM_LEASE_SECONDS)
+        assert index.claim_due(now) == []
+
+    def test_claim_due_respects_limit(self, index):
+        now = datetime.now(timezone.utc)
+        index.add({uuid.uuid4(): now - timedelta(minutes=i) for i in range(5)})
+
+        assert len(index.claim_due(now, limit=2)) == 2
+        assert index.due_count(now) == 3
+
+    def test_remove(self, index):
+        schedule_id = uuid.uuid4()
+        index.add({schedule_id: datetime.now(timezone.utc)})
+        index.remove([schedule_id])
+        assert index.redis.zcard(REMINDER_INDEX_KEY) == 0
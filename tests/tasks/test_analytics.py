@@ -0,0 +1,147 @@
+"""
+Tests for the daily analytics task.
+Covers the grouped aggregate metrics and the incremental daily rollups.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+
+from backend.models import AnalyticsDailyRollup
+from backend.tasks import analytics
+from backend.tasks.analytics import _refresh_daily_rollups, compute_daily_analytics
+from tests.fixtures.factories import AlertSentFactory, GrantFactory, MatchFactory, UserFactory
+
+
+@pytest.fixture
+def seeded(sync_session):
+    """Two users, three grants, four matches and three alerts over three days."""
+    now = datetime.utcnow()
+    users = UserFactory.create_batch(2)
+    grants = [
+        GrantFactory.create(source="nih", created_at=now - timedelta(days=2), deadline=now + timedelta(days=10)),
+        GrantFactory.create(source="nih", created_at=now, deadline=now - timedelta(days=1)),
+        GrantFactory.create(source="nsf", created_at=now - timedelta(days=10), deadline=now + timedelta(days=5)),
+    ]
+    matches = [
+        MatchFactory.create(user_id=users[0].id, grant_id=grants[0].id, match_score=0.15, created_at=now),
+        MatchFactory.create(
+            user_id=users[0].id, grant_id=grants[1].id, match_score=0.85, user_action="saved", created_at=now
+        ),
+        MatchFactory.create(
+            user_id=users[1].id,
+            grant_id=grants[0].id,
+            match_score=0.95,
+            user_action="applied",
+            created_at=now - timedelta(days=2),
+        ),
+        MatchFactory.create(user_id=users[1].id, grant_id=grants[2].id, match_score=0.2, created_at=now),
+    ]
+    alerts = [
+        AlertSentFactory.create(match_id=matches[1].id, channel="email", sent_at=now, opened_at=now, clicked_at=now),
+        AlertSentFactory.create(
+            match_id=matches[2].id, channel="email", sent_at=now - timedelta(days=2), opened_at=now
+        ),
+        AlertSentFactory.create(match_id=matches[2].id, channel="sms", sent_at=now - timedelta(days=2)),
+    ]
+    sync_session.add_all([*users, *grants, *matches, *alerts])
+    sync_session.commit()
+    return now
+
+
+@pytest.fixture
+def run_task(sync_session):
+    """Run compute_daily_analytics against the test session and fake Redis."""
+
+    def run():
+        with (
+            patch.object(analytics, "get_sync_db", return_value=sync_session),
+            patch.object(analytics, "redis_client", fakeredis.FakeRedis(decode_responses=True)),
+        ):
+            return compute_daily_analytics.run()
+
+    return run
+
+
+class TestComputeDailyAnalytics:
+    """Tests for the aggregate metrics."""
+
+    def test_grant_metrics(self, seeded, run_task):
+        grants = run_task()["grant_discovery"]
+
+        assert grants["total_grants"] == 3
+        assert grants["grants_by_source"] == {"nih": 2, "nsf": 1}
+        assert grants["grants_last_24h"] == 1
+        assert grants["grants_last_7d"] == 2
+        assert grants["active_grants"] == 2
+
+    def test_match_metrics_and_histogram(self, seeded, run_task):
+        matches = run_task()["match_computation"]
+
+        assert matches["total_matches"] == 4
+        assert matches["matches_last_24h"] == 3
+        assert matches["avg_match_score"] == pytest.approx(0.5375)
+        assert matches["score_distribution"] == {
+            "0-20": 1,
+            "20-40": 1,
+            "40-60": 0,
+            "60-80": 0,
+            "80-90": 1,
+            "90-100": 1,
+        }
+
+    def test_alert_and_engagement_metrics(self, seeded, run_task):
+        summary = run_task()
+
+        alerts = summary["alert_delivery"]
+        assert alerts["total_alerts_sent"] == 3
+        assert alerts["alerts_by_channel"] == {"email": 2, "sms": 1}
+        assert alerts["alerts_last_24h"] == 1
+        assert alerts["open_rate_percent"] == pytest.approx(66.67)
+        assert alerts["click_through_rate_percent"] == 50.0
+
+        engagement = summary["user_engagement"]
+        assert engagement["total_users"] == 2
+        assert engagement["active_users"] == 2
+        assert engagement["users_with_actions"] == 2
+        assert engagement["user_actions"] == {"saved": 1, "applied": 1}
+
+    def test_empty_database(self, sync_session, run_task):
+        summary = run_task()
+
+        assert summary["match_computation"]["total_matches"] == 0
+        assert summary["match_computation"]["avg_match_score"] == 0.0
+        assert summary["daily_activity"] == []
+
+
+class TestDailyRollups:
+    """Tests for the incremental per-day rollups."""
+
+    def test_backfill_then_daily_activity(self, seeded, run_task):
+        activity = {row["day"]: row for row in run_task()["daily_activity"]}
+
+        today = activity[seeded.date().isoformat()]
+        assert today["matches_created"] == 3
+        assert today["alerts_by_channel"] == {"email": 1}
+        two_days_ago = activity[(seeded - timedelta(days=2)).date().isoformat()]
+        assert two_days_ago["grants_by_source"] == {"nih": 1}
+        assert two_days_ago["avg_match_score"] == 0.95
+        assert two_days_ago["alerts_sent"] == 2
+        # Older days are stored too while inside the 30-day window
+        assert activity[(seeded - timedelta(days=10)).date().isoformat()]["grants_created"] == 1
+
+    def test_refresh_starts_from_checkpoint(self, seeded, sync_session):
+        assert _refresh_daily_rollups(sync_session) is None
+        # Older rows are left alone: a stored past day is not re-read
+        old_day = sync_session.get(AnalyticsDailyRollup, (seeded - timedelta(days=2)).date())
+        old_day.grants_created = 99
+        sync_session.commit()
+
+        sync_session.add(GrantFactory.create(source="nsf", created_at=seeded))
+        sync_session.commit()
+
+        assert _refresh_daily_rollups(sync_session) == seeded.date()
+        assert sync_session.get(AnalyticsDailyRollup, (seeded - timedelta(days=2)).date()).grants_created == 99
+        assert sync_session.get(AnalyticsDailyRollup, seeded.date()).grants_by_source == {"nih": 1, "nsf": 1}
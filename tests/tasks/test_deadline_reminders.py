@@ -342,3 +342,240 @@ class TestReminderScheduleStatus:
         # Should have at least 1 unsent reminder
         assert len(unsent) >= 1
         assert all(not r.is_sent for r in unsent)
+
+
+# =============================================================================
+# Due-time Index Dispatch
+# =============================================================================
+
+
+@pytest.fixture
+def reminder_index():
+    """Reminder index over fakeredis."""
+    import fakeredis
+
+    from backend.services.reminder_index import ReminderIndex
+
+    return ReminderIndex(fakeredis.FakeRedis(decode_responses=True))
+
+
+@pytest.fixture
+def sync_reminder_data(sync_session):
+    """A user with one eligible deadline due in two hours."""
+    user = User(
+        id=uuid.uuid4(),
+        email="sync-reminder@university.edu",
+        password_hash="hashed_pw",
+        name="Sync Reminder User",
+    )
+    deadline = Deadline(
+        id=uuid.uuid4(),
+        user_id=user.id,
+        title="NIH R01",
+        sponsor_deadline=datetime.now(timezone.utc) + timedelta(hours=2),
+        priority="high",
+        status="drafting",
+    )
+    sync_session.add_all([user, deadline])
+    sync_session.commit()
+    return user, deadline
+
+
+def _add_schedule(session, deadline, minutes, **kwargs):
+    from backend.services.reminder_index import compute_fire_at
+
+    schedule = ReminderSchedule(
+        id=uuid.uuid4(),
+        deadline_id=deadline.id,
+        reminder_type="email",
+        remind_before_minutes=minutes,
+        fire_at=compute_fire_at(deadline.sponsor_deadline, minutes),
+        **kwargs,
+    )
+    session.add(schedule)
+    session.commit()
+    return schedule
+
+
+def _run_dispatch(sync_session, index):
+    from contextlib import nullcontext
+    from unittest.mock import patch
+
+    from backend.tasks import deadline_reminders
+
+    with (
+        patch.object(deadline_reminders, "get_sync_session", return_value=nullcontext(sync_session)),
+        patch.object(deadline_reminders, "get_reminder_index", return_value=index),
+        patch.object(deadline_reminders, "_send_reminder") as mock_send,
+    ):
+        result = deadline_reminders.check_and_send_deadline_reminders()
+    return result, mock_send
+
+
+class TestIndexedReminderDispatch:
+    """Tests for dispatching reminders from the due-time index."""
+
+    def test_sends_only_claimed_due_reminders(self, sync_session, sync_reminder_data, reminder_index):
+        """Due reminders are sent; future ones stay indexed."""
+        _, deadline = sync_reminder_data
+        due = _add_schedule(sync_session, deadline, 180)
+        future = _add_schedule(sync_session, deadline, 60)
+        reminder_index.add({due.id: due.fire_at, future.id: future.fire_at})
+
+        result, mock_send = _run_dispatch(sync_session, reminder_index)
+
+        assert result == {"sent": 1, "errors": 0}
+        assert mock_send.call_count == 1
+        sync_session.refresh(due)
+        assert due.is_sent is True
+        assert reminder_index.redis.zscore("reminders:due", str(due.id)) is None
+        assert reminder_index.redis.zscore("reminders:due", str(future.id)) is not None
+
+    def test_skips_ineligible_and_sent_reminders(self, sync_session, sync_reminder_data, reminder_index):
+        """Claimed reminders that no longer apply leave the index unsent."""
+        _, deadline = sync_reminder_data
+        already_sent = _add_schedule(sync_session, deadline, 180, is_sent=True)
+        reminder_index.add({already_sent.id: already_sent.fire_at, uuid.uuid4(): datetime.now(timezone.utc)})
+
+        result, mock_send = _run_dispatch(sync_session, reminder_index)
+
+        assert result == {"sent": 0, "errors": 0}
+        mock_send.assert_not_called()
+        assert reminder_index.redis.zcard("reminders:due") == 0
+
+    def test_rescores_reminder_whose_deadline_moved(self, sync_session, sync_reminder_data, reminder_index):
+        """A reminder indexed with a stale, earlier time is re-scored, not sent."""
+        _, deadline = sync_reminder_data
+        schedule = _add_schedule(sync_session, deadline, 60)
+        reminder_index.add({schedule.id: datetime.now(timezone.utc) - timedelta(minutes=5)})
+
+        result, mock_send = _run_dispatch(sync_session, reminder_index)
+
+        assert result["sent"] == 0
+        mock_send.assert_not_called()
+        score = reminder_index.redis.zscore("reminders:due", str(schedule.id))
+        assert score == pytest.approx(schedule.fire_at.replace(tzinfo=timezone.utc).timestamp())
+
+    def test_failed_send_stays_claimed(self, sync_session, sync_reminder_data, reminder_index):
+        """A failed send keeps its lease for a later retry."""
+        from contextlib import nullcontext
+        from unittest.mock import patch
+
+        from backend.tasks import deadline_reminders
+
+        _, deadline = sync_reminder_data
+        schedule = _add_schedule(sync_session, deadline, 180)
+        reminder_index.add({schedule.id: schedule.fire_at})
+
+        with (
+            patch.object(deadline_reminders, "get_sync_session", return_value=nullcontext(sync_session)),
+            patch.object(deadline_reminders, "get_reminder_index", return_value=reminder_index),
+            patch.object(deadline_reminders, "_send_reminder", side_effect=RuntimeError("smtp down")),
+        ):
+            result = deadline_reminders.check_and_send_deadline_reminders()
+
+        assert result == {"sent": 0, "errors": 1}
+        score = reminder_index.redis.zscore("reminders:due", str(schedule.id))
+        assert score > datetime.now(timezone.utc).timestamp()
+
+    def test_falls_back_to_database_when_redis_fails(self, sync_session, sync_reminder_data):
+        """Due rows are read from the database if the index is unavailable."""
+        from unittest.mock import MagicMock
+
+        import redis
+
+        _, deadline = sync_reminder_data
+        due = _add_schedule(sync_session, deadline, 180)
+        _add_schedule(sync_session, deadline, 60)
+        broken_index = MagicMock()
+        broken_index.claim_due.side_effect = redis.ConnectionError("down")
+
+        result, mock_send = _run_dispatch(sync_session, broken_index)
+
+        assert result == {"sent": 1, "errors": 0}
+        assert mock_send.call_args[0][0].id == due.id
+
+    def test_passed_deadline_closed_without_sending(self, sync_session, sync_reminder_data, reminder_index):
+        """A claimed reminder whose deadline has passed is closed, not sent."""
+        _, deadline = sync_reminder_data
+        deadline.sponsor_deadline = datetime.now(timezone.utc) - timedelta(days=3)
+        sync_session.commit()
+        stale = _add_schedule(sync_session, deadline, 1440)
+        reminder_index.add({stale.id: stale.fire_at})
+
+        result, mock_send = _run_dispatch(sync_session, reminder_index)
+
+        assert result == {"sent": 0, "errors": 0}
+        mock_send.assert_not_called()
+        sync_session.refresh(stale)
+        assert stale.is_sent is True
+        assert stale.sent_at is None
+        assert reminder_index.redis.zcard("reminders:due") == 0
+
+    def test_database_fallback_ignores_passed_deadlines(self, sync_session, sync_reminder_data):
+        """The backlog of reminders for past deadlines is not read from the database."""
+        from unittest.mock import MagicMock
+
+        import redis
+
+        _, deadline = sync_reminder_data
+        deadline.sponsor_deadline = datetime.now(timezone.utc) - timedelta(days=3)
+        sync_session.commit()
+        _add_schedule(sync_session, deadline, 1440)
+        broken_index = MagicMock()
+        broken_index.claim_due.side_effect = redis.ConnectionError("down")
+
+        result, mock_send = _run_dispatch(sync_session, broken_index)
+
+        assert result == {"sent": 0, "errors": 0}
+        mock_send.assert_not_called()
+
+
+class TestReminderConfigSync:
+    """Tests for materializing config reminders and re-indexing."""
+
+    def test_materializes_config_and_indexes_due_soon(self, sync_session, sync_reminder_data, reminder_index):
+        """Deadlines without reminders get config rows; near-term ones are indexed."""
+        from contextlib import nullcontext
+        from unittest.mock import patch
+
+        from backend.tasks import deadline_reminders
+
+        _, deadline = sync_reminder_data
+        deadline.sponsor_deadline = datetime.now(timezone.utc) + timedelta(days=1, hours=1)
+        deadline.reminder_config = [7, 1]
+        sync_session.commit()
+
+        with (
+            patch.object(deadline_reminders, "get_sync_session", return_value=nullcontext(sync_session)),
+            patch.object(deadline_reminders, "get_reminder_index", return_value=reminder_index),
+        ):
+            result = deadline_reminders.check_reminder_config_reminders()
+
+        assert result["reminders_created"] == 2
+        schedules = sync_session.query(ReminderSchedule).filter_by(deadline_id=deadline.id).all()
+        assert sorted(s.remind_before_minutes for s in schedules) == [1440, 10080]
+        # The 7-day reminder is overdue and the 1-day one fires within the horizon
+        assert result["reminders_indexed"] == 2
+        assert reminder_index.redis.zcard("reminders:due") == 2
+
+    def test_reindex_skips_passed_deadlines(self, sync_session, sync_reminder_data, reminder_index):
+        """Unsent reminders on deadlines that have passed are not re-indexed."""
+        from contextlib import nullcontext
+        from unittest.mock import patch
+
+        from backend.tasks import deadline_reminders
+
+        _, deadline = sync_reminder_data
+        deadline.sponsor_deadline = datetime.now(timezone.utc) - timedelta(days=30)
+        sync_session.commit()
+        _add_schedule(sync_session, deadline, 1440)
+
+        with (
+            patch.object(deadline_reminders, "get_sync_session", return_value=nullcontext(sync_session)),
+            patch.object(deadline_reminders, "get_reminder_index", return_value=reminder_index),
+        ):
+            result = deadline_reminders.check_reminder_config_reminders()
+
+        assert result["reminders_indexed"] == 0
+        assert reminder_index.redis.zcard("reminders:due") == 0
@@ -3,6 +3,7 @@ Tests for funding alerts Celery tasks.
 Tests scheduled alert delivery and user-specific alerts.
 """
 
+import asyncio
 import uuid
 from datetime import datetime, timedelta, timezone
 
@@ -10,7 +11,7 @@ import pytest
 import pytest_asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.models import User, FundingAlertPreference
+from backend.models import Deadline, User, FundingAlertPreference
 
 
 @pytest_asyncio.fixture
@@ -327,3 +328,124 @@ class TestPreferredFunders:
             filtered = grants
 
         assert len(filtered) == 3
+
+
+# =============================================================================
+# Incremental Scheduler
+# =============================================================================
+
+
+@pytest.fixture
+def alert_session_factory(async_engine):
+    """Session factory bound to the test database, patched into the tasks."""
+    from unittest.mock import patch
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    factory = async_sessionmaker(async_engine, expire_on_commit=False)
+    with patch("backend.database.AsyncSessionLocal", factory):
+        yield factory
+
+
+class TestNextAlertTime:
+    """Tests for next-send-at computation."""
+
+    def test_never_sent_is_due_now(self):
+        from backend.services.funding_alerts import next_alert_time
+
+        assert next_alert_time("weekly") <= datetime.now(timezone.utc)
+
+    @pytest.mark.parametrize("frequency,days", [("daily", 1), ("weekly", 7), ("monthly", 30), ("unknown", 1)])
+    def test_interval_by_frequency(self, frequency, days):
+        from backend.services.funding_alerts import next_alert_time
+
+        last_sent = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        assert next_alert_time(frequency, last_sent) == last_sent + timedelta(days=days)
+
+
+class TestScheduledAlerts:
+    """Tests for due-user selection and batched sending."""
+
+    @pytest.mark.asyncio
+    async def test_queues_only_due_enabled_users(self, async_session, alert_session_factory):
+        """Only enabled users whose next_send_at has passed are queued and claimed."""
+        from unittest.mock import patch
+
+        from backend.tasks import funding_alerts
+
+        now = datetime.now(timezone.utc)
+        users = [
+            User(id=uuid.uuid4(), email=f"sched{i}@university.edu", password_hash="x", name=f"U{i}") for i in range(3)
+        ]
+        async_session.add_all(users)
+        async_session.add_all(
+            [
+                FundingAlertPreference(user_id=users[0].id, enabled=True, next_send_at=now - timedelta(hours=1)),
+                FundingAlertPreference(user_id=users[1].id, enabled=True, next_send_at=now + timedelta(days=3)),
+                FundingAlertPreference(user_id=users[2].id, enabled=False, next_send_at=now - timedelta(hours=1)),
+            ]
+        )
+        await async_session.commit()
+
+        with patch.object(funding_alerts.send_funding_alert_batch, "delay") as mock_delay:
+            queued = await asyncio.to_thread(funding_alerts.send_scheduled_alerts)
+
+        assert queued == 1
+        mock_delay.assert_called_once_with([str(users[0].id)])
+
+        async with alert_session_factory() as db:
+            prefs = await db.get(FundingAlertPreference, (await _prefs_id(db, users[0].id)))
+            assert prefs.next_send_at.replace(tzinfo=timezone.utc) > now
+
+    @pytest.mark.asyncio
+    async def test_batch_send_advances_next_send_at(
+        self, async_session, alert_session_factory, alert_user, alert_prefs_daily
+    ):
+        """A sent alert records last_sent_at and schedules the next one; empty ones retry tomorrow."""
+        from unittest.mock import MagicMock, patch
+
+        from backend.tasks import funding_alerts
+
+        idle_user = User(id=uuid.uuid4(), email="idle@university.edu", password_hash="x", name="Idle")
+        async_session.add(idle_user)
+        async_session.add(FundingAlertPreference(user_id=idle_user.id, enabled=True, frequency="weekly"))
+        async_session.add(
+            Deadline(
+                user_id=alert_user.id,
+                title="R01",
+                sponsor_deadline=datetime.now(timezone.utc) + timedelta(days=10),
+                status="active",
+                priority="high",
+            )
+        )
+        await async_session.commit()
+
+        with (
+            patch.object(funding_alerts.settings, "sendgrid_api_key", "SG.test"),
+            patch.object(funding_alerts, "SendGridAPIClient") as mock_sg,
+            patch.object(funding_alerts.FundingAlertsService, "_generate_insights", return_value=None),
+        ):
+            mock_sg.return_value.send.return_value = MagicMock(status_code=202)
+            sent = await asyncio.to_thread(
+                funding_alerts.send_funding_alert_batch, [str(alert_user.id), str(idle_user.id)]
+            )
+
+        assert sent == 1
+        assert mock_sg.return_value.send.call_count == 1
+        async with alert_session_factory() as db:
+            sent_prefs = await db.get(FundingAlertPreference, alert_prefs_daily.id)
+            last_sent = sent_prefs.last_sent_at.replace(tzinfo=timezone.utc)
+            assert sent_prefs.next_send_at.replace(tzinfo=timezone.utc) == last_sent + timedelta(days=1)
+
+            idle_prefs = await db.get(FundingAlertPreference, await _prefs_id(db, idle_user.id))
+            assert idle_prefs.last_sent_at is None
+            assert idle_prefs.next_send_at.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc) + timedelta(
+                hours=23
+            )
+
+
+async def _prefs_id(db, user_id):
+    from sqlalchemy import select
+
+    result = await db.execute(select(FundingAlertPreference.id).where(FundingAlertPreference.user_id == user_id))
+    return result.scalar_one()
@@ -0,0 +1,191 @@
+"""
+Tests for applying grant update events.
+Covers field mapping from "grants:updated" events onto stored grants, the
+stream consumer's acknowledge/retry/DLQ handling and the user notifications.
+"""
+
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fakeredis
+import pytest
+
+from backend.tasks import grants, notifications
+from backend.tasks.grants import (
+    GRANT_UPDATE_MAX_ATTEMPTS,
+    GRANT_UPDATES_DLQ,
+    GRANT_UPDATES_GROUP,
+    GRANT_UPDATES_STREAM,
+    apply_grant_update,
+    consume_grant_updates,
+)
+from backend.tasks.notifications import notify_grant_update
+from tests.fixtures.factories import GrantFactory, MatchFactory, UserFactory
+
+
+def _update(external_id: str, **grant_fields) -> dict:
+    return {
+        "external_id": external_id,
+        "source": "grants_gov",
+        "update_type": "deadline_changed",
+        "changes": {"close_date": {"old": "2030-12-31T00:00:00", "new": "2031-01-15T00:00:00"}},
+        "message": "Deadline changed from 2030-12-31 to 2031-01-15",
+        "grant": {"external_id": external_id, "title": "Renamed", **grant_fields},
+    }
+
+
+class TestApplyGrantUpdate:
+    """Tests for apply_grant_update."""
+
+    def test_updates_fields(self, sync_session):
+        grant = GrantFactory.create(source="grants_gov", external_id="350001", amount_min=1000, amount_max=2000)
+        sync_session.add(grant)
+        sync_session.commit()
+
+        updated = apply_grant_update(
+            sync_session,
+            _update("350001", deadline="2031-01-15T00:00:00", award_ceiling=750000.0),
+        )
+
+        assert updated.id == grant.id
+        assert updated.title == "Renamed"
+        assert updated.deadline.replace(tzinfo=None) == datetime(2031, 1, 15)
+        assert updated.amount_max == 750000
+        # Fields missing from the event are left alone
+        assert updated.amount_min == 1000
+
+    def test_unknown_grant(self, sync_session):
+        assert apply_grant_update(sync_session, _update("missing")) is None
+
+    def test_matches_on_source(self, sync_session):
+        sync_session.add(GrantFactory.create(source="nsf", external_id="350002"))
+        sync_session.commit()
+
+        assert apply_grant_update(sync_session, _update("350002")) is None
+
+
+@pytest.fixture
+def redis_client():
+    """Fake Redis shared by the consumer across runs."""
+    client = fakeredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+    client.close = MagicMock()
+    return client
+
+
+@pytest.fixture
+def run_consumer(sync_session, redis_client):
+    """Run consume_grant_updates with notify_grant_update mocked."""
+
+    def run(notify: AsyncMock, retry_idle_ms: int = 0):
+        with (
+            patch.object(grants, "get_sync_db", return_value=sync_session),
+            patch.object(grants, "get_redis_client", return_value=redis_client),
+            # By default failed events are retried on the very next run
+            patch.object(grants, "GRANT_UPDATE_RETRY_IDLE_MS", retry_idle_ms),
+            patch.object(grants, "notify_grant_update", notify),
+            patch.object(grants.compute_grant_embedding, "delay") as embed,
+        ):
+            stats = consume_grant_updates.run(block_ms=None)
+        return stats, embed
+
+    return run
+
+
+class TestConsumeGrantUpdates:
+    """Tests for the grants:updated consumer."""
+
+    @pytest.fixture(autouse=True)
+    def stored_grant(self, sync_session):
+        grant = GrantFactory.create(source="grants_gov", external_id="350001")
+        sync_session.add(grant)
+        sync_session.commit()
+        return grant
+
+    def _publish(self, redis_client, update: dict) -> None:
+        redis_client.xadd(GRANT_UPDATES_STREAM, {"data": json.dumps(update)})
+
+    def _pending(self, redis_client) -> int:
+        return redis_client.xpending(GRANT_UPDATES_STREAM, GRANT_UPDATES_GROUP)["pending"]
+
+    def test_applies_notifies_and_acks(self, redis_client, run_consumer):
+        self._publish(redis_client, _update("350001"))
+        self._publish(redis_client, _update("missing"))
+
+        stats, embed = run_consumer(AsyncMock(return_value=2))
+
+        assert stats == {"consumed": 2, "applied": 1, "notified": 2, "failed": 0, "dead_lettered": 0}
+        assert self._pending(redis_client) == 0
+        # Only the deadline changed, so the embedding is left alone
+        embed.assert_not_called()
+
+    def test_failed_notification_is_retried(self, redis_client, run_consumer):
+        self._publish(redis_client, _update("350001"))
+
+        stats, _ = run_consumer(AsyncMock(side_effect=RuntimeError("smtp down")))
+        assert stats["failed"] == 1
+        assert self._pending(redis_client) == 1
+
+        notify = AsyncMock(return_value=1)
+        stats, _ = run_consumer(notify)
+
+        assert stats["consumed"] == 1
+        assert stats["notified"] == 1
+        notify.assert_awaited_once()
+        assert self._pending(redis_client) == 0
+
+    def test_recent_failure_waits_for_idle_time(self, redis_client, run_consumer):
+        self._publish(redis_client, _update("350001"))
+        run_consumer(AsyncMock(side_effect=RuntimeError("smtp down")))
+
+        notify = AsyncMock(return_value=1)
+        stats, _ = run_consumer(notify, retry_idle_ms=60_000)
+
+        assert stats == {"consumed": 0, "applied": 0, "notified": 0, "failed": 0, "dead_lettered": 0}
+        notify.assert_not_awaited()
+        assert self._pending(redis_client) == 1
+
+    def test_repeated_failures_move_to_dlq(self, redis_client, run_consumer):
+        self._publish(redis_client, _update("350001"))
+
+        for _ in range(GRANT_UPDATE_MAX_ATTEMPTS):
+            stats, _ = run_consumer(AsyncMock(side_effect=RuntimeError("smtp down")))
+
+        assert stats["dead_lettered"] == 1
+        assert self._pending(redis_client) == 0
+        [(_, dead)] = redis_client.xrange(GRANT_UPDATES_DLQ)
+        assert json.loads(dead["data"])["external_id"] == "350001"
+        assert dead["error"] == "smtp down"
+
+
+class TestNotifyGrantUpdate:
+    """Tests for notify_grant_update."""
+
+    async def test_notifies_saved_and_high_matches(self, async_session):
+        users = UserFactory.create_batch(3)
+        grant = GrantFactory.create()
+        async_session.add_all([*users, grant])
+        await async_session.flush()
+        async_session.add_all(
+            [
+                MatchFactory.create(user_id=users[0].id, grant_id=grant.id, match_score=0.2, user_action="saved"),
+                MatchFactory.create(user_id=users[1].id, grant_id=grant.id, match_score=0.9),
+                MatchFactory.create(user_id=users[2].id, grant_id=grant.id, match_score=0.3),
+            ]
+        )
+        await async_session.commit()
+
+        @asynccontextmanager
+        async def session_scope():
+            yield async_session
+
+        service = MagicMock()
+        with (
+            patch.object(notifications, "get_async_session", session_scope),
+            patch.object(notifications, "get_sync_notification_service", return_value=service),
+        ):
+            notified = await notify_grant_update(grant.id, "deadline_changed", message="Deadline changed")
+
+        assert notified == 2
+        assert {c.kwargs["user_id"] for c in service.notify_grant_update.call_args_list} == {users[0].id, users[1].id}
@@ -0,0 +1,220 @@
+"""
+Tests for indexing Celery tasks.
+Tests the streaming bulk reindex_grants pipeline with a fake embeddings API.
+"""
+
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+import pytest
+
+from backend.tasks.indexing import (
+    REINDEX_CHECKPOINT_KEY,
+    ReindexCheckpoint,
+    TokenBudget,
+    _reindex_grant_pages,
+)
+
+
+def _grant_row(title=None):
+    grant_id = uuid.uuid4()
+    return SimpleNamespace(
+        id=grant_id,
+        title=title or f"Grant {grant_id}",
+        agency="NSF",
+        source="nsf",
+        description="Description",
+        categories=["biology"],
+        eligibility=None,
+        amount_min=None,
+        amount_max=None,
+    )
+
+
+class FakeEmbeddingsClient:
+    """AsyncOpenAI stand-in that embeds batches after a delay."""
+
+    def __init__(self, latency=0.05, fail_on_call=None):
+        self.latency = latency
+        self.fail_on_call = fail_on_call
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.embeddings = SimpleNamespace(create=self._create)
+
+    async def _create(self, model, input, encoding_format):
+        self.calls.append(list(input))
+        call_number = len(self.calls)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if call_number == self.fail_on_call:
+                raise RuntimeError("embedding failure")
+            # Return out of order to check results are re-sorted by index
+            data = [SimpleNamespace(index=i, embedding=[float(i)] * 4) for i in range(len(input))]
+            return SimpleNamespace(data=list(reversed(data)))
+        finally:
+            self.in_flight -= 1
+
+    async def close(self):
+        pass
+
+
+def _stats():
+    return {"total_processed": 0, "successful": 0, "failed": 0, "batches": 0}
+
+
+def _run(pages, client, checkpoint, write_db=None, concurrency=3):
+    stats = _stats()
+    write_db = write_db or MagicMock()
+    asyncio.run(
+        _reindex_grant_pages(
+            pages,
+            write_db,
+            checkpoint,
+            stats,
+            client=client,
+            concurrency=concurrency,
+            budget=TokenBudget(10_000_000),
+        )
+    )
+    return stats, write_db
+
+
+class TestTokenBudget:
+    """Tests for the token-rate budget."""
+
+    def test_acquire_within_budget_does_not_wait(self):
+        budget = TokenBudget(6000)
+
+        start = time.monotonic()
+        asyncio.run(budget.acquire(6000))
+
+        assert time.monotonic() - start < 0.05
+
+    def test_acquire_over_budget_waits_for_refill(self):
+        budget = TokenBudget(6000)  # 100 tokens/second
+
+        async def spend():
+            await budget.acquire(6000)
+            await budget.acquire(10)
+
+        start = time.monotonic()
+        asyncio.run(spend())
+
+        assert time.monotonic() - start >= 0.08
+
+
+class TestReindexGrantPages:
+    """Tests for the concurrent embed-and-store pipeline."""
+
+    @pytest.fixture
+    def checkpoint(self):
+        return ReindexCheckpoint(fakeredis.FakeRedis(decode_responses=True))
+
+    def test_one_request_and_one_update_per_page(self, checkpoint):
+        pages = [[_grant_row() for _ in range(5)] for _ in range(4)]
+        client = FakeEmbeddingsClient()
+
+        stats, write_db = _run(pages, client, checkpoint)
+
+        assert len(client.calls) == 4
+        assert all(len(call) == 5 for call in client.calls)
+        assert write_db.execute.call_count == 4
+        assert write_db.commit.call_count == 4
+        assert stats == {"total_processed": 20, "successful": 20, "failed": 0, "batches": 4}
+
+        # Pages may finish in any order; find the update for the first page
+        first_ids = [str(row.id) for row in pages[0]]
+        params = next(c[0][1] for c in write_db.execute.call_args_list if c[0][1]["ids"] == first_ids)
+        assert params["embeddings"][0] == "[0,0,0,0]"
+        assert params["embeddings"][4] == "[4,4,4,4]"
+
+    def test_requests_run_concurrently_up_to_limit(self, checkpoint):
+        pages = [[_grant_row()] for _ in range(6)]
+        client = FakeEmbeddingsClient(latency=0.05)
+
+        start = time.monotonic()
+        _run(pages, client, checkpoint, concurrency=3)
+        elapsed = time.monotonic() - start
+
+        assert client.max_in_flight == 3
+        assert elapsed < 6 * 0.05
+
+    def test_checkpoint_tracks_last_page(self, checkpoint):
+        pages = [[_grant_row() for _ in range(2)] for _ in range(3)]
+
+        _run(pages, FakeEmbeddingsClient(), checkpoint)
+
+        assert checkpoint.load() == str(pages[-1][-1].id)
+
+    def test_failed_batch_is_counted_and_others_stored(self, checkpoint):
+        pages = [[_grant_row() for _ in range(2)] for _ in range(3)]
+        client = FakeEmbeddingsClient(fail_on_call=2)
+
+        stats, write_db = _run(pages, client, checkpoint, concurrency=1)
+
+        assert stats["successful"] == 4
+        assert stats["failed"] == 2
+        assert write_db.execute.call_count == 2
+
+    def test_cached_texts_are_not_requested(self, checkpoint):
+        repeated = [_grant_row(title="Same"), _grant_row(title="Same")]
+        client = FakeEmbeddingsClient()
+
+        stats, _ = _run([[repeated[0]], [repeated[1]]], client, checkpoint, concurrency=1)
+
+        assert len(client.calls) == 1
+        assert stats["successful"] == 2
+
+    def test_empty_grant_text_is_skipped(self, checkpoint):
+        empty = _grant_row()
+        empty.title = empty.agency = empty.source = empty.description = empty.categories = None
+        client = FakeEmbeddingsClient()
+
+        stats, _ = _run([[empty, _grant_row()]], client, checkpoint)
+
+        assert len(client.calls[0]) == 1
+        assert stats["failed"] == 1
+        assert stats["successful"] == 1
+
+
+class TestReindexGrantsTask:
+    """Tests for the reindex_grants Celery task."""
+
+    def _run_task(self, redis_client, **kwargs):
+        from backend.tasks.indexing import reindex_grants
+
+        with (
+            patch("backend.tasks.indexing.get_sync_db", return_value=MagicMock()),
+            patch("backend.tasks.indexing.redis.from_url", return_value=redis_client),
+            patch("backend.tasks.indexing._iter_grant_pages", return_value=iter([])) as iter_pages,
+            patch("backend.tasks.indexing.openai.AsyncOpenAI", return_value=FakeEmbeddingsClient()),
+        ):
+            stats = reindex_grants.run(**kwargs)
+        return stats, iter_pages
+
+    def test_resumes_from_checkpoint_and_clears_it(self):
+        redis_client = fakeredis.FakeRedis(decode_responses=True)
+        resume_id = str(uuid.uuid4())
+        redis_client.set(REINDEX_CHECKPOINT_KEY, resume_id)
+
+        stats, iter_pages = self._run_task(redis_client, batch_size=10)
+
+        assert iter_pages.call_args[0][1:] == (resume_id, 10)
+        assert stats["resumed_from"] == resume_id
+        assert redis_client.get(REINDEX_CHECKPOINT_KEY) is None
+
+    def test_resume_false_starts_from_beginning(self):
+        redis_client = fakeredis.FakeRedis(decode_responses=True)
+        redis_client.set(REINDEX_CHECKPOINT_KEY, str(uuid.uuid4()))
+
+        stats, iter_pages = self._run_task(redis_client, resume=False)
+
+        assert iter_pages.call_args[0][1] is None
+        assert stats["resumed_from"] is None
@@ -0,0 +1,161 @@
+"""
+Tests for matching Celery tasks.
+Tests the set-based recompute_user_matches flow with mocked DB, LLM and Redis.
+"""
+
+import json
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agents.matching.models import MatchResult
+
+
+def _row(**fields):
+    row = MagicMock()
+    for key, value in fields.items():
+        setattr(row, key, value)
+    return row
+
+
+def _grant_row(distance):
+    return _row(
+        id=uuid.uuid4(),
+        title="Grant",
+        description="Description",
+        funding_agency="NSF",
+        funding_amount=100000,
+        deadline=None,
+        eligibility={"applicant_types": ["Universities"]},
+        categories=["biology"],
+        distance=distance,
+    )
+
+
+class TestRecomputeUserMatches:
+    """Tests for recompute_user_matches."""
+
+    def _run(self, user_id, grant_rows, existing=(), llm_score=90):
+        from backend.tasks.matching import recompute_user_matches
+
+        profile = _row(
+            id=uuid.uuid4(),
+            research_areas=["biology"],
+            methods=[],
+            past_grants=[{"title": "Prior award"}],
+            institution="MIT",
+            department="Biology",
+            keywords=[],
+        )
+
+        session = MagicMock()
+        self.match_ids = {row.id: uuid.uuid4() for row in grant_rows}
+        results = [
+            MagicMock(fetchone=MagicMock(return_value=profile)),
+            MagicMock(fetchall=MagicMock(return_value=grant_rows)),
+            iter(existing),
+            iter([_row(id=match_id, grant_id=grant_id) for grant_id, match_id in self.match_ids.items()]),
+        ]
+        session.execute = MagicMock(side_effect=results)
+        session_ctx = MagicMock()
+        session_ctx.__enter__ = MagicMock(return_value=session)
+        session_ctx.__exit__ = MagicMock(return_value=False)
+
+        matcher = MagicMock()
+        matcher._compute_priority_level.return_value = "high"
+
+        def rerank(pairs):
+            results = {
+                (grant.grant_id, pm.user_id): MatchResult(match_score=llm_score, reasoning="Fit", predicted_success=50)
+                for grant, pm in pairs
+            }
+            return results, {"llm_calls": 1, "llm_cache_hits": 0, "llm_evaluated": len(pairs), "llm_batches_failed": 0}
+
+        matcher.rerank_pairs = MagicMock(side_effect=rerank)
+        redis_client = MagicMock()
+
+        with (
+            patch("backend.tasks.matching.Session", return_value=session_ctx),
+            patch("backend.tasks.matching.GrantMatcher", return_value=matcher),
+            patch("backend.tasks.matching.redis.from_url", return_value=redis_client),
+        ):
+            stats = recompute_user_matches.run(str(user_id))
+
+        return stats, session, matcher, redis_client
+
+    def test_single_ann_query_and_bulk_upsert(self):
+        """Candidates come from one query and matches are written in one statement."""
+        user_id = uuid.uuid4()
+        grant_rows = [_grant_row(0.1), _grant_row(0.2), _grant_row(0.3)]
+
+        stats, session, matcher, redis_client = self._run(user_id, grant_rows)
+
+        assert stats["grants_evaluated"] == 3
+        assert stats["matches_updated"] == 3
+        assert stats["llm_calls"] == 1
+        # profile + ANN candidates + existing scores + bulk upsert
+        assert session.execute.call_count == 4
+        upsert_params = session.execute.call_args_list[3][0][1]
+        assert upsert_params["user_id"] == str(user_id)
+        assert upsert_params["grant_ids"] == [str(row.id) for row in grant_rows]
+        matcher.rerank_pairs.assert_called_once()
+        assert len(matcher.rerank_pairs.call_args[0][0]) == 3
+        session.commit.assert_called_once()
+
+    def test_similarity_from_distance(self):
+        """Vector similarity handed to the re-rank is 1 - distance."""
+        stats, session, matcher, _ = self._run(uuid.uuid4(), [_grant_row(0.25)])
+
+        ((_, profile_match),) = matcher.rerank_pairs.call_args[0][0]
+        assert profile_match.vector_similarity == pytest.approx(0.75)
+
+    def test_new_high_matches_published_in_pipeline(self):
+        """Only newly high-scoring matches are published, through one pipeline."""
+        grant_rows = [_grant_row(0.1), _grant_row(0.1)]
+        existing = [_row(grant_id=grant_rows[0].id, match_score=0.85)]
+
+        stats, _, _, redis_client = self._run(uuid.uuid4(), grant_rows, existing=existing)
+
+        pipe = redis_client.pipeline.return_value
+        assert stats["new_high_matches"] == 1
+        assert pipe.xadd.call_count == 1
+        pipe.execute.assert_called_once()
+        redis_client.xadd.assert_not_called()
+
+    def test_existing_high_match_not_republished(self):
+        """A match already stored above the threshold (0-1 scale) is not published again."""
+        grant_rows = [_grant_row(0.1)]
+        existing = [_row(grant_id=grant_rows[0].id, match_score=0.85)]
+
+        stats, _, _, redis_client = self._run(uuid.uuid4(), grant_rows, existing=existing)
+
+        assert stats["new_high_matches"] == 0
+        redis_client.pipeline.return_value.xadd.assert_not_called()
+
+    def test_improved_match_is_published(self):
+        """A stored match below the threshold that now scores above it is published."""
+        grant_rows = [_grant_row(0.1)]
+        existing = [_row(grant_id=grant_rows[0].id, match_score=0.5)]
+
+        stats, _, _, redis_client = self._run(uuid.uuid4(), grant_rows, existing=existing)
+
+        assert stats["new_high_matches"] == 1
+        assert redis_client.pipeline.return_value.xadd.call_count == 1
+
+    def test_published_events_carry_stored_match_ids(self):
+        """Events reference the match rows returned by the upsert."""
+        grant_rows = [_grant_row(0.1)]
+
+        _, _, _, redis_client = self._run(uuid.uuid4(), grant_rows)
+
+        pipe = redis_client.pipeline.return_value
+        event = json.loads(pipe.xadd.call_args[0][1]["data"])
+        assert event["match_id"] == str(self.match_ids[grant_rows[0].id])
+
+    def test_no_candidates_returns_early(self):
+        """Users with no nearby grants skip the LLM entirely."""
+        stats, session, matcher, _ = self._run(uuid.uuid4(), [])
+
+        assert stats["grants_evaluated"] == 0
+        matcher.rerank_pairs.assert_not_called()
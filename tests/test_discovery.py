@@ -6,8 +6,9 @@ Tests for grant discovery agents including RSS parsing, API fetching, and Redis
 import asyncio
 import json
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import fakeredis
 import httpx
 import pytest
 
@@ -19,6 +20,7 @@ from agents.discovery.grants_gov_rss import (
     DiscoveredGrant,
     RateLimiter,
 )
+from backend.core.config import settings
 
 
 # =============================================================================
@@ -398,9 +400,9 @@ class TestGrantsGovRSSAgent:
         assert normalized.description == "RSS description"
 
     @pytest.mark.asyncio
-    async def test_discover_new_grants_filters_duplicates(self, agent, fake_redis, sample_rss_feed, mock_httpx_client):
+    async def test_discover_new_grants_filters_duplicates(self, agent, sample_rss_feed, mock_httpx_client):
         """Test that already-processed grants are filtered."""
-        agent._redis = fake_redis
+        agent._redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
 
         # Mark one entry as already processed
         await agent.mark_processed("123456")
@@ -567,6 +569,72 @@ class TestBaseDiscoveryAgent:
         assert base_agent._redis_client is None
 
 
+class TestBatchSeenSet:
+    """Tests for batched duplicate checks against the set and Bloom backends."""
+
+    class ConcreteAgent(DiscoveryAgent):
+        async def discover(self):
+            return []
+
+        async def run(self):
+            return 0
+
+    @pytest.fixture(params=["set", "bloom"])
+    def agent(self, request):
+        """Agent on fake Redis, once per seen-set backend."""
+        agent = self.ConcreteAgent("test_source")
+        agent.SEEN_BACKEND = request.param
+        agent._redis_client = fakeredis.FakeRedis(decode_responses=True)
+        return agent
+
+    def test_filter_duplicates_marks_seen_and_repeats(self, agent):
+        """Test seen grants and repeats within the batch are duplicates."""
+        agent.mark_many_as_seen([("1", "Grant 1")])
+
+        duplicates = agent.filter_duplicates([("1", "Grant 1"), ("2", "Grant 2"), ("2", "Grant 2"), ("3", "Grant 3")])
+
+        assert duplicates == [True, False, True, False]
+
+    def test_single_grant_helpers_share_storage(self, agent):
+        """Test is_duplicate and mark_as_seen agree with the batch methods."""
+        agent.mark_as_seen("1", "Grant 1")
+
+        assert agent.is_duplicate("1", "Grant 1")
+        assert not agent.is_duplicate("2", "Grant 2")
+        assert agent.filter_duplicates([("1", "Grant 1")]) == [True]
+
+    def test_ttl_refreshed_once_per_run(self, agent):
+        """Test marking pages does not touch the TTL until refresh_seen_ttl."""
+        redis_client = agent.redis_client
+        with patch.object(redis_client, "expire", wraps=redis_client.expire) as expire:
+            agent.mark_many_as_seen([("1", "Grant 1")])
+            agent.mark_many_as_seen([("2", "Grant 2")])
+            agent.refresh_seen_ttl()
+            # Nothing marked since the last refresh
+            agent.refresh_seen_ttl()
+
+        expire.assert_called_once()
+        key = expire.call_args[0][0]
+        assert 0 < redis_client.ttl(key) <= agent.SEEN_GRANT_TTL_SECONDS
+
+    def test_bloom_filter_memory_is_bounded(self):
+        """Test the Bloom backend stores a bitmap sized by its capacity."""
+        agent = self.ConcreteAgent("test_source")
+        agent.SEEN_BACKEND = "bloom"
+        agent._redis_client = fakeredis.FakeRedis(decode_responses=True)
+        with (
+            patch.object(settings, "discovery_bloom_capacity", 1000),
+            patch.object(settings, "discovery_bloom_error_rate", 0.01),
+        ):
+            agent.mark_many_as_seen([(str(i), f"Grant {i}") for i in range(1000)])
+            bloom = agent._get_bloom_filter()
+
+        assert agent.redis_client.type(agent._get_seen_key()) == "none"
+        assert agent.redis_client.strlen(bloom.key) <= bloom.size // 8 + 1
+        unseen = agent.filter_duplicates([(str(i), f"Other {i}") for i in range(1000)])
+        assert sum(unseen) < 50
+
+
 # =============================================================================
 # Error Handling Tests
 # =============================================================================
@@ -705,16 +773,15 @@ class TestRedisStreamPublishing:
                 return 0
 
         agent = ConcreteAgent("test")
-        # Use sync mock for batch operations
-        mock_redis = MagicMock()
-        mock_redis.xadd = MagicMock(return_value="123-0")
-        mock_redis.sadd = MagicMock()
-        mock_redis.expire = MagicMock()
-        agent._redis_client = mock_redis
+        sync_redis = fakeredis.FakeRedis(decode_responses=True)
+        agent._redis_client = sync_redis
 
         grants = [{"external_id": f"grant-{i}", "title": f"Grant {i}"} for i in range(5)]
 
-        message_ids = agent.publish_grants_batch(grants)
+        with patch.object(sync_redis, "pipeline", wraps=sync_redis.pipeline) as pipeline:
+            message_ids = agent.publish_grants_batch(grants)
 
         assert len(message_ids) == 5
-        assert mock_redis.xadd.call_count == 5
+        assert sync_redis.xlen(agent.GRANTS_STREAM) == 5
+        # All five XADDs went out in one pipeline
+        pipeline.assert_called_once()
@@ -53,8 +53,9 @@ class TestStreamNames:
         from backend.events import StreamNames
 
         streams = StreamNames.all_streams()
-        assert len(streams) == 4
+        assert len(streams) == 5
         assert "grants:discovered" in streams
+        assert "grants:updated" in streams
         assert "grants:validated" in streams
 
 
@@ -3,8 +3,12 @@ Tests for WebSocket server.
 Tests the Socket.io server and connection management.
 """
 
+import asyncio
+import json
+import time
 import uuid
 from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -389,3 +393,292 @@ class TestWebSocketEventTypes:
 
         assert handler is not None
         assert handler({}) == "match"
+
+
+class TestConsistentHashRing:
+    """Tests for consistent hashing of users to workers."""
+
+    WORKERS = ["http://ws-1:8000", "http://ws-2:8000", "http://ws-3:8000"]
+
+    def test_node_for_is_stable(self):
+        """Test the same user always maps to the same worker."""
+        from backend.websocket import ConsistentHashRing
+
+        user_id = str(uuid.uuid4())
+
+        assert ConsistentHashRing(self.WORKERS).node_for(user_id) == ConsistentHashRing(
+            list(reversed(self.WORKERS))
+        ).node_for(user_id)
+
+    def test_users_spread_across_workers(self):
+        """Test users are distributed over every worker."""
+        from backend.websocket import ConsistentHashRing
+
+        ring = ConsistentHashRing(self.WORKERS)
+        counts = {worker: 0 for worker in self.WORKERS}
+        for _ in range(3000):
+            counts[ring.node_for(uuid.uuid4())] += 1
+
+        assert all(count > 600 for count in counts.values())
+
+    def test_adding_worker_moves_only_its_share(self):
+        """Test adding a worker only reassigns users to the new worker."""
+        from backend.websocket import ConsistentHashRing
+
+        before = ConsistentHashRing(self.WORKERS)
+        after = ConsistentHashRing(self.WORKERS + ["http://ws-4:8000"])
+        users = [str(uuid.uuid4()) for _ in range(1000)]
+
+        moved = [u for u in users if before.node_for(u) != after.node_for(u)]
+
+        assert all(after.node_for(u) == "http://ws-4:8000" for u in moved)
+        assert len(moved) < 400
+
+    def test_empty_ring_rejected(self):
+        """Test a ring needs at least one worker."""
+        from backend.websocket import ConsistentHashRing
+
+        with pytest.raises(ValueError):
+            ConsistentHashRing([])
+
+    def test_worker_for_user_unsharded(self, monkeypatch):
+        """Test no worker is assigned when the tier is not sharded."""
+        from backend.core.config import settings
+        from backend.websocket import worker_for_user
+
+        monkeypatch.setattr(settings, "ws_workers", "")
+
+        assert worker_for_user(uuid.uuid4()) is None
+
+    def test_worker_for_user_from_settings(self, monkeypatch):
+        """Test users are assigned to one of the configured workers."""
+        from backend.core.config import settings
+        from backend.websocket import worker_for_user
+
+        monkeypatch.setattr(settings, "ws_workers", " http://ws-1:8000, http://ws-2:8000 ")
+
+        assert worker_for_user(uuid.uuid4()) in {"http://ws-1:8000", "http://ws-2:8000"}
+
+
+class TestEmitCoalescer:
+    """Tests for per-user emit coalescing."""
+
+    @pytest.fixture
+    def emitted(self):
+        """Frames passed to the emit callback."""
+        return []
+
+    @pytest.fixture
+    def coalescer(self, emitted):
+        """Create a coalescer with a short window."""
+        from backend.websocket import EmitCoalescer, WorkerStats
+
+        async def emit(event, data, room):
+            emitted.append((event, data, room))
+
+        return EmitCoalescer(emit, WorkerStats(), window_seconds=0.01)
+
+    async def test_single_event_emitted_as_is(self, coalescer, emitted):
+        """Test a lone event is not wrapped in a batch."""
+        coalescer.add("u1", "new_match", {"grant_id": "g1"})
+        await asyncio.sleep(0.05)
+
+        assert emitted == [("new_match", {"grant_id": "g1"}, "user:u1")]
+
+    async def test_burst_coalesced_into_one_frame(self, coalescer, emitted):
+        """Test a burst for one user becomes a single batch frame."""
+        for i in range(3):
+            coalescer.add("u1", "new_match", {"grant_id": f"g{i}"})
+        coalescer.add("u2", "deadline_soon", {"deadline_id": "d1"})
+        await asyncio.sleep(0.05)
+
+        frames = {room: (event, data) for event, data, room in emitted}
+        assert len(emitted) == 2
+        assert frames["user:u1"][0] == "batch"
+        assert [e["payload"]["grant_id"] for e in frames["user:u1"][1]["events"]] == ["g0", "g1", "g2"]
+        assert frames["user:u2"] == ("deadline_soon", {"deadline_id": "d1"})
+
+    async def test_stats_update_superseded(self, coalescer, emitted):
+        """Test only the latest stats_update in a burst is sent."""
+        coalescer.add("u1", "stats_update", {"new_grants_count": 1})
+        coalescer.add("u1", "stats_update", {"new_grants_count": 2})
+        await asyncio.sleep(0.05)
+
+        assert emitted == [("stats_update", {"new_grants_count": 2}, "user:u1")]
+
+    async def test_max_batch_flushes_immediately(self, emitted):
+        """Test a full batch is emitted without waiting for the window."""
+        from backend.websocket import EmitCoalescer, WorkerStats
+
+        async def emit(event, data, room):
+            emitted.append((event, data, room))
+
+        coalescer = EmitCoalescer(emit, WorkerStats(), window_seconds=60, max_batch=2)
+        coalescer.add("u1", "new_match", {})
+        coalescer.add("u1", "new_match", {})
+        await asyncio.sleep(0.01)
+
+        assert len(emitted) == 1
+        assert emitted[0][0] == "batch"
+
+    async def test_close_flushes_pending(self, coalescer, emitted):
+        """Test closing emits events still inside their window."""
+        from backend.websocket import EmitCoalescer, WorkerStats
+
+        async def emit(event, data, room):
+            emitted.append((event, data, room))
+
+        coalescer = EmitCoalescer(emit, WorkerStats(), window_seconds=60)
+        coalescer.add("u1", "new_match", {})
+        await coalescer.close()
+
+        assert len(emitted) == 1
+
+    async def test_emit_stats_recorded(self):
+        """Test frames, events and errors are counted."""
+        from backend.websocket import EmitCoalescer, WorkerStats
+
+        stats = WorkerStats()
+        calls = []
+
+        async def emit(event, data, room):
+            calls.append(room)
+            if room == "user:bad":
+                raise RuntimeError("boom")
+
+        coalescer = EmitCoalescer(emit, stats, window_seconds=0.01)
+        coalescer.add("u1", "new_match", {}, published_at=time.time())
+        coalescer.add("u1", "new_match", {}, published_at=time.time())
+        coalescer.add("bad", "new_match", {})
+        await asyncio.sleep(0.05)
+
+        snapshot = stats.snapshot()
+        assert snapshot["frames_emitted"] == 1
+        assert snapshot["events_emitted"] == 2
+        assert snapshot["events_coalesced"] == 1
+        assert snapshot["emit_errors"] == 1
+        assert snapshot["delivery_latency_ms"]["p50"] is not None
+
+
+class TestWorkerStats:
+    """Tests for worker emit statistics."""
+
+    def test_empty_percentiles(self):
+        """Test percentiles are None before any emit."""
+        from backend.websocket import WorkerStats
+
+        snapshot = WorkerStats().snapshot()
+
+        assert snapshot["emit_latency_ms"] == {"p50": None, "p95": None, "p99": None}
+
+    def test_percentiles(self):
+        """Test emit latency percentiles."""
+        from backend.websocket import WorkerStats
+
+        stats = WorkerStats()
+        for ms in range(1, 101):
+            stats.record_emit(1, float(ms))
+
+        latency = stats.snapshot()["emit_latency_ms"]
+        assert latency["p50"] == 51.0
+        assert latency["p99"] == 100.0
+
+
+class TestShardedWebSocket:
+    """Tests for a WebSocket worker in a sharded tier."""
+
+    WORKERS = ["http://ws-1:8000", "http://ws-2:8000"]
+
+    @pytest.fixture
+    def ws(self):
+        """Create a sharded worker."""
+        from backend.websocket import GrantRadarWebSocket
+
+        return GrantRadarWebSocket(workers=self.WORKERS, worker_url=self.WORKERS[0], redis_client=MagicMock())
+
+    def _user_owned_by(self, ws, owned: bool) -> str:
+        while True:
+            user_id = str(uuid.uuid4())
+            if ws.owns_user(user_id) == owned:
+                return user_id
+
+    def test_worker_must_be_in_list(self):
+        """Test a worker URL outside the tier is rejected."""
+        from backend.websocket import GrantRadarWebSocket
+
+        with pytest.raises(ValueError):
+            GrantRadarWebSocket(workers=self.WORKERS, worker_url="http://ws-9:8000")
+
+    def test_unsharded_worker_owns_everyone(self):
+        """Test an unsharded worker serves every user."""
+        from backend.websocket import GrantRadarWebSocket
+
+        ws = GrantRadarWebSocket(workers=[], redis_client=MagicMock())
+
+        assert ws.owns_user(str(uuid.uuid4())) is True
+        assert ws.get_stats()["sharded"] is False
+
+    async def test_connect_redirects_to_owner(self, ws):
+        """Test a user connecting to the wrong worker is pointed at the owner."""
+        import socketio
+
+        from backend.api.deps import create_access_token
+
+        user_id = self._user_owned_by(ws, owned=False)
+        connect = ws.sio.handlers["/"]["connect"]
+
+        with pytest.raises(socketio.exceptions.ConnectionRefusedError) as exc_info:
+            await connect("sid-1", {}, {"token": create_access_token({"sub": user_id})})
+
+        assert exc_info.value.error_args == {"message": "wrong_shard", "data": {"worker_url": self.WORKERS[1]}}
+        assert ws.state.get_stats()["total_connections"] == 0
+
+    async def test_connect_subscribes_user_channel_once(self, ws):
+        """Test the owner subscribes a user's channel on their first session only."""
+        from backend.api.deps import create_access_token
+        from backend.websocket import PubSubChannels
+
+        ws._pubsub = AsyncMock()
+        ws._sio.enter_room = AsyncMock()
+        ws._sio.leave_room = AsyncMock()
+        ws._sio.emit = AsyncMock()
+        user_id = self._user_owned_by(ws, owned=True)
+        token = create_access_token({"sub": user_id})
+        connect = ws.sio.handlers["/"]["connect"]
+        disconnect = ws.sio.handlers["/"]["disconnect"]
+
+        await connect("sid-1", {}, {"token": token})
+        await connect("sid-2", {}, {"token": token})
+        ws._pubsub.subscribe.assert_awaited_once_with(PubSubChannels.user_channel(user_id))
+
+        await disconnect("sid-1")
+        ws._pubsub.unsubscribe.assert_not_awaited()
+        await disconnect("sid-2")
+        ws._pubsub.unsubscribe.assert_awaited_once_with(PubSubChannels.user_channel(user_id))
+
+    async def test_user_channel_message_coalesced(self, ws):
+        """Test user channel messages are queued on the coalescer."""
+        ws._coalescer = MagicMock()
+
+        await ws._handle_pubsub_message(
+            {
+                "channel": "ws:user:u1",
+                "data": json.dumps({"event_type": "new_match", "payload": {"grant_id": "g1"}}),
+            }
+        )
+
+        ws._coalescer.add.assert_called_once_with("u1", "new_match", {"grant_id": "g1"}, None)
+        assert ws.get_stats()["events_received"] == 1
+
+    async def test_targeted_event_skipped_when_user_elsewhere(self, ws):
+        """Test event channel messages for users on other workers are dropped."""
+        ws._coalescer = MagicMock()
+
+        await ws._handle_pubsub_message(
+            {
+                "channel": "ws:event:new_match",
+                "data": json.dumps({"event_type": "new_match", "payload": {}, "user_id": "u1"}),
+            }
+        )
+
+        ws._coalescer.add.assert_not_called()